@@ -0,0 +1,148 @@
+"""
+Throughput benchmark for CopilotDetector.detect_in_text.
+
+Runs the detector over a synthetic corpus of comment bodies and reports
+throughput in MB/s, alongside the previous per-keyword implementation for
+comparison. Both build full Detection objects with evidence windows, and
+the single-pass detector is given the previous keyword list as its only
+rule, so both do the same work. The built-in rule set, which covers many
+more tools, is reported on its own for reference.
+
+Usage:
+    python benchmarks/bench_detector.py [--bodies N] [--repeat N]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from llmdev.detector import CopilotDetector, Detection
+from llmdev.rules import DetectionRule, RuleSet
+
+
+SENTENCES = [
+    "Refactored the request handler to reuse the session pool.",
+    "LGTM, but please add a regression test for the empty case.",
+    "CI is green on all supported Python versions.",
+    "This was drafted with GitHub Copilot and then reviewed by hand.",
+    "Renamed the helper and updated the docstrings accordingly.",
+    "Could we move this into the config module instead?",
+    "Generated by Copilot, verified against the spec.",
+    "Fixed the off-by-one in the pagination cursor.",
+]
+
+
+def build_corpus(count: int, seed: int = 0):
+    """Build a list of synthetic comment bodies."""
+    rng = random.Random(seed)
+    return [
+        "\n".join(rng.choice(SENTENCES) for _ in range(rng.randint(1, 12)))
+        for _ in range(count)
+    ]
+
+
+# Keyword list used by the previous implementation
+LEGACY_KEYWORDS = [
+    "copilot",
+    "co-pilot",
+    "github copilot",
+    "gh copilot",
+    "generated by copilot",
+    "using copilot",
+    "with copilot",
+]
+
+
+def legacy_detect_in_text(text: str, source_type: str, source_id: str):
+    """The previous detect_in_text: one context regex per keyword per call."""
+    if not text:
+        return []
+
+    detections = []
+    search_text = text.lower()
+
+    for keyword in LEGACY_KEYWORDS:
+        if keyword in search_text:
+            pattern = re.compile(f".{{0,50}}{re.escape(keyword)}.{{0,50}}", re.IGNORECASE)
+            for match in pattern.findall(text):
+                detections.append(
+                    Detection(
+                        source_type=source_type,
+                        source_id=source_id,
+                        detection_type="explicit_mention",
+                        confidence=0.95,
+                        evidence=match.strip(),
+                        metadata={"keyword": keyword},
+                    )
+                )
+            break
+
+    return detections
+
+
+def legacy_rules() -> RuleSet:
+    """The previous keyword list as a single rule, for a like-for-like comparison."""
+    return RuleSet(
+        [
+            DetectionRule(
+                name="copilot-keywords",
+                tool="copilot",
+                patterns=[re.escape(keyword) for keyword in LEGACY_KEYWORDS],
+                confidence=0.95,
+            )
+        ]
+    )
+
+
+def measure(label: str, func, corpus, repeat: int) -> float:
+    """Run func over the corpus and print throughput in MB/s."""
+    total_bytes = sum(len(body.encode("utf-8")) for body in corpus) * repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for index, body in enumerate(corpus):
+            func(body, index)
+    elapsed = time.perf_counter() - start
+    throughput = total_bytes / elapsed / 1_000_000
+    print(f"{label:<16} {throughput:8.2f} MB/s  ({elapsed:.3f}s for {total_bytes:,} bytes)")
+    return throughput
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bodies", type=int, default=20000, help="Number of comment bodies")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.bodies)
+    detector = CopilotDetector(legacy_rules())
+    builtin = CopilotDetector()
+
+    found = sum(len(legacy_detect_in_text(body, "pr", str(i))) for i, body in enumerate(corpus))
+    assert found == sum(
+        len(detector.detect_in_text(body, "pr", str(i))) for i, body in enumerate(corpus)
+    ), "implementations disagree on the number of detections"
+
+    legacy = measure(
+        "legacy",
+        lambda body, i: legacy_detect_in_text(body, "pr", str(i)),
+        corpus,
+        args.repeat,
+    )
+    current = measure(
+        "single-pass",
+        lambda body, i: detector.detect_in_text(body, "pr", str(i)),
+        corpus,
+        args.repeat,
+    )
+    print(f"{'speedup':<16} {current / legacy:8.2f}x  ({found:,} detections per pass)")
+    measure(
+        "built-in rules",
+        lambda body, i: builtin.detect_in_text(body, "pr", str(i)),
+        corpus,
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Base class for mergeable summary accumulators.
+
+Aggregate summaries (detections, iteration patterns, prompt patterns, PR
+categories) are built incrementally: items are added one at a time, partial
+summaries from shards, workers or earlier runs are merged, and the final
+dictionary is produced once at the end. No per-item results need to be
+kept in memory.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, TypeVar
+
+
+A = TypeVar("A", bound="Accumulator")
+
+
+class Accumulator(ABC):
+    """Incrementally built summary that can be combined with others.
+
+    Subclasses keep only running totals, so instances are small and can be
+    pickled between processes.
+    """
+
+    @abstractmethod
+    def add(self: A, item: Any) -> A:
+        """
+        Add one item to the summary.
+
+        Args:
+            item: Per-item result
+
+        Returns:
+            This accumulator
+        """
+
+    def extend(self: A, items: Iterable[Any]) -> A:
+        """
+        Add many items to the summary.
+
+        Args:
+            items: Per-item results
+
+        Returns:
+            This accumulator
+        """
+        for item in items:
+            self.add(item)
+        return self
+
+    @abstractmethod
+    def merge(self: A, other: A) -> A:
+        """
+        Merge another partial summary into this one.
+
+        Args:
+            other: Accumulator of the same type
+
+        Returns:
+            This accumulator
+        """
+
+    @abstractmethod
+    def finalize(self) -> Any:
+        """
+        Produce the summary.
+
+        Returns:
+            Summary dictionary
+        """
@@ -2,22 +2,68 @@
 Repository analyzer that orchestrates data collection and analysis.
 """
 
+import os
+import sys
+import sqlite3
 import logging
-from typing import Dict, List, Any
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Sequence, Tuple
 from datetime import datetime
 
+from llmdev import document
+from llmdev.cache import MemoStore, content_hash, source_version
 from llmdev.config import Config
+from llmdev.corpus import Corpus
 from llmdev.github_client import GitHubClient
-from llmdev.detector import CopilotDetector, Detection
+from llmdev.detector import CopilotDetector, Detection, DetectionStore
+from llmdev.importers import Importer
+from llmdev.minhash import NearDuplicateIndex
+from llmdev.rules import load_rules
+from llmdev.records import CommitRecord, IssueRecord, PRRecord
+from llmdev.search import SearchIndex
+from llmdev.spill import MemoryBudget
+from llmdev.store import AnalysisStore
+from llmdev.streaming import StreamPipeline
+from llmdev.trailers import CoAuthorIndex
 from llmdev.analyzers import PRAnalyzer, IterationAnalyzer, PromptAnalyzer
+from llmdev.analyzers import CategoryDistribution, IterationSummary, PromptPatternSummary
+from llmdev.analyzers import PRDistributions
+from llmdev.analyzers import iteration_analyzer, markdown, pr_analyzer, prompt_analyzer
 
 
 logger = logging.getLogger(__name__)
 
 
+def deep_analysis_version() -> str:
+    """
+    Version of the deep analysis code, derived from its source.
+
+    Memoized per-PR results are stored under this version, so editing any
+    analyzer invalidates them automatically.
+
+    Returns:
+        Short hex digest of the analyzer sources
+    """
+    return source_version(
+        pr_analyzer,
+        iteration_analyzer,
+        prompt_analyzer,
+        markdown,
+        document,
+        sys.modules[__name__],
+    )
+
+
 class RepositoryAnalyzer:
     """Analyzes GitHub repositories for LLM-generated code."""
 
+    # Deep analysis runs in-process below this many changed PRs
+    MIN_PARALLEL_PRS = 200
+    DEEP_ANALYSIS_CHUNK_SIZE = 50
+    # PRs whose per-PR outcomes are held in memory together during deep analysis
+    DEEP_ANALYSIS_BLOCK_SIZE = 2000
+
     def __init__(self, config: Config):
         """
         Initialize the analyzer.
@@ -27,7 +73,7 @@ class RepositoryAnalyzer:
         """
         self.config = config
         self.github_client = GitHubClient(config)
-        self.detector = CopilotDetector()
+        self.detector = CopilotDetector(load_rules(config.detection_rules_path))
 
         # Initialize deep analyzers if enabled
         if config.deep_analysis:
@@ -39,10 +85,29 @@ class RepositoryAnalyzer:
             self.iteration_analyzer = None
             self.prompt_analyzer = None
 
+        # Memoize per-PR deep analysis across runs
+        self.memo = None
+        if config.deep_analysis and config.enable_cache:
+            self.memo = MemoStore(str(config.memo_dir), deep_analysis_version())
+
+        # Spill bulky collections to disk beyond the memory ceiling
+        self.memory_budget = None
+        if config.memory_limit_mb:
+            self.memory_budget = MemoryBudget(config.memory_limit_mb << 20, config.spill_dir)
+
     def analyze(self, owner: str, repo: str) -> Dict[str, Any]:
         """
         Analyze a GitHub repository.
 
+        Runs the collect, normalize, detect, deep and aggregate stages in
+        order. Collected data is written to the analysis store, when
+        enabled, but the later stages run on the data collected in this run
+        only, within the configured limits; data kept from earlier
+        collections is analyzed with ``analyze_stored``.
+
+        With ``config.pipelined`` the stages instead overlap; see
+        ``_analyze_pipelined``.
+
         Args:
             owner: Repository owner
             repo: Repository name
@@ -51,36 +116,300 @@ class RepositoryAnalyzer:
             Dictionary containing analysis results
         """
         logger.info(f"Starting analysis of {owner}/{repo}")
+        if self.config.pipelined:
+            return self._analyze_pipelined(owner, repo)
+        collected = self.normalize(self.collect(owner, repo))
+        return self._analyze_collected(collected)
+
+    def analyze_stored(self, full_name: str) -> Dict[str, Any]:
+        """
+        Analyze a repository from the analysis store, without calling GitHub.
+
+        Args:
+            full_name: Repository full name ('owner/repo')
+
+        Returns:
+            Dictionary containing analysis results
+
+        Raises:
+            ValueError: If the analysis store is disabled
+            KeyError: If the repository has not been collected
+        """
+        return self._analyze_collected(self.load_stored(full_name))
+
+    def analyze_corpus(self, full_name: str) -> Dict[str, Any]:
+        """
+        Analyze a repository from the JSONL corpus, without calling GitHub.
+
+        Records are read lazily from the memory-mapped corpus as the stages
+        iterate over them, so repeated offline runs skip both the network
+        and loading the whole collection.
+
+        Args:
+            full_name: Repository full name ('owner/repo')
+
+        Returns:
+            Dictionary containing analysis results
+
+        Raises:
+            ValueError: If no corpus is configured
+            KeyError: If the repository is not in the corpus
+        """
+        if self.config.corpus_path is None:
+            raise ValueError("Corpus analysis requires a corpus (corpus_path)")
+
+        with Corpus(self.config.corpus_path) as corpus:
+            collected = corpus.load_collection(full_name)
+        logger.info(f"Loaded {full_name} from corpus {self.config.corpus_path}")
+        return self._analyze_collected(collected)
+
+    def _analyze_collected(self, collected: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the stages after normalization."""
+        detection = self.detect(collected)
+        deep_analysis = self.deep(collected)
+        results = self.aggregate(collected, detection, deep_analysis)
+        logger.info("Analysis complete")
+        return results
+
+    def _analyze_pipelined(self, owner: str, repo: str) -> Dict[str, Any]:
+        """
+        Fetch, detect and deep-analyze with overlapping stages.
+
+        Records flow from the GitHub fetcher to detection and, when enabled,
+        deep analysis through bounded queues, each stage in its own thread.
+        PRs are analyzed while later ones are still being fetched, and a
+        slow stage makes the fetcher wait instead of letting records pile
+        up. Results are the same as those of the serial stages on the same
+        data; the collection and detections are saved to the analysis store
+        afterwards. Per-stage utilization is reported under
+        results['analysis']['stages'].
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+
+        Returns:
+            Dictionary containing analysis results
+        """
+        repository = self.github_client.get_repository(owner, repo)
+        collected = {
+            "repository": self._repository_metadata(owner, repo, repository),
+            "commits": self._collection((), "commits"),
+            "prs": self._collection((), "prs"),
+            "issues": self._collection((), "issues"),
+        }
+        self.detector.co_authors = CoAuthorIndex()
+        all_detections = DetectionStore()
+        outcomes = []
+
+        def fetch():
+            for record in self._iter_commits(repository):
+                yield "commit", record
+            for record in self._iter_prs(repository):
+                yield "pr", record
+            for record in self._iter_issues(repository):
+                yield "issue", record
+
+        def detect(item):
+            source_type, record = item
+            return [(source_type, record, self.detector.detect_record(record, source_type), None)]
+
+        def deep(item):
+            source_type, record, detections, _ = item
+            if source_type != "pr":
+                return [item]
+            (outcome,), _ = self._deep_outcomes([self._deep_item(record)])
+            return [(source_type, record, detections, outcome)]
+
+        logger.info("Collecting and analyzing repository data in a pipeline...")
+        stream = StreamPipeline(self.config.pipeline_queue_size).add_stage("detect", detect)
+        if self.config.deep_analysis:
+            stream.add_stage("deep", deep)
+        for source_type, record, detections, outcome in stream.run(fetch(), "fetch"):
+            collected[f"{source_type}s"].append(record)
+            all_detections.extend(detections)
+            if outcome is not None:
+                outcomes.append(outcome)
+
+        logger.info(
+            f"Collected {len(collected['commits'])} commits, {len(collected['prs'])} pull "
+            f"requests and {len(collected['issues'])} issues; "
+            f"found {len(all_detections)} AI assistant detections"
+        )
+        if self.config.store_path is not None:
+            with AnalysisStore(self.config.store_path) as store:
+                full_name = store.save_collection(collected)
+                store.save_detections(full_name, all_detections)
+        self._write_corpus(collected)
+
+        detection = {"detections": all_detections, "authors": self.detector.co_authors.summary()}
+        deep_analysis = self._summarize_deep(outcomes) if self.config.deep_analysis else None
+        results = self.aggregate(collected, detection, deep_analysis)
+        results["analysis"]["stages"] = {
+            name: stats.to_dict() for name, stats in stream.stats.items()
+        }
+        logger.info("Analysis complete")
+        return results
+
+    def collect(self, owner: str, repo: str) -> Dict[str, Any]:
+        """
+        Collect stage: fetch repository metadata, commits, PRs and issues.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
 
+        Returns:
+            Dictionary with 'repository' metadata and 'commits', 'prs' and
+            'issues' lists
+        """
         # Get repository
         repository = self.github_client.get_repository(owner, repo)
 
         # Collect data
         logger.info("Collecting repository data...")
-        commits_data = self._collect_commits(repository)
-        prs_data = self._collect_prs(repository)
-        issues_data = self._collect_issues(repository)
+        return {
+            "repository": self._repository_metadata(owner, repo, repository),
+            "commits": self._collect_commits(repository),
+            "prs": self._collect_prs(repository),
+            "issues": self._collect_issues(repository),
+        }
 
-        # Run detection
-        logger.info("Running Copilot detection...")
-        all_detections = []
+    def import_collection(self, importer: Importer) -> Dict[str, Any]:
+        """
+        Collect stage from local data dumps instead of the GitHub API.
 
-        # Detect in commits
-        for commit_data in commits_data:
-            detections = self.detector.detect_in_commit(commit_data)
-            all_detections.extend(detections)
+        Args:
+            importer: Importer reading the dumps
 
-        # Detect in PRs
-        for pr_data in prs_data:
-            detections = self.detector.detect_in_pr(pr_data)
-            all_detections.extend(detections)
+        Returns:
+            Dictionary with 'repository' metadata and 'commits', 'prs' and
+            'issues' collections, as collect() returns them
 
-        # Detect in issues
-        for issue_data in issues_data:
-            detections = self.detector.detect_in_issue(issue_data)
-            all_detections.extend(detections)
+        Raises:
+            ValueError: If the repository cannot be determined from the dumps
+        """
+        logger.info(f"Importing repository data from {len(importer.paths)} local sources...")
+        return importer.collect(self._collection)
 
-        logger.info(f"Found {len(all_detections)} Copilot detections")
+    @staticmethod
+    def _repository_metadata(owner: str, repo: str, repository) -> Dict[str, Any]:
+        """Repository metadata as stored with collected data."""
+        return {
+            "owner": owner,
+            "name": repo,
+            "full_name": repository.full_name,
+            "description": repository.description,
+            "stars": repository.stargazers_count,
+            "forks": repository.forks_count,
+            "created_at": repository.created_at,
+            "updated_at": repository.updated_at,
+        }
+
+    def normalize(self, collected: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize stage: save collected data to the analysis store and corpus.
+
+        Each is written only when configured. The store may also hold data
+        from earlier collections of the repository; that is read back only
+        by offline analysis (``load_stored``), so a run's results stay
+        within its own collection limits.
+
+        Args:
+            collected: Output of the collect stage
+
+        Returns:
+            The collected data of this run
+        """
+        self._write_corpus(collected)
+        if self.config.store_path is not None:
+            with AnalysisStore(self.config.store_path) as store:
+                store.save_collection(collected)
+        return collected
+
+    def load_stored(self, full_name: str) -> Dict[str, Any]:
+        """
+        Load the stored data of a repository, as the normalize stage returns it.
+
+        Args:
+            full_name: Repository full name ('owner/repo')
+
+        Returns:
+            Stored repository data
+
+        Raises:
+            ValueError: If the analysis store is disabled
+            KeyError: If the repository has not been collected
+        """
+        if self.config.store_path is None:
+            raise ValueError("Offline analysis requires an analysis store (store_path)")
+
+        with AnalysisStore(self.config.store_path) as store:
+            collected = store.load_collection(full_name, self._collection)
+        logger.info(f"Loaded {full_name} from the analysis store")
+        return collected
+
+    def detect(self, collected: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Detect stage: find AI assistant usage in commits, PRs and issues.
+
+        Detections are saved to the analysis store, when enabled.
+
+        Args:
+            collected: Output of the normalize stage
+
+        Returns:
+            Dictionary with 'detections' and the co-author 'authors' summary
+        """
+        logger.info("Running AI assistant detection...")
+        self.detector.co_authors = CoAuthorIndex()
+        all_detections = DetectionStore()
+
+        workers = self.config.detection_workers
+        all_detections.extend(self.detector.detect_batch(collected["commits"], "commit", workers))
+        all_detections.extend(self.detector.detect_batch(collected["prs"], "pr", workers))
+        all_detections.extend(self.detector.detect_batch(collected["issues"], "issue", workers))
+
+        logger.info(f"Found {len(all_detections)} AI assistant detections")
+        if self.config.store_path is not None:
+            with AnalysisStore(self.config.store_path) as store:
+                store.save_detections(collected["repository"]["full_name"], all_detections)
+
+        return {"detections": all_detections, "authors": self.detector.co_authors.summary()}
+
+    def deep(self, collected: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Deep stage: prompt, iteration and category analysis of PRs.
+
+        Args:
+            collected: Output of the normalize stage
+
+        Returns:
+            Deep analysis results, or None when deep analysis is disabled
+        """
+        if not self.config.deep_analysis:
+            return None
+        logger.info("Running deep analysis...")
+        return self._run_deep_analysis(collected["prs"], collected["commits"])
+
+    def aggregate(
+        self,
+        collected: Dict[str, Any],
+        detection: Dict[str, Any],
+        deep_analysis: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Aggregate stage: compile the results and update the search index.
+
+        Args:
+            collected: Output of the normalize stage
+            detection: Output of the detect stage
+            deep_analysis: Output of the deep stage
+
+        Returns:
+            Dictionary containing analysis results
+        """
+        all_detections = detection["detections"]
 
         # Generate summary
         summary = self.detector.get_summary(all_detections)
@@ -88,186 +417,374 @@ class RepositoryAnalyzer:
         # Compile results
         results = {
             "repository": {
-                "owner": owner,
-                "name": repo,
-                "full_name": repository.full_name,
-                "description": repository.description,
-                "stars": repository.stargazers_count,
-                "forks": repository.forks_count,
-                "created_at": repository.created_at,
-                "updated_at": repository.updated_at,
+                key: collected["repository"].get(key)
+                for key in (
+                    "owner",
+                    "name",
+                    "full_name",
+                    "description",
+                    "stars",
+                    "forks",
+                    "created_at",
+                    "updated_at",
+                )
             },
             "analysis": {
                 "timestamp": datetime.now(),
-                "commits_analyzed": len(commits_data),
-                "prs_analyzed": len(prs_data),
-                "issues_analyzed": len(issues_data),
+                "commits_analyzed": len(collected["commits"]),
+                "prs_analyzed": len(collected["prs"]),
+                "issues_analyzed": len(collected["issues"]),
             },
-            "commits": commits_data,
-            "prs": prs_data,
-            "issues": issues_data,
+            "commits": collected["commits"],
+            "prs": collected["prs"],
+            "issues": collected["issues"],
             "detections": all_detections,
             "summary": summary,
+            "authors": detection["authors"],
         }
 
         # Add deep analysis if enabled
-        if self.config.deep_analysis:
-            logger.info("Running deep analysis...")
-            deep_analysis = self._run_deep_analysis(prs_data, commits_data)
+        if deep_analysis is not None:
             results["deep_analysis"] = deep_analysis
 
-        logger.info("Analysis complete")
+        self._index_for_search(results)
         return results
 
+    def _collection(self, records: Iterable[Any], name: str) -> Sequence:
+        """
+        Build a collection of records under the memory ceiling.
+
+        Args:
+            records: Records to hold
+            name: Collection name, such as 'prs'
+
+        Returns:
+            A list, or a disk-backed SpillList when a memory limit is set
+        """
+        if self.memory_budget is None:
+            return list(records)
+        return self.memory_budget.collection(records, name)
+
+    def _write_corpus(self, collected: Dict[str, Any]):
+        """Append collected data to the JSONL corpus, when one is configured."""
+        if self.config.corpus_path is None:
+            return
+        with Corpus(self.config.corpus_path) as corpus:
+            corpus.write_collection(collected)
+
+    def _index_for_search(self, results: Dict[str, Any]):
+        """Add the collected texts to the local full-text search index."""
+        if self.config.search_index_path is None:
+            return
+        try:
+            with SearchIndex(self.config.search_index_path) as index:
+                index.index_results(results)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not update search index: {e}")
+
     def _collect_commits(self, repository) -> List[Dict[str, Any]]:
         """Collect commit data from repository."""
+        commits_data = self._collection(self._iter_commits(repository), "commits")
+        logger.info(f"Collected {len(commits_data)} commits")
+        return commits_data
+
+    def _collect_prs(self, repository) -> List[Dict[str, Any]]:
+        """Collect PR data from repository."""
+        prs_data = self._collection(self._iter_prs(repository), "prs")
+        logger.info(f"Collected {len(prs_data)} pull requests")
+        return prs_data
+
+    def _collect_issues(self, repository) -> List[Dict[str, Any]]:
+        """Collect issue data from repository."""
+        issues_data = self._collection(self._iter_issues(repository), "issues")
+        logger.info(f"Collected {len(issues_data)} issues")
+        return issues_data
+
+    def _iter_commits(self, repository) -> Iterator[CommitRecord]:
+        """Yield commit records from repository as they are fetched."""
         logger.info("Fetching commits...")
         commits = self.github_client.get_commits(repository)
 
-        commits_data = []
         for commit in commits:
             try:
-                commits_data.append(
-                    {
-                        "sha": commit.sha,
-                        "message": commit.commit.message,
-                        "author": commit.commit.author.name if commit.commit.author else "unknown",
-                        "author_email": commit.commit.author.email if commit.commit.author else "",
-                        "date": commit.commit.author.date if commit.commit.author else None,
-                        "url": commit.html_url,
-                    }
+                record = CommitRecord(
+                    sha=commit.sha,
+                    message=commit.commit.message,
+                    author=commit.commit.author.name if commit.commit.author else "unknown",
+                    author_email=commit.commit.author.email if commit.commit.author else "",
+                    date=commit.commit.author.date if commit.commit.author else None,
+                    url=commit.html_url,
                 )
             except Exception as e:
                 logger.warning(f"Error processing commit {commit.sha}: {e}")
                 continue
+            yield record
 
-        logger.info(f"Collected {len(commits_data)} commits")
-        return commits_data
-
-    def _collect_prs(self, repository) -> List[Dict[str, Any]]:
-        """Collect PR data from repository."""
+    def _iter_prs(self, repository) -> Iterator[PRRecord]:
+        """Yield PR records from repository as they are fetched."""
         logger.info("Fetching pull requests...")
         prs = self.github_client.get_pull_requests(repository)
 
-        prs_data = []
         for pr in prs:
             try:
                 # Get comments
                 comments = self.github_client.get_pr_comments(pr)
 
-                prs_data.append(
-                    {
-                        "number": pr.number,
-                        "title": pr.title,
-                        "body": pr.body or "",
-                        "author": pr.user.login if pr.user else "unknown",
-                        "state": pr.state,
-                        "created_at": pr.created_at,
-                        "updated_at": pr.updated_at,
-                        "merged": pr.merged,
-                        "url": pr.html_url,
-                        "comments": comments,
-                    }
+                record = PRRecord(
+                    number=pr.number,
+                    title=pr.title,
+                    body=pr.body or "",
+                    author=pr.user.login if pr.user else "unknown",
+                    state=pr.state,
+                    created_at=pr.created_at,
+                    updated_at=pr.updated_at,
+                    merged=pr.merged,
+                    merged_at=pr.merged_at,
+                    url=pr.html_url,
+                    comments=comments,
                 )
             except Exception as e:
                 logger.warning(f"Error processing PR #{pr.number}: {e}")
                 continue
+            yield record
 
-        logger.info(f"Collected {len(prs_data)} pull requests")
-        return prs_data
-
-    def _collect_issues(self, repository) -> List[Dict[str, Any]]:
-        """Collect issue data from repository."""
+    def _iter_issues(self, repository) -> Iterator[IssueRecord]:
+        """Yield issue records from repository as they are fetched."""
         logger.info("Fetching issues...")
         issues = self.github_client.get_issues(repository)
 
-        issues_data = []
         for issue in issues:
             try:
                 # Get comments
                 comments = self.github_client.get_issue_comments(issue)
 
-                issues_data.append(
-                    {
-                        "number": issue.number,
-                        "title": issue.title,
-                        "body": issue.body or "",
-                        "author": issue.user.login if issue.user else "unknown",
-                        "state": issue.state,
-                        "created_at": issue.created_at,
-                        "updated_at": issue.updated_at,
-                        "url": issue.html_url,
-                        "comments": comments,
-                    }
+                record = IssueRecord(
+                    number=issue.number,
+                    title=issue.title,
+                    body=issue.body or "",
+                    author=issue.user.login if issue.user else "unknown",
+                    state=issue.state,
+                    created_at=issue.created_at,
+                    updated_at=issue.updated_at,
+                    url=issue.html_url,
+                    comments=comments,
                 )
             except Exception as e:
                 logger.warning(f"Error processing issue #{issue.number}: {e}")
                 continue
-
-        logger.info(f"Collected {len(issues_data)} issues")
-        return issues_data
+            yield record
 
     def _run_deep_analysis(
-        self, prs_data: List[Dict[str, Any]], commits_data: List[Dict[str, Any]]
+        self, prs_data: Sequence[Dict[str, Any]], commits_data: Sequence[Dict[str, Any]]
     ) -> Dict[str, Any]:
         """
         Run deep analysis on PRs using specialized analyzers.
 
+        PRs are analyzed in blocks and the outcomes of each block are
+        summarized before the next is read, so only one block of PRs is in
+        memory at a time.
+
         Args:
-            prs_data: List of PR data
-            commits_data: List of commit data
+            prs_data: Sequence of PR data
+            commits_data: Sequence of commit data
 
         Returns:
             Dictionary with deep analysis results
         """
-        pr_analyses = []
-        all_prompts = []
+        block_size = self.DEEP_ANALYSIS_BLOCK_SIZE
+        counts = {"total": 0, "analyzed": 0}
+
+        def outcomes():
+            records = iter(prs_data)
+            while True:
+                items = [self._deep_item(pr_data) for pr_data in islice(records, block_size)]
+                if not items:
+                    return
+                block, analyzed = self._deep_outcomes(items)
+                counts["total"] += len(items)
+                counts["analyzed"] += analyzed
+                yield from block
+
+        deep_analysis = self._summarize_deep(outcomes())
+
+        if self.memo:
+            logger.info(
+                f"Deep analysis: {counts['total'] - counts['analyzed']} unchanged PRs reused, "
+                f"{counts['analyzed']} analyzed"
+            )
+        return deep_analysis
+
+    def _deep_item(self, pr_data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Pair a PR with the commits deep analysis looks at."""
+        pr_commits = []
+        if self.config.analyze_commits_per_pr:
+            # In a real implementation, we'd fetch commits per PR
+            # For now, use iteration count from PR metadata
+            pass
+        return pr_data, pr_commits
+
+    def _deep_outcomes(
+        self, items: Sequence[Tuple[Dict[str, Any], List[Dict[str, Any]]]]
+    ) -> Tuple[List[Tuple[Dict[str, Any], List[List[float]]]], int]:
+        """
+        Analyze PRs, serving unchanged ones from the memo.
+
+        Args:
+            items: Tuples of (PR data, commits in that PR)
 
-        for pr_data in prs_data:
-            # Get commits for this PR if needed
-            pr_commits = []
-            if self.config.analyze_commits_per_pr:
-                # In a real implementation, we'd fetch commits per PR
-                # For now, use iteration count from PR metadata
-                pass
+        Returns:
+            Tuples of (PR analysis, prompt feature rows) in input order, and
+            the number of PRs that were analyzed rather than reused
+        """
+        # Serve unchanged PRs from the memo
+        outcomes: List[Optional[Tuple[Dict[str, Any], List[List[float]]]]] = [None] * len(items)
+        keys: List[Optional[str]] = [None] * len(items)
+        if self.memo:
+            for i, (pr_data, pr_commits) in enumerate(items):
+                keys[i] = content_hash(pr_data, pr_commits)
+                memoized = self.memo.get(keys[i])
+                if memoized is not None:
+                    outcomes[i] = (memoized["pr_analysis"], memoized["prompt_features"])
+
+        # Analyze the changed PRs, in parallel when there are many
+        pending = [i for i, result in enumerate(outcomes) if result is None]
+        analyzed = self._analyze_prs([items[i] for i in pending])
+        for i, (pr_analysis, pr_features) in zip(pending, analyzed):
+            outcomes[i] = (pr_analysis, pr_features)
+            if self.memo:
+                self.memo.set(
+                    keys[i], {"pr_analysis": pr_analysis, "prompt_features": pr_features}
+                )
+        return outcomes, len(pending)
 
-            # Analyze PR content
-            pr_analysis = self.pr_analyzer.analyze_pr(pr_data, pr_commits)
+    def _summarize_deep(
+        self, outcomes: Iterable[Tuple[Dict[str, Any], List[List[float]]]]
+    ) -> Dict[str, Any]:
+        """
+        Build the deep analysis results from per-PR outcomes.
 
-            # Analyze iterations
-            iterations = self.iteration_analyzer.analyze_iterations(pr_data, pr_commits)
-            pr_analysis["iterations"] = iterations
+        Args:
+            outcomes: Tuples of (PR analysis, prompt feature rows)
 
-            # Analyze prompts
-            prompts = pr_analysis.get("prompt_extraction", [])
-            for prompt in prompts:
-                prompt_analysis = self.prompt_analyzer.analyze_prompt(
+        Returns:
+            Dictionary with deep analysis results
+        """
+        # Build aggregate summaries incrementally
+        pr_analyses = self._collection((), "pr_analyses")
+        iteration_summary = IterationSummary()
+        prompt_patterns = PromptPatternSummary()
+        category_distribution = CategoryDistribution()
+        distributions = PRDistributions()
+        prompts = []
+        for pr_analysis, pr_features in outcomes:
+            pr_analyses.append(pr_analysis)
+            iteration_summary.add(pr_analysis)
+            prompt_patterns.extend(pr_features)
+            category_distribution.add(pr_analysis)
+            distributions.add(pr_analysis)
+            prompts.extend(
+                (
                     prompt.get("content", ""),
-                    outcome_data={
-                        "iteration_count": pr_analysis.get("iteration_count", 0),
-                        "complexity_score": pr_analysis.get("complexity_score", 0),
-                        "merged": pr_data.get("merged", False),
-                    },
+                    {"pr": pr_analysis.get("number"), "type": prompt.get("type")},
                 )
-                prompt_analysis["pr_number"] = pr_data.get("number")
-                all_prompts.append(prompt_analysis)
+                for prompt in pr_analysis.get("prompt_extraction", [])
+            )
 
-            pr_analyses.append(pr_analysis)
-
-        # Generate aggregate summaries
-        iteration_summary = self.iteration_analyzer.get_iteration_summary(pr_analyses)
-        prompt_patterns = self.prompt_analyzer.extract_prompt_patterns(all_prompts)
-
-        # Categorize PRs
-        category_distribution = {}
-        for pr_analysis in pr_analyses:
-            category = pr_analysis.get("category", "unknown")
-            category_distribution[category] = category_distribution.get(category, 0) + 1
+        # Group reused prompt templates in one batched pass
+        prompt_templates = NearDuplicateIndex().extend(prompts)
 
         return {
             "pr_analyses": pr_analyses,
-            "iteration_summary": iteration_summary,
-            "prompt_patterns": prompt_patterns,
-            "category_distribution": category_distribution,
-            "total_prompts_found": len(all_prompts),
+            "iteration_summary": iteration_summary.finalize(),
+            "prompt_patterns": prompt_patterns.finalize(),
+            "category_distribution": category_distribution.finalize(),
+            "distributions": distributions.finalize(),
+            "prompt_templates": prompt_templates.finalize(),
+            "total_prompts_found": prompt_patterns.total_prompts,
         }
+
+    def _analyze_prs(
+        self, items: Sequence[Tuple[Dict[str, Any], List[Dict[str, Any]]]]
+    ) -> List[Tuple[Dict[str, Any], List[List[float]]]]:
+        """
+        Run the per-PR analyzers over many PRs.
+
+        Large inputs are split into chunks and fanned out across a process
+        pool; results come back in input order, so the output matches a
+        serial run. Small inputs, or a single worker, run in-process.
+
+        Args:
+            items: Tuples of (PR data, commits in that PR)
+
+        Returns:
+            Tuples of (PR analysis, prompt feature rows) in input order
+        """
+        workers = self.config.deep_analysis_workers or os.cpu_count() or 1
+
+        if workers <= 1 or len(items) < self.MIN_PARALLEL_PRS:
+            return _analyze_pr_chunk(
+                items, self.pr_analyzer, self.iteration_analyzer, self.prompt_analyzer
+            )
+
+        chunk_size = self.DEEP_ANALYSIS_CHUNK_SIZE
+        chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+        logger.debug(f"Analyzing {len(items)} PRs in {len(chunks)} chunks")
+
+        analyzed = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk_results in pool.map(_analyze_pr_chunk, chunks):
+                analyzed.extend(chunk_results)
+        return analyzed
+
+
+def _analyze_pr_chunk(
+    items: Sequence[Tuple[Dict[str, Any], List[Dict[str, Any]]]],
+    pr_analyzer: Optional[PRAnalyzer] = None,
+    iteration_analyzer: Optional[IterationAnalyzer] = None,
+    prompt_analyzer: Optional[PromptAnalyzer] = None,
+) -> List[Tuple[Dict[str, Any], List[List[float]]]]:
+    """
+    Analyze a chunk of PRs; also the entry point of deep analysis workers.
+
+    Prompts of every PR in the chunk are analyzed in one batch.
+
+    Args:
+        items: Tuples of (PR data, commits in that PR)
+        pr_analyzer: PR analyzer; a new one is created when omitted
+        iteration_analyzer: Iteration analyzer; a new one is created when omitted
+        prompt_analyzer: Prompt analyzer; a new one is created when omitted
+
+    Returns:
+        Tuples of (PR analysis, prompt feature rows) in input order
+    """
+    pr_analyzer = pr_analyzer or PRAnalyzer()
+    iteration_analyzer = iteration_analyzer or IterationAnalyzer()
+    prompt_analyzer = prompt_analyzer or PromptAnalyzer()
+
+    pr_analyses = []
+    prompt_counts = []
+    prompt_texts = []
+    for pr_data, pr_commits in items:
+        # Analyze PR content
+        pr_analysis = pr_analyzer.analyze_pr(pr_data, pr_commits)
+
+        # Analyze iterations
+        iterations = iteration_analyzer.analyze_iterations(pr_data, pr_commits)
+        pr_analysis["iterations"] = iterations
+
+        # Collect prompts for batch analysis
+        prompts = pr_analysis.get("prompt_extraction", [])
+        prompt_counts.append(len(prompts))
+        prompt_texts.extend(prompt.get("content", "") for prompt in prompts)
+
+        pr_analyses.append(pr_analysis)
+
+    features = prompt_analyzer.analyze_prompts(prompt_texts)
+    rows = features.tolist() if hasattr(features, "tolist") else features
+
+    analyzed = []
+    offset = 0
+    for pr_analysis, count in zip(pr_analyses, prompt_counts):
+        analyzed.append((pr_analysis, rows[offset : offset + count]))
+        offset += count
+    return analyzed
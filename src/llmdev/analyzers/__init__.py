@@ -2,8 +2,16 @@
 Specialized analyzers for deep repository analysis.
 """
 
-from llmdev.analyzers.pr_analyzer import PRAnalyzer
-from llmdev.analyzers.iteration_analyzer import IterationAnalyzer
-from llmdev.analyzers.prompt_analyzer import PromptAnalyzer
+from llmdev.analyzers.pr_analyzer import CategoryDistribution, PRAnalyzer, PRDistributions
+from llmdev.analyzers.iteration_analyzer import IterationAnalyzer, IterationSummary
+from llmdev.analyzers.prompt_analyzer import PromptAnalyzer, PromptPatternSummary
 
-__all__ = ["PRAnalyzer", "IterationAnalyzer", "PromptAnalyzer"]
+__all__ = [
+    "PRAnalyzer",
+    "IterationAnalyzer",
+    "PromptAnalyzer",
+    "CategoryDistribution",
+    "PRDistributions",
+    "IterationSummary",
+    "PromptPatternSummary",
+]
@@ -6,6 +6,8 @@ import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from llmdev.accumulator import Accumulator
+
 
 logger = logging.getLogger(__name__)
 
@@ -240,7 +242,62 @@ class IterationAnalyzer:
         Returns:
             Summary dictionary with aggregate statistics
         """
-        if not all_prs_analysis:
+        return IterationSummary().extend(all_prs_analysis).finalize()
+
+
+class IterationSummary(Accumulator):
+    """Running iteration statistics across PRs."""
+
+    def __init__(self):
+        """Initialize an empty summary."""
+        self.total_prs = 0
+        self.pattern_counts: Dict[str, int] = {}
+        self.total_commits = 0
+        self.total_refinements = 0
+
+    def add(self, pr_analysis: Dict[str, Any]) -> "IterationSummary":
+        """
+        Add one PR analysis.
+
+        Args:
+            pr_analysis: PR analysis result with an 'iterations' entry
+
+        Returns:
+            This summary
+        """
+        iterations = pr_analysis.get("iterations", {})
+        pattern = iterations.get("pattern_type", "unknown")
+        self.pattern_counts[pattern] = self.pattern_counts.get(pattern, 0) + 1
+        self.total_commits += iterations.get("commit_count", 0)
+        self.total_refinements += iterations.get("refinement_count", 0)
+        self.total_prs += 1
+        return self
+
+    def merge(self, other: "IterationSummary") -> "IterationSummary":
+        """
+        Merge another partial summary.
+
+        Args:
+            other: Summary to merge
+
+        Returns:
+            This summary
+        """
+        for pattern, count in other.pattern_counts.items():
+            self.pattern_counts[pattern] = self.pattern_counts.get(pattern, 0) + count
+        self.total_commits += other.total_commits
+        self.total_refinements += other.total_refinements
+        self.total_prs += other.total_prs
+        return self
+
+    def finalize(self) -> Dict[str, Any]:
+        """
+        Produce the iteration summary.
+
+        Returns:
+            Summary dictionary with aggregate statistics
+        """
+        if not self.total_prs:
             return {
                 "total_prs": 0,
                 "pattern_distribution": {},
@@ -248,22 +305,9 @@ class IterationAnalyzer:
                 "average_refinements": 0,
             }
 
-        pattern_counts = {}
-        total_commits = 0
-        total_refinements = 0
-
-        for pr_analysis in all_prs_analysis:
-            iterations = pr_analysis.get("iterations", {})
-            pattern = iterations.get("pattern_type", "unknown")
-            pattern_counts[pattern] = pattern_counts.get(pattern, 0) + 1
-            total_commits += iterations.get("commit_count", 0)
-            total_refinements += iterations.get("refinement_count", 0)
-
-        total_prs = len(all_prs_analysis)
-
         return {
-            "total_prs": total_prs,
-            "pattern_distribution": pattern_counts,
-            "average_commits": total_commits / total_prs if total_prs > 0 else 0,
-            "average_refinements": total_refinements / total_prs if total_prs > 0 else 0,
+            "total_prs": self.total_prs,
+            "pattern_distribution": dict(self.pattern_counts),
+            "average_commits": self.total_commits / self.total_prs,
+            "average_refinements": self.total_refinements / self.total_prs,
         }
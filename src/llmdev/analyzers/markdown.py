@@ -0,0 +1,174 @@
+"""
+Single-pass markdown tokenizer for PR bodies.
+
+Splits a body into headed sections, labelled blocks ("Task Request:",
+"Prompt:"), paragraphs and checklist lines once, so every PRAnalyzer
+extractor can work from the same structure instead of rescanning the text.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+# Section headings recognized by the extractors ("## Problem", "## Solution", ...)
+SECTION_KEYWORDS = (
+    "problem",
+    "issue",
+    "task",
+    "request",
+    "objective",
+    "goal",
+    "solution",
+    "approach",
+    "implementation",
+    "context",
+    "background",
+    "description",
+    "changes",
+)
+
+# Inline labels whose block runs to the next blank line
+LABEL_KEYWORDS = ("task request", "prompt")
+
+# One scan finds every heading and label. Headings may appear anywhere (not
+# only at line start), matching the extractors' historical behaviour.
+MARKER_PATTERN = re.compile(
+    r"##\s*(?P<heading>" + "|".join(SECTION_KEYWORDS) + r")[:\s]*\n"
+    r"|(?P<label>" + "|".join(LABEL_KEYWORDS) + r")[:\s]*\n",
+    re.IGNORECASE,
+)
+
+# Markdown checklist items: - [ ] or - [x]
+CHECKLIST_PATTERN = re.compile(r"^[^\S\n]*-[^\S\n]*\[([xX]|[^\S\n])\][^\S\n]*(.+)$", re.MULTILINE)
+
+# A heading's content ends at the next "##"; a label's at the next blank line
+SECTION_BREAK = "\n##"
+PARAGRAPH_BREAK = "\n\n"
+
+
+class Section(NamedTuple):
+    """A heading or label and the span of its content."""
+
+    keyword: str  # lowercase heading/label keyword
+    start: int
+    content_start: int
+    content_end: int
+
+
+class ChecklistLine(NamedTuple):
+    """A markdown checklist item."""
+
+    text: str
+    completed: bool
+
+
+class MarkdownDocument:
+    """Tokenized view of a PR body shared by the PRAnalyzer extractors."""
+
+    def __init__(self, text: str):
+        """
+        Tokenize the text.
+
+        Args:
+            text: PR body text
+        """
+        self.text = text or ""
+        self._section_breaks = self._find_all(SECTION_BREAK)
+        self.sections: List[Section] = [
+            self._section(match) for match in MARKER_PATTERN.finditer(self.text)
+        ]
+        self._checklist: Optional[List[ChecklistLine]] = None
+
+    def _find_all(self, needle: str) -> List[int]:
+        """Offsets of every occurrence of a literal."""
+        offsets = []
+        position = self.text.find(needle)
+        while position != -1:
+            offsets.append(position)
+            position = self.text.find(needle, position + 1)
+        return offsets
+
+    def _section(self, match: "re.Match") -> Section:
+        """Build a section from a marker match, resolving where its content ends."""
+        content_start = match.end()
+        if match.group("heading"):
+            keyword = match.group("heading").casefold()
+            index = bisect_left(self._section_breaks, content_start)
+            content_end = (
+                self._section_breaks[index] if index < len(self._section_breaks) else len(self.text)
+            )
+        else:
+            keyword = match.group("label").casefold()
+            content_end = self.text.find(PARAGRAPH_BREAK, content_start)
+            if content_end == -1:
+                content_end = len(self.text)
+        return Section(keyword, match.start(), content_start, content_end)
+
+    def content(self, section: Section) -> str:
+        """
+        Get the content text of a section.
+
+        Args:
+            section: Section from this document
+
+        Returns:
+            Content between the marker and the end of the section
+        """
+        return self.text[section.content_start : section.content_end]
+
+    def iter_sections(self, keywords: Iterable[str]) -> Iterator[Section]:
+        """
+        Iterate over non-overlapping sections with any of the keywords.
+
+        A section nested inside an earlier matching section's content is
+        skipped, just as a regex scan would consume it.
+
+        Args:
+            keywords: Lowercase heading/label keywords
+
+        Yields:
+            Sections in document order
+        """
+        keywords = set(keywords)
+        position = 0
+        for section in self.sections:
+            if section.keyword in keywords and section.start >= position:
+                position = section.content_end
+                yield section
+
+    def first_section(self, keyword: str) -> Optional[Section]:
+        """
+        Get the first section with a keyword.
+
+        Args:
+            keyword: Lowercase heading/label keyword
+
+        Returns:
+            First matching section, or None
+        """
+        for section in self.sections:
+            if section.keyword == keyword:
+                return section
+        return None
+
+    def paragraphs(self, limit: int) -> List[str]:
+        """
+        Get the first paragraphs of the text.
+
+        Args:
+            limit: Number of paragraphs to return at most
+
+        Returns:
+            Paragraph strings, split on blank lines
+        """
+        return self.text.split(PARAGRAPH_BREAK, limit)[:limit]
+
+    @property
+    def checklist(self) -> List[ChecklistLine]:
+        """Checklist items in document order, parsed on first access."""
+        if self._checklist is None:
+            self._checklist = [
+                ChecklistLine(match.group(2).strip(), match.group(1).strip().lower() == "x")
+                for match in CHECKLIST_PATTERN.finditer(self.text)
+            ]
+        return self._checklist
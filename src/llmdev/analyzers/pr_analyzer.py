@@ -2,11 +2,15 @@
 Deep PR content analysis - extracts prompts, problems, solutions, and checklists.
 """
 
-import re
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 
+from llmdev.accumulator import Accumulator
+from llmdev.analyzers.markdown import MarkdownDocument
+from llmdev.document import Document
+from llmdev.sketches import KLLSketch
+
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +28,19 @@ class PRAnalyzer:
         "docs": ["readme", "documentation", "guide", "docs", "comment", "docstring"],
     }
 
+    # Prompt section keywords and the prompt type they produce, in output order
+    PROMPT_SECTIONS = [
+        (["problem", "issue", "task", "request", "objective", "goal"], "problem"),
+        (["solution", "approach", "implementation"], "solution"),
+        (["context", "background"], "context"),
+        (["task request"], "task_request"),
+        (["prompt"], "explicit_prompt"),
+    ]
+
+    # Section keywords tried in order for problem statements and solutions
+    PROBLEM_SECTIONS = ["problem", "issue", "description"]
+    SOLUTION_SECTIONS = ["solution", "approach", "implementation", "changes"]
+
     def analyze_pr(
         self, pr_data: Dict[str, Any], commits_data: Optional[List[Dict]] = None
     ) -> Dict[str, Any]:
@@ -43,18 +60,19 @@ class PRAnalyzer:
         merged_at = pr_data.get("merged_at")
         updated_at = pr_data.get("updated_at")
 
-        # Extract various components
-        prompts = self.extract_prompts(body)
-        problem = self.extract_problem_statement(body)
-        solution = self.extract_solution_approach(body)
-        checklist_items = self.extract_checklist(body)
+        # Extract various components from one shared view of the body
+        doc = Document(body)
+        prompts = self.extract_prompts(doc)
+        problem = self.extract_problem_statement(doc)
+        solution = self.extract_solution_approach(doc)
+        checklist_items = self.extract_checklist(doc)
 
         # Calculate metrics
         iteration_count = len(commits_data) if commits_data else 0
         time_to_merge = self._calculate_duration(created_at, merged_at or updated_at)
 
         # Categorize PR
-        category = self.categorize_pr(title, body)
+        category = self.categorize_pr(title, doc)
 
         # Assess complexity
         complexity = self._assess_complexity(
@@ -71,13 +89,14 @@ class PRAnalyzer:
             "checklist_items": checklist_items,
             "iteration_count": iteration_count,
             "time_to_merge_hours": time_to_merge,
+            "comment_count": len(pr_data.get("comments", [])),
             "complexity_score": complexity["score"],
             "complexity_indicators": complexity["indicators"],
             "created_at": created_at,
             "merged_at": merged_at,
         }
 
-    def extract_prompts(self, text: str) -> List[Dict[str, str]]:
+    def extract_prompts(self, text: Union[str, Document, MarkdownDocument]) -> List[Dict[str, str]]:
         """
         Extract prompt-like sections from PR body.
 
@@ -87,33 +106,20 @@ class PRAnalyzer:
         - Quoted sections that look like instructions
 
         Args:
-            text: PR body text
+            text: PR body text, its Document or its MarkdownDocument
 
         Returns:
             List of extracted prompts with type and content
         """
-        if not text:
+        doc = self._document(text)
+        if not doc.text:
             return []
 
         prompts = []
 
-        # Look for markdown headers that indicate prompts/problems/tasks
-        patterns = [
-            (
-                r"##\s*(Problem|Issue|Task|Request|Objective|Goal)[:\s]*\n(.*?)(?=\n##|\Z)",
-                "problem",
-            ),
-            (r"##\s*(Solution|Approach|Implementation)[:\s]*\n(.*?)(?=\n##|\Z)", "solution"),
-            (r"##\s*(Context|Background)[:\s]*\n(.*?)(?=\n##|\Z)", "context"),
-            (r"Task Request[:\s]*\n(.*?)(?=\n\n|\Z)", "task_request"),
-            (r"Prompt[:\s]*\n(.*?)(?=\n\n|\Z)", "explicit_prompt"),
-        ]
-
-        for pattern, prompt_type in patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.DOTALL)
-            for match in matches:
-                content = match.group(2) if match.lastindex >= 2 else match.group(1)
-                content = content.strip()
+        for keywords, prompt_type in self.PROMPT_SECTIONS:
+            for section in doc.iter_sections(keywords):
+                content = doc.content(section).strip()
                 if content and len(content) > 20:  # Meaningful content
                     prompts.append(
                         {
@@ -124,104 +130,99 @@ class PRAnalyzer:
 
         return prompts
 
-    def extract_problem_statement(self, text: str) -> Optional[str]:
+    def extract_problem_statement(
+        self, text: Union[str, Document, MarkdownDocument]
+    ) -> Optional[str]:
         """
         Extract the problem statement from PR body.
 
         Args:
-            text: PR body text
+            text: PR body text, its Document or its MarkdownDocument
 
         Returns:
             Problem statement if found, None otherwise
         """
-        if not text:
+        doc = self._document(text)
+        if not doc.text:
             return None
 
         # Look for problem/issue sections
-        patterns = [
-            r"##\s*Problem[:\s]*\n(.*?)(?=\n##|\Z)",
-            r"##\s*Issue[:\s]*\n(.*?)(?=\n##|\Z)",
-            r"##\s*Description[:\s]*\n(.*?)(?=\n##|\Z)",
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                problem = match.group(1).strip()
-                if problem and len(problem) > 20:
-                    return problem[:500]  # Limit length
+        problem = self._first_section_content(doc, self.PROBLEM_SECTIONS)
+        if problem:
+            return problem
 
         # If no explicit section, use first substantial paragraph
-        paragraphs = text.split("\n\n")
-        for para in paragraphs[:3]:  # Check first 3 paragraphs
+        for para in doc.paragraphs(3):  # Check first 3 paragraphs
             para = para.strip()
             if para and len(para) > 50 and not para.startswith("#"):
                 return para[:500]
 
         return None
 
-    def extract_solution_approach(self, text: str) -> Optional[str]:
+    def extract_solution_approach(
+        self, text: Union[str, Document, MarkdownDocument]
+    ) -> Optional[str]:
         """
         Extract the solution approach from PR body.
 
         Args:
-            text: PR body text
+            text: PR body text, its Document or its MarkdownDocument
 
         Returns:
             Solution approach if found, None otherwise
         """
-        if not text:
+        doc = self._document(text)
+        if not doc.text:
             return None
 
-        patterns = [
-            r"##\s*Solution[:\s]*\n(.*?)(?=\n##|\Z)",
-            r"##\s*Approach[:\s]*\n(.*?)(?=\n##|\Z)",
-            r"##\s*Implementation[:\s]*\n(.*?)(?=\n##|\Z)",
-            r"##\s*Changes[:\s]*\n(.*?)(?=\n##|\Z)",
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                solution = match.group(1).strip()
-                if solution and len(solution) > 20:
-                    return solution[:500]
+        return self._first_section_content(doc, self.SOLUTION_SECTIONS)
 
-        return None
-
-    def extract_checklist(self, text: str) -> List[Dict[str, Any]]:
+    def extract_checklist(
+        self, text: Union[str, Document, MarkdownDocument]
+    ) -> List[Dict[str, Any]]:
         """
         Extract checklist items from PR body.
 
         Args:
-            text: PR body text
+            text: PR body text, its Document or its MarkdownDocument
 
         Returns:
             List of checklist items with completion status
         """
-        if not text:
+        doc = self._document(text)
+        if not doc.text:
             return []
 
-        checklist_items = []
+        return [{"text": item.text, "completed": item.completed} for item in doc.checklist]
+
+    def _document(self, text: Union[str, Document, MarkdownDocument]) -> MarkdownDocument:
+        """Get the markdown structure, tokenizing the text only if needed."""
+        if isinstance(text, MarkdownDocument):
+            return text
+        return Document.of(text).markdown
+
+    def _first_section_content(self, doc: MarkdownDocument, keywords: List[str]) -> Optional[str]:
+        """
+        Get the content of the first substantial section, trying keywords in order.
 
-        # Match markdown checklist items: - [ ] or - [x]
-        pattern = r"^\s*-\s*\[([xX\s])\]\s*(.+)$"
+        Only the first section for each keyword is considered.
 
-        for line in text.split("\n"):
-            match = re.match(pattern, line)
-            if match:
-                checked = match.group(1).strip().lower() == "x"
-                item_text = match.group(2).strip()
-                checklist_items.append(
-                    {
-                        "text": item_text,
-                        "completed": checked,
-                    }
-                )
+        Args:
+            doc: Tokenized PR body
+            keywords: Section keywords in priority order
 
-        return checklist_items
+        Returns:
+            Section content (truncated) if found, None otherwise
+        """
+        for keyword in keywords:
+            section = doc.first_section(keyword)
+            if section is not None:
+                content = doc.content(section).strip()
+                if content and len(content) > 20:
+                    return content[:500]
+        return None
 
-    def categorize_pr(self, title: str, body: str) -> str:
+    def categorize_pr(self, title: str, body: Union[str, Document]) -> str:
         """
         Categorize PR based on title and body content.
 
@@ -235,12 +236,12 @@ class PRAnalyzer:
 
         Args:
             title: PR title
-            body: PR body text
+            body: PR body text or its Document
 
         Returns:
             Category name
         """
-        combined_text = f"{title} {body}".lower()
+        combined_text = f"{title.lower()} {Document.of(body).lower}"
 
         # Count keyword matches for each category
         category_scores = {}
@@ -349,3 +350,106 @@ class PRAnalyzer:
             "level": complexity_level,
             "indicators": indicators,
         }
+
+
+class CategoryDistribution(Accumulator):
+    """Running count of PRs per category."""
+
+    def __init__(self):
+        """Initialize an empty distribution."""
+        self.counts: Dict[str, int] = {}
+
+    def add(self, pr_analysis: Dict[str, Any]) -> "CategoryDistribution":
+        """
+        Count one PR analysis.
+
+        Args:
+            pr_analysis: PR analysis result with a 'category' entry
+
+        Returns:
+            This distribution
+        """
+        category = pr_analysis.get("category", "unknown")
+        self.counts[category] = self.counts.get(category, 0) + 1
+        return self
+
+    def merge(self, other: "CategoryDistribution") -> "CategoryDistribution":
+        """
+        Merge another partial distribution.
+
+        Args:
+            other: Distribution to merge
+
+        Returns:
+            This distribution
+        """
+        for category, count in other.counts.items():
+            self.counts[category] = self.counts.get(category, 0) + count
+        return self
+
+    def finalize(self) -> Dict[str, int]:
+        """
+        Produce the category distribution.
+
+        Returns:
+            Mapping of category to PR count
+        """
+        return dict(self.counts)
+
+
+class PRDistributions(Accumulator):
+    """Quantile sketches of per-PR metrics."""
+
+    # Metrics sketched per PR; time to merge is only recorded for merged PRs
+    METRICS = ("time_to_merge_hours", "commit_count", "refinement_count", "comment_count")
+
+    def __init__(self, k: int = KLLSketch.DEFAULT_K):
+        """
+        Initialize empty sketches.
+
+        Args:
+            k: Sketch accuracy parameter
+        """
+        self.sketches: Dict[str, KLLSketch] = {metric: KLLSketch(k) for metric in self.METRICS}
+
+    def add(self, pr_analysis: Dict[str, Any]) -> "PRDistributions":
+        """
+        Add one PR analysis.
+
+        Args:
+            pr_analysis: PR analysis result
+
+        Returns:
+            These distributions
+        """
+        if pr_analysis.get("merged_at"):
+            self.sketches["time_to_merge_hours"].add(pr_analysis.get("time_to_merge_hours", 0))
+        self.sketches["commit_count"].add(pr_analysis.get("iteration_count", 0))
+        self.sketches["refinement_count"].add(
+            pr_analysis.get("iterations", {}).get("refinement_count", 0)
+        )
+        self.sketches["comment_count"].add(pr_analysis.get("comment_count", 0))
+        return self
+
+    def merge(self, other: "PRDistributions") -> "PRDistributions":
+        """
+        Merge other distributions, such as another repository's.
+
+        Args:
+            other: Distributions to merge
+
+        Returns:
+            These distributions
+        """
+        for metric, sketch in other.sketches.items():
+            self.sketches[metric].merge(sketch)
+        return self
+
+    def finalize(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize each metric.
+
+        Returns:
+            Mapping of metric to count, min, max, p50, p90 and p99
+        """
+        return {metric: sketch.finalize() for metric, sketch in self.sketches.items()}
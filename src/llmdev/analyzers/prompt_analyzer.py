@@ -4,7 +4,16 @@ Prompt extraction and analysis - studies prompt effectiveness.
 
 import re
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence, Set, Union
+
+from llmdev.accumulator import Accumulator
+from llmdev.document import Document
+from llmdev.minhash import NearDuplicateIndex
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
 
 
 logger = logging.getLogger(__name__)
@@ -13,20 +22,90 @@ logger = logging.getLogger(__name__)
 class PromptAnalyzer:
     """Analyzes prompts to understand effectiveness patterns."""
 
+    # Whole-word indicators are checked against the document's token set
+    TECH_WORD_GROUPS = [
+        ("function", "class", "method", "variable", "parameter", "return", "type"),
+        ("implement", "create", "add", "update", "modify", "refactor"),
+        ("bug", "error", "issue", "fix", "resolve"),
+    ]
+    CONTEXT_WORDS = (
+        "context",
+        "background",
+        "currently",
+        "existing",
+        "previous",
+        "because",
+        "since",
+        "reason",
+        "problem",
+        "issue",
+        "challenge",
+    )
+    CONSTRAINT_WORDS = (
+        "must",
+        "should",
+        "need",
+        "require",
+        "constraint",
+        "requirement",
+        "without",
+        "avoid",
+        "cannot",
+        "within",
+        "under",
+    )
+    EXAMPLE_WORDS = ("example", "like")
+    IMPERATIVE_WORDS = ("implement", "create", "add", "fix", "update", "change", "make", "do")
+    COLLABORATIVE_WORDS = ("should", "could", "would", "might", "perhaps", "consider", "suggest")
+
+    # Phrases and headings that span tokens, found in one pass over the
+    # lowercased text. Matches are zero-width so overlapping phrases are all
+    # seen; the leading guard skips positions no phrase can start at.
+    PHRASE_PATTERN = re.compile(
+        r"(?:\b(?=[adeflmps])|(?=##))(?="
+        r"(?P<file_reference>\bfile\s+\w+\.\w+\b)"
+        r"|(?P<path_reference>\bpath[:\s]+[/\w]+)"
+        r"|(?P<context>\bdue to\b|##\s*(?:context|background))"
+        r"|(?P<constraints>\bdon\'t\b|\b(?:less than|more than|at least)\b"
+        r"|##\s*(?:requirements|constraints))"
+        r"|(?P<examples>\b(?:e\.g\.|for instance|such as)\b|##\s*example))"
+    )
+
+    # Columns of the prompt feature matrix, in order
+    FEATURE_COLUMNS = (
+        "specificity_score",
+        "tech_terms",
+        "has_numbers",
+        "has_code",
+        "has_list",
+        "char_count",
+        "has_context",
+        "has_constraints",
+        "has_examples",
+        "word_count",
+        "imperative_count",
+        "collaborative_count",
+        "question_count",
+    )
+    FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_COLUMNS)}
+
     def analyze_prompt(
-        self, prompt_text: str, outcome_data: Optional[Dict[str, Any]] = None
+        self,
+        prompt_text: Union[str, Document],
+        outcome_data: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         Analyze a prompt for characteristics and effectiveness.
 
         Args:
-            prompt_text: The prompt text to analyze
+            prompt_text: The prompt text to analyze, or its Document
             outcome_data: Optional outcome information (iterations, success, etc.)
 
         Returns:
             Dictionary with prompt analysis
         """
-        if not prompt_text:
+        doc = Document.of(prompt_text)
+        if not doc.text:
             return {
                 "specificity_score": 0,
                 "has_context": False,
@@ -35,20 +114,19 @@ class PromptAnalyzer:
                 "word_count": 0,
             }
 
-        specificity = self._measure_specificity(prompt_text)
-        has_context = self._check_for_context(prompt_text)
-        has_constraints = self._check_for_constraints(prompt_text)
-        has_examples = self._check_for_examples(prompt_text)
-        word_count = len(prompt_text.split())
-        tone = self._analyze_tone(prompt_text)
+        features = dict(zip(self.FEATURE_COLUMNS, self.prompt_features(doc)))
 
         analysis = {
-            "specificity_score": specificity,
-            "has_context": has_context,
-            "has_constraints": has_constraints,
-            "has_examples": has_examples,
-            "word_count": word_count,
-            "tone": tone,
+            "specificity_score": features["specificity_score"],
+            "has_context": bool(features["has_context"]),
+            "has_constraints": bool(features["has_constraints"]),
+            "has_examples": bool(features["has_examples"]),
+            "word_count": int(features["word_count"]),
+            "tone": self._tone_from_counts(
+                features["imperative_count"],
+                features["collaborative_count"],
+                features["question_count"],
+            ),
         }
 
         # Add effectiveness correlation if outcome data provided
@@ -57,120 +135,190 @@ class PromptAnalyzer:
 
         return analysis
 
-    def _measure_specificity(self, text: str) -> float:
+    def analyze_prompts(self, prompts: Sequence[Union[str, Document]]) -> Any:
         """
-        Measure how specific/detailed a prompt is.
+        Extract features for many prompts at once.
 
-        Factors:
-        - Presence of technical terms
-        - Specific numbers/values
-        - File/path references
-        - Concrete examples
+        Each prompt is tokenized and scanned for phrases once; the
+        specificity score is then computed for all rows together.
 
         Args:
-            text: Prompt text
+            prompts: Prompt texts or Documents
 
         Returns:
-            Specificity score from 0.0 to 1.0
+            Feature matrix with one row per prompt and FEATURE_COLUMNS as
+            columns: a float64 numpy array when numpy is installed, otherwise
+            a list of row lists
         """
-        score = 0.0
-        text_lower = text.lower()
-
-        # Technical indicators
-        tech_patterns = [
-            r"\b(function|class|method|variable|parameter|return|type)\b",
-            r"\b(implement|create|add|update|modify|refactor)\b",
-            r"\b(bug|error|issue|fix|resolve)\b",
-            r"\bfile\s+\w+\.\w+\b",  # File references
-            r"\bpath[:\s]+[/\w]+",  # Path references
-        ]
+        rows = [self._raw_features(Document.of(prompt)) for prompt in prompts]
+        specificity = self.FEATURE_INDEX["specificity_score"]
 
-        for pattern in tech_patterns:
-            if re.search(pattern, text_lower):
-                score += 0.15
+        if np is None:
+            for row in rows:
+                row[specificity] = self._specificity_from_features(row)
+            return rows
 
-        # Specific numbers or values
-        if re.search(r"\b\d+\b", text):
-            score += 0.1
+        matrix = np.array(rows, dtype=np.float64).reshape(len(rows), len(self.FEATURE_COLUMNS))
+        matrix[:, specificity] = self._specificity_from_features(matrix.T)
+        return matrix
 
-        # Code blocks
-        if "```" in text or "`" in text:
-            score += 0.2
+    def prompt_features(self, prompt_text: Union[str, Document]) -> List[float]:
+        """
+        Extract the feature row for one prompt.
 
-        # Lists or bullet points (structured)
-        if re.search(r"^\s*[-*]\s+", text, re.MULTILINE) or re.search(
-            r"^\s*\d+\.\s+", text, re.MULTILINE
-        ):
-            score += 0.15
+        Args:
+            prompt_text: Prompt text or Document
 
-        # Detailed description (length)
-        if len(text) > 200:
-            score += 0.1
-        if len(text) > 500:
-            score += 0.1
+        Returns:
+            Feature values in FEATURE_COLUMNS order
+        """
+        row = self._raw_features(Document.of(prompt_text))
+        row[self.FEATURE_INDEX["specificity_score"]] = self._specificity_from_features(row)
+        return row
+
+    def _raw_features(self, doc: Document) -> List[float]:
+        """Feature row with the specificity score left at zero."""
+        if not doc.text:
+            return [0.0] * len(self.FEATURE_COLUMNS)
+
+        phrases = self._phrase_hits(doc)
+        tech_terms = sum(1 for words in self.TECH_WORD_GROUPS if doc.has_token(*words))
+        tech_terms += ("file_reference" in phrases) + ("path_reference" in phrases)
+
+        return [
+            0.0,
+            float(tech_terms),
+            float(any(token.isdecimal() for token in doc.token_set)),
+            float("`" in doc.text),
+            float(self._has_list_item(doc)),
+            float(len(doc)),
+            float(doc.has_token(*self.CONTEXT_WORDS) or "context" in phrases),
+            float(doc.has_token(*self.CONSTRAINT_WORDS) or "constraints" in phrases),
+            float(self._has_examples(doc, phrases)),
+            float(doc.word_count),
+            float(doc.count_tokens(*self.IMPERATIVE_WORDS)),
+            float(doc.count_tokens(*self.COLLABORATIVE_WORDS)),
+            float(doc.text.count("?")),
+        ]
+
+    def _specificity_from_features(self, features: Any) -> Any:
+        """
+        Compute specificity from feature columns.
+
+        Works on one feature row or on the transposed feature matrix (one
+        array per column). Scores are added in the same order as the
+        original per-prompt calculation so results are bit-identical.
+        """
+        index = self.FEATURE_INDEX
+        tech_terms = features[index["tech_terms"]]
+        char_count = features[index["char_count"]]
 
+        score = 0.0
+        for i in range(len(self.TECH_WORD_GROUPS) + 2):
+            score = score + 0.15 * (tech_terms > i)
+        score = score + 0.1 * (features[index["has_numbers"]] > 0)
+        score = score + 0.2 * (features[index["has_code"]] > 0)
+        score = score + 0.15 * (features[index["has_list"]] > 0)
+        score = score + 0.1 * (char_count > 200)
+        score = score + 0.1 * (char_count > 500)
+
+        if np is not None and isinstance(score, np.ndarray):
+            return np.minimum(score, 1.0)
         return min(score, 1.0)
 
-    def _check_for_context(self, text: str) -> bool:
+    def _phrase_hits(self, doc: Document) -> Set[str]:
+        """Names of the PHRASE_PATTERN groups found in the text."""
+        if not doc.text:
+            return set()
+        return {match.lastgroup for match in self.PHRASE_PATTERN.finditer(doc.lower)}
+
+    def _measure_specificity(self, text: Union[str, Document]) -> float:
+        """
+        Measure how specific/detailed a prompt is.
+
+        Factors:
+        - Presence of technical terms
+        - Specific numbers/values
+        - File/path references
+        - Concrete examples
+
+        Args:
+            text: Prompt text or Document
+
+        Returns:
+            Specificity score from 0.0 to 1.0
+        """
+        return self.prompt_features(text)[self.FEATURE_INDEX["specificity_score"]]
+
+    @staticmethod
+    def _has_list_item(doc: Document) -> bool:
+        """Check for a line starting with a bullet ('-', '*') or a number ('1.')."""
+        last = len(doc.lines) - 1
+        for index, line in enumerate(doc.lines):
+            item = line.lstrip()
+            if item[:1] in ("-", "*"):
+                rest = item[1:]
+            else:
+                digits = 0
+                while digits < len(item) and item[digits].isdecimal():
+                    digits += 1
+                if not digits or item[digits : digits + 1] != ".":
+                    continue
+                rest = item[digits + 1 :]
+            # The marker must be followed by whitespace, which may be the newline
+            if rest[:1].isspace() or (not rest and index < last):
+                return True
+        return False
+
+    def _check_for_context(self, text: Union[str, Document]) -> bool:
         """
         Check if prompt provides context or background.
 
         Args:
-            text: Prompt text
+            text: Prompt text or Document
 
         Returns:
             True if context is present
         """
-        context_indicators = [
-            r"\b(context|background|currently|existing|previous)\b",
-            r"\b(because|since|due to|reason)\b",
-            r"\b(problem|issue|challenge)\b",
-            r"##\s*(context|background)",
-        ]
+        doc = Document.of(text)
+        return doc.has_token(*self.CONTEXT_WORDS) or "context" in self._phrase_hits(doc)
 
-        text_lower = text.lower()
-        return any(re.search(pattern, text_lower) for pattern in context_indicators)
-
-    def _check_for_constraints(self, text: str) -> bool:
+    def _check_for_constraints(self, text: Union[str, Document]) -> bool:
         """
         Check if prompt specifies constraints or requirements.
 
         Args:
-            text: Prompt text
+            text: Prompt text or Document
 
         Returns:
             True if constraints are present
         """
-        constraint_indicators = [
-            r"\b(must|should|need|require|constraint|requirement)\b",
-            r"\b(without|avoid|don\'t|cannot)\b",
-            r"\b(within|under|less than|more than|at least)\b",
-            r"##\s*(requirements|constraints)",
-        ]
-
-        text_lower = text.lower()
-        return any(re.search(pattern, text_lower) for pattern in constraint_indicators)
+        doc = Document.of(text)
+        return doc.has_token(*self.CONSTRAINT_WORDS) or "constraints" in self._phrase_hits(doc)
 
-    def _check_for_examples(self, text: str) -> bool:
+    def _check_for_examples(self, text: Union[str, Document]) -> bool:
         """
         Check if prompt includes examples.
 
         Args:
-            text: Prompt text
+            text: Prompt text or Document
 
         Returns:
             True if examples are present
         """
-        example_indicators = [
-            r"\b(example|e\.g\.|for instance|such as|like)\b",
-            r"```",  # Code blocks
-            r"##\s*example",
-        ]
+        doc = Document.of(text)
+        return self._has_examples(doc, self._phrase_hits(doc))
 
-        text_lower = text.lower()
-        return any(re.search(pattern, text_lower) for pattern in example_indicators)
+    def _has_examples(self, doc: Document, phrases: Set[str]) -> bool:
+        """Check example words, fenced code blocks and example phrases."""
+        if doc.has_token(*self.EXAMPLE_WORDS):
+            return True
+        # Code blocks
+        if any(span.fenced for span in doc.code_spans):
+            return True
+        return "examples" in phrases
 
-    def _analyze_tone(self, text: str) -> str:
+    def _analyze_tone(self, text: Union[str, Document]) -> str:
         """
         Analyze the tone of the prompt.
 
@@ -180,26 +328,23 @@ class PromptAnalyzer:
         - descriptive: Explaining what's needed
 
         Args:
-            text: Prompt text
+            text: Prompt text or Document
 
         Returns:
             Tone classification
         """
-        text_lower = text.lower()
-
-        # Count imperative indicators
-        imperative_count = len(
-            re.findall(r"\b(implement|create|add|fix|update|change|make|do)\b", text_lower)
-        )
-
-        # Count collaborative indicators
-        collaborative_count = len(
-            re.findall(r"\b(should|could|would|might|perhaps|consider|suggest)\b", text_lower)
+        doc = Document.of(text)
+        return self._tone_from_counts(
+            doc.count_tokens(*self.IMPERATIVE_WORDS),
+            doc.count_tokens(*self.COLLABORATIVE_WORDS),
+            doc.text.count("?"),
         )
 
-        # Count question marks
-        question_count = text.count("?")
-
+    @staticmethod
+    def _tone_from_counts(
+        imperative_count: float, collaborative_count: float, question_count: float
+    ) -> str:
+        """Classify tone from imperative, collaborative and question counts."""
         if imperative_count > collaborative_count + question_count:
             return "imperative"
         elif collaborative_count > 0 or question_count > 0:
@@ -247,17 +392,124 @@ class PromptAnalyzer:
         else:
             return "moderate"
 
-    def extract_prompt_patterns(self, all_prompts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def extract_prompt_patterns(self, all_prompts: Any) -> Dict[str, Any]:
         """
         Extract common patterns from a collection of prompts.
 
         Args:
-            all_prompts: List of prompt analyses
+            all_prompts: Feature matrix from analyze_prompts, or a list of
+                prompt analyses from analyze_prompt
 
         Returns:
             Dictionary with pattern statistics
         """
-        if not all_prompts:
+        return PromptPatternSummary().extend(all_prompts).finalize()
+
+    def find_prompt_templates(self, prompts: Sequence[Any]) -> Dict[str, Any]:
+        """
+        Find groups of near-duplicate prompts, such as reused templates.
+
+        Prompts are grouped with MinHash signatures and locality-sensitive
+        hashing, so the cost grows linearly with the number of prompts.
+
+        Args:
+            prompts: Prompt texts, or (text, reference) tuples where the
+                reference identifies the prompt in the result
+
+        Returns:
+            Dictionary with near-duplicate groups and template reuse rate
+        """
+        return NearDuplicateIndex().extend(prompts).finalize()
+
+
+class PromptPatternSummary(Accumulator):
+    """Running prompt pattern statistics."""
+
+    # Feature flags counted by the summary, in counter order
+    FLAG_COLUMNS = ("has_context", "has_constraints", "has_examples")
+
+    def __init__(self):
+        """Initialize an empty summary."""
+        self.total_prompts = 0
+        self.total_specificity = 0.0
+        self.context_count = 0
+        self.constraints_count = 0
+        self.examples_count = 0
+
+    def add(self, prompt: Any) -> "PromptPatternSummary":
+        """
+        Add one prompt.
+
+        Args:
+            prompt: Prompt analysis dictionary, or a feature row in
+                PromptAnalyzer.FEATURE_COLUMNS order
+
+        Returns:
+            This summary
+        """
+        if isinstance(prompt, dict):
+            specificity = prompt.get("specificity_score", 0)
+            flags = [prompt.get(name, False) for name in self.FLAG_COLUMNS]
+        else:
+            index = PromptAnalyzer.FEATURE_INDEX
+            specificity = prompt[index["specificity_score"]]
+            flags = [prompt[index[name]] for name in self.FLAG_COLUMNS]
+
+        self.total_prompts += 1
+        self.total_specificity += specificity
+        self.context_count += bool(flags[0])
+        self.constraints_count += bool(flags[1])
+        self.examples_count += bool(flags[2])
+        return self
+
+    def extend(self, prompts: Any) -> "PromptPatternSummary":
+        """
+        Add many prompts; a numpy feature matrix is summed column-wise.
+
+        Args:
+            prompts: Feature matrix, feature rows or prompt analyses
+
+        Returns:
+            This summary
+        """
+        if np is None or not isinstance(prompts, np.ndarray):
+            return super().extend(prompts)
+
+        index = PromptAnalyzer.FEATURE_INDEX
+        self.total_prompts += len(prompts)
+        self.total_specificity += float(prompts[:, index["specificity_score"]].sum())
+        counts = np.count_nonzero(prompts[:, [index[name] for name in self.FLAG_COLUMNS]], axis=0)
+        self.context_count += int(counts[0])
+        self.constraints_count += int(counts[1])
+        self.examples_count += int(counts[2])
+        return self
+
+    def merge(self, other: "PromptPatternSummary") -> "PromptPatternSummary":
+        """
+        Merge another partial summary.
+
+        Args:
+            other: Summary to merge
+
+        Returns:
+            This summary
+        """
+        self.total_prompts += other.total_prompts
+        self.total_specificity += other.total_specificity
+        self.context_count += other.context_count
+        self.constraints_count += other.constraints_count
+        self.examples_count += other.examples_count
+        return self
+
+    def finalize(self) -> Dict[str, Any]:
+        """
+        Produce the prompt pattern summary.
+
+        Returns:
+            Dictionary with pattern statistics
+        """
+        total = self.total_prompts
+        if not total:
             return {
                 "total_prompts": 0,
                 "average_specificity": 0,
@@ -266,16 +518,10 @@ class PromptAnalyzer:
                 "examples_percentage": 0,
             }
 
-        total = len(all_prompts)
-        total_specificity = sum(p.get("specificity_score", 0) for p in all_prompts)
-        context_count = sum(1 for p in all_prompts if p.get("has_context", False))
-        constraints_count = sum(1 for p in all_prompts if p.get("has_constraints", False))
-        examples_count = sum(1 for p in all_prompts if p.get("has_examples", False))
-
         return {
             "total_prompts": total,
-            "average_specificity": total_specificity / total if total > 0 else 0,
-            "context_percentage": (context_count / total * 100) if total > 0 else 0,
-            "constraints_percentage": (constraints_count / total * 100) if total > 0 else 0,
-            "examples_percentage": (examples_count / total * 100) if total > 0 else 0,
+            "average_specificity": self.total_specificity / total,
+            "context_percentage": self.context_count / total * 100,
+            "constraints_percentage": self.constraints_count / total * 100,
+            "examples_percentage": self.examples_count / total * 100,
         }
@@ -0,0 +1,288 @@
+"""
+Content-addressed storage of large and repeated text bodies.
+
+PR templates, bot comments and CI status messages repeat thousands of times
+across a repository. Each distinct text is kept once, as a Blob addressed
+by the digest of its content, and records refer to the shared Blob instead
+of holding their own copy. Blobs read from the analysis store load their
+text only when it is first accessed, and results derived from a text, such
+as its Document views or detections, are cached on the Blob and so
+computed once for every record that shares it.
+"""
+
+import re
+import sqlite3
+import hashlib
+import logging
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Union
+
+from llmdev.document import Document
+
+
+logger = logging.getLogger(__name__)
+
+# Texts shorter than this stay plain strings; a Blob would not save memory
+MIN_BLOB_LENGTH = 64
+
+DIGEST_SIZE = 16
+DIGEST_PATTERN = re.compile(r"[0-9a-f]{%d}" % (DIGEST_SIZE * 2))
+
+
+def text_digest(text: str) -> str:
+    """
+    Compute the content address of a text.
+
+    Args:
+        text: Text to address
+
+    Returns:
+        Hex digest of the UTF-8 encoded text
+    """
+    return hashlib.blake2b(
+        text.encode("utf-8", "surrogatepass"), digest_size=DIGEST_SIZE
+    ).hexdigest()
+
+
+class BlobSource:
+    """Loads blob texts from the blobs table of an SQLite database on demand."""
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Initialize the source; the database is opened on the first load.
+
+        Args:
+            db_path: SQLite database with a blobs (digest, text) table
+        """
+        self.db_path = Path(db_path)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        weakref.finalize(self, self._close, self.__dict__)
+
+    def load(self, digest: str) -> Optional[str]:
+        """
+        Load the text of a blob.
+
+        Args:
+            digest: Content address of the text
+
+        Returns:
+            Text, or None if the database has no such blob
+        """
+        with self._lock:
+            if self._connection is None:
+                self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+                logger.debug(f"Loading blobs from {self.db_path}")
+            row = self._connection.execute(
+                "SELECT text FROM blobs WHERE digest = ?", (digest,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def __reduce__(self):
+        return blob_source, (str(self.db_path),)
+
+    @staticmethod
+    def _close(state: Dict[str, Any]):
+        """Close the connection when the source is collected."""
+        if state.get("_connection") is not None:
+            state["_connection"].close()
+
+
+_sources: Dict[str, BlobSource] = {}
+
+
+def blob_source(db_path: Union[str, Path]) -> BlobSource:
+    """
+    Get the shared blob source of a database.
+
+    Args:
+        db_path: SQLite database path
+
+    Returns:
+        BlobSource, created on first use
+    """
+    key = str(Path(db_path).resolve())
+    if key not in _sources:
+        _sources[key] = BlobSource(db_path)
+    return _sources[key]
+
+
+class Blob:
+    """A shared text, addressed by the digest of its content.
+
+    Equal texts give equal blobs. A Blob created from a digest alone loads
+    its text from its source on first access; a digest the source does not
+    know is itself the text, which keeps bodies stored before blobs existed
+    readable.
+    """
+
+    __slots__ = ("digest", "_text", "_source", "_document", "_results", "__weakref__")
+
+    def __init__(
+        self,
+        digest: str,
+        text: Optional[str] = None,
+        source: Optional[BlobSource] = None,
+    ):
+        """
+        Create a blob.
+
+        Args:
+            digest: Content address of the text
+            text: The text, or None to load it from the source
+            source: Where to load the text from when it is not given
+        """
+        self.digest = digest
+        self._text = text
+        self._source = source
+        self._document: Optional[Document] = None
+        self._results: Optional[Dict[Hashable, Any]] = None
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the text is in memory."""
+        return self._text is not None
+
+    @property
+    def source(self) -> Optional[BlobSource]:
+        """Source the text is loaded from, if any."""
+        return self._source
+
+    @property
+    def text(self) -> str:
+        """The text, loaded on first access."""
+        if self._text is None:
+            text = self._source.load(self.digest) if self._source else None
+            self._text = self.digest if text is None else text
+        return self._text
+
+    @property
+    def document(self) -> Document:
+        """Document of the text, shared by every record holding this blob."""
+        if self._document is None:
+            self._document = Document(self.text)
+        return self._document
+
+    def cached(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Get a result derived from the text, computing it once per blob.
+
+        Args:
+            key: Identifies the computation, including anything besides the
+                text that its result depends on
+            compute: Computes the result when it is not cached
+
+        Returns:
+            Cached or computed result
+        """
+        if self._results is None:
+            self._results = {}
+        if key not in self._results:
+            self._results[key] = compute()
+        return self._results[key]
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Blob):
+            return NotImplemented
+        return self.digest == other.digest
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        state = f"{len(self._text)} chars" if self._text is not None else "not loaded"
+        return f"Blob({self.digest}, {state})"
+
+    def __reduce__(self):
+        # Loaded blobs travel with their text; others with where to load it from
+        if self._text is not None:
+            return intern_text, (self._text,)
+        return blob_handle, (self.digest, self._source)
+
+
+class BlobStore:
+    """In-memory registry that keeps one Blob per distinct text.
+
+    Blobs are held weakly, so a text is released once no record refers to
+    it any more.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._blobs: "weakref.WeakValueDictionary[str, Blob]" = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of live blobs."""
+        return len(self._blobs)
+
+    def intern(self, text: str) -> Blob:
+        """
+        Get the shared blob of a text.
+
+        Args:
+            text: Text to store
+
+        Returns:
+            The existing blob with this content, or a new one
+        """
+        digest = text_digest(text)
+        with self._lock:
+            blob = self._blobs.get(digest)
+            if blob is None:
+                blob = self._blobs[digest] = Blob(digest, text)
+            elif blob._text is None:
+                blob._text = text
+        return blob
+
+    def handle(self, digest: str, source: Optional[BlobSource]) -> Blob:
+        """
+        Get the shared blob of a digest, loading its text lazily.
+
+        Args:
+            digest: Content address
+            source: Where to load the text from
+
+        Returns:
+            The existing blob with this digest, or a new unloaded one
+        """
+        with self._lock:
+            blob = self._blobs.get(digest)
+            if blob is None:
+                blob = self._blobs[digest] = Blob(digest, source=source)
+        return blob
+
+
+# Registry used by records and the analysis store
+DEFAULT_STORE = BlobStore()
+
+
+def intern_text(text: str) -> Blob:
+    """Get the shared blob of a text from the default registry."""
+    return DEFAULT_STORE.intern(text)
+
+
+def blob_handle(digest: str, source: Optional[BlobSource]) -> Blob:
+    """Get the shared, lazily loaded blob of a digest from the default registry."""
+    return DEFAULT_STORE.handle(digest, source)
+
+
+def blob_of(record: Mapping, field: str) -> Optional[Blob]:
+    """
+    Get the blob of a record's text field.
+
+    Args:
+        record: Record or plain dictionary
+        field: Name of a text field
+
+    Returns:
+        Blob of the text, or None if the record is a plain dictionary or
+        keeps the field as a plain string
+    """
+    blob = getattr(record, "blob", None)
+    return blob(field) if blob is not None else None
@@ -1,8 +1,9 @@
 """
-Caching infrastructure for GitHub API responses.
+Caching infrastructure for GitHub API responses and analysis results.
 """
 
 from llmdev.cache.disk_cache import DiskCache
+from llmdev.cache.memo_store import MemoStore, content_hash, source_version
 from llmdev.cache.rate_limiter import RateLimiter
 
-__all__ = ["DiskCache", "RateLimiter"]
+__all__ = ["DiskCache", "MemoStore", "RateLimiter", "content_hash", "source_version"]
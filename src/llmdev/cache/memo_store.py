@@ -0,0 +1,205 @@
+"""
+Persistent memoization of analysis results keyed by content hash.
+"""
+
+import re
+import json
+import pickle
+import shutil
+import hashlib
+import logging
+import inspect
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Names of version directories, as produced by source_version
+VERSION_NAME_PATTERN = re.compile(r"[0-9a-f]{16}")
+
+
+def content_hash(*parts: Any) -> str:
+    """
+    Hash JSON-compatible values into a stable hex digest.
+
+    Dictionaries and other mappings, such as collected records, are hashed
+    with sorted keys, other collections (such as disk-backed lists and
+    detection stores) as arrays and remaining non-JSON values (such as
+    datetimes) by their string form, so equal content always gives the
+    same digest.
+
+    Args:
+        parts: Values to hash
+
+    Returns:
+        SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, default=_json_default).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize mappings as objects, other collections as arrays and the rest as strings."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if isinstance(value, Iterable) and not isinstance(value, (str, bytes)):
+        return list(value)
+    return str(value)
+
+
+def source_version(*modules: ModuleType) -> str:
+    """
+    Derive a version string from the source code of modules.
+
+    Any edit to one of the modules yields a new version, which invalidates
+    results memoized under the old one.
+
+    Args:
+        modules: Modules whose source determines the version
+
+    Returns:
+        Short hex digest of the module sources
+    """
+    digest = hashlib.sha256()
+    for module in modules:
+        digest.update(module.__name__.encode())
+        digest.update(Path(inspect.getfile(module)).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class MemoStore:
+    """Disk-backed memo of results, partitioned by code version."""
+
+    def __init__(self, cache_dir: str, version: str):
+        """
+        Initialize the memo store.
+
+        Entries written under other versions are left in place, since
+        another checkout sharing the directory may still use them; remove
+        them with ``prune_stale_versions``.
+
+        Args:
+            cache_dir: Directory holding one subdirectory per version
+            version: Version of the code producing the results
+        """
+        self.root = Path(cache_dir)
+        self.version = version
+        self.cache_dir = self.root / version
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        logger.debug(f"Initialized memo store at {self.cache_dir}")
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a memoized value.
+
+        Args:
+            key: Content hash of the inputs
+
+        Returns:
+            Memoized value or None if not found
+        """
+        memo_file = self._get_memo_file(key)
+
+        if not memo_file.exists():
+            self.misses += 1
+            return None
+
+        try:
+            with memo_file.open("rb") as f:
+                value = pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, IOError) as e:
+            logger.warning(f"Error reading memo {key}: {e}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> bool:
+        """
+        Memoize a value.
+
+        The value is written to a temporary file and renamed into place so
+        an interrupted run never leaves a truncated entry.
+
+        Args:
+            key: Content hash of the inputs
+            value: Picklable value
+
+        Returns:
+            True if successful, False otherwise
+        """
+        memo_file = self._get_memo_file(key)
+        tmp_file = memo_file.with_suffix(".tmp")
+
+        try:
+            with tmp_file.open("wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_file.replace(memo_file)
+            return True
+        except (pickle.PicklingError, TypeError, AttributeError, IOError) as e:
+            logger.warning(f"Error writing memo {key}: {e}")
+            tmp_file.unlink(missing_ok=True)
+            return False
+
+    def clear(self) -> int:
+        """
+        Remove all memoized values for the current version.
+
+        Returns:
+            Number of entries deleted
+        """
+        count = 0
+        for memo_file in self.cache_dir.glob("*.pkl"):
+            try:
+                memo_file.unlink()
+                count += 1
+            except IOError as e:
+                logger.warning(f"Error deleting memo file {memo_file}: {e}")
+
+        logger.info(f"Cleared {count} memo entries")
+        return count
+
+    def prune_stale_versions(self) -> int:
+        """
+        Remove the entries of all other versions.
+
+        Only subdirectories named like a version are removed, so other data
+        kept under the same directory survives.
+
+        Returns:
+            Number of version directories deleted
+        """
+        count = 0
+        for path in self.root.iterdir():
+            if (
+                path.is_dir()
+                and path.name != self.version
+                and VERSION_NAME_PATTERN.fullmatch(path.name)
+            ):
+                shutil.rmtree(path, ignore_errors=True)
+                logger.debug(f"Removed stale memo version {path.name}")
+                count += 1
+        return count
+
+    def _get_memo_file(self, key: str) -> Path:
+        """
+        Get the memo file path for a key.
+
+        Args:
+            key: Content hash
+
+        Returns:
+            Path to memo file
+        """
+        return self.cache_dir / f"{key}.pkl"
@@ -5,13 +5,18 @@ Command-line interface for llmdev.
 import click
 import logging
 import sys
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from llmdev.analyzer import RepositoryAnalyzer
 from llmdev.reporter import ReportGenerator
+from llmdev.exporter import ResultExporter
 from llmdev.config import Config
+from llmdev.importers import IMPORTERS
 from llmdev.mcp_instructions import MCPInstructionsGenerator
+from llmdev.pipeline import STAGES, Pipeline
+from llmdev.search import SOURCE_TYPES, SearchIndex
 
 
 def setup_logging(verbose: bool) -> None:
@@ -24,6 +29,33 @@ def setup_logging(verbose: bool) -> None:
     )
 
 
+def _confirm_deprecated_analyze(repository: str) -> None:
+    """Warn that the analyze command hits API rate limits and ask to continue."""
+    click.echo("=" * 70, err=True)
+    click.echo("⚠️  DEPRECATION WARNING", err=True)
+    click.echo("=" * 70, err=True)
+    click.echo("This command is deprecated and likely to fail on real repositories.", err=True)
+    click.echo("", err=True)
+    click.echo("GitHub API rate limits:", err=True)
+    click.echo("  - Unauthenticated: 60 requests/hour", err=True)
+    click.echo("  - Authenticated: 5,000 requests/hour", err=True)
+    click.echo("", err=True)
+    click.echo("A typical repository analysis requires hundreds or thousands of API calls.", err=True)
+    click.echo("", err=True)
+    click.echo("🚀 RECOMMENDED APPROACH:", err=True)
+    click.echo(f"   llmdev generate-instructions {repository} --phase intro", err=True)
+    click.echo("", err=True)
+    click.echo("This creates phase-by-phase instructions for MCP-enabled tools", err=True)
+    click.echo("that avoid rate limits entirely.", err=True)
+    click.echo("=" * 70, err=True)
+    click.echo("", err=True)
+    
+    # Ask for confirmation to continue
+    if not click.confirm("Do you want to continue with the deprecated analyze command?"):
+        click.echo("Aborted. Use 'generate-instructions' instead.")
+        sys.exit(0)
+
+
 @click.group()
 @click.version_option(version="0.1.0")
 def cli():
@@ -62,6 +94,48 @@ def cli():
     help="Enable deep analysis with prompt extraction, iteration patterns, and categorization",
 )
 @click.option("--no-cache", is_flag=True, help="Disable caching of API responses")
+@click.option(
+    "--workers",
+    type=int,
+    default=None,
+    help="Worker processes for detection and deep analysis (default: all CPUs for large inputs)",
+)
+@click.option(
+    "--all-findings",
+    is_flag=True,
+    help="List every detection in the report instead of the first 10 per source",
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Analyze data already in the local analysis store instead of fetching from GitHub",
+)
+@click.option(
+    "--corpus",
+    "corpus_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="JSONL corpus (.gz to compress) to append collected data to; with --offline, "
+    "analyze the corpus instead of the analysis store",
+)
+@click.option(
+    "--memory-limit",
+    type=int,
+    default=None,
+    help="Spill collected records to disk beyond this many megabytes (default: no limit)",
+)
+@click.option(
+    "--pipelined",
+    is_flag=True,
+    help="Overlap fetching with detection and deep analysis, and report per-stage utilization",
+)
+@click.option(
+    "--export",
+    "export_formats",
+    multiple=True,
+    type=click.Choice(["jsonl", "parquet"], case_sensitive=False),
+    help="Also export structured results (repeatable; parquet requires pyarrow)",
+)
 def analyze(
     repository: str,
     token: Optional[str],
@@ -72,6 +146,13 @@ def analyze(
     max_issues: int,
     deep_analysis: bool,
     no_cache: bool,
+    workers: Optional[int],
+    all_findings: bool,
+    offline: bool,
+    corpus_path: Optional[str],
+    memory_limit: Optional[int],
+    pipelined: bool,
+    export_formats: Tuple[str, ...],
 ):
     """
     [DEPRECATED] Analyze a GitHub repository for LLM-generated code using REST API.
@@ -91,30 +172,9 @@ def analyze(
     setup_logging(verbose)
     logger = logging.getLogger(__name__)
     
-    # Show deprecation warning
-    click.echo("=" * 70, err=True)
-    click.echo("⚠️  DEPRECATION WARNING", err=True)
-    click.echo("=" * 70, err=True)
-    click.echo("This command is deprecated and likely to fail on real repositories.", err=True)
-    click.echo("", err=True)
-    click.echo("GitHub API rate limits:", err=True)
-    click.echo("  - Unauthenticated: 60 requests/hour", err=True)
-    click.echo("  - Authenticated: 5,000 requests/hour", err=True)
-    click.echo("", err=True)
-    click.echo("A typical repository analysis requires hundreds or thousands of API calls.", err=True)
-    click.echo("", err=True)
-    click.echo("🚀 RECOMMENDED APPROACH:", err=True)
-    click.echo(f"   llmdev generate-instructions {repository} --phase intro", err=True)
-    click.echo("", err=True)
-    click.echo("This creates phase-by-phase instructions for MCP-enabled tools", err=True)
-    click.echo("that avoid rate limits entirely.", err=True)
-    click.echo("=" * 70, err=True)
-    click.echo("", err=True)
-    
-    # Ask for confirmation to continue
-    if not click.confirm("Do you want to continue with the deprecated analyze command?"):
-        click.echo("Aborted. Use 'generate-instructions' instead.")
-        sys.exit(0)
+    # Show deprecation warning; offline analysis makes no API calls
+    if not offline:
+        _confirm_deprecated_analyze(repository)
 
     logger.info(f"Starting analysis of repository: {repository}")
 
@@ -126,7 +186,7 @@ def analyze(
     owner, repo = repository.split("/", 1)
 
     # Check for GitHub token
-    if not token:
+    if not token and not offline:
         click.echo(
             "Warning: No GitHub token provided. API rate limits will be restrictive.\n"
             "Set GITHUB_TOKEN environment variable or use --token option.",
@@ -147,6 +207,13 @@ def analyze(
         verbose=verbose,
         deep_analysis=deep_analysis,
         enable_cache=not no_cache,
+        detection_workers=workers,
+        deep_analysis_workers=workers,
+        report_findings_limit=None if all_findings else 10,
+        export_formats=tuple(fmt.lower() for fmt in export_formats),
+        pipelined=pipelined,
+        memory_limit_mb=memory_limit,
+        corpus_path=corpus_path,
     )
 
     try:
@@ -158,7 +225,12 @@ def analyze(
 
         # Run analysis
         logger.info("Fetching repository data...")
-        results = analyzer.analyze(owner, repo)
+        if offline and corpus_path:
+            results = analyzer.analyze_corpus(repository)
+        elif offline:
+            results = analyzer.analyze_stored(repository)
+        else:
+            results = analyzer.analyze(owner, repo)
 
         # Generate report
         logger.info("Generating report...")
@@ -167,6 +239,18 @@ def analyze(
 
         click.echo(f"\n✓ Analysis complete!")
         click.echo(f"✓ Report saved to: {report_path}")
+        for name, stats in results["analysis"].get("stages", {}).items():
+            click.echo(
+                f"  Stage {name}: {stats['items']} items, {stats['utilization']:.0%} busy, "
+                f"{stats['starved_seconds']:.1f}s waiting for input, "
+                f"{stats['blocked_seconds']:.1f}s waiting for queue space"
+            )
+
+        # Export structured results
+        if config.export_formats:
+            exported = ResultExporter(config).export(results, config.export_formats)
+            export_dir = next(iter(exported.values())).parent
+            click.echo(f"✓ Structured results exported to: {export_dir}")
 
     except Exception as e:
         logger.exception("Analysis failed")
@@ -270,6 +354,261 @@ def generate_instructions(repository: str, output: str, phase: Optional[str]):
         sys.exit(1)
 
 
+@cli.command()
+@click.argument("repository")
+@click.option(
+    "--token", envvar="GITHUB_TOKEN", help="GitHub API token (can also use GITHUB_TOKEN env var)"
+)
+@click.option(
+    "--output",
+    "-o",
+    default="output",
+    type=click.Path(),
+    help="Output directory for reports (default: output/)",
+)
+@click.option("--verbose", "-v", is_flag=True, help="Enable verbose logging")
+@click.option("--max-commits", type=int, default=100, help="Maximum commits to collect")
+@click.option("--max-prs", type=int, default=50, help="Maximum PRs to collect")
+@click.option("--max-issues", type=int, default=50, help="Maximum issues to collect")
+@click.option("--deep-analysis", is_flag=True, help="Enable deep analysis")
+@click.option("--workers", type=int, default=None, help="Worker processes for analysis")
+@click.option(
+    "--stage",
+    "only",
+    type=click.Choice(STAGES),
+    help="Run only this stage, using the cached outputs of the stages it depends on",
+)
+@click.option(
+    "--from",
+    "rerun_from",
+    type=click.Choice(STAGES),
+    help="Rerun this stage and every later stage even if they are up to date",
+)
+@click.option("--until", type=click.Choice(STAGES), default="report", help="Last stage to run")
+@click.option("--offline", is_flag=True, help="Skip collection and use the local analysis store")
+def run(
+    repository: str,
+    token: Optional[str],
+    output: str,
+    verbose: bool,
+    max_commits: int,
+    max_prs: int,
+    max_issues: int,
+    deep_analysis: bool,
+    workers: Optional[int],
+    only: Optional[str],
+    rerun_from: Optional[str],
+    until: str,
+    offline: bool,
+):
+    """
+    Run the staged analysis pipeline for a repository.
+
+    Stages run in order (collect, normalize, detect, deep, aggregate, report).
+    A stage whose code, settings and inputs are unchanged since the last run
+    is skipped and its cached output reused. Collection runs every time,
+    unless --from names a later stage, so new GitHub data is picked up.
+
+    REPOSITORY should be in the format 'owner/repo' (e.g., 'microsoft/vscode')
+
+    Examples:
+        # Rerun detection after editing detection rules, without refetching
+        llmdev run owner/repo --from detect
+    """
+    setup_logging(verbose)
+    logger = logging.getLogger(__name__)
+
+    if "/" not in repository:
+        click.echo("Error: Repository must be in format 'owner/repo'", err=True)
+        sys.exit(1)
+    owner, repo = repository.split("/", 1)
+
+    output_path = Path(output)
+    output_path.mkdir(parents=True, exist_ok=True)
+    config = Config(
+        github_token=token,
+        output_dir=output_path,
+        max_commits=max_commits,
+        max_prs=max_prs,
+        max_issues=max_issues,
+        verbose=verbose,
+        deep_analysis=deep_analysis,
+        detection_workers=workers,
+        deep_analysis_workers=workers,
+    )
+
+    try:
+        pipeline = Pipeline(config)
+        statuses = pipeline.run(
+            owner, repo, only=only, rerun_from=rerun_from, until=until, offline=offline
+        )
+    except Exception as e:
+        logger.exception("Pipeline failed")
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+    for stage, status in statuses.items():
+        click.echo(f"{stage:<10} {status}")
+    if "report" in statuses and statuses["report"] != "skipped":
+        click.echo(f"\n✓ Report: {pipeline.output('report')['report']}")
+
+
+@cli.command()
+@click.argument("query")
+@click.option("--repo", "-r", help="Only search this repository (owner/repo)")
+@click.option(
+    "--type",
+    "source_type",
+    type=click.Choice(SOURCE_TYPES, case_sensitive=False),
+    help="Only search this source type",
+)
+@click.option("--author", "-a", help="Only search texts by this author")
+@click.option(
+    "--since", type=click.DateTime(formats=["%Y-%m-%d"]), help="Only texts created on or after"
+)
+@click.option(
+    "--until", type=click.DateTime(formats=["%Y-%m-%d"]), help="Only texts created on or before"
+)
+@click.option("--limit", "-n", type=int, default=20, help="Maximum results (default: 20)")
+@click.option(
+    "--index",
+    "index_path",
+    default=str(Config.search_index_path),
+    type=click.Path(),
+    help=f"Search index database (default: {Config.search_index_path})",
+)
+def search(
+    query: str,
+    repo: Optional[str],
+    source_type: Optional[str],
+    author: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    limit: int,
+    index_path: str,
+):
+    """
+    Search collected PRs, issues, commits and comments of analyzed repositories.
+
+    Texts are indexed locally during analysis, so searching never calls the
+    GitHub API. Plain terms must all match; FTS5 syntax such as "exact
+    phrase", prefix* and OR is also accepted.
+
+    Examples:
+        llmdev search "copilot agent" --repo owner/repo --type pr
+    """
+    if not Path(index_path).exists():
+        click.echo(f"Error: No search index at {index_path}; run an analysis first", err=True)
+        sys.exit(1)
+
+    with SearchIndex(index_path) as index:
+        try:
+            hits = index.search(
+                query,
+                repo=repo,
+                source_type=source_type.lower() if source_type else None,
+                author=author,
+                since=since.date() if since else None,
+                until=until.date() if until else None,
+                limit=limit,
+            )
+        except ValueError as e:
+            click.echo(f"Error: {e}", err=True)
+            sys.exit(1)
+
+    if not hits:
+        click.echo("No matches found.")
+        return
+
+    for hit in hits:
+        date = hit.created_at[:10] if hit.created_at else "unknown date"
+        click.echo(f"{hit.repo} {hit.source_type} {hit.source_id} - {hit.author} ({date})")
+        if hit.title:
+            click.echo(f"  {hit.title}")
+        click.echo(f"  {' '.join(hit.snippet.split())}")
+        if hit.url:
+            click.echo(f"  {hit.url}")
+        click.echo("")
+
+
+@cli.command("import")
+@click.argument("source_format", metavar="FORMAT", type=click.Choice(sorted(IMPORTERS)))
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option(
+    "--repo",
+    "-r",
+    "repository",
+    help="Repository to import (owner/repo); required for GH Archive event files",
+)
+@click.option(
+    "--store",
+    "store_path",
+    default=str(Config.store_path),
+    type=click.Path(dir_okay=False),
+    help=f"Analysis store database (default: {Config.store_path})",
+)
+@click.option(
+    "--corpus",
+    "corpus_path",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="Also append the imported data to this JSONL corpus (.gz to compress)",
+)
+@click.option(
+    "--memory-limit",
+    type=int,
+    default=None,
+    help="Spill imported records to disk beyond this many megabytes (default: no limit)",
+)
+@click.option("--verbose", "-v", is_flag=True, help="Enable verbose logging")
+def import_data(
+    source_format: str,
+    paths: Tuple[str, ...],
+    repository: Optional[str],
+    store_path: str,
+    corpus_path: Optional[str],
+    memory_limit: Optional[int],
+    verbose: bool,
+):
+    """
+    Import repository data from local dumps for offline analysis.
+
+    FORMAT is one of: gh-api (output of 'gh api --paginate' for the pulls,
+    commits, issues and comment endpoints), migration (GitHub migration or
+    export archives) or gharchive (GH Archive event files).
+
+    Examples:
+        gh api --paginate 'repos/owner/repo/pulls?state=all' > pulls.json
+        llmdev import gh-api pulls.json comments.json --repo owner/repo
+        llmdev analyze owner/repo --offline
+    """
+    setup_logging(verbose)
+    logger = logging.getLogger(__name__)
+
+    config = Config(
+        store_path=Path(store_path),
+        corpus_path=corpus_path,
+        search_index_path=None,
+        enable_cache=False,
+        memory_limit_mb=memory_limit,
+    )
+    try:
+        analyzer = RepositoryAnalyzer(config)
+        importer = IMPORTERS[source_format](paths, repository)
+        imported = analyzer.normalize(analyzer.import_collection(importer))
+    except Exception as e:
+        logger.exception("Import failed")
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+    full_name = imported["repository"]["full_name"]
+    click.echo(
+        f"✓ Imported {len(imported['commits'])} commits, {len(imported['prs'])} PRs and "
+        f"{len(imported['issues'])} issues of {full_name} into {store_path}"
+    )
+    click.echo(f"  Analyze offline with: llmdev analyze {full_name} --offline")
+
+
 def main():
     """Main entry point for the CLI."""
     cli()
@@ -4,7 +4,7 @@ Configuration management for llmdev.
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 
 @dataclass
@@ -26,12 +26,46 @@ class Config:
     enable_cache: bool = True
     cache_ttl: int = 3600  # seconds (1 hour)
     enable_rate_limiting: bool = True
+    memo_dir: Path = Path(".llmdev_cache") / "memo"  # memoized deep analysis per PR
+    stage_cache_dir: Path = Path(".llmdev_cache") / "stages"  # cached pipeline stage outputs
+    store_path: Optional[Path] = Path(".llmdev_cache") / "store.db"  # None keeps data in memory
+    search_index_path: Optional[Path] = Path(".llmdev_cache") / "search.db"  # None disables
+    corpus_path: Optional[Path] = None  # JSONL corpus collected data is appended to; .gz compresses
+
+    # Memory ceiling for collected records (None keeps everything in memory)
+    memory_limit_mb: Optional[int] = None
+    spill_dir: Path = Path(".llmdev_cache") / "spill"  # segments of spilled collections
+
+    # Detection rules (None uses the built-in rule file)
+    detection_rules_path: Optional[Path] = None
+    detection_workers: Optional[int] = None  # None uses all CPUs for large batches
+
+    # Reporting (None lists every detection in the detailed findings)
+    report_findings_limit: Optional[int] = 10
+    export_formats: Tuple[str, ...] = ()  # 'jsonl' and/or 'parquet'
 
     # Deep analysis features (MVP2)
     deep_analysis: bool = False
     analyze_commits_per_pr: bool = False
+    deep_analysis_workers: Optional[int] = None  # None uses all CPUs for large batches
+
+    # Overlap fetching with detection and deep analysis
+    pipelined: bool = False
+    pipeline_queue_size: int = 64  # records waiting between two pipelined stages
 
     def __post_init__(self):
-        """Ensure output_dir is a Path object."""
+        """Ensure directory and database settings are Path objects."""
         if not isinstance(self.output_dir, Path):
             self.output_dir = Path(self.output_dir)
+        if not isinstance(self.memo_dir, Path):
+            self.memo_dir = Path(self.memo_dir)
+        if not isinstance(self.stage_cache_dir, Path):
+            self.stage_cache_dir = Path(self.stage_cache_dir)
+        if not isinstance(self.spill_dir, Path):
+            self.spill_dir = Path(self.spill_dir)
+        if self.store_path is not None and not isinstance(self.store_path, Path):
+            self.store_path = Path(self.store_path)
+        if self.search_index_path is not None and not isinstance(self.search_index_path, Path):
+            self.search_index_path = Path(self.search_index_path)
+        if self.corpus_path is not None and not isinstance(self.corpus_path, Path):
+            self.corpus_path = Path(self.corpus_path)
@@ -0,0 +1,521 @@
+"""
+Append-only JSONL corpus of collected records for offline re-analysis.
+
+A corpus file holds one JSON object per line: a collected repository,
+commit, PR (with its comments) or issue, tagged with its repository and
+table. Files whose name ends in ``.gz`` are written as a series of gzip
+members of up to BLOCK_RECORDS lines each; standard tools still read them
+as a single JSONL stream, and each member can be decompressed on its own.
+
+An offset index kept next to the corpus (``<corpus>.idx``) records where
+every record is, so the corpus is read through ``mmap`` instead of being
+loaded: a record is parsed only when it is accessed, straight from the
+mapped file, and PRs, issues and commits are found by number or SHA
+without a scan. A record appended later replaces an earlier one with the
+same key, so re-collecting a repository just appends to its corpus.
+"""
+
+import os
+import json
+import mmap
+import gzip
+import zlib
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from llmdev.records import RECORD_TYPES
+from llmdev.store import TABLE_COLUMNS
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when the index layout changes; older indexes are rebuilt from the corpus
+INDEX_VERSION = 1
+
+# Field identifying the records of each table within a repository
+KEY_FIELDS = {
+    "repositories": "full_name",
+    "commits": "sha",
+    "prs": "number",
+    "issues": "number",
+}
+
+TIMESTAMP_FIELDS = {
+    table: tuple(name for name, kind in columns if kind == "timestamp")
+    for table, columns in TABLE_COLUMNS.items()
+}
+
+# Gzip window bits for zlib
+GZIP_WBITS = 31
+
+# An index entry: [key, block, start, end]. Offsets are into the file for
+# uncompressed corpora (block -1) and into the decompressed block otherwise.
+Entry = List[Any]
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize timestamps and records."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "keys"):
+        return dict(value)
+    return str(value)
+
+
+def _parse_timestamps(record: Dict[str, Any], fields: Sequence[str]):
+    """Turn ISO timestamp strings back into datetimes, in place."""
+    for name in fields:
+        value = record.get(name)
+        if isinstance(value, str):
+            try:
+                record[name] = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            except ValueError:
+                pass
+
+
+def _decode(table: str, record: Dict[str, Any]) -> Any:
+    """Convert a parsed corpus record back to its collected form."""
+    _parse_timestamps(record, TIMESTAMP_FIELDS.get(table, ()))
+    for comment in record.get("comments") or ():
+        _parse_timestamps(comment, TIMESTAMP_FIELDS["comments"])
+    record_type = RECORD_TYPES.get(table)
+    return record_type.from_dict(record) if record_type else record
+
+
+class Corpus:
+    """Append-only JSONL corpus of collected records, read through mmap."""
+
+    # Lines per gzip member in compressed corpora
+    BLOCK_RECORDS = 256
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open or create a corpus, loading or rebuilding its offset index.
+
+        Args:
+            path: Corpus file; a name ending in '.gz' selects compression
+        """
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self.compressed = self.path.suffix == ".gz"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._size = 0
+        self._blocks: List[Tuple[int, int]] = []
+        self._entries: Dict[Tuple[str, str], List[Entry]] = {}
+        self._positions: Dict[Tuple[str, str], Dict[Hashable, int]] = {}
+        self._file = None
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+        self._index_dirty = False
+        self._map: Optional[mmap.mmap] = None
+        self._map_size = 0
+        self._block: Tuple[int, bytes] = (-1, b"")
+        self._load_index()
+
+    def __enter__(self) -> "Corpus":
+        """Use the corpus as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Flush and close on exit."""
+        self.close()
+
+    def close(self):
+        """
+        Write pending records and the index, and release the mapping.
+
+        Record views stay usable; the file is mapped again when they are read.
+        """
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._block = (-1, b"")
+
+    def repositories(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the repositories in the corpus.
+
+        Returns:
+            Mapping of repository full name to repository metadata
+        """
+        return {
+            repo: self.get(repo, "repositories", repo)
+            for repo, table in self._entries
+            if table == "repositories"
+        }
+
+    def write_collection(self, collected: Dict[str, Any]) -> str:
+        """
+        Append collected repository data.
+
+        Args:
+            collected: Dictionary with 'repository' metadata and 'commits',
+                'prs' and 'issues' records as built by the collectors
+
+        Returns:
+            Full name of the repository
+        """
+        repository = dict(collected["repository"])
+        repo = repository["full_name"]
+        repository.setdefault("collected_at", datetime.now())
+
+        self.append(repo, "repositories", repository)
+        for table in ("commits", "prs", "issues"):
+            for record in collected.get(table, []):
+                self.append(repo, table, record)
+        self.flush()
+
+        logger.info(
+            f"Wrote {len(collected.get('commits', []))} commits, "
+            f"{len(collected.get('prs', []))} PRs and {len(collected.get('issues', []))} "
+            f"issues for {repo} to {self.path}"
+        )
+        return repo
+
+    def append(self, repo: str, table: str, record: Dict[str, Any]):
+        """
+        Append a record, replacing any earlier record with the same key.
+
+        Args:
+            repo: Repository full name
+            table: 'repositories', 'commits', 'prs' or 'issues'
+            record: Record in the form the collectors produce
+
+        Raises:
+            KeyError: If the table is unknown
+        """
+        key = record.get(KEY_FIELDS[table])
+        line = json.dumps(
+            {"repo": repo, "table": table, "record": record},
+            default=_json_default,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        line += b"\n"
+
+        if self._file is None:
+            self._file = self.path.open("ab")
+            # Drop an incomplete record left by an interrupted write
+            if self._file.tell() > self._size:
+                self._file.truncate(self._size)
+        if self.compressed:
+            start = self._pending_size
+            self._pending.append(line)
+            self._pending_size += len(line)
+            self._add_entry(repo, table, key, len(self._blocks), start, start + len(line) - 1)
+            if len(self._pending) >= self.BLOCK_RECORDS:
+                self._write_block()
+        else:
+            self._file.write(line)
+            self._add_entry(repo, table, key, -1, self._size, self._size + len(line) - 1)
+            self._size += len(line)
+
+    def flush(self):
+        """Write pending records and save the index."""
+        self._write_block()
+        if self._file is not None:
+            self._file.flush()
+        if self._index_dirty:
+            self._save_index()
+
+    def table(self, repo: str, table: str) -> "CorpusTable":
+        """
+        Get a lazy view of a repository's records of one table.
+
+        Args:
+            repo: Repository full name
+            table: 'commits', 'prs' or 'issues'
+
+        Returns:
+            Sequence of the records, in the order they were first written
+
+        Raises:
+            KeyError: If the table is unknown
+        """
+        if table not in KEY_FIELDS:
+            raise KeyError(f"Unknown corpus table {table!r}")
+        return CorpusTable(self, repo, table)
+
+    def get(self, repo: str, table: str, key: Hashable) -> Any:
+        """
+        Get a record by its key.
+
+        Args:
+            repo: Repository full name
+            table: 'repositories', 'commits', 'prs' or 'issues'
+            key: Commit SHA, PR or issue number, or repository full name
+
+        Returns:
+            Latest record with the key
+
+        Raises:
+            KeyError: If the corpus has no such record
+        """
+        position = self._positions.get((repo, table), {}).get(key)
+        if position is None:
+            raise KeyError(f"No {table} record {key!r} for {repo} in {self.path}")
+        return self._read(table, self._entries[(repo, table)][position])
+
+    def load_collection(self, repo: str) -> Dict[str, Any]:
+        """
+        Load a repository's data as lazy record views.
+
+        Args:
+            repo: Repository full name ('owner/repo')
+
+        Returns:
+            Dictionary with 'repository' and the 'commits', 'prs' and
+            'issues' records, each PR and issue carrying its 'comments'
+
+        Raises:
+            KeyError: If the repository is not in the corpus
+        """
+        if (repo, "repositories") not in self._entries:
+            raise KeyError(f"Repository {repo} is not in corpus {self.path}")
+        loaded = {"repository": self.get(repo, "repositories", repo)}
+        for table in ("commits", "prs", "issues"):
+            loaded[table] = self.table(repo, table)
+        return loaded
+
+    def _add_entry(self, repo: str, table: str, key: Hashable, block: int, start: int, end: int):
+        """Index a record, replacing the entry of an earlier record with the same key."""
+        entries = self._entries.setdefault((repo, table), [])
+        positions = self._positions.setdefault((repo, table), {})
+        entry = [key, block, start, end]
+        if key is not None and key in positions:
+            entries[positions[key]] = entry
+        else:
+            if key is not None:
+                positions[key] = len(entries)
+            entries.append(entry)
+        self._index_dirty = True
+
+    def _write_block(self):
+        """Write the pending records of a compressed corpus as one gzip member."""
+        if not self._pending:
+            return
+        data = gzip.compress(b"".join(self._pending), mtime=0)
+        self._file.write(data)
+        self._blocks.append((self._size, len(data)))
+        self._size += len(data)
+        self._pending = []
+        self._pending_size = 0
+
+    def _mapped(self) -> Union[mmap.mmap, bytes]:
+        """Map the corpus file, again if it has grown since it was mapped."""
+        if self._pending or self._file is not None:
+            self._write_block()
+            self._file.flush()
+        if self._map is None or self._map_size < self._size:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._size == 0:
+                return b""
+            with self.path.open("rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._map_size = len(self._map)
+        return self._map
+
+    def _line(self, entry: Entry) -> bytes:
+        """Get the bytes of an indexed record."""
+        _, block, start, end = entry
+        mapped = self._mapped()
+        if block < 0:
+            return mapped[start:end]
+        if self._block[0] != block:
+            offset, length = self._blocks[block]
+            self._block = (block, zlib.decompress(mapped[offset : offset + length], GZIP_WBITS))
+        return self._block[1][start:end]
+
+    def _read(self, table: str, entry: Entry) -> Any:
+        """Parse an indexed record."""
+        return _decode(table, json.loads(self._line(entry))["record"])
+
+    def _load_index(self):
+        """Load the saved index, indexing any records appended since it was saved."""
+        size = self.path.stat().st_size if self.path.exists() else 0
+        try:
+            with self.index_path.open("r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index["version"] != INDEX_VERSION or index["size"] > size:
+                raise ValueError("stale index")
+        except (OSError, ValueError, KeyError):
+            index = None
+
+        if index is not None:
+            self._size = index["size"]
+            self._blocks = [tuple(block) for block in index["blocks"]]
+            for repo, tables in index["tables"].items():
+                for table, entries in tables.items():
+                    self._entries[(repo, table)] = entries
+                    self._positions[(repo, table)] = {
+                        entry[0]: position
+                        for position, entry in enumerate(entries)
+                        if entry[0] is not None
+                    }
+        if self._size < size:
+            logger.info(f"Indexing {size - self._size} bytes of corpus {self.path}")
+            self._scan(size)
+            self._save_index()
+
+    def _scan(self, size: int):
+        """Index records from the end of the indexed part to the end of the file."""
+        with self.path.open("rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            position = self._size
+            while position < size:
+                if self.compressed:
+                    block, length = self._scan_block(mapped, position, size)
+                    if block is None:
+                        logger.warning(f"Ignoring incomplete last block of {self.path}")
+                        break
+                    self._index_lines(block, len(self._blocks), 0)
+                    self._blocks.append((position, length))
+                else:
+                    end = mapped.find(b"\n", position, size)
+                    if end < 0:
+                        logger.warning(f"Ignoring incomplete last line of {self.path}")
+                        break
+                    length = end + 1 - position
+                    self._index_lines(mapped[position : end + 1], -1, position)
+                position += length
+            self._size = position
+        finally:
+            mapped.close()
+
+    @staticmethod
+    def _scan_block(mapped: mmap.mmap, position: int, size: int) -> Tuple[Optional[bytes], int]:
+        """
+        Decompress the gzip member at a position.
+
+        Returns:
+            Tuple of the decompressed data, or None if the member is
+            incomplete, and the member's length in the file
+        """
+        decompressor = zlib.decompressobj(GZIP_WBITS)
+        chunks = []
+        consumed = position
+        while not decompressor.eof and consumed < size:
+            chunk = mapped[consumed : min(consumed + (1 << 16), size)]
+            chunks.append(decompressor.decompress(chunk))
+            consumed += len(chunk)
+        if not decompressor.eof:
+            return None, size - position
+        return b"".join(chunks), consumed - position - len(decompressor.unused_data)
+
+    def _index_lines(self, data: bytes, block: int, base: int):
+        """Index the complete lines of a chunk of JSONL data."""
+        start = 0
+        while start < len(data):
+            end = data.find(b"\n", start)
+            if end < 0:
+                end = len(data)
+            if end > start:
+                line = json.loads(data[start:end])
+                table = line["table"]
+                key = line["record"].get(KEY_FIELDS[table])
+                self._add_entry(line["repo"], table, key, block, base + start, base + end)
+            start = end + 1
+
+    def _save_index(self):
+        """Write the index next to the corpus, replacing the previous one atomically."""
+        tables: Dict[str, Dict[str, List[Entry]]] = {}
+        for (repo, table), entries in self._entries.items():
+            tables.setdefault(repo, {})[table] = entries
+        index = {
+            "version": INDEX_VERSION,
+            "size": self._size,
+            "blocks": self._blocks,
+            "tables": tables,
+        }
+        temporary = self.index_path.with_name(self.index_path.name + ".tmp")
+        with temporary.open("w", encoding="utf-8") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(temporary, self.index_path)
+        self._index_dirty = False
+
+
+class CorpusTable(Sequence):
+    """Lazy, read-only sequence of one table's records in a corpus.
+
+    Records are parsed from the mapped corpus each time they are accessed,
+    so changing a record does not change the corpus. Records appended to
+    the corpus later appear in the view.
+    """
+
+    def __init__(self, corpus: Corpus, repo: str, table: str):
+        """
+        Initialize the view.
+
+        Args:
+            corpus: Corpus holding the records
+            repo: Repository full name
+            table: 'commits', 'prs' or 'issues'
+        """
+        self.corpus = corpus
+        self.repo = repo
+        self.table = table
+        self._entries = corpus._entries.setdefault((repo, table), [])
+        corpus._positions.setdefault((repo, table), {})
+
+    def __len__(self) -> int:
+        """Number of records."""
+        return len(self._entries)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        """
+        Get a record, or a list of records for a slice.
+
+        Args:
+            index: Record position or slice
+
+        Returns:
+            Record, or list of records
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self.corpus._read(self.table, self._entries[index])
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the records in corpus order."""
+        for entry in list(self._entries):
+            yield self.corpus._read(self.table, entry)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a record by its PR or issue number or commit SHA.
+
+        Args:
+            key: Record key
+            default: Returned when there is no such record
+
+        Returns:
+            Record, or the default
+        """
+        try:
+            return self.corpus.get(self.repo, self.table, key)
+        except KeyError:
+            return default
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare record by record with another sequence."""
+        if not isinstance(other, (Sequence, list, tuple)) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        """Summarize the view without reading it."""
+        return f"CorpusTable({self.repo!r}, {self.table!r}, {len(self)} records)"
+
+    def __reduce__(self):
+        """Pickle as a plain list of the records."""
+        return list, (), None, iter(self)
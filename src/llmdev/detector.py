@@ -1,102 +1,466 @@
 """
-Copilot detection heuristics and pattern matching.
+AI assistant detection heuristics and pattern matching.
 """
 
-import re
+import os
+import sys
 import logging
-from typing import Dict, List, Optional, Set
-from dataclasses import dataclass
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from llmdev.accumulator import Accumulator
+from llmdev.blobs import blob_of
+from llmdev.document import Document
+from llmdev.rules import SCOPES, RuleSet, load_rules
+from llmdev.trailers import AI_ASSIST_KEYS, CO_AUTHOR_KEYS, CoAuthorIndex, Trailer, split_trailers
 
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
 class Detection:
-    """Represents a Copilot detection result."""
+    """Represents an AI assistant detection result.
+
+    Uses ``__slots__`` and interned label strings so tens of thousands of
+    detections stay small; ``metadata`` is only allocated when accessed.
+    """
+
+    __slots__ = (
+        "source_type",
+        "source_id",
+        "detection_type",
+        "confidence",
+        "evidence",
+        "_metadata",
+    )
+
+    def __init__(
+        self,
+        source_type: str,  # 'commit', 'pr', 'issue'
+        source_id: str,
+        detection_type: str,
+        confidence: float,  # 0.0 to 1.0
+        evidence: str,
+        metadata: Optional[Dict] = None,
+    ):
+        self.source_type = sys.intern(source_type)
+        self.source_id = source_id
+        self.detection_type = sys.intern(detection_type)
+        self.confidence = confidence
+        self.evidence = evidence
+        self._metadata = metadata or None
+
+    @property
+    def metadata(self) -> Dict:
+        """Extra detection details (keyword, tool, rule, author...)."""
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: Optional[Dict]):
+        self._metadata = value or None
+
+    def _key(self) -> Tuple:
+        return (
+            self.source_type,
+            self.source_id,
+            self.detection_type,
+            self.confidence,
+            self.evidence,
+            self._metadata or {},
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Detection):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __repr__(self) -> str:
+        return (
+            f"Detection(source_type={self.source_type!r}, source_id={self.source_id!r}, "
+            f"detection_type={self.detection_type!r}, confidence={self.confidence!r}, "
+            f"evidence={self.evidence!r}, metadata={self.metadata!r})"
+        )
+
+    def __getstate__(self) -> Tuple:
+        return self._key()
+
+    def __setstate__(self, state: Tuple):
+        Detection.__init__(self, *state)
+
+
+class DetectionStore:
+    """Compact, append-only storage for many detections.
+
+    Labels (source type, detection type) are kept as small integer codes,
+    confidences in a float array, and identical metadata dictionaries are
+    stored once. Detection objects are only built when iterated or indexed,
+    and summaries are computed directly from the arrays.
+    """
+
+    def __init__(self, detections: Optional[Iterable[Detection]] = None):
+        """
+        Initialize the store.
 
-    source_type: str  # 'commit', 'pr', 'issue'
-    source_id: str
-    detection_type: str
-    confidence: float  # 0.0 to 1.0
-    evidence: str
-    metadata: Dict = None
+        Args:
+            detections: Optional detections to add
+        """
+        self._labels: List[str] = []
+        self._label_codes: Dict[str, int] = {}
+        self._source_type = array("H")
+        self._detection_type = array("H")
+        self._confidence = array("d")
+        self._source_ids: List[str] = []
+        self._evidence: List[str] = []
+        self._metadata_table: List[Dict] = [{}]
+        self._metadata_codes: Dict[Tuple, int] = {(): 0}
+        self._metadata = array("I")
+
+        if detections is not None:
+            self.extend(detections)
+
+    def _label_code(self, label: str) -> int:
+        code = self._label_codes.get(label)
+        if code is None:
+            code = self._label_codes[label] = len(self._labels)
+            self._labels.append(sys.intern(label))
+        return code
+
+    def _metadata_code(self, metadata: Optional[Dict]) -> int:
+        if not metadata:
+            return 0
+        key = tuple(metadata.items())
+        try:
+            code = self._metadata_codes.get(key)
+        except TypeError:
+            # Unhashable values: store this dictionary on its own
+            self._metadata_table.append(dict(metadata))
+            return len(self._metadata_table) - 1
+        if code is None:
+            code = self._metadata_codes[key] = len(self._metadata_table)
+            self._metadata_table.append(
+                {k: sys.intern(v) if isinstance(v, str) else v for k, v in metadata.items()}
+            )
+        return code
 
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
+    def add(self, detection: Detection):
+        """
+        Add a detection.
 
+        Args:
+            detection: Detection to store
+        """
+        self._source_type.append(self._label_code(detection.source_type))
+        self._detection_type.append(self._label_code(detection.detection_type))
+        self._confidence.append(detection.confidence)
+        self._source_ids.append(sys.intern(detection.source_id))
+        self._evidence.append(detection.evidence)
+        self._metadata.append(self._metadata_code(detection._metadata))
+
+    def extend(self, detections: Iterable[Detection]):
+        """
+        Add several detections.
 
-class CopilotDetector:
-    """Detect Copilot-generated code and mentions."""
-
-    # Keywords that indicate Copilot usage
-    COPILOT_KEYWORDS = [
-        "copilot",
-        "co-pilot",
-        "github copilot",
-        "gh copilot",
-        "generated by copilot",
-        "using copilot",
-        "with copilot",
-    ]
-
-    # Bot usernames that might be Copilot-related
-    BOT_PATTERNS = [
-        r"copilot",
-        r"github-copilot",
-    ]
+        Args:
+            detections: Detections to store
+        """
+        for detection in detections:
+            self.add(detection)
+
+    def __len__(self) -> int:
+        return len(self._confidence)
+
+    def __getitem__(self, index: int) -> Detection:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return Detection(
+            self._labels[self._source_type[index]],
+            self._source_ids[index],
+            self._labels[self._detection_type[index]],
+            self._confidence[index],
+            self._evidence[index],
+            dict(self._metadata_table[self._metadata[index]]),
+        )
+
+    def __iter__(self) -> Iterator[Detection]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def _count_labels(self, codes: "array") -> Dict[str, int]:
+        """Count label codes, keeping first-appearance order."""
+        return {self._labels[code]: count for code, count in Counter(codes).items()}
+
+    def counts_by_source(self) -> Dict[str, int]:
+        """Number of detections per source type."""
+        return self._count_labels(self._source_type)
+
+    def counts_by_type(self) -> Dict[str, int]:
+        """Number of detections per detection type."""
+        return self._count_labels(self._detection_type)
+
+    def total_confidence(self) -> float:
+        """Sum of confidence across all detections."""
+        return sum(self._confidence)
+
+    def mean_confidence(self) -> float:
+        """Mean confidence across all detections."""
+        return self.total_confidence() / len(self) if len(self) else 0.0
+
+
+class DetectionSummary(Accumulator):
+    """Running detection counts and confidence."""
 
     def __init__(self):
-        """Initialize the detector."""
+        """Initialize an empty summary."""
+        self.total = 0
+        self.by_source: Dict[str, int] = {}
+        self.by_type: Dict[str, int] = {}
+        self.total_confidence = 0.0
+
+    def add(self, detection: Detection) -> "DetectionSummary":
+        """
+        Add one detection.
+
+        Args:
+            detection: Detection to count
+
+        Returns:
+            This summary
+        """
+        self.by_source[detection.source_type] = self.by_source.get(detection.source_type, 0) + 1
+        self.by_type[detection.detection_type] = self.by_type.get(detection.detection_type, 0) + 1
+        self.total_confidence += detection.confidence
+        self.total += 1
+        return self
+
+    def extend(self, detections: Iterable[Detection]) -> "DetectionSummary":
+        """
+        Add many detections; a DetectionStore is counted from its arrays.
+
+        Args:
+            detections: Detections or a DetectionStore
+
+        Returns:
+            This summary
+        """
+        if not isinstance(detections, DetectionStore):
+            return super().extend(detections)
+
+        self._merge_counts(detections.counts_by_source(), detections.counts_by_type())
+        self.total_confidence += detections.total_confidence()
+        self.total += len(detections)
+        return self
+
+    def merge(self, other: "DetectionSummary") -> "DetectionSummary":
+        """
+        Merge another partial summary.
+
+        Args:
+            other: Summary to merge
+
+        Returns:
+            This summary
+        """
+        self._merge_counts(other.by_source, other.by_type)
+        self.total_confidence += other.total_confidence
+        self.total += other.total
+        return self
+
+    def _merge_counts(self, by_source: Dict[str, int], by_type: Dict[str, int]):
+        """Add per-source and per-type counts."""
+        for source_type, count in by_source.items():
+            self.by_source[source_type] = self.by_source.get(source_type, 0) + count
+        for detection_type, count in by_type.items():
+            self.by_type[detection_type] = self.by_type.get(detection_type, 0) + count
+
+    def finalize(self) -> Dict:
+        """
+        Produce the detection summary.
+
+        Returns:
+            Dictionary with summary statistics
+        """
+        if not self.total:
+            return {"total": 0, "by_source": {}, "by_type": {}, "average_confidence": 0.0}
+
+        return {
+            "total": self.total,
+            "by_source": dict(self.by_source),
+            "by_type": dict(self.by_type),
+            "average_confidence": self.total_confidence / self.total,
+        }
+
+
+class CopilotDetector:
+    """Detect Copilot and other AI assistant usage using data-driven rules."""
+
+    # Characters of context kept on each side of a match for evidence
+    EVIDENCE_CONTEXT = 50
+
+    # Structured trailers are explicit declarations, so they outrank free-text mentions
+    TRAILER_CONFIDENCE = 0.98
+
+    # Batches smaller than this are detected in-process; pool startup would dominate
+    MIN_PARALLEL_RECORDS = 2000
+    BATCH_CHUNK_SIZE = 500
+
+    def __init__(self, rules: Optional[RuleSet] = None):
+        """
+        Initialize the detector.
+
+        Args:
+            rules: Detection rules; defaults to the built-in rule file
+        """
         self.detections: List[Detection] = []
+        self.rules = rules if rules is not None else load_rules()
+        self.co_authors = CoAuthorIndex()
 
     def detect_in_text(
-        self, text: str, source_type: str, source_id: str, case_sensitive: bool = False
+        self,
+        text: Union[str, Document],
+        source_type: str,
+        source_id: str,
+        case_sensitive: bool = False,
+        scope: Optional[str] = None,
     ) -> List[Detection]:
         """
-        Detect Copilot mentions in text.
+        Detect AI assistant mentions in text.
+
+        All rule patterns for the scope are found in a single pass over the
+        text and evidence is sliced from the match offsets. Occurrences that
+        fall inside the evidence window of a previous match are reported only
+        once. Each detection's ``keyword`` metadata is the phrase matched at
+        that occurrence, preferring the longest rule keyword (``"github
+        copilot"`` rather than ``"copilot"``), so detections from one text may
+        carry different keywords.
 
         Args:
-            text: Text to search
+            text: Text to search, or its Document to reuse the lowercased view
             source_type: Type of source ('commit', 'pr', 'issue')
             source_id: Identifier for the source
             case_sensitive: Whether to use case-sensitive matching
+            scope: Rule scope to apply; defaults to source_type when it is a
+                known scope, otherwise all text rules
 
         Returns:
             List of Detection objects
         """
+        lowered = None
+        if isinstance(text, Document):
+            if not case_sensitive:
+                lowered = text.lower
+            text = text.text
         if not text:
             return []
 
+        if scope is None and source_type in SCOPES:
+            scope = source_type
+        matcher = self.rules.matcher(scope, case_sensitive)
+
         detections = []
-        search_text = text if case_sensitive else text.lower()
-
-        for keyword in self.COPILOT_KEYWORDS:
-            search_keyword = keyword if case_sensitive else keyword.lower()
-            if search_keyword in search_text:
-                # Find the context around the keyword
-                pattern = re.compile(
-                    f".{{0,50}}{re.escape(search_keyword)}.{{0,50}}",
-                    re.IGNORECASE if not case_sensitive else 0,
+        window_end = 0
+
+        for match, rule in matcher.finditer(text, lowered):
+            start, end = match.span()
+            if start < window_end:
+                continue
+
+            evidence_start, evidence_end = self._evidence_window(text, start, end, window_end)
+            window_end = evidence_end
+
+            detections.append(
+                Detection(
+                    source_type=source_type,
+                    source_id=source_id,
+                    detection_type=rule.detection_type,
+                    confidence=rule.confidence,
+                    evidence=text[evidence_start:evidence_end].strip(),
+                    metadata={
+                        "keyword": sys.intern(match.group().lower()),
+                        "tool": rule.tool,
+                        "rule": rule.name,
+                    },
                 )
-                matches = pattern.findall(text)
-
-                for match in matches:
-                    detections.append(
-                        Detection(
-                            source_type=source_type,
-                            source_id=source_id,
-                            detection_type="explicit_mention",
-                            confidence=0.95,
-                            evidence=match.strip(),
-                            metadata={"keyword": keyword},
-                        )
-                    )
-                break  # Only count once per text
+            )
 
         return detections
 
+    def detect_in_field(
+        self,
+        record: Dict,
+        field: str,
+        source_type: str,
+        source_id: str,
+        scope: Optional[str] = None,
+    ) -> List[Detection]:
+        """
+        Detect AI assistant mentions in a text field of a record.
+
+        Texts held as blobs are searched once per distinct text: the
+        detections are cached on the blob and copied with this record's
+        source ID, so a PR template or bot comment repeated across thousands
+        of records costs a single search.
+
+        Args:
+            record: Record or dictionary holding the text
+            field: Name of the text field
+            source_type: Type of source ('commit', 'pr', 'issue')
+            source_id: Identifier for the source
+            scope: Rule scope to apply, as for detect_in_text()
+
+        Returns:
+            List of Detection objects
+        """
+        blob = blob_of(record, field)
+        if blob is None:
+            return self.detect_in_text(record.get(field, ""), source_type, source_id, scope=scope)
+
+        if scope is None and source_type in SCOPES:
+            scope = source_type
+        # The matcher identifies the rules, so edited rules are not served stale results
+        matcher = self.rules.matcher(scope, False)
+        found = blob.cached(
+            ("detect", matcher, source_type),
+            lambda: self.detect_in_text(blob.text, source_type, "", scope=scope),
+        )
+        return [
+            Detection(
+                source_type=detection.source_type,
+                source_id=source_id,
+                detection_type=detection.detection_type,
+                confidence=detection.confidence,
+                evidence=detection.evidence,
+                metadata=dict(detection.metadata),
+            )
+            for detection in found
+        ]
+
+    def _evidence_window(self, text: str, start: int, end: int, floor: int = 0) -> Tuple[int, int]:
+        """
+        Compute the evidence slice around a match, bounded by its line.
+
+        Args:
+            text: Text containing the match
+            start: Match start offset
+            end: Match end offset
+            floor: Lowest offset the window may start at
+
+        Returns:
+            Tuple of (window_start, window_end) offsets
+        """
+        line_start = text.rfind("\n", 0, start) + 1
+        line_end = text.find("\n", end)
+        if line_end == -1:
+            line_end = len(text)
+
+        window_start = max(line_start, start - self.EVIDENCE_CONTEXT, floor)
+        window_end = min(line_end, end + self.EVIDENCE_CONTEXT)
+        return window_start, window_end
+
     def detect_in_commit(self, commit_data: Dict) -> List[Detection]:
         """
         Detect Copilot usage in a commit.
@@ -109,22 +473,149 @@ class CopilotDetector:
         """
         detections = []
         commit_id = commit_data.get("sha", "unknown")
+        author = commit_data.get("author", "")
 
-        # Check commit message
-        message = commit_data.get("message", "")
-        detections.extend(self.detect_in_text(message, "commit", commit_id))
+        # Trailers are parsed structurally; the rest of the message, and any
+        # trailer that did not produce a structural detection, is free-text scanned
+        body, trailers = split_trailers(commit_data.get("message", ""))
+        trailer_detections = self.detect_in_trailers(trailers, commit_id)
+        detected = {(d.metadata["trailer"], d.metadata["value"]) for d in trailer_detections}
+        other_trailers = "\n".join(
+            f"{trailer.key}: {trailer.value}"
+            for trailer in trailers
+            if (trailer.key, trailer.value) not in detected
+        )
+
+        detections.extend(self.detect_in_text(body, "commit", commit_id))
+        detections.extend(self.detect_in_text(other_trailers, "commit", commit_id))
+        detections.extend(trailer_detections)
 
         # Check author
-        author = commit_data.get("author", "")
-        if author and self._is_bot_author(author):
+        detections.extend(self.detect_author(author, "commit", commit_id))
+
+        self.co_authors.add_commit(
+            author,
+            commit_data.get("author_email", ""),
+            trailers,
+            {d.metadata["value"]: d.metadata["tool"] for d in trailer_detections},
+        )
+
+        return detections
+
+    def detect_batch(
+        self,
+        records: Sequence[Dict],
+        source_type: str,
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+    ) -> List[Detection]:
+        """
+        Detect AI assistant usage across many records of one source type.
+
+        Large inputs are split into chunks and fanned out across a process
+        pool; results are merged in input order, so the output matches a
+        sequential run. Small inputs, or a single worker, run in-process.
+
+        Args:
+            records: Commit, PR or issue dictionaries
+            source_type: Type of the records ('commit', 'pr', 'issue')
+            workers: Number of worker processes; defaults to the CPU count
+            chunk_size: Records per task; defaults to BATCH_CHUNK_SIZE
+
+        Returns:
+            List of Detection objects in record order
+        """
+        detect = self._batch_method(source_type)
+        workers = workers or os.cpu_count() or 1
+
+        if workers <= 1 or len(records) < self.MIN_PARALLEL_RECORDS:
+            detections = []
+            for record in records:
+                detections.extend(detect(record))
+            return detections
+
+        chunk_size = chunk_size or self.BATCH_CHUNK_SIZE
+        chunks = [records[i : i + chunk_size] for i in range(0, len(records), chunk_size)]
+        logger.debug(f"Detecting {len(records)} {source_type} records in {len(chunks)} chunks")
+
+        detections = []
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_batch_worker, initargs=(self.rules,)
+        ) as pool:
+            for chunk_detections, co_authors in pool.map(
+                _detect_chunk, chunks, repeat(source_type)
+            ):
+                detections.extend(chunk_detections)
+                self.co_authors.merge(co_authors)
+
+        return detections
+
+    def detect_record(self, record: Dict, source_type: str) -> List[Detection]:
+        """
+        Detect AI assistant usage in one record of any source type.
+
+        Args:
+            record: Commit, PR or issue dictionary
+            source_type: Type of the record ('commit', 'pr', 'issue')
+
+        Returns:
+            List of Detection objects
+        """
+        return self._batch_method(source_type)(record)
+
+    def _batch_method(self, source_type: str):
+        """Get the per-record detection method for a source type."""
+        methods = {
+            "commit": self.detect_in_commit,
+            "pr": self.detect_in_pr,
+            "issue": self.detect_in_issue,
+        }
+        if source_type not in methods:
+            raise ValueError(f"Unsupported source type for batch detection: {source_type}")
+        return methods[source_type]
+
+    def detect_in_trailers(self, trailers: List[Trailer], commit_id: str) -> List[Detection]:
+        """
+        Detect AI assistance declared in commit trailers.
+
+        ``Co-authored-by`` trailers count when the identity matches an author
+        rule; ``Generated-by`` style trailers always count, with the tool taken
+        from the rules when it can be identified.
+
+        Args:
+            trailers: Trailers parsed from a commit message
+            commit_id: Commit SHA
+
+        Returns:
+            List of Detection objects, one per AI trailer
+        """
+        detections = []
+        author_matcher = self.rules.matcher("author")
+
+        for trailer in trailers:
+            key = trailer.normalized_key
+            if key in CO_AUTHOR_KEYS:
+                found = author_matcher.search(trailer.value)
+                if found is None:
+                    continue
+                detection_type = "co_author_trailer"
+            elif key in AI_ASSIST_KEYS:
+                found = author_matcher.search(trailer.value) or self.rules.matcher().search(
+                    trailer.value
+                )
+                detection_type = "generated_by_trailer"
+            else:
+                continue
+
+            tool = found[1].tool if found else "unknown"
             detections.append(
                 Detection(
                     source_type="commit",
                     source_id=commit_id,
-                    detection_type="bot_author",
-                    confidence=0.8,
-                    evidence=f"Author: {author}",
-                    metadata={"author": author},
+                    detection_type=detection_type,
+                    confidence=self.TRAILER_CONFIDENCE,
+                    evidence=f"{trailer.key}: {trailer.value}",
+                    metadata={"trailer": trailer.key, "value": trailer.value, "tool": tool},
                 )
             )
 
@@ -148,13 +639,16 @@ class CopilotDetector:
         detections.extend(self.detect_in_text(title, "pr", pr_id))
 
         # Check PR body/description
-        body = pr_data.get("body", "")
-        detections.extend(self.detect_in_text(body, "pr", pr_id))
+        detections.extend(self.detect_in_field(pr_data, "body", "pr", pr_id))
+
+        # Check author (agent bot accounts open PRs directly)
+        detections.extend(self.detect_author(pr_data.get("author", ""), "pr", pr_id))
 
         # Check comments
         for comment in pr_data.get("comments", []):
-            comment_body = comment.get("body", "")
-            detections.extend(self.detect_in_text(comment_body, "pr", pr_id))
+            detections.extend(
+                self.detect_in_field(comment, "body", "pr", pr_id, scope="comment")
+            )
 
         return detections
 
@@ -176,62 +670,77 @@ class CopilotDetector:
         detections.extend(self.detect_in_text(title, "issue", issue_id))
 
         # Check issue body/description
-        body = issue_data.get("body", "")
-        detections.extend(self.detect_in_text(body, "issue", issue_id))
+        detections.extend(self.detect_in_field(issue_data, "body", "issue", issue_id))
+
+        # Check author
+        detections.extend(self.detect_author(issue_data.get("author", ""), "issue", issue_id))
 
         # Check comments
         for comment in issue_data.get("comments", []):
-            comment_body = comment.get("body", "")
-            detections.extend(self.detect_in_text(comment_body, "issue", issue_id))
+            detections.extend(
+                self.detect_in_field(comment, "body", "issue", issue_id, scope="comment")
+            )
 
         return detections
 
-    def _is_bot_author(self, author: str) -> bool:
+    def detect_author(self, author: str, source_type: str, source_id: str) -> List[Detection]:
         """
-        Check if an author name matches bot patterns.
+        Detect AI assistant bot accounts from an author identity.
 
         Args:
-            author: Author name to check
+            author: Author name or login
+            source_type: Type of source ('commit', 'pr', 'issue')
+            source_id: Identifier for the source
 
         Returns:
-            True if the author appears to be a bot
+            List with at most one Detection
         """
-        author_lower = author.lower()
-        for pattern in self.BOT_PATTERNS:
-            if re.search(pattern, author_lower):
-                return True
-        return False
+        found = self.rules.matcher("author").search(author) if author else None
+        if found is None:
+            return []
 
-    def get_summary(self, detections: List[Detection]) -> Dict:
+        _, rule = found
+        return [
+            Detection(
+                source_type=source_type,
+                source_id=source_id,
+                detection_type=rule.detection_type,
+                confidence=rule.confidence,
+                evidence=f"Author: {author}",
+                metadata={"author": author, "tool": rule.tool, "rule": rule.name},
+            )
+        ]
+
+    def get_summary(self, detections: Union[List[Detection], DetectionStore]) -> Dict:
         """
         Generate a summary of detections.
 
         Args:
-            detections: List of Detection objects
+            detections: List of Detection objects or a DetectionStore
 
         Returns:
             Dictionary with summary statistics
         """
-        if not detections:
-            return {"total": 0, "by_source": {}, "by_type": {}, "average_confidence": 0.0}
+        return DetectionSummary().extend(detections).finalize()
 
-        by_source = {}
-        by_type = {}
-        total_confidence = 0.0
 
-        for detection in detections:
-            # Count by source type
-            by_source[detection.source_type] = by_source.get(detection.source_type, 0) + 1
+# Detector owned by each batch worker process, built once per process
+_worker_detector: Optional[CopilotDetector] = None
 
-            # Count by detection type
-            by_type[detection.detection_type] = by_type.get(detection.detection_type, 0) + 1
 
-            # Sum confidence
-            total_confidence += detection.confidence
+def _init_batch_worker(rules: RuleSet):
+    """Build the worker-local detector."""
+    global _worker_detector
+    _worker_detector = CopilotDetector(rules)
 
-        return {
-            "total": len(detections),
-            "by_source": by_source,
-            "by_type": by_type,
-            "average_confidence": total_confidence / len(detections) if detections else 0.0,
-        }
+
+def _detect_chunk(
+    records: Sequence[Dict], source_type: str
+) -> Tuple[List[Detection], CoAuthorIndex]:
+    """Detect in one chunk of records, returning detections and the chunk's co-author index."""
+    _worker_detector.co_authors = CoAuthorIndex()
+    detect = _worker_detector._batch_method(source_type)
+    detections = []
+    for record in records:
+        detections.extend(detect(record))
+    return detections, _worker_detector.co_authors
@@ -0,0 +1,209 @@
+"""
+Shared text document with cached derived views.
+
+A PR body or prompt is inspected by the detector and by several analyzers.
+Wrapping it in a Document computes each derived view (lowercased text,
+tokens, lines, code spans, markdown structure) at most once, however many
+consumers ask for it.
+"""
+
+import re
+from collections import Counter
+from typing import TYPE_CHECKING, FrozenSet, List, NamedTuple, Optional, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    from llmdev.analyzers.markdown import MarkdownDocument
+
+
+# Word tokens, matching the boundaries of the analyzers' \b...\b keyword patterns
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class CodeSpan(NamedTuple):
+    """A fenced code block or inline code span."""
+
+    start: int
+    end: int
+    fenced: bool
+
+
+class Document:
+    """A text with lazily computed, cached views."""
+
+    __slots__ = (
+        "text",
+        "_lower",
+        "_tokens",
+        "_token_set",
+        "_token_counts",
+        "_word_count",
+        "_lines",
+        "_code_spans",
+        "_markdown",
+    )
+
+    def __init__(self, text: Optional[str]):
+        """
+        Wrap a text.
+
+        Args:
+            text: Text to wrap; None is treated as empty
+        """
+        self.text = text or ""
+        self._lower: Optional[str] = None
+        self._tokens: Optional[List[str]] = None
+        self._token_set: Optional[FrozenSet[str]] = None
+        self._token_counts: Optional[Counter] = None
+        self._word_count: Optional[int] = None
+        self._lines: Optional[List[str]] = None
+        self._code_spans: Optional[List[CodeSpan]] = None
+        self._markdown: Optional["MarkdownDocument"] = None
+
+    @classmethod
+    def of(cls, text: Union[str, "Document", None]) -> "Document":
+        """
+        Get a Document for a text, reusing it if it already is one.
+
+        Args:
+            text: Plain text or Document
+
+        Returns:
+            Document instance
+        """
+        if isinstance(text, Document):
+            return text
+        return cls(text)
+
+    def __len__(self) -> int:
+        """Length of the text in characters."""
+        return len(self.text)
+
+    def __repr__(self) -> str:
+        """Short representation showing the start of the text."""
+        preview = self.text[:40] + ("..." if len(self.text) > 40 else "")
+        return f"Document({preview!r})"
+
+    @property
+    def lower(self) -> str:
+        """Lowercased text."""
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def tokens(self) -> List[str]:
+        """Lowercased word tokens in order."""
+        if self._tokens is None:
+            if self.text.isascii():
+                self._tokens = TOKEN_PATTERN.findall(self.lower)
+            else:
+                # Lowercasing can change token boundaries outside ASCII: "İ"
+                # becomes "i" plus a combining dot, which \w does not match
+                self._tokens = [token.lower() for token in TOKEN_PATTERN.findall(self.text)]
+        return self._tokens
+
+    @property
+    def token_set(self) -> FrozenSet[str]:
+        """Distinct lowercased word tokens."""
+        if self._token_set is None:
+            self._token_set = frozenset(self.tokens)
+        return self._token_set
+
+    @property
+    def token_counts(self) -> Counter:
+        """Occurrence count of each lowercased word token."""
+        if self._token_counts is None:
+            self._token_counts = Counter(self.tokens)
+        return self._token_counts
+
+    @property
+    def word_count(self) -> int:
+        """Number of whitespace-separated words."""
+        if self._word_count is None:
+            self._word_count = len(self.text.split())
+        return self._word_count
+
+    @property
+    def lines(self) -> List[str]:
+        """Lines of the text, split on newlines."""
+        if self._lines is None:
+            self._lines = self.text.split("\n")
+        return self._lines
+
+    @property
+    def code_spans(self) -> List[CodeSpan]:
+        """
+        Code spans in document order.
+
+        A run of three or more backticks opens a fenced block that ends at the
+        next identical run, or at the end of the text when unclosed. Shorter
+        runs delimit inline code when a matching run follows before the next
+        fence.
+        """
+        if self._code_spans is None:
+            self._code_spans = self._find_code_spans()
+        return self._code_spans
+
+    @property
+    def markdown(self) -> "MarkdownDocument":
+        """Markdown section structure of the text."""
+        if self._markdown is None:
+            # Imported here: the analyzers package imports this module
+            from llmdev.analyzers.markdown import MarkdownDocument
+
+            self._markdown = MarkdownDocument(self.text)
+        return self._markdown
+
+    def has_token(self, *words: str) -> bool:
+        """
+        Check whether any of the lowercase words occurs as a whole token.
+
+        Args:
+            words: Lowercase words
+
+        Returns:
+            True if at least one word is a token of the text
+        """
+        return not self.token_set.isdisjoint(words)
+
+    def count_tokens(self, *words: str) -> int:
+        """
+        Count occurrences of the lowercase words as whole tokens.
+
+        Args:
+            words: Lowercase words
+
+        Returns:
+            Total number of occurrences
+        """
+        counts = self.token_counts
+        return sum(counts[word] for word in words)
+
+    def _find_code_spans(self) -> List[CodeSpan]:
+        """Scan backtick runs once and pair them into code spans."""
+        text = self.text
+        spans = []
+        position = text.find("`")
+        while position != -1:
+            run_end = position
+            while run_end < len(text) and text[run_end] == "`":
+                run_end += 1
+            fence = text[position:run_end]
+
+            if len(fence) >= 3:
+                close = text.find(fence, run_end)
+                end = len(text) if close == -1 else close + len(fence)
+                spans.append(CodeSpan(position, end, True))
+                position = text.find("`", end)
+                continue
+
+            # Fenced blocks take precedence: an inline span cannot run past one
+            next_fence = text.find("```", run_end)
+            limit = len(text) if next_fence == -1 else next_fence
+            closing = re.compile(r"(?<!`)" + fence + r"(?!`)").search(text, run_end, limit)
+            if closing is None:
+                position = text.find("`", run_end)
+                continue
+            spans.append(CodeSpan(position, closing.end(), False))
+            position = text.find("`", closing.end())
+        return spans
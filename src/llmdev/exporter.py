@@ -0,0 +1,340 @@
+"""
+Machine-readable export of analysis results.
+
+Writes one table per entity (commits, PRs, issues, comments, detections and
+deep-analysis rows) as streaming JSONL, and as Parquet when pyarrow is
+installed. Every row carries the schema version and repository name so
+exports from many repositories can be concatenated directly.
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from llmdev.config import Config
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when a table's columns change meaning or are removed
+SCHEMA_VERSION = 1
+
+# Column names and types per table; types are used for the Parquet schema
+TABLE_SCHEMAS: Dict[str, List[Tuple[str, str]]] = {
+    "commits": [
+        ("sha", "string"),
+        ("message", "string"),
+        ("author", "string"),
+        ("author_email", "string"),
+        ("date", "timestamp"),
+        ("url", "string"),
+    ],
+    "prs": [
+        ("number", "int64"),
+        ("title", "string"),
+        ("body", "string"),
+        ("author", "string"),
+        ("state", "string"),
+        ("created_at", "timestamp"),
+        ("updated_at", "timestamp"),
+        ("merged", "bool"),
+        ("merged_at", "timestamp"),
+        ("url", "string"),
+        ("comment_count", "int64"),
+    ],
+    "issues": [
+        ("number", "int64"),
+        ("title", "string"),
+        ("body", "string"),
+        ("author", "string"),
+        ("state", "string"),
+        ("created_at", "timestamp"),
+        ("updated_at", "timestamp"),
+        ("url", "string"),
+        ("comment_count", "int64"),
+    ],
+    "comments": [
+        ("source_type", "string"),
+        ("source_number", "int64"),
+        ("type", "string"),
+        ("author", "string"),
+        ("created_at", "timestamp"),
+        ("path", "string"),
+        ("body", "string"),
+    ],
+    "detections": [
+        ("source_type", "string"),
+        ("source_id", "string"),
+        ("detection_type", "string"),
+        ("confidence", "float64"),
+        ("evidence", "string"),
+        ("tool", "string"),
+        ("metadata", "json"),
+    ],
+    "deep_analysis": [
+        ("number", "int64"),
+        ("title", "string"),
+        ("category", "string"),
+        ("complexity_score", "int64"),
+        ("iteration_count", "int64"),
+        ("time_to_merge_hours", "float64"),
+        ("pattern_type", "string"),
+        ("refinement_count", "int64"),
+        ("prompt_count", "int64"),
+        ("checklist_items", "int64"),
+        ("checklist_completed", "int64"),
+    ],
+}
+
+# Columns added to every row
+COMMON_COLUMNS = [("schema_version", "int64"), ("repository", "string")]
+
+# Rows per Parquet row group
+PARQUET_BATCH_SIZE = 10000
+
+
+def parquet_available() -> bool:
+    """Whether Parquet export is possible (pyarrow is installed)."""
+    return pa is not None
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize values json doesn't handle natively."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _parse_timestamp(value: str) -> Optional[datetime]:
+    """Parse an ISO timestamp string, or None if it is not one."""
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        logger.debug(f"Exporting unparseable timestamp {value!r} as null")
+        return None
+
+
+class ResultExporter:
+    """Exports analysis results as JSONL and Parquet tables."""
+
+    FORMATS = ("jsonl", "parquet")
+
+    def __init__(self, config: Config):
+        """
+        Initialize the exporter.
+
+        Args:
+            config: Configuration object
+        """
+        self.config = config
+
+    def export(
+        self, results: Dict[str, Any], formats: Iterable[str] = ("jsonl",)
+    ) -> Dict[str, Path]:
+        """
+        Export every table of the results.
+
+        Args:
+            results: Analysis results dictionary
+            formats: Output formats ('jsonl', 'parquet')
+
+        Returns:
+            Mapping of output file name to path, including the manifest
+        """
+        formats = list(formats)
+        unknown = [fmt for fmt in formats if fmt not in self.FORMATS]
+        if unknown:
+            raise ValueError(f"Unknown export format(s): {', '.join(unknown)}")
+        if "parquet" in formats and not parquet_available():
+            logger.warning("pyarrow is not installed; skipping Parquet export")
+            formats = [fmt for fmt in formats if fmt != "parquet"]
+
+        repo_name = results["repository"]["name"]
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        export_dir = self.config.output_dir / f"{repo_name}_export_{timestamp}"
+        export_dir.mkdir(parents=True, exist_ok=True)
+
+        written: Dict[str, Path] = {}
+        row_counts: Dict[str, int] = {}
+        for table in TABLE_SCHEMAS:
+            if "jsonl" in formats:
+                path = export_dir / f"{table}.jsonl"
+                row_counts[table] = self.write_jsonl(self.iter_rows(results, table), path)
+                written[path.name] = path
+            if "parquet" in formats:
+                path = export_dir / f"{table}.parquet"
+                row_counts[table] = self.write_parquet(self.iter_rows(results, table), table, path)
+                written[path.name] = path
+
+        manifest_path = export_dir / "manifest.json"
+        with manifest_path.open("w") as f:
+            json.dump(
+                {
+                    "schema_version": SCHEMA_VERSION,
+                    "repository": results["repository"].get("full_name"),
+                    "exported_at": datetime.now().isoformat(),
+                    "formats": formats,
+                    "tables": {
+                        table: {
+                            "columns": [name for name, _ in COMMON_COLUMNS + columns],
+                            "rows": row_counts.get(table, 0),
+                        }
+                        for table, columns in TABLE_SCHEMAS.items()
+                    },
+                },
+                f,
+                indent=2,
+            )
+        written[manifest_path.name] = manifest_path
+
+        logger.info(f"Exported {len(written)} files to {export_dir}")
+        return written
+
+    def iter_rows(self, results: Dict[str, Any], table: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the rows of one table, shaped by its schema.
+
+        Args:
+            results: Analysis results dictionary
+            table: Table name (a key of TABLE_SCHEMAS)
+
+        Yields:
+            Row dictionaries
+        """
+        common = {
+            "schema_version": SCHEMA_VERSION,
+            "repository": results["repository"].get("full_name"),
+        }
+        columns = [name for name, _ in TABLE_SCHEMAS[table]]
+        for record in self._iter_records(results, table):
+            row = dict(common)
+            row.update((name, record.get(name)) for name in columns)
+            yield row
+
+    def _iter_records(self, results: Dict[str, Any], table: str) -> Iterator[Dict[str, Any]]:
+        """Yield raw records for a table before column selection."""
+        if table == "commits":
+            yield from results.get("commits", [])
+        elif table in ("prs", "issues"):
+            for item in results.get(table, []):
+                record = dict(item)
+                record["comment_count"] = len(item.get("comments", []))
+                yield record
+        elif table == "comments":
+            for source_type, key in (("pr", "prs"), ("issue", "issues")):
+                for item in results.get(key, []):
+                    for comment in item.get("comments", []):
+                        record = dict(comment)
+                        record["source_type"] = source_type
+                        record["source_number"] = item.get("number")
+                        yield record
+        elif table == "detections":
+            for detection in results.get("detections", []):
+                yield {
+                    "source_type": detection.source_type,
+                    "source_id": detection.source_id,
+                    "detection_type": detection.detection_type,
+                    "confidence": detection.confidence,
+                    "evidence": detection.evidence,
+                    "tool": detection.metadata.get("tool"),
+                    "metadata": detection.metadata,
+                }
+        elif table == "deep_analysis":
+            for analysis in results.get("deep_analysis", {}).get("pr_analyses", []):
+                iterations = analysis.get("iterations", {})
+                checklist = analysis.get("checklist_items", [])
+                yield {
+                    "number": analysis.get("number"),
+                    "title": analysis.get("title"),
+                    "category": analysis.get("category"),
+                    "complexity_score": analysis.get("complexity_score"),
+                    "iteration_count": analysis.get("iteration_count"),
+                    "time_to_merge_hours": analysis.get("time_to_merge_hours"),
+                    "pattern_type": iterations.get("pattern_type"),
+                    "refinement_count": iterations.get("refinement_count"),
+                    "prompt_count": len(analysis.get("prompt_extraction", [])),
+                    "checklist_items": len(checklist),
+                    "checklist_completed": sum(1 for item in checklist if item.get("completed")),
+                }
+
+    def write_jsonl(self, rows: Iterable[Dict[str, Any]], path: Path) -> int:
+        """
+        Stream rows to a JSONL file.
+
+        Args:
+            rows: Row dictionaries
+            path: Output file path
+
+        Returns:
+            Number of rows written
+        """
+        count = 0
+        with path.open("w") as f:
+            for row in rows:
+                f.write(json.dumps(row, default=_json_default))
+                f.write("\n")
+                count += 1
+        return count
+
+    def write_parquet(self, rows: Iterable[Dict[str, Any]], table: str, path: Path) -> int:
+        """
+        Write rows to a Parquet file in row groups of PARQUET_BATCH_SIZE.
+
+        Timestamp strings are parsed as ISO timestamps; any that are not are
+        written as null.
+
+        Args:
+            rows: Row dictionaries
+            table: Table name, used to pick the schema
+            path: Output file path
+
+        Returns:
+            Number of rows written
+        """
+        if not parquet_available():
+            raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+        columns = COMMON_COLUMNS + TABLE_SCHEMAS[table]
+        schema = pa.schema([(name, self._arrow_type(kind)) for name, kind in columns])
+        json_columns = [name for name, kind in columns if kind == "json"]
+        timestamp_columns = [name for name, kind in columns if kind == "timestamp"]
+
+        count = 0
+        with pq.ParquetWriter(str(path), schema) as writer:
+            batch: List[Dict[str, Any]] = []
+            for row in rows:
+                for name in json_columns:
+                    row[name] = json.dumps(row[name], default=_json_default)
+                for name in timestamp_columns:
+                    if isinstance(row[name], str):
+                        row[name] = _parse_timestamp(row[name])
+                batch.append(row)
+                if len(batch) >= PARQUET_BATCH_SIZE:
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                    count += len(batch)
+                    batch = []
+            if batch or count == 0:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+        return count
+
+    @staticmethod
+    def _arrow_type(kind: str) -> Optional["pa.DataType"]:
+        """Map a schema column type to an Arrow type."""
+        return {
+            "string": pa.string(),
+            "json": pa.string(),
+            "int64": pa.int64(),
+            "float64": pa.float64(),
+            "bool": pa.bool_(),
+            "timestamp": pa.timestamp("us", tz="UTC"),
+        }[kind]
@@ -0,0 +1,635 @@
+"""
+Offline importers for GitHub data dumps.
+
+Each importer reads data fetched ahead of time with whatever tool was
+cheapest, and turns it into the same commit, PR and issue records that
+the API collectors produce. The imported data can then be stored and
+analyzed any number of times without API access. Supported sources:
+
+- ``gh-api``: output of ``gh api --paginate`` for the repository, pulls,
+  commits, issues, issue comments and pull request review comments
+  endpoints (concatenated JSON pages or JSON lines, optionally gzipped)
+- ``migration``: GitHub migration / export archives, as a ``.tar.gz`` file
+  or an extracted directory
+- ``gharchive``: GH Archive hourly event files (``.json.gz``)
+"""
+
+import re
+import gzip
+import json
+import logging
+import tarfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Optional, Sequence, Union
+
+from llmdev.records import CommitRecord, IssueRecord, PRRecord
+
+
+logger = logging.getLogger(__name__)
+
+# Characters read at a time from concatenated JSON pages
+READ_CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = re.compile(r"\s*")
+# owner/repo in a github.com or api.github.com URL
+_REPO_URL = re.compile(r"github\.com/(?:repos/)?([^/]+)/([^/#?]+)")
+
+
+def _timestamp(value: Any) -> Any:
+    """Parse an ISO 8601 timestamp as GitHub writes it; other values are kept."""
+    if not isinstance(value, str):
+        return value
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return value
+
+
+def _login(user: Any) -> str:
+    """Login of a user object (API) or profile URL (migration archives)."""
+    if isinstance(user, dict):
+        return user.get("login") or "unknown"
+    if isinstance(user, str) and user:
+        return user.rstrip("/").rsplit("/", 1)[-1]
+    return "unknown"
+
+
+def _number(url: Optional[str]) -> Optional[int]:
+    """Issue or PR number at the end of a URL such as '.../pull/42#discussion'."""
+    if not url:
+        return None
+    last = url.split("#", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+    return int(last) if last.isdigit() else None
+
+
+def _repo_from_url(url: Optional[str]) -> Optional[str]:
+    """Repository full name in a GitHub URL."""
+    found = _REPO_URL.search(url or "")
+    return f"{found.group(1)}/{found.group(2)}" if found else None
+
+
+def _open_text(path: Path) -> IO[str]:
+    """Open a possibly gzipped text file."""
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open("r", encoding="utf-8")
+
+
+def iter_json_values(path: Union[str, Path]) -> Iterator[Any]:
+    """
+    Stream the JSON values of a file holding several of them.
+
+    Handles the concatenated pages written by ``gh api --paginate``
+    (``[...][...]``) as well as JSON lines and single documents, reading
+    the file in chunks instead of all at once.
+
+    Args:
+        path: JSON file, optionally gzipped
+
+    Returns:
+        Iterator over the top-level values
+
+    Raises:
+        ValueError: If the file is not valid JSON
+    """
+    path = Path(path)
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+    with _open_text(path) as f:
+        while True:
+            position = _WHITESPACE.match(buffer, position).end()
+            if position < len(buffer):
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError as e:
+                    if eof:
+                        raise ValueError(f"Invalid JSON in {path}: {e}") from e
+                else:
+                    # A value ending with the buffer may continue in the next chunk
+                    if end < len(buffer) or eof:
+                        yield value
+                        position = end
+                        continue
+            elif eof:
+                return
+            chunk = f.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+
+def comment_record(item: Dict[str, Any], comment_type: Optional[str]) -> Dict[str, Any]:
+    """
+    Build a comment as the API collectors do.
+
+    Args:
+        item: Comment object from the API, an event or a migration archive
+        comment_type: 'issue_comment' or 'review_comment' for PR comments;
+            None for issue comments, which carry no type
+
+    Returns:
+        Comment dictionary
+    """
+    comment = {}
+    if comment_type is not None:
+        comment["type"] = comment_type
+    comment["body"] = item.get("body")
+    comment["author"] = _login(item.get("user"))
+    comment["created_at"] = _timestamp(item.get("created_at"))
+    if comment_type == "review_comment":
+        comment["path"] = item.get("path")
+    return comment
+
+
+def commit_record(item: Dict[str, Any]) -> CommitRecord:
+    """
+    Build a commit record from a commit object of the REST API.
+
+    Args:
+        item: Commit object, as listed by the commits endpoint
+
+    Returns:
+        CommitRecord
+    """
+    author = item["commit"].get("author")
+    return CommitRecord(
+        sha=item["sha"],
+        message=item["commit"].get("message"),
+        author=author.get("name") if author else "unknown",
+        author_email=author.get("email") if author else "",
+        date=_timestamp(author.get("date")) if author else None,
+        url=item.get("html_url"),
+    )
+
+
+def pr_record(item: Dict[str, Any], comments: List[Dict[str, Any]]) -> PRRecord:
+    """
+    Build a PR record from a pull request object.
+
+    Args:
+        item: Pull request object from the REST API or an event payload;
+            'merged' may be missing, as in list responses
+        comments: The PR's conversation comments, then its review comments
+
+    Returns:
+        PRRecord
+    """
+    merged_at = _timestamp(item.get("merged_at"))
+    merged = item.get("merged")
+    return PRRecord(
+        number=item["number"],
+        title=item.get("title"),
+        body=item.get("body") or "",
+        author=_login(item.get("user")),
+        state=item.get("state"),
+        created_at=_timestamp(item.get("created_at")),
+        updated_at=_timestamp(item.get("updated_at")),
+        merged=merged_at is not None if merged is None else merged,
+        merged_at=merged_at,
+        url=item.get("html_url"),
+        comments=comments,
+    )
+
+
+def issue_record(item: Dict[str, Any], comments: List[Dict[str, Any]]) -> IssueRecord:
+    """
+    Build an issue record from an issue object.
+
+    Args:
+        item: Issue object from the REST API or an event payload
+        comments: The issue's comments
+
+    Returns:
+        IssueRecord
+    """
+    return IssueRecord(
+        number=item["number"],
+        title=item.get("title"),
+        body=item.get("body") or "",
+        author=_login(item.get("user")),
+        state=item.get("state"),
+        created_at=_timestamp(item.get("created_at")),
+        updated_at=_timestamp(item.get("updated_at")),
+        url=item.get("html_url"),
+        comments=comments,
+    )
+
+
+class Importer:
+    """Base class of importers turning local data dumps into collected records.
+
+    Subclasses read their sources in prepare(), keeping what records need
+    from other files (comments, repository metadata), and then stream the
+    records from iter_commits(), iter_prs() and iter_issues().
+    """
+
+    def __init__(self, paths: Iterable[Union[str, Path]], full_name: Optional[str] = None):
+        """
+        Initialize the importer.
+
+        Args:
+            paths: Files or directories to import
+            full_name: Repository full name ('owner/repo'); taken from the
+                data when omitted, where the source allows it
+        """
+        self.paths = [Path(path) for path in paths]
+        self.full_name = full_name
+        self._metadata: Dict[str, Any] = {}
+        self._issue_comments: Dict[int, List[Dict[str, Any]]] = {}
+        self._review_comments: Dict[int, List[Dict[str, Any]]] = {}
+
+    def collect(
+        self, collection: Optional[Callable[[Iterable[Any], str], Sequence]] = None
+    ) -> Dict[str, Any]:
+        """
+        Import the data, as the collect stage would fetch it.
+
+        Args:
+            collection: Called with the records and the table name to build
+                each collection; plain lists by default
+
+        Returns:
+            Dictionary with 'repository' metadata and 'commits', 'prs' and
+            'issues' records
+
+        Raises:
+            ValueError: If the repository cannot be determined
+        """
+        collection = collection or (lambda records, table: list(records))
+        self.prepare()
+        collected = {
+            "repository": self.repository(),
+            "commits": collection(self.iter_commits(), "commits"),
+            "prs": collection(self.iter_prs(), "prs"),
+            "issues": collection(self.iter_issues(), "issues"),
+        }
+        logger.info(
+            f"Imported {len(collected['commits'])} commits, {len(collected['prs'])} PRs and "
+            f"{len(collected['issues'])} issues of {collected['repository']['full_name']}"
+        )
+        return collected
+
+    def prepare(self):
+        """Read what records need ahead of streaming them."""
+
+    def repository(self) -> Dict[str, Any]:
+        """
+        Get the repository metadata.
+
+        Returns:
+            Repository dictionary as the collectors build it
+
+        Raises:
+            ValueError: If the repository cannot be determined
+        """
+        full_name = self.full_name or self._metadata.get("full_name")
+        if not full_name or "/" not in full_name:
+            raise ValueError("Repository unknown; pass its full name ('owner/repo')")
+        owner, name = full_name.split("/", 1)
+        metadata = {
+            "owner": owner,
+            "name": name,
+            "full_name": full_name,
+            "description": None,
+            "stars": None,
+            "forks": None,
+            "created_at": None,
+            "updated_at": None,
+        }
+        metadata.update({key: value for key, value in self._metadata.items() if value is not None})
+        return metadata
+
+    def iter_commits(self) -> Iterator[CommitRecord]:
+        """Yield commit records."""
+        return iter(())
+
+    def iter_prs(self) -> Iterator[PRRecord]:
+        """Yield PR records."""
+        return iter(())
+
+    def iter_issues(self) -> Iterator[IssueRecord]:
+        """Yield issue records."""
+        return iter(())
+
+    def _pr_comments(self, number: int) -> List[Dict[str, Any]]:
+        """Comments of a PR in collector order: conversation, then review comments."""
+        return self._issue_comments.get(number, []) + self._review_comments.get(number, [])
+
+    def _issue_comments_of(self, number: int) -> List[Dict[str, Any]]:
+        """Comments of an issue, without the PR comment type."""
+        comments = []
+        for comment in self._issue_comments.get(number, []):
+            comment = dict(comment)
+            comment.pop("type", None)
+            comments.append(comment)
+        return comments
+
+    def _add_comment(self, number: Optional[int], comment: Dict[str, Any]):
+        """Keep a comment for the PR or issue it belongs to."""
+        if number is None:
+            return
+        if comment.get("type") == "review_comment":
+            self._review_comments.setdefault(number, []).append(comment)
+        else:
+            self._issue_comments.setdefault(number, []).append(comment)
+
+
+class GhApiImporter(Importer):
+    """Imports the output of ``gh api --paginate`` for a repository's endpoints.
+
+    Files may hold any mix of endpoints; each object is recognized by its
+    fields. Pull requests listed by the issues endpoint are skipped, as the
+    API collector does, since the pulls endpoint describes them fully.
+    """
+
+    def prepare(self):
+        """Read the repository metadata and all comments."""
+        for item in self._items():
+            kind = self._kind(item)
+            if kind == "repository":
+                self._metadata = {
+                    "full_name": item.get("full_name"),
+                    "description": item.get("description"),
+                    "stars": item.get("stargazers_count"),
+                    "forks": item.get("forks_count"),
+                    "created_at": _timestamp(item.get("created_at")),
+                    "updated_at": _timestamp(item.get("updated_at")),
+                }
+            elif kind == "issue_comment":
+                self._add_comment(
+                    _number(item.get("issue_url")), comment_record(item, "issue_comment")
+                )
+            elif kind == "review_comment":
+                self._add_comment(
+                    _number(item.get("pull_request_url")), comment_record(item, "review_comment")
+                )
+            elif not self._metadata.get("full_name") and kind is not None:
+                self._metadata["full_name"] = _repo_from_url(item.get("html_url"))
+
+    def iter_commits(self) -> Iterator[CommitRecord]:
+        """Yield commit records."""
+        for item in self._items():
+            if self._kind(item) == "commit":
+                yield commit_record(item)
+
+    def iter_prs(self) -> Iterator[PRRecord]:
+        """Yield PR records with their comments."""
+        for item in self._items():
+            if self._kind(item) == "pr":
+                yield pr_record(item, self._pr_comments(item["number"]))
+
+    def iter_issues(self) -> Iterator[IssueRecord]:
+        """Yield issue records with their comments."""
+        for item in self._items():
+            if self._kind(item) == "issue":
+                yield issue_record(item, self._issue_comments_of(item["number"]))
+
+    def _items(self) -> Iterator[Dict[str, Any]]:
+        """Yield the objects of all files, flattening pages."""
+        for path in self.paths:
+            files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+            for file in files:
+                for value in iter_json_values(file):
+                    if isinstance(value, list):
+                        yield from (item for item in value if isinstance(item, dict))
+                    elif isinstance(value, dict):
+                        yield value
+
+    @staticmethod
+    def _kind(item: Dict[str, Any]) -> Optional[str]:
+        """Recognize the endpoint an object comes from."""
+        if "sha" in item and "commit" in item:
+            return "commit"
+        if "stargazers_count" in item and "full_name" in item:
+            return "repository"
+        if "pull_request_url" in item and "diff_hunk" in item:
+            return "review_comment"
+        if "issue_url" in item and "number" not in item:
+            return "issue_comment"
+        if "number" in item:
+            if "head" in item or "merged_at" in item:
+                return "pr"
+            if "pull_request" not in item:
+                return "issue"
+        return None
+
+
+class MigrationArchiveImporter(Importer):
+    """Imports GitHub migration / export archives.
+
+    Archives hold one JSON array per kind and part, such as
+    ``pull_requests_000001.json``, where users, PRs and issues are referred
+    to by URL. They carry no commit metadata (the repository itself is a
+    bare git clone), so no commits are imported; import a ``gh api`` dump
+    of the commits endpoint alongside for commit detection.
+    """
+
+    def prepare(self):
+        """Read the repository metadata and all comments."""
+        for item in self._documents("repositories"):
+            full_name = _repo_from_url(item.get("url"))
+            if self.full_name and full_name != self.full_name:
+                continue
+            self._metadata = {
+                "full_name": full_name,
+                "description": item.get("description"),
+                "created_at": _timestamp(item.get("created_at")),
+            }
+        for item in self._documents("issue_comments"):
+            target = item.get("pull_request") or item.get("issue")
+            self._add_comment(_number(target), comment_record(item, "issue_comment"))
+        for item in self._documents("pull_request_review_comments"):
+            self._add_comment(
+                _number(item.get("pull_request")), comment_record(item, "review_comment")
+            )
+
+    def iter_prs(self) -> Iterator[PRRecord]:
+        """Yield PR records with their comments."""
+        for item in self._documents("pull_requests"):
+            item = self._normalized(item)
+            yield pr_record(item, self._pr_comments(item["number"]))
+
+    def iter_issues(self) -> Iterator[IssueRecord]:
+        """Yield issue records with their comments."""
+        for item in self._documents("issues"):
+            item = self._normalized(item)
+            yield issue_record(item, self._issue_comments_of(item["number"]))
+
+    @staticmethod
+    def _normalized(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the API fields an archived PR or issue lacks."""
+        item = dict(item)
+        item["number"] = _number(item.get("url"))
+        item["html_url"] = item.get("url")
+        item.setdefault("state", "closed" if item.get("closed_at") else "open")
+        item.setdefault("updated_at", item.get("closed_at") or item.get("created_at"))
+        return item
+
+    def _documents(self, kind: str) -> Iterator[Dict[str, Any]]:
+        """Yield the objects of every part of one kind, across all archives."""
+        pattern = re.compile(rf"{kind}_\d+\.json")
+        for path in self.paths:
+            if path.is_dir():
+                for file in sorted(path.rglob(f"{kind}_*.json")):
+                    if pattern.fullmatch(file.name):
+                        with file.open("r", encoding="utf-8") as f:
+                            yield from json.load(f)
+                continue
+            with tarfile.open(path, "r:*") as archive:
+                members = [
+                    member
+                    for member in archive.getmembers()
+                    if member.isfile() and pattern.fullmatch(Path(member.name).name)
+                ]
+                for member in sorted(members, key=lambda member: member.name):
+                    yield from json.load(archive.extractfile(member))
+
+
+class GHArchiveImporter(Importer):
+    """Imports one repository's activity from GH Archive event files.
+
+    Event files cover all of GitHub, so the repository must be named; lines
+    that do not mention it are skipped before being parsed. The latest
+    event for a PR or issue gives its state, and commits come from push
+    events, dated by the push.
+    """
+
+    def __init__(self, paths: Iterable[Union[str, Path]], full_name: Optional[str] = None):
+        """
+        Initialize the importer.
+
+        Args:
+            paths: Event files (JSON lines, optionally gzipped) or directories of them
+            full_name: Repository full name ('owner/repo')
+
+        Raises:
+            ValueError: If no repository is given
+        """
+        if not full_name:
+            raise ValueError("GH Archive imports need the repository full name ('owner/repo')")
+        super().__init__(paths, full_name)
+        self._commits: Dict[str, CommitRecord] = {}
+        self._prs: Dict[int, Dict[str, Any]] = {}
+        self._issues: Dict[int, Dict[str, Any]] = {}
+        self._comments: Dict[int, Dict[Any, Dict[str, Any]]] = {}
+
+    def prepare(self):
+        """Read the repository's events, keeping the latest state of each item."""
+        for event in self._events():
+            payload = event.get("payload") or {}
+            handler = getattr(self, f"_on_{event.get('type')}", None)
+            if handler is not None:
+                handler(event, payload)
+
+        for number, comments in self._comments.items():
+            for comment in comments.values():
+                self._add_comment(number, comment)
+
+    def iter_commits(self) -> Iterator[CommitRecord]:
+        """Yield commit records from push events."""
+        yield from self._commits.values()
+
+    def iter_prs(self) -> Iterator[PRRecord]:
+        """Yield PR records with their comments."""
+        for number, item in self._prs.items():
+            yield pr_record(item, self._pr_comments(number))
+
+    def iter_issues(self) -> Iterator[IssueRecord]:
+        """Yield issue records with their comments."""
+        for number, item in self._issues.items():
+            yield issue_record(item, self._issue_comments_of(number))
+
+    def _events(self) -> Iterator[Dict[str, Any]]:
+        """Yield the events of the repository, in file order."""
+        needle = f'"{self.full_name}"'.encode("utf-8")
+        for path in self.paths:
+            files = (
+                sorted(p for p in path.rglob("*.json*") if p.is_file()) if path.is_dir() else [path]
+            )
+            for file in files:
+                opener = gzip.open if file.suffix == ".gz" else open
+                with opener(file, "rb") as f:
+                    for line in f:
+                        if needle not in line:
+                            continue
+                        event = json.loads(line)
+                        if (event.get("repo") or {}).get("name") == self.full_name:
+                            yield event
+
+    def _on_PullRequestEvent(self, event: Dict[str, Any], payload: Dict[str, Any]):
+        """Keep the latest state of a PR."""
+        pr = payload.get("pull_request") or {}
+        if "number" in pr:
+            self._prs[pr["number"]] = pr
+            self._repository_from(pr)
+
+    def _on_PullRequestReviewCommentEvent(self, event: Dict[str, Any], payload: Dict[str, Any]):
+        """Keep a review comment and the PR state it was made on."""
+        self._on_PullRequestEvent(event, payload)
+        pr, comment = payload.get("pull_request") or {}, payload.get("comment") or {}
+        self._keep_comment(pr.get("number"), payload, comment_record(comment, "review_comment"))
+
+    def _on_IssuesEvent(self, event: Dict[str, Any], payload: Dict[str, Any]):
+        """Keep the latest state of an issue."""
+        issue = payload.get("issue") or {}
+        if "number" in issue and "pull_request" not in issue:
+            self._issues[issue["number"]] = issue
+
+    def _on_IssueCommentEvent(self, event: Dict[str, Any], payload: Dict[str, Any]):
+        """Keep a conversation comment, and the PR or issue it was made on if not seen yet."""
+        issue, comment = payload.get("issue") or {}, payload.get("comment") or {}
+        number = issue.get("number")
+        if number is None:
+            return
+        # PRs and issues only seen through their comments are described by the issue object
+        if "pull_request" in issue:
+            merged_at = (issue["pull_request"] or {}).get("merged_at")
+            self._prs.setdefault(number, dict(issue, merged_at=merged_at))
+        else:
+            self._issues[number] = issue
+        self._keep_comment(number, payload, comment_record(comment, "issue_comment"))
+
+    def _on_PushEvent(self, event: Dict[str, Any], payload: Dict[str, Any]):
+        """Keep the commits of a push."""
+        for commit in payload.get("commits") or ():
+            author = commit.get("author") or {}
+            self._commits[commit["sha"]] = CommitRecord(
+                sha=commit["sha"],
+                message=commit.get("message"),
+                author=author.get("name") or "unknown",
+                author_email=author.get("email") or "",
+                date=_timestamp(event.get("created_at")),
+                url=f"https://github.com/{self.full_name}/commit/{commit['sha']}",
+            )
+
+    def _keep_comment(self, number: Optional[int], payload: Dict[str, Any], comment: Dict):
+        """Keep the latest version of a comment, dropping deleted ones."""
+        if number is None:
+            return
+        comments = self._comments.setdefault(number, {})
+        comment_id = (payload.get("comment") or {}).get("id", len(comments))
+        if payload.get("action") == "deleted":
+            comments.pop(comment_id, None)
+        else:
+            comments[comment_id] = comment
+
+    def _repository_from(self, pr: Dict[str, Any]):
+        """Take repository metadata from the base repository of a PR."""
+        repo = (pr.get("base") or {}).get("repo") or {}
+        if repo.get("full_name") == self.full_name:
+            self._metadata = {
+                "description": repo.get("description"),
+                "stars": repo.get("stargazers_count"),
+                "forks": repo.get("forks_count"),
+                "created_at": _timestamp(repo.get("created_at")),
+                "updated_at": _timestamp(repo.get("updated_at")),
+            }
+
+
+# Importer for each supported source format
+IMPORTERS = {
+    "gh-api": GhApiImporter,
+    "migration": MigrationArchiveImporter,
+    "gharchive": GHArchiveImporter,
+}
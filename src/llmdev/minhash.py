@@ -0,0 +1,333 @@
+"""
+Near-duplicate detection with MinHash and locality-sensitive hashing.
+
+Each text is reduced to a fixed-size MinHash signature of its word
+shingles; the fraction of equal signature slots estimates the Jaccard
+similarity of two texts. Signatures are split into bands and hashed into
+buckets, so a new text is only compared with the texts it shares a bucket
+with instead of with every text seen so far.
+"""
+
+import random
+import zlib
+from array import array
+from itertools import islice
+from operator import eq
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from llmdev.accumulator import Accumulator
+from llmdev.document import Document
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+# Hash permutations are (a * x + b) mod a Mersenne prime; with 32-bit shingle
+# hashes and 31-bit coefficients the products stay within 64 bits
+MERSENNE_PRIME = (1 << 61) - 1
+HASH_MASK = 0xFFFFFFFF
+
+
+class MinHasher:
+    """Computes MinHash signatures of texts from their word shingles."""
+
+    # Texts hashed together by the numpy batch path
+    BATCH_SIZE = 256
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        """
+        Initialize the hasher.
+
+        Args:
+            num_perm: Number of hash permutations, i.e. signature length
+            shingle_size: Number of consecutive words per shingle
+            seed: Seed of the permutation coefficients; signatures are only
+                comparable between hashers with the same seed and num_perm
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self.coefficients = [
+            (rng.randrange(1, 1 << 31), rng.randrange(0, 1 << 31)) for _ in range(num_perm)
+        ]
+        if np is not None:
+            self._a = np.array([a for a, _ in self.coefficients], dtype=np.uint64)
+            self._b = np.array([b for _, b in self.coefficients], dtype=np.uint64)
+
+    def shingle_hashes(self, text: Union[str, Document]) -> List[int]:
+        """
+        Hash the distinct word shingles of a text.
+
+        Shingles are taken over the lowercased word tokens, so case and
+        punctuation do not affect similarity. Texts shorter than one
+        shingle hash as a single shingle.
+
+        Args:
+            text: Text or its Document
+
+        Returns:
+            32-bit shingle hashes
+        """
+        tokens = Document.of(text).tokens
+        size = self.shingle_size
+        if len(tokens) <= size:
+            return [zlib.crc32(" ".join(tokens).encode())]
+        shingles = {" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)}
+        return [zlib.crc32(shingle.encode()) for shingle in shingles]
+
+    def signature(self, text: Union[str, Document]) -> array:
+        """
+        Compute the MinHash signature of a text.
+
+        Args:
+            text: Text or its Document
+
+        Returns:
+            Array of num_perm unsigned 32-bit values
+        """
+        return self.signatures([text])[0]
+
+    def signatures(self, texts: Iterable[Union[str, Document]]) -> List[array]:
+        """
+        Compute MinHash signatures of many texts.
+
+        With numpy the permutations of a batch of texts are evaluated in one
+        vectorized step; the results are identical to the pure Python path.
+
+        Args:
+            texts: Texts or Documents
+
+        Returns:
+            Signatures in input order
+        """
+        shingle_lists = (self.shingle_hashes(text) for text in texts)
+        if np is None:
+            return [self._signature_python(hashes) for hashes in shingle_lists]
+
+        signatures = []
+        while True:
+            batch = list(islice(shingle_lists, self.BATCH_SIZE))
+            if not batch:
+                return signatures
+            signatures.extend(self._signatures_numpy(batch))
+
+    def _signature_python(self, hashes: Sequence[int]) -> array:
+        """Signature of one shingle set without numpy."""
+        return array(
+            "I",
+            (
+                min(((a * x + b) % MERSENNE_PRIME) & HASH_MASK for x in hashes)
+                for a, b in self.coefficients
+            ),
+        )
+
+    def _signatures_numpy(self, batch: Sequence[Sequence[int]]) -> List[array]:
+        """Signatures of a batch of shingle sets, evaluated together."""
+        hashes = np.fromiter((x for hashes in batch for x in hashes), dtype=np.uint64)
+        offsets = np.cumsum([0] + [len(hashes) for hashes in batch[:-1]])
+        # One row per permutation keeps each text's shingles contiguous
+        values = (self._a[:, None] * hashes + self._b[:, None]) % np.uint64(MERSENNE_PRIME)
+        values &= np.uint64(HASH_MASK)
+        minima = np.minimum.reduceat(values, offsets, axis=1).T.astype(np.uint32)
+        return [array("I", row.tobytes()) for row in minima]
+
+
+def similarity(first: Sequence[int], second: Sequence[int]) -> float:
+    """
+    Estimate the Jaccard similarity of two texts from their signatures.
+
+    Args:
+        first: MinHash signature
+        second: MinHash signature of the same length
+
+    Returns:
+        Fraction of equal signature slots
+    """
+    return sum(map(eq, first, second)) / len(first)
+
+
+class NearDuplicateIndex(Accumulator):
+    """Groups near-duplicate texts with MinHash signatures and banded LSH.
+
+    Each band of a signature is hashed into a bucket that remembers the
+    first text it received. A new text is compared only with those bucket
+    representatives and joins the group of any whose estimated similarity
+    reaches the threshold, so adding a text costs O(bands) regardless of
+    how many texts are indexed. Groups are tracked with union-find.
+    """
+
+    DEFAULT_BANDS = 16
+    DEFAULT_THRESHOLD = 0.7
+    # Largest groups reported by finalize, and members listed per group
+    MAX_GROUPS = 20
+    MAX_GROUP_MEMBERS = 50
+    SAMPLE_LENGTH = 200
+
+    def __init__(
+        self,
+        hasher: Optional[MinHasher] = None,
+        bands: int = DEFAULT_BANDS,
+        threshold: float = DEFAULT_THRESHOLD,
+    ):
+        """
+        Initialize an empty index.
+
+        Args:
+            hasher: MinHash hasher; a default one is created when omitted
+            bands: Number of LSH bands; must divide the signature length.
+                With r rows per band, texts of similarity s share a bucket
+                with probability 1 - (1 - s^r)^bands
+            threshold: Minimum estimated similarity for near-duplicates
+        """
+        self.hasher = hasher or MinHasher()
+        if self.hasher.num_perm % bands:
+            raise ValueError(
+                f"Signature length {self.hasher.num_perm} is not divisible by {bands} bands"
+            )
+        self.bands = bands
+        self.rows = self.hasher.num_perm // bands
+        self.threshold = threshold
+        self.signatures: List[array] = []
+        self.refs: List[Any] = []
+        # Text samples are kept only for texts that started a new group
+        self.samples: Dict[int, str] = {}
+        self._parent: List[int] = []
+        self._buckets: List[Dict[int, int]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        """Number of indexed texts."""
+        return len(self.signatures)
+
+    def add(self, item: Union[str, Tuple[str, Any]]) -> "NearDuplicateIndex":
+        """
+        Index one text.
+
+        Args:
+            item: Text, or a (text, reference) tuple; references identify
+                group members in the summary
+
+        Returns:
+            This index
+        """
+        return self.extend([item])
+
+    def extend(self, items: Iterable[Union[str, Tuple[str, Any]]]) -> "NearDuplicateIndex":
+        """
+        Index many texts, hashing them in batches.
+
+        Args:
+            items: Texts or (text, reference) tuples
+
+        Returns:
+            This index
+        """
+        items = [(item, None) if isinstance(item, str) else item for item in items]
+        texts = [text for text, _ in items]
+        for (text, ref), signature in zip(items, self.hasher.signatures(texts)):
+            self._insert(signature, ref, text)
+        return self
+
+    def merge(self, other: "NearDuplicateIndex") -> "NearDuplicateIndex":
+        """
+        Merge another index built with the same hasher settings.
+
+        Signatures are reused, so no text is hashed again, and the groups
+        found by the other index are preserved.
+
+        Args:
+            other: Index to merge
+
+        Returns:
+            This index
+        """
+        if (other.hasher.num_perm, other.bands) != (self.hasher.num_perm, self.bands):
+            raise ValueError("Cannot merge indexes with different signature layouts")
+
+        offset = len(self)
+        for i, (signature, ref) in enumerate(zip(other.signatures, other.refs)):
+            self._insert(signature, ref, other.samples.get(i))
+        for i in range(len(other)):
+            self._union(offset + other._find(i), offset + i)
+        return self
+
+    def _insert(self, signature: array, ref: Any, text: Optional[str]):
+        """Add a signature, joining the groups of matching bucket representatives."""
+        index = len(self.signatures)
+        self.signatures.append(signature)
+        self.refs.append(ref)
+        self._parent.append(index)
+
+        matched = False
+        rows = self.rows
+        for band, buckets in enumerate(self._buckets):
+            key = hash(tuple(signature[band * rows : (band + 1) * rows]))
+            candidate = buckets.setdefault(key, index)
+            if candidate == index or self._find(candidate) == self._find(index):
+                continue
+            if similarity(signature, self.signatures[candidate]) >= self.threshold:
+                self._union(candidate, index)
+                matched = True
+
+        if not matched and text is not None:
+            self.samples[index] = text[: self.SAMPLE_LENGTH]
+
+    def _find(self, index: int) -> int:
+        """Root of a group, with path halving."""
+        parent = self._parent
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def _union(self, first: int, second: int):
+        """Join two groups; the earlier root stays the root."""
+        first, second = self._find(first), self._find(second)
+        if first != second:
+            first, second = min(first, second), max(first, second)
+            self._parent[second] = first
+
+    def groups(self) -> List[List[int]]:
+        """
+        Get the groups of near-duplicate texts.
+
+        Returns:
+            Lists of text indexes with at least two members, largest first
+        """
+        members: Dict[int, List[int]] = {}
+        for index in range(len(self)):
+            members.setdefault(self._find(index), []).append(index)
+        return sorted(
+            (group for group in members.values() if len(group) > 1),
+            key=lambda group: (-len(group), group[0]),
+        )
+
+    def finalize(self) -> Dict[str, Any]:
+        """
+        Summarize near-duplicate groups and template reuse.
+
+        Returns:
+            Dictionary with total and duplicate counts, the template reuse
+            rate (percentage of texts in a group), the number of distinct
+            templates and the largest groups
+        """
+        total = len(self)
+        groups = self.groups()
+        duplicates = sum(len(group) for group in groups)
+
+        return {
+            "total_prompts": total,
+            "duplicate_prompts": duplicates,
+            "template_reuse_rate": duplicates / total * 100 if total else 0,
+            "distinct_templates": total - duplicates + len(groups),
+            "group_count": len(groups),
+            "groups": [
+                {
+                    "size": len(group),
+                    "sample": self.samples.get(group[0], ""),
+                    "members": [self.refs[i] for i in group[: self.MAX_GROUP_MEMBERS]],
+                }
+                for group in groups[: self.MAX_GROUPS]
+            ],
+        }
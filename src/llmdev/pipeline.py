@@ -0,0 +1,323 @@
+"""
+Staged analysis pipeline with cached stage outputs.
+
+The analysis runs as named stages: collect, normalize, detect, deep,
+aggregate and report. Each stage's output is cached on disk under a key
+hashed from its code version, its settings and the content hashes of its
+inputs. A stage therefore only re-executes when one of those changes: a
+new detection rule reruns detection and everything after it, but not
+normalization.
+
+Collection always re-executes, since GitHub data can change at any time,
+unless the run starts from a later stage. When the collected data is
+unchanged its content hash is too, and the later stages stay cached.
+"""
+
+import json
+import pickle
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from llmdev import analyzer, detector, document, exporter, github_client, reporter
+from llmdev import rules, search, store, trailers
+from llmdev.analyzer import RepositoryAnalyzer, deep_analysis_version
+from llmdev.cache import content_hash, source_version
+from llmdev.config import Config
+from llmdev.exporter import ResultExporter
+from llmdev.reporter import ReportGenerator
+
+
+logger = logging.getLogger(__name__)
+
+# Stages in execution order, with the stages whose outputs they consume
+STAGES = ("collect", "normalize", "detect", "deep", "aggregate", "report")
+DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "collect": (),
+    "normalize": ("collect",),
+    "detect": ("normalize",),
+    "deep": ("normalize",),
+    "aggregate": ("normalize", "detect", "deep"),
+    "report": ("aggregate",),
+}
+
+# Modules whose source determines each stage's code version
+STAGE_MODULES = {
+    "collect": (github_client, analyzer),
+    "normalize": (store, analyzer),
+    "detect": (detector, rules, trailers, document, analyzer),
+    "aggregate": (search, analyzer),
+    "report": (reporter, exporter),
+}
+
+
+class StageCache:
+    """Stage outputs of one repository, with the keys they were built for."""
+
+    def __init__(self, cache_dir: Path):
+        """
+        Initialize the stage cache.
+
+        Args:
+            cache_dir: Directory holding this repository's stage outputs
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def manifest(self, stage: str) -> Optional[Dict[str, str]]:
+        """
+        Get the key and output hash of a cached stage output.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            Dictionary with 'key' and 'output_hash', or None if not cached
+        """
+        path = self.cache_dir / f"{stage}.json"
+        if not path.exists() or not (self.cache_dir / f"{stage}.pkl").exists():
+            return None
+        try:
+            with path.open() as f:
+                return json.load(f)
+        except (ValueError, IOError) as e:
+            logger.warning(f"Error reading stage manifest {path}: {e}")
+            return None
+
+    def load(self, stage: str) -> Any:
+        """
+        Load a cached stage output.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            Stage output
+        """
+        with (self.cache_dir / f"{stage}.pkl").open("rb") as f:
+            return pickle.load(f)
+
+    def save(self, stage: str, key: str, output: Any) -> str:
+        """
+        Cache a stage output.
+
+        The output is written before its manifest, each through a temporary
+        file, so an interrupted run never leaves a manifest pointing at a
+        partial output. The output hash is taken over its content rather
+        than its pickle, whose bytes can differ for equal outputs.
+
+        Args:
+            stage: Stage name
+            key: Input key the output was built for
+            output: Picklable stage output
+
+        Returns:
+            Content hash of the output
+        """
+        data = pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL)
+        output_hash = content_hash(output)
+
+        for suffix, payload in (
+            (".pkl", data),
+            (".json", json.dumps({"key": key, "output_hash": output_hash}).encode()),
+        ):
+            path = self.cache_dir / f"{stage}{suffix}"
+            tmp_path = path.with_suffix(suffix + ".tmp")
+            tmp_path.write_bytes(payload)
+            tmp_path.replace(path)
+        return output_hash
+
+
+class Pipeline:
+    """Runs the analysis stages of a repository, skipping up-to-date ones."""
+
+    def __init__(self, config: Config, repository_analyzer: Optional[RepositoryAnalyzer] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            config: Configuration object
+            repository_analyzer: Analyzer implementing the stages; created
+                from the configuration when omitted
+        """
+        self.config = config
+        self.analyzer = repository_analyzer or RepositoryAnalyzer(config)
+        self._versions: Dict[str, str] = {}
+        self._outputs: Dict[str, Any] = {}
+        self._cache: Optional[StageCache] = None
+
+    def run(
+        self,
+        owner: str,
+        repo: str,
+        only: Optional[str] = None,
+        rerun_from: Optional[str] = None,
+        until: str = "report",
+        offline: bool = False,
+    ) -> Dict[str, str]:
+        """
+        Run the pipeline for a repository.
+
+        By default every stage up to ``until`` runs unless its cached output
+        is up to date. Online collection counts as up to date only when
+        ``rerun_from`` names a later stage, and a report only while its
+        files still exist.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            only: Run just this stage, on the cached outputs of earlier ones
+            rerun_from: Re-execute this stage and all later ones, even when
+                their cached outputs are up to date
+            until: Last stage to run
+            offline: Skip collection and read the analysis store instead
+
+        Returns:
+            Mapping of stage name to 'ran', 'cached' or 'skipped'
+
+        Raises:
+            ValueError: If a stage name is unknown, or an earlier stage
+                needed by ``only`` has no cached output
+        """
+        for name in (only, rerun_from, until):
+            if name is not None and name not in STAGES:
+                raise ValueError(f"Unknown stage {name!r}; stages are {', '.join(STAGES)}")
+
+        self._outputs = {}
+        self._cache = None
+        if self.config.enable_cache:
+            self._cache = StageCache(self.config.stage_cache_dir / f"{owner}__{repo}")
+
+        last = STAGES.index(only or until)
+        forced_from = STAGES.index(rerun_from) if rerun_from else len(STAGES)
+        statuses: Dict[str, str] = {}
+        hashes: Dict[str, str] = {}
+
+        for position, stage in enumerate(STAGES[: last + 1]):
+            if offline and stage == "collect":
+                statuses[stage] = "skipped"
+                continue
+
+            manifest = self._cache.manifest(stage) if self._cache else None
+            if only and stage != only:
+                # Inputs of the single stage are taken from the cache as they are
+                if stage not in DEPENDENCIES[only]:
+                    statuses[stage] = "skipped"
+                    continue
+                if manifest is None:
+                    raise ValueError(f"Stage {stage!r} has no cached output; run it first")
+                hashes[stage] = manifest["output_hash"]
+                statuses[stage] = "cached"
+                continue
+
+            upstream = [hashes.get(dependency) for dependency in DEPENDENCIES[stage]]
+            key = content_hash(
+                stage, self._version(stage), self._settings(stage, owner, repo), upstream
+            )
+
+            # GitHub data and, offline, the store's contents may change at any time
+            up_to_date = (
+                manifest is not None
+                and manifest["key"] == key
+                and position < forced_from
+                and stage != only
+                and not (stage == "collect" and rerun_from is None)
+                and not (offline and stage == "normalize")
+                and self._files_exist(stage)
+            )
+            if up_to_date:
+                hashes[stage] = manifest["output_hash"]
+                statuses[stage] = "cached"
+                logger.info(f"Stage {stage}: up to date")
+                continue
+
+            logger.info(f"Stage {stage}: running")
+            output = self._execute(stage, owner, repo, offline)
+            self._outputs[stage] = output
+            if self._cache:
+                hashes[stage] = self._cache.save(stage, key, output)
+            else:
+                hashes[stage] = content_hash(key, "uncached")
+            statuses[stage] = "ran"
+
+        return statuses
+
+    def output(self, stage: str) -> Any:
+        """
+        Get the output of a stage from the last run.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            Stage output, loaded from the cache if the stage did not run
+        """
+        if stage not in self._outputs:
+            if self._cache is None or self._cache.manifest(stage) is None:
+                raise KeyError(f"No output for stage {stage!r}")
+            self._outputs[stage] = self._cache.load(stage)
+        return self._outputs[stage]
+
+    def _files_exist(self, stage: str) -> bool:
+        """Check that the files written by a cached stage have not been removed."""
+        if stage != "report":
+            return True
+        output = self._cache.load(stage)
+        paths = [output["report"], *output["exports"].values()]
+        return all(Path(path).exists() for path in paths)
+
+    def _execute(self, stage: str, owner: str, repo: str, offline: bool) -> Any:
+        """Run one stage on the outputs of the stages it depends on."""
+        steps: Dict[str, Callable[[], Any]] = {
+            "collect": lambda: self.analyzer.collect(owner, repo),
+            "normalize": lambda: (
+                self.analyzer.load_stored(f"{owner}/{repo}")
+                if offline
+                else self.analyzer.normalize(self.output("collect"))
+            ),
+            "detect": lambda: self._detect(self.output("normalize")),
+            "deep": lambda: self.analyzer.deep(self.output("normalize")),
+            "aggregate": lambda: self.analyzer.aggregate(
+                self.output("normalize"), self.output("detect"), self.output("deep")
+            ),
+            "report": lambda: self._report(self.output("aggregate")),
+        }
+        return steps[stage]()
+
+    def _detect(self, collected: Dict[str, Any]) -> Dict[str, Any]:
+        """Detect stage with the rules as they are now, matching the stage key."""
+        self.analyzer.detector.rules = rules.load_rules(self.config.detection_rules_path)
+        return self.analyzer.detect(collected)
+
+    def _report(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Report stage: write the markdown report and structured exports."""
+        report_path = ReportGenerator(self.config).generate(results)
+        exported: Dict[str, Path] = {}
+        if self.config.export_formats:
+            exported = ResultExporter(self.config).export(results, self.config.export_formats)
+        return {"report": report_path, "exports": exported}
+
+    def _version(self, stage: str) -> str:
+        """Code version of a stage."""
+        if stage not in self._versions:
+            if stage == "deep":
+                self._versions[stage] = deep_analysis_version()
+            else:
+                self._versions[stage] = source_version(*STAGE_MODULES[stage])
+        return self._versions[stage]
+
+    def _settings(self, stage: str, owner: str, repo: str) -> List[Any]:
+        """Configuration values that affect a stage's output."""
+        config = self.config
+        if stage == "collect":
+            return [owner, repo, config.max_commits, config.max_prs, config.max_issues]
+        if stage == "normalize":
+            return [str(config.store_path)]
+        if stage == "detect":
+            rules_path = config.detection_rules_path or rules.DEFAULT_RULES_PATH
+            return [Path(rules_path).read_text(), str(config.store_path)]
+        if stage == "deep":
+            return [config.deep_analysis, config.analyze_commits_per_pr]
+        if stage == "aggregate":
+            return [str(config.search_index_path)]
+        return [str(config.output_dir), config.report_findings_limit, list(config.export_formats)]
@@ -3,7 +3,9 @@ Report generation for analysis results.
 """
 
 import logging
-from typing import Dict, Any, List
+from array import array
+from itertools import islice
+from typing import Dict, Any, Iterator, List, Optional, Sequence
 from pathlib import Path
 from datetime import datetime
 
@@ -14,9 +16,93 @@ from llmdev.detector import Detection
 logger = logging.getLogger(__name__)
 
 
+class ReportIndex:
+    """Lookup tables shared by all report sections, built once per report."""
+
+    def __init__(self, results: Dict[str, Any]):
+        """
+        Index collected records and detections.
+
+        Records are indexed by position rather than held in the index, so
+        disk-backed collections are only read for the records a report
+        actually shows.
+
+        Args:
+            results: Analysis results dictionary
+        """
+        self.records: Dict[str, Sequence[Dict[str, Any]]] = {
+            "commit": results.get("commits", []),
+            "pr": results.get("prs", []),
+            "issue": results.get("issues", []),
+        }
+        self.record_positions: Dict[str, Dict[str, int]] = {
+            "commit": {commit["sha"]: i for i, commit in enumerate(self.records["commit"])},
+            "pr": {str(pr["number"]): i for i, pr in enumerate(self.records["pr"])},
+            "issue": {str(issue["number"]): i for i, issue in enumerate(self.records["issue"])},
+        }
+
+        # Positions of each source type's detections, so sections can stream
+        # them without materializing per-source lists of Detection objects
+        self.detections: Sequence[Detection] = results.get("detections", [])
+        self.detection_positions: Dict[str, array] = {}
+        for position, detection in enumerate(self.detections):
+            positions = self.detection_positions.setdefault(detection.source_type, array("I"))
+            positions.append(position)
+
+    def record(self, source_type: str, source_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the collected record behind a detection.
+
+        Args:
+            source_type: Type of source ('commit', 'pr', 'issue')
+            source_id: Commit SHA or PR/issue number
+
+        Returns:
+            Record dictionary, or None if it was not collected
+        """
+        position = self.record_positions.get(source_type, {}).get(source_id)
+        if position is None:
+            return None
+        return self.records[source_type][position]
+
+    def iter_detections(self, source_type: str, limit: Optional[int] = None) -> Iterator[Detection]:
+        """
+        Iterate over the detections of one source type in result order.
+
+        Args:
+            source_type: Type of source ('commit', 'pr', 'issue')
+            limit: Maximum number of detections to yield, or None for all
+
+        Yields:
+            Detection objects
+        """
+        positions = self.detection_positions.get(source_type, array("I"))
+        for position in islice(positions, limit):
+            yield self.detections[position]
+
+    def count(self, source_type: str) -> int:
+        """Number of detections for a source type."""
+        return len(self.detection_positions.get(source_type, ()))
+
+
 class ReportGenerator:
     """Generates markdown reports from analysis results."""
 
+    # Detailed findings sections: (source type, heading, item title, overflow label)
+    FINDING_SECTIONS = [
+        ("commit", "Commits with Copilot Detection", "Commit", "commit"),
+        ("pr", "Pull Requests with Copilot Mentions", "PR", "PR"),
+        ("issue", "Issues with Copilot Mentions", "Issue", "issue"),
+    ]
+
+    # Deep-analysis metric distributions: (metric, table label)
+    DISTRIBUTION_LABELS = [
+        ("time_to_merge_hours", "Time to merge (hours)"),
+        ("commit_count", "Commits per PR"),
+        ("refinement_count", "Refinements per PR"),
+        ("comment_count", "Comments per PR"),
+    ]
+
     def __init__(self, config: Config):
         """
         Initialize the report generator.
@@ -44,251 +130,302 @@ class ReportGenerator:
         report_filename = f"{repo_name}_analysis_{timestamp}.md"
         report_path = self.config.output_dir / report_filename
 
-        # Generate report content
-        content = self._generate_markdown(results)
-
-        # Write report
-        report_path.write_text(content)
+        # Stream report content to disk as sections are produced
+        with report_path.open("w") as f:
+            for position, line in enumerate(self._iter_markdown(results)):
+                if position:
+                    f.write("\n")
+                f.write(line)
         logger.info(f"Report saved to {report_path}")
 
         return report_path
 
     def _generate_markdown(self, results: Dict[str, Any]) -> str:
         """Generate markdown content for the report."""
+        return "\n".join(self._iter_markdown(results))
+
+    def _iter_markdown(self, results: Dict[str, Any]) -> Iterator[str]:
+        """Yield the report's markdown lines section by section."""
         repo = results["repository"]
         analysis = results["analysis"]
         summary = results["summary"]
         detections = results["detections"]
-
-        lines = []
+        index = ReportIndex(results)
 
         # Header
-        lines.append(f"# LLM Development Analysis Report")
-        lines.append(f"")
-        lines.append(
-            f"**Repository:** [{repo['full_name']}](https://github.com/{repo['full_name']})"
-        )
-        lines.append(f"**Analysis Date:** {analysis['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append(f"")
+        yield f"# LLM Development Analysis Report"
+        yield f""
+        yield f"**Repository:** [{repo['full_name']}](https://github.com/{repo['full_name']})"
+        yield f"**Analysis Date:** {analysis['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}"
+        yield f""
 
         # Repository Overview
-        lines.append(f"## Repository Overview")
-        lines.append(f"")
+        yield f"## Repository Overview"
+        yield f""
         if repo.get("description"):
-            lines.append(f"**Description:** {repo['description']}")
-            lines.append(f"")
-        lines.append(f"- **Stars:** {repo['stars']:,}")
-        lines.append(f"- **Forks:** {repo['forks']:,}")
-        lines.append(f"- **Created:** {repo['created_at'].strftime('%Y-%m-%d')}")
-        lines.append(f"- **Last Updated:** {repo['updated_at'].strftime('%Y-%m-%d')}")
-        lines.append(f"")
+            yield f"**Description:** {repo['description']}"
+            yield f""
+        yield f"- **Stars:** {repo['stars']:,}"
+        yield f"- **Forks:** {repo['forks']:,}"
+        yield f"- **Created:** {repo['created_at'].strftime('%Y-%m-%d')}"
+        yield f"- **Last Updated:** {repo['updated_at'].strftime('%Y-%m-%d')}"
+        yield f""
 
         # Analysis Scope
-        lines.append(f"## Analysis Scope")
-        lines.append(f"")
-        lines.append(f"- **Commits Analyzed:** {analysis['commits_analyzed']}")
-        lines.append(f"- **Pull Requests Analyzed:** {analysis['prs_analyzed']}")
-        lines.append(f"- **Issues Analyzed:** {analysis['issues_analyzed']}")
-        lines.append(f"")
+        yield f"## Analysis Scope"
+        yield f""
+        yield f"- **Commits Analyzed:** {analysis['commits_analyzed']}"
+        yield f"- **Pull Requests Analyzed:** {analysis['prs_analyzed']}"
+        yield f"- **Issues Analyzed:** {analysis['issues_analyzed']}"
+        yield f""
 
         # Add deep analysis sections if available
         if "deep_analysis" in results:
-            deep_lines = self._generate_deep_analysis_sections(results["deep_analysis"])
-            lines.extend(deep_lines)
+            yield from self._generate_deep_analysis_sections(results["deep_analysis"])
 
         # Detection Summary
-        lines.append(f"## Detection Summary")
-        lines.append(f"")
-        lines.append(f"**Total Copilot Detections:** {summary['total']}")
-        lines.append(f"")
+        yield f"## Detection Summary"
+        yield f""
+        yield f"**Total Copilot Detections:** {summary['total']}"
+        yield f""
 
         if summary["total"] > 0:
-            lines.append(f"**Average Confidence:** {summary['average_confidence']:.2%}")
-            lines.append(f"")
+            yield f"**Average Confidence:** {summary['average_confidence']:.2%}"
+            yield f""
 
             # Breakdown by source
-            lines.append(f"### Detections by Source")
-            lines.append(f"")
+            yield f"### Detections by Source"
+            yield f""
             for source_type, count in summary["by_source"].items():
                 percentage = (count / summary["total"] * 100) if summary["total"] > 0 else 0
-                lines.append(f"- **{source_type.capitalize()}:** {count} ({percentage:.1f}%)")
-            lines.append(f"")
+                yield f"- **{source_type.capitalize()}:** {count} ({percentage:.1f}%)"
+            yield f""
 
             # Breakdown by detection type
-            lines.append(f"### Detections by Type")
-            lines.append(f"")
+            yield f"### Detections by Type"
+            yield f""
             for detection_type, count in summary["by_type"].items():
                 percentage = (count / summary["total"] * 100) if summary["total"] > 0 else 0
                 type_name = detection_type.replace("_", " ").title()
-                lines.append(f"- **{type_name}:** {count} ({percentage:.1f}%)")
-            lines.append(f"")
+                yield f"- **{type_name}:** {count} ({percentage:.1f}%)"
+            yield f""
         else:
-            lines.append(f"*No Copilot usage detected in the analyzed content.*")
-            lines.append(f"")
+            yield f"*No Copilot usage detected in the analyzed content.*"
+            yield f""
+
+        # AI trailers by author
+        authors = results.get("authors", {})
+        if authors.get("ai_trailer_commits", 0) > 0:
+            yield from self._generate_trailer_section(authors)
 
         # Detailed Findings
         if detections:
-            lines.append(f"## Detailed Findings")
-            lines.append(f"")
-
-            # Group detections by source type
-            detections_by_source = {}
-            for detection in detections:
-                source_type = detection.source_type
-                if source_type not in detections_by_source:
-                    detections_by_source[source_type] = []
-                detections_by_source[source_type].append(detection)
-
-            # Commits
-            if "commit" in detections_by_source:
-                lines.append(f"### Commits with Copilot Detection")
-                lines.append(f"")
-                commit_detections = detections_by_source["commit"][:10]  # Top 10
-                for detection in commit_detections:
-                    lines.append(f"- **Commit:** `{detection.source_id[:8]}`")
-                    lines.append(
-                        f"  - **Type:** {detection.detection_type.replace('_', ' ').title()}"
-                    )
-                    lines.append(f"  - **Confidence:** {detection.confidence:.0%}")
-                    lines.append(f'  - **Evidence:** "{detection.evidence}"')
-                    # Find commit URL
-                    for commit_data in results["commits"]:
-                        if commit_data["sha"] == detection.source_id:
-                            lines.append(f"  - **Link:** {commit_data['url']}")
-                            break
-                    lines.append(f"")
-
-                if len(detections_by_source["commit"]) > 10:
-                    lines.append(
-                        f"*... and {len(detections_by_source['commit']) - 10} more commit detections*"
-                    )
-                    lines.append(f"")
-
-            # Pull Requests
-            if "pr" in detections_by_source:
-                lines.append(f"### Pull Requests with Copilot Mentions")
-                lines.append(f"")
-                pr_detections = detections_by_source["pr"][:10]  # Top 10
-                for detection in pr_detections:
-                    lines.append(f"- **PR #{detection.source_id}**")
-                    lines.append(
-                        f"  - **Type:** {detection.detection_type.replace('_', ' ').title()}"
-                    )
-                    lines.append(f"  - **Confidence:** {detection.confidence:.0%}")
-                    lines.append(f'  - **Evidence:** "{detection.evidence}"')
-                    # Find PR URL
-                    for pr_data in results["prs"]:
-                        if str(pr_data["number"]) == detection.source_id:
-                            lines.append(f"  - **Link:** {pr_data['url']}")
-                            break
-                    lines.append(f"")
-
-                if len(detections_by_source["pr"]) > 10:
-                    lines.append(
-                        f"*... and {len(detections_by_source['pr']) - 10} more PR detections*"
-                    )
-                    lines.append(f"")
-
-            # Issues
-            if "issue" in detections_by_source:
-                lines.append(f"### Issues with Copilot Mentions")
-                lines.append(f"")
-                issue_detections = detections_by_source["issue"][:10]  # Top 10
-                for detection in issue_detections:
-                    lines.append(f"- **Issue #{detection.source_id}**")
-                    lines.append(
-                        f"  - **Type:** {detection.detection_type.replace('_', ' ').title()}"
-                    )
-                    lines.append(f"  - **Confidence:** {detection.confidence:.0%}")
-                    lines.append(f'  - **Evidence:** "{detection.evidence}"')
-                    # Find issue URL
-                    for issue_data in results["issues"]:
-                        if str(issue_data["number"]) == detection.source_id:
-                            lines.append(f"  - **Link:** {issue_data['url']}")
-                            break
-                    lines.append(f"")
-
-                if len(detections_by_source["issue"]) > 10:
-                    lines.append(
-                        f"*... and {len(detections_by_source['issue']) - 10} more issue detections*"
-                    )
-                    lines.append(f"")
+            yield f"## Detailed Findings"
+            yield f""
+
+            for section in self.FINDING_SECTIONS:
+                if index.count(section[0]):
+                    yield from self._generate_findings_section(index, *section)
 
         # Footer
-        lines.append(f"---")
-        lines.append(f"")
-        lines.append(f"*Report generated by llmdev v0.1.0*")
+        yield f"---"
+        yield f""
+        yield f"*Report generated by llmdev v0.1.0*"
+
+    def _generate_findings_section(
+        self, index: ReportIndex, source_type: str, heading: str, title: str, label: str
+    ) -> Iterator[str]:
+        """
+        Generate the detailed findings list for one source type.
+
+        Args:
+            index: Report lookup tables
+            source_type: Type of source ('commit', 'pr', 'issue')
+            heading: Section heading
+            title: Item title shown for each detection
+            label: Item label used in the overflow note
+
+        Yields:
+            Markdown lines
+        """
+        yield f"### {heading}"
+        yield ""
+
+        limit = self.config.report_findings_limit
+        for detection in index.iter_detections(source_type, limit):
+            if source_type == "commit":
+                yield f"- **{title}:** `{detection.source_id[:8]}`"
+            else:
+                yield f"- **{title} #{detection.source_id}**"
+            yield f"  - **Type:** {detection.detection_type.replace('_', ' ').title()}"
+            yield f"  - **Confidence:** {detection.confidence:.0%}"
+            yield f'  - **Evidence:** "{detection.evidence}"'
+            record = index.record(source_type, detection.source_id)
+            if record is not None:
+                yield f"  - **Link:** {record['url']}"
+            yield ""
+
+        remaining = index.count(source_type) - limit if limit is not None else 0
+        if remaining > 0:
+            yield f"*... and {remaining} more {label} detections*"
+            yield ""
+
+    def _generate_trailer_section(self, authors: Dict[str, Any]) -> Iterator[str]:
+        """
+        Generate the markdown section for AI commit trailers.
 
-        return "\n".join(lines)
+        Args:
+            authors: Author aggregates from the co-author index
 
-    def _generate_deep_analysis_sections(self, deep_analysis: Dict[str, Any]) -> List[str]:
+        Yields:
+            Markdown lines
+        """
+        yield "### AI Commit Trailers"
+        yield ""
+        yield (
+            f"**Commits with AI Trailers:** {authors['ai_trailer_commits']} of "
+            f"{authors['total_commits']} ({authors['ai_trailer_share']:.1%})"
+        )
+        yield ""
+
+        ai_authors = sorted(
+            (a for a in authors["authors"].values() if a["ai_trailer_commits"] > 0),
+            key=lambda a: a["ai_trailer_commits"],
+            reverse=True,
+        )[:10]
+        for author in ai_authors:
+            yield (
+                f"- **{author['name']}:** {author['ai_trailer_commits']}/{author['commits']} "
+                f"commits ({author['ai_trailer_share']:.0%})"
+            )
+        yield ""
+
+        co_authors = [c for c in authors["co_authors"].values() if c["tool"]][:10]
+        if co_authors:
+            yield "**AI Co-Authors:**"
+            yield ""
+            for co_author in co_authors:
+                yield (
+                    f"- **{co_author['name']}** ({co_author['tool']}): "
+                    f"{co_author['commits']} commits"
+                )
+            yield ""
+
+    def _generate_distribution_section(
+        self, distributions: Dict[str, Dict[str, Any]]
+    ) -> Iterator[str]:
+        """
+        Generate the per-PR metric distribution table.
+
+        Args:
+            distributions: Metric summaries from the quantile sketches
+
+        Yields:
+            Markdown lines
+        """
+        rows = [
+            (label, distributions[metric])
+            for metric, label in self.DISTRIBUTION_LABELS
+            if distributions.get(metric, {}).get("count")
+        ]
+        if not rows:
+            return
+
+        yield "### Distributions"
+        yield ""
+        yield "| Metric | p50 | p90 | p99 | Max |"
+        yield "|--------|-----|-----|-----|-----|"
+        for label, summary in rows:
+            values = " | ".join(f"{summary[key]:.1f}" for key in ("p50", "p90", "p99", "max"))
+            yield f"| {label} | {values} |"
+        yield ""
+
+    def _generate_template_section(self, templates: Dict[str, Any]) -> Iterator[str]:
+        """
+        Generate the reused prompt template section.
+
+        Args:
+            templates: Near-duplicate prompt groups and reuse rate
+
+        Yields:
+            Markdown lines
+        """
+        if not templates.get("group_count"):
+            return
+
+        yield "### Prompt Templates"
+        yield ""
+        yield f"**Template Reuse Rate:** {templates.get('template_reuse_rate', 0):.1f}%"
+        yield f"**Distinct Templates:** {templates.get('distinct_templates', 0)}"
+        yield ""
+        for group in templates.get("groups", [])[:5]:
+            sample = " ".join(group.get("sample", "").split())[:80]
+            yield f"- **{group['size']} prompts:** {sample}"
+        yield ""
+
+    def _generate_deep_analysis_sections(self, deep_analysis: Dict[str, Any]) -> Iterator[str]:
         """
         Generate markdown sections for deep analysis results.
 
         Args:
             deep_analysis: Deep analysis results
 
-        Returns:
-            List of markdown lines
+        Yields:
+            Markdown lines
         """
-        lines = []
-
         # PR Category Distribution
-        lines.append("## PR Category Distribution")
-        lines.append("")
+        yield "## PR Category Distribution"
+        yield ""
         category_dist = deep_analysis.get("category_distribution", {})
         if category_dist:
             for category, count in sorted(category_dist.items(), key=lambda x: x[1], reverse=True):
-                lines.append(f"- **{category.title()}:** {count} PRs")
-            lines.append("")
+                yield f"- **{category.title()}:** {count} PRs"
+            yield ""
 
         # Iteration Patterns
-        lines.append("## Iteration Patterns")
-        lines.append("")
+        yield "## Iteration Patterns"
+        yield ""
         iteration_summary = deep_analysis.get("iteration_summary", {})
         if iteration_summary:
-            lines.append(
-                f"**Average Commits per PR:** {iteration_summary.get('average_commits', 0):.1f}"
-            )
-            lines.append(
+            yield f"**Average Commits per PR:** {iteration_summary.get('average_commits', 0):.1f}"
+            yield (
                 f"**Average Refinements per PR:** {iteration_summary.get('average_refinements', 0):.1f}"
             )
-            lines.append("")
+            yield ""
 
             pattern_dist = iteration_summary.get("pattern_distribution", {})
             if pattern_dist:
-                lines.append("### Pattern Distribution")
-                lines.append("")
+                yield "### Pattern Distribution"
+                yield ""
                 for pattern, count in sorted(
                     pattern_dist.items(), key=lambda x: x[1], reverse=True
                 ):
                     pattern_name = pattern.replace("_", " ").title()
-                    lines.append(f"- **{pattern_name}:** {count} PRs")
-                lines.append("")
+                    yield f"- **{pattern_name}:** {count} PRs"
+                yield ""
+
+        yield from self._generate_distribution_section(deep_analysis.get("distributions", {}))
 
         # Prompt Analysis
-        lines.append("## Prompt Analysis")
-        lines.append("")
+        yield "## Prompt Analysis"
+        yield ""
         prompt_patterns = deep_analysis.get("prompt_patterns", {})
         if prompt_patterns and prompt_patterns.get("total_prompts", 0) > 0:
-            lines.append(f"**Total Prompts Analyzed:** {prompt_patterns['total_prompts']}")
-            lines.append(
+            yield f"**Total Prompts Analyzed:** {prompt_patterns['total_prompts']}"
+            yield (
                 f"**Average Specificity Score:** {prompt_patterns.get('average_specificity', 0):.2f}"
             )
-            lines.append("")
-            lines.append("### Prompt Characteristics")
-            lines.append("")
-            lines.append(f"- **With Context:** {prompt_patterns.get('context_percentage', 0):.1f}%")
-            lines.append(
-                f"- **With Constraints:** {prompt_patterns.get('constraints_percentage', 0):.1f}%"
-            )
-            lines.append(
-                f"- **With Examples:** {prompt_patterns.get('examples_percentage', 0):.1f}%"
-            )
-            lines.append("")
+            yield ""
+            yield "### Prompt Characteristics"
+            yield ""
+            yield f"- **With Context:** {prompt_patterns.get('context_percentage', 0):.1f}%"
+            yield f"- **With Constraints:** {prompt_patterns.get('constraints_percentage', 0):.1f}%"
+            yield f"- **With Examples:** {prompt_patterns.get('examples_percentage', 0):.1f}%"
+            yield ""
+            yield from self._generate_template_section(deep_analysis.get("prompt_templates", {}))
         else:
-            lines.append("*No structured prompts found in PR descriptions.*")
-            lines.append("")
+            yield "*No structured prompts found in PR descriptions.*"
+            yield ""
 
         # Top Complex PRs
         pr_analyses = deep_analysis.get("pr_analyses", [])
@@ -301,31 +438,31 @@ class ReportGenerator:
             )[:5]
 
             if complex_prs:
-                lines.append("## Most Complex PRs")
-                lines.append("")
+                yield "## Most Complex PRs"
+                yield ""
                 for pr in complex_prs:
-                    lines.append(f"### PR #{pr.get('number')}: {pr.get('title', 'N/A')}")
-                    lines.append("")
-                    lines.append(f"- **Category:** {pr.get('category', 'unknown').title()}")
-                    lines.append(f"- **Complexity Score:** {pr.get('complexity_score', 0)}")
-                    lines.append(f"- **Iterations:** {pr.get('iteration_count', 0)} commits")
+                    yield f"### PR #{pr.get('number')}: {pr.get('title', 'N/A')}"
+                    yield ""
+                    yield f"- **Category:** {pr.get('category', 'unknown').title()}"
+                    yield f"- **Complexity Score:** {pr.get('complexity_score', 0)}"
+                    yield f"- **Iterations:** {pr.get('iteration_count', 0)} commits"
                     if pr.get("time_to_merge_hours", 0) > 0:
                         hours = pr["time_to_merge_hours"]
                         if hours > 24:
-                            lines.append(f"- **Time to Merge:** {hours/24:.1f} days")
+                            yield f"- **Time to Merge:** {hours/24:.1f} days"
                         else:
-                            lines.append(f"- **Time to Merge:** {hours:.1f} hours")
+                            yield f"- **Time to Merge:** {hours:.1f} hours"
 
                     indicators = pr.get("complexity_indicators", [])
                     if indicators:
-                        lines.append(f"- **Complexity Indicators:** {', '.join(indicators)}")
+                        yield f"- **Complexity Indicators:** {', '.join(indicators)}"
 
                     # Show problem/solution if available
                     problem = pr.get("problem_statement")
                     if problem:
-                        lines.append(f"- **Problem:** {problem[:200]}...")
+                        yield f"- **Problem:** {problem[:200]}..."
 
-                    lines.append("")
+                    yield ""
 
             # Quick wins
             quick_wins = [
@@ -335,12 +472,10 @@ class ReportGenerator:
             ][:5]
 
             if quick_wins:
-                lines.append("## Quick Wins (1-2 commits)")
-                lines.append("")
+                yield "## Quick Wins (1-2 commits)"
+                yield ""
                 for pr in quick_wins:
-                    lines.append(
+                    yield (
                         f"- **PR #{pr.get('number')}:** {pr.get('title', 'N/A')} ({pr.get('category', 'unknown')})"
                     )
-                lines.append("")
-
-        return lines
+                yield ""
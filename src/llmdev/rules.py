@@ -0,0 +1,256 @@
+"""
+Data-driven detection rules for AI coding assistants.
+
+Rules are loaded from a JSON file and compiled into a single matcher per
+scope, so scan time stays flat as rules are added.
+"""
+
+import re
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+
+logger = logging.getLogger(__name__)
+
+# Built-in rule file shipped with the package
+DEFAULT_RULES_PATH = Path(__file__).parent / "data" / "detection_rules.json"
+
+# Where a rule applies: commit messages, PR and issue text, comments, author identities
+SCOPES = ("commit", "pr", "issue", "comment", "author")
+
+# Escapes, named groups, flags and comments: letters in them are not literal text
+NON_LITERAL_PATTERN = re.compile(
+    r"\\N\{[^}]*\}|\\.|\(\?(?:P<\w+>|P=\w+\)|[aiLmsux-]+[:)]|#[^)]*\))"
+)
+
+
+def has_uppercase_literal(pattern: str) -> bool:
+    """
+    Check whether a regex pattern matches uppercase letters literally.
+
+    Escapes such as ``\\S`` and group names do not count.
+
+    Args:
+        pattern: Regex pattern
+
+    Returns:
+        True if the pattern contains an uppercase literal letter
+    """
+    return any(char.isupper() for char in NON_LITERAL_PATTERN.sub("", pattern))
+
+
+@dataclass
+class DetectionRule:
+    """A single detection rule for one AI assistant."""
+
+    name: str
+    tool: str
+    patterns: List[str]
+    scope: List[str] = field(default_factory=lambda: ["commit", "pr", "issue", "comment"])
+    confidence: float = 0.9
+    detection_type: str = "explicit_mention"
+
+    def __post_init__(self):
+        """Validate scope, confidence and patterns."""
+        unknown = [scope for scope in self.scope if scope not in SCOPES]
+        if unknown:
+            raise ValueError(f"Rule '{self.name}' has unknown scope(s): {', '.join(unknown)}")
+        if not 0.0 <= self.confidence <= 1.0:
+            raise ValueError(f"Rule '{self.name}' confidence must be between 0.0 and 1.0")
+        if not self.patterns:
+            raise ValueError(f"Rule '{self.name}' has no patterns")
+        for pattern in self.patterns:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Rule '{self.name}' has invalid pattern {pattern!r}: {e}")
+
+
+class RuleMatcher:
+    """All rules of one scope compiled into a single alternation."""
+
+    def __init__(self, rules: List[DetectionRule], case_sensitive: bool = False):
+        """
+        Compile rules into one pattern.
+
+        The combined pattern has no capturing groups so the regex engine can
+        use its literal-prefix fast path; the rule behind a match is resolved
+        afterwards by re-matching only at the match offset. Case-insensitive
+        matching runs against lowercased text, which is much faster than
+        ``re.IGNORECASE``. A pattern with uppercase literals could never
+        match lowercased text, so when any rule has one, as a user rule file
+        may, the matcher uses ``re.IGNORECASE`` instead.
+
+        Args:
+            rules: Rules to compile
+            case_sensitive: Whether matching is case-sensitive
+        """
+        self.rules = rules
+        self.case_sensitive = case_sensitive
+
+        # Longer patterns first so the most specific one wins at a position
+        self._branches = [
+            "|".join(f"(?:{p})" for p in sorted(rule.patterns, key=len, reverse=True))
+            for rule in rules
+        ]
+        combined = "|".join(self._branches)
+        self.pattern = re.compile(combined, re.MULTILINE) if combined else None
+        self._rule_patterns = self._compile_branches(re.MULTILINE)
+
+        self._scan_lowered = not any(
+            has_uppercase_literal(pattern) for rule in rules for pattern in rule.patterns
+        )
+
+        # Used when lowercasing changes the text length (some non-ASCII
+        # characters), since offsets must line up with the original text,
+        # and for patterns with uppercase literals
+        self._ignorecase_pattern = None
+        self._ignorecase_rule_patterns: List["re.Pattern"] = []
+        if combined and not case_sensitive:
+            self._ignorecase_pattern = re.compile(combined, re.MULTILINE | re.IGNORECASE)
+            self._ignorecase_rule_patterns = self._compile_branches(re.MULTILINE | re.IGNORECASE)
+
+    def _compile_branches(self, flags: int) -> List["re.Pattern"]:
+        """Compile each rule's alternation on its own."""
+        return [re.compile(branch, flags) for branch in self._branches]
+
+    def _scan(
+        self, text: str, lowered: Optional[str] = None
+    ) -> Tuple[str, "re.Pattern", List["re.Pattern"]]:
+        """Choose the text view and patterns to scan with."""
+        if self.case_sensitive:
+            return text, self.pattern, self._rule_patterns
+        if not self._scan_lowered:
+            return text, self._ignorecase_pattern, self._ignorecase_rule_patterns
+        if lowered is None:
+            lowered = text.lower()
+        if len(lowered) == len(text):
+            return lowered, self.pattern, self._rule_patterns
+        return text, self._ignorecase_pattern, self._ignorecase_rule_patterns
+
+    def _resolve(self, text: str, start: int, rule_patterns: List["re.Pattern"]) -> DetectionRule:
+        """Find the rule whose alternation branch matched at an offset."""
+        for rule, pattern in zip(self.rules, rule_patterns):
+            if pattern.match(text, start):
+                return rule
+        raise AssertionError(f"No rule matches at offset {start}")
+
+    def finditer(
+        self, text: str, lowered: Optional[str] = None
+    ) -> Iterator[Tuple["re.Match", DetectionRule]]:
+        """
+        Find all rule matches in one pass over the text.
+
+        Match offsets refer to the original text; the matched string may be
+        the lowercased form.
+
+        Args:
+            text: Text to scan
+            lowered: Already lowercased text, to avoid lowercasing it again
+
+        Yields:
+            Tuples of (match, rule)
+        """
+        if self.pattern is None or not text:
+            return
+        view, pattern, rule_patterns = self._scan(text, lowered)
+        for match in pattern.finditer(view):
+            yield match, self._resolve(view, match.start(), rule_patterns)
+
+    def search(
+        self, text: str, lowered: Optional[str] = None
+    ) -> Optional[Tuple["re.Match", DetectionRule]]:
+        """
+        Find the first rule match in the text.
+
+        Args:
+            text: Text to scan
+            lowered: Already lowercased text, to avoid lowercasing it again
+
+        Returns:
+            Tuple of (match, rule), or None if nothing matches
+        """
+        if self.pattern is None or not text:
+            return None
+        view, pattern, rule_patterns = self._scan(text, lowered)
+        match = pattern.search(view)
+        if match is None:
+            return None
+        return match, self._resolve(view, match.start(), rule_patterns)
+
+
+class RuleSet:
+    """A collection of detection rules with compiled per-scope matchers."""
+
+    def __init__(self, rules: List[DetectionRule], version: int = 1):
+        """
+        Initialize the rule set.
+
+        Args:
+            rules: Detection rules
+            version: Version of the rule file format
+        """
+        self.rules = rules
+        self.version = version
+        self._matchers: Dict[Tuple[Optional[str], bool], RuleMatcher] = {}
+
+    def matcher(self, scope: Optional[str] = None, case_sensitive: bool = False) -> RuleMatcher:
+        """
+        Get the compiled matcher for a scope, compiling it on first use.
+
+        Args:
+            scope: Scope name, or None for every text (non-author) scope
+            case_sensitive: Whether matching is case-sensitive
+
+        Returns:
+            RuleMatcher for the scope
+        """
+        key = (scope, case_sensitive)
+        if key not in self._matchers:
+            if scope is None:
+                rules = [rule for rule in self.rules if set(rule.scope) - {"author"}]
+            else:
+                rules = [rule for rule in self.rules if scope in rule.scope]
+            self._matchers[key] = RuleMatcher(rules, case_sensitive)
+        return self._matchers[key]
+
+    @property
+    def tools(self) -> List[str]:
+        """Names of all tools covered by the rules, in file order."""
+        return list(dict.fromkeys(rule.tool for rule in self.rules))
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RuleSet":
+        """
+        Build a rule set from parsed rule file data.
+
+        Args:
+            data: Dictionary with 'version' and 'rules' keys
+
+        Returns:
+            RuleSet instance
+        """
+        rules = [DetectionRule(**rule) for rule in data.get("rules", [])]
+        return cls(rules, version=data.get("version", 1))
+
+
+def load_rules(path: Optional[Union[str, Path]] = None) -> RuleSet:
+    """
+    Load detection rules from a JSON file.
+
+    Args:
+        path: Rule file path; defaults to the built-in rules
+
+    Returns:
+        RuleSet with the loaded rules
+    """
+    path = Path(path) if path else DEFAULT_RULES_PATH
+    with path.open("r") as f:
+        data = json.load(f)
+
+    rule_set = RuleSet.from_dict(data)
+    logger.debug(f"Loaded {len(rule_set.rules)} detection rules from {path}")
+    return rule_set
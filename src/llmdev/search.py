@@ -0,0 +1,336 @@
+"""
+Full-text search over collected commits, PRs, issues and comments.
+
+Collected texts are stored in an SQLite database with an FTS5 index and
+ranked with BM25, so past analyses of many repositories can be searched
+locally without calling the GitHub API again.
+"""
+
+import re
+import sqlite3
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+
+logger = logging.getLogger(__name__)
+
+# Source types stored in the index
+SOURCE_TYPES = ("commit", "pr", "issue", "pr_comment", "issue_comment")
+
+# BM25 column weights: a match in the title counts more than one in the body
+TITLE_WEIGHT = 5.0
+BODY_WEIGHT = 1.0
+
+# Columns of the FTS5 index, usable as column filters in queries
+INDEXED_COLUMNS = ("title", "body")
+
+# Queries containing these are passed to FTS5 as query syntax; a colon only
+# counts as a column filter after the name of an indexed column
+FTS_SYNTAX_PATTERN = re.compile(
+    r'["*()^]|\b(?:AND|OR|NOT|NEAR)\b|\b(?:' + "|".join(INDEXED_COLUMNS) + r")\s*:"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    repo TEXT NOT NULL,
+    source_type TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    author TEXT,
+    created_at TEXT,
+    url TEXT,
+    title TEXT,
+    body TEXT,
+    UNIQUE (repo, source_type, source_id)
+);
+CREATE INDEX IF NOT EXISTS documents_source_type ON documents (source_type);
+CREATE INDEX IF NOT EXISTS documents_author ON documents (author);
+CREATE INDEX IF NOT EXISTS documents_created_at ON documents (created_at);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, body, content='documents', content_rowid='id', tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, title, body)
+    VALUES ('delete', old.id, old.title, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, title, body)
+    VALUES ('delete', old.id, old.title, old.body);
+    INSERT INTO documents_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+"""
+
+
+class SearchHit(NamedTuple):
+    """A ranked search result."""
+
+    repo: str
+    source_type: str
+    source_id: str
+    author: Optional[str]
+    created_at: Optional[str]
+    url: Optional[str]
+    title: Optional[str]
+    snippet: str
+    score: float
+
+
+def _timestamp(value: Any) -> Optional[str]:
+    """Normalize a datetime or ISO string to a sortable UTC ISO string."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return value
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat(timespec="seconds")
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def match_expression(query: str) -> str:
+    """
+    Turn a user query into an FTS5 match expression.
+
+    Queries using FTS5 syntax (quotes, prefix stars, ``title:`` or
+    ``body:`` column filters, AND/OR/NOT/NEAR) are passed through
+    unchanged. Otherwise every term is quoted, so punctuation such as
+    hyphens or a colon after a word cannot cause syntax errors, and all
+    terms must match.
+
+    Args:
+        query: Search query
+
+    Returns:
+        FTS5 match expression
+    """
+    if FTS_SYNTAX_PATTERN.search(query):
+        return query
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+class SearchIndex:
+    """SQLite FTS5 index of collected texts across repositories."""
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Open or create the search index.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.db_path))
+        self.connection.executescript(SCHEMA)
+        logger.debug(f"Opened search index at {self.db_path}")
+
+    def __enter__(self) -> "SearchIndex":
+        """Use the index as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the database on exit."""
+        self.close()
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def __len__(self) -> int:
+        """Number of indexed documents."""
+        return self.connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def index_results(self, results: Dict[str, Any]) -> int:
+        """
+        Index the commits, PRs, issues and comments of an analysis.
+
+        Documents already indexed for the repository are deleted first, so
+        an analysis can be indexed again after new data is collected and
+        texts that are no longer part of it stop matching.
+
+        Args:
+            results: Analysis results dictionary
+
+        Returns:
+            Number of documents indexed
+        """
+        repo = results["repository"].get("full_name")
+        with self.connection:
+            self.connection.execute("DELETE FROM documents WHERE repo = ?", (repo,))
+            count = self._write_documents(self._iter_documents(repo, results))
+        logger.info(f"Indexed {count} documents from {repo} for search")
+        return count
+
+    def add_documents(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert or replace documents in one transaction.
+
+        Args:
+            documents: Dictionaries with repo, source_type and source_id and
+                optionally author, created_at, url, title and body
+
+        Returns:
+            Number of documents written
+        """
+        with self.connection:
+            return self._write_documents(documents)
+
+    def _write_documents(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace documents in the current transaction."""
+        rows = (
+            (
+                doc["repo"],
+                doc["source_type"],
+                str(doc["source_id"]),
+                doc.get("author"),
+                _timestamp(doc.get("created_at")),
+                doc.get("url"),
+                doc.get("title") or "",
+                doc.get("body") or "",
+            )
+            for doc in documents
+        )
+        cursor = self.connection.executemany(
+            """
+            INSERT INTO documents
+                (repo, source_type, source_id, author, created_at, url, title, body)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (repo, source_type, source_id) DO UPDATE SET
+                author = excluded.author,
+                created_at = excluded.created_at,
+                url = excluded.url,
+                title = excluded.title,
+                body = excluded.body
+            """,
+            rows,
+        )
+        return cursor.rowcount
+
+    def search(
+        self,
+        query: str,
+        repo: Optional[str] = None,
+        source_type: Optional[str] = None,
+        author: Optional[str] = None,
+        since: Optional[Union[date, datetime]] = None,
+        until: Optional[Union[date, datetime]] = None,
+        limit: int = 20,
+    ) -> List[SearchHit]:
+        """
+        Search indexed texts, best matches first.
+
+        Args:
+            query: Search terms or an FTS5 query
+            repo: Only search this repository ('owner/repo')
+            source_type: Only search this source type (see SOURCE_TYPES)
+            author: Only search texts by this author
+            since: Only search texts created at or after this time
+            until: Only search texts created at or before this time; a date
+                includes the whole day
+            limit: Maximum number of results
+
+        Returns:
+            Ranked search hits
+
+        Raises:
+            ValueError: If the query is not valid FTS5 syntax
+        """
+        conditions = ["documents_fts MATCH ?"]
+        params: List[Any] = [match_expression(query)]
+        for column, value in (("repo", repo), ("source_type", source_type), ("author", author)):
+            if value is not None:
+                conditions.append(f"d.{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("d.created_at >= ?")
+            params.append(_timestamp(since))
+        if until is not None:
+            if not isinstance(until, datetime):
+                # Compare against the start of the next day to include all of it
+                conditions.append("d.created_at < ?")
+                params.append(_timestamp(datetime.combine(until + timedelta(days=1), time())))
+            else:
+                conditions.append("d.created_at <= ?")
+                params.append(_timestamp(until))
+        params.append(limit)
+
+        sql = f"""
+            SELECT d.repo, d.source_type, d.source_id, d.author, d.created_at, d.url, d.title,
+                   snippet(documents_fts, 1, '[', ']', '...', 12),
+                   bm25(documents_fts, {TITLE_WEIGHT}, {BODY_WEIGHT}) AS score
+            FROM documents_fts
+            JOIN documents d ON d.id = documents_fts.rowid
+            WHERE {' AND '.join(conditions)}
+            ORDER BY score
+            LIMIT ?
+        """
+        try:
+            rows = self.connection.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query {query!r}: {e}") from e
+        return [SearchHit(*row) for row in rows]
+
+    def repositories(self) -> Dict[str, int]:
+        """
+        Get the indexed repositories.
+
+        Returns:
+            Mapping of repository name to number of documents
+        """
+        return dict(
+            self.connection.execute(
+                "SELECT repo, COUNT(*) FROM documents GROUP BY repo ORDER BY repo"
+            ).fetchall()
+        )
+
+    def _iter_documents(self, repo: str, results: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield searchable documents from analysis results."""
+        for commit in results.get("commits", []):
+            message = commit.get("message") or ""
+            yield {
+                "repo": repo,
+                "source_type": "commit",
+                "source_id": commit.get("sha"),
+                "author": commit.get("author"),
+                "created_at": commit.get("date"),
+                "url": commit.get("url"),
+                "title": message.split("\n", 1)[0],
+                "body": message,
+            }
+
+        for source_type, key in (("pr", "prs"), ("issue", "issues")):
+            for item in results.get(key, []):
+                number = item.get("number")
+                yield {
+                    "repo": repo,
+                    "source_type": source_type,
+                    "source_id": number,
+                    "author": item.get("author"),
+                    "created_at": item.get("created_at"),
+                    "url": item.get("url"),
+                    "title": item.get("title"),
+                    "body": item.get("body"),
+                }
+                for position, comment in enumerate(item.get("comments", [])):
+                    yield {
+                        "repo": repo,
+                        "source_type": f"{source_type}_comment",
+                        "source_id": f"{number}#{position}",
+                        "author": comment.get("author"),
+                        "created_at": comment.get("created_at"),
+                        "url": item.get("url"),
+                        "body": comment.get("body"),
+                    }
@@ -0,0 +1,191 @@
+"""
+Streaming quantile sketches.
+
+A KLL sketch summarizes a stream of numbers in bounded memory and answers
+quantile queries (median, p90, p99) with a small rank error. Sketches are
+mergeable, so per-shard or per-repository sketches combine into one
+distribution without revisiting the data.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+from llmdev.accumulator import Accumulator
+
+
+# Quantiles reported by KLLSketch.finalize, keyed by their report label
+REPORTED_QUANTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))
+
+
+class KLLSketch(Accumulator):
+    """KLL quantile sketch (Karnin, Lang and Liberty, 2016).
+
+    Values enter the bottom compactor. When the sketch is full, the lowest
+    full compactor is sorted and every other value is promoted one level up
+    with twice the weight. Capacities shrink geometrically towards the lower
+    levels, so memory stays O(k log(n/k)). Results are exact until the first
+    compaction. Compaction alternates between odd and even offsets instead
+    of flipping a coin, so results are reproducible.
+    """
+
+    DEFAULT_K = 200
+    CAPACITY_DECAY = 2.0 / 3.0
+
+    def __init__(self, k: int = DEFAULT_K):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            k: Accuracy parameter; rank error is roughly 1.7 / k
+        """
+        if k < 8:
+            raise ValueError("KLL sketch k must be at least 8")
+        self.k = k
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.compactors: List[List[float]] = []
+        self._offsets: List[int] = []
+        self._size = 0
+        self._max_size = 0
+        self._grow()
+
+    def __len__(self) -> int:
+        """Number of values added to the sketch."""
+        return self.count
+
+    def _capacity(self, level: int) -> int:
+        """Capacity of a compactor level; the top level holds k values."""
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * self.CAPACITY_DECAY**depth)))
+
+    def _grow(self):
+        """Add a compactor level on top."""
+        self.compactors.append([])
+        self._offsets.append(0)
+        self._max_size = sum(self._capacity(level) for level in range(len(self.compactors)))
+
+    def add(self, value: float) -> "KLLSketch":
+        """
+        Add a value.
+
+        Args:
+            value: Number to add
+
+        Returns:
+            This sketch
+        """
+        value = float(value)
+        self.compactors[0].append(value)
+        self._size += 1
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """
+        Merge another sketch into this one.
+
+        Args:
+            other: Sketch to merge
+
+        Returns:
+            This sketch
+        """
+        if not other.count:
+            return self
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self._size += other._size
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _compress(self):
+        """Compact full levels until the sketch fits its capacity."""
+        while self._size >= self._max_size:
+            for level, items in enumerate(self.compactors):
+                if len(items) < self._capacity(level):
+                    continue
+                if level + 1 == len(self.compactors):
+                    self._grow()
+
+                items.sort()
+                # An odd value out stays behind at its current weight
+                keep = items[-1:] if len(items) % 2 else []
+                pairs = items[: len(items) - len(keep)]
+                offset = self._offsets[level]
+                self._offsets[level] ^= 1
+
+                self.compactors[level + 1].extend(pairs[offset::2])
+                self.compactors[level] = keep
+                self._size -= len(pairs) // 2
+                break
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile between 0.0 and 1.0
+
+        Returns:
+            Estimated value at the quantile, or None if the sketch is empty
+        """
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Sequence[float]) -> List[Optional[float]]:
+        """
+        Estimate several quantiles with one pass over the sketch.
+
+        Args:
+            qs: Quantiles between 0.0 and 1.0
+
+        Returns:
+            Estimated values, in the order of qs
+        """
+        if not self.count:
+            return [None] * len(qs)
+
+        weighted = sorted(
+            (value, 1 << level) for level, items in enumerate(self.compactors) for value in items
+        )
+        results: List[Optional[float]] = []
+        for q in qs:
+            if not 0.0 <= q <= 1.0:
+                raise ValueError(f"Quantile must be between 0.0 and 1.0, got {q}")
+            if q == 0.0:
+                results.append(self.min)
+                continue
+            target = q * self.count
+            cumulative = 0
+            estimate = self.max
+            for value, weight in weighted:
+                cumulative += weight
+                if cumulative >= target:
+                    estimate = value
+                    break
+            results.append(estimate)
+        return results
+
+    def finalize(self) -> Dict[str, Any]:
+        """
+        Summarize the distribution.
+
+        Returns:
+            Dictionary with count, min, max and the reported quantiles
+        """
+        labels = [label for label, _ in REPORTED_QUANTILES]
+        values = self.quantiles([q for _, q in REPORTED_QUANTILES])
+        summary: Dict[str, Any] = {"count": self.count, "min": self.min, "max": self.max}
+        summary.update(zip(labels, values))
+        return summary
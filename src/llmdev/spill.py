@@ -0,0 +1,292 @@
+"""
+Disk-backed record collections for analyses that exceed a memory ceiling.
+
+Collections of records start in memory and are charged against a shared
+memory budget. When the budget is exceeded, the largest resident
+collections are written to on-disk segments. A spilled collection still
+behaves as a read-only sequence, loading one segment at a time, and new
+records collect in a small in-memory tail that is flushed whenever it
+fills a segment.
+"""
+
+import sys
+import pickle
+import shutil
+import logging
+import tempfile
+import weakref
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from llmdev.blobs import Blob
+from llmdev.records import Record
+
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory used by a record.
+
+    Containers are followed recursively; shared objects are counted each
+    time they are reached, which overestimates rather than underestimates.
+
+    Args:
+        value: Record, typically a dictionary of strings and timestamps
+
+    Returns:
+        Approximate size in bytes
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, Record):
+        # Field names are shared by all records of a type
+        for item in value.raw_values():
+            size += estimate_size(item)
+    elif isinstance(value, Blob):
+        # Texts that are not loaded yet cost nothing until they are read
+        if value.loaded:
+            size += sys.getsizeof(value.text)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            size += estimate_size(key) + estimate_size(item)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item)
+    return size
+
+
+class MemoryBudget:
+    """Memory ceiling shared by the record collections of an analysis."""
+
+    def __init__(self, limit_bytes: int, spill_dir: Union[str, Path]):
+        """
+        Initialize the budget.
+
+        Args:
+            limit_bytes: Memory the resident records of all collections may use
+            spill_dir: Directory for the segments of spilled collections
+        """
+        self.limit_bytes = limit_bytes
+        self.spill_dir = Path(spill_dir)
+        self._collections: List[weakref.ref] = []
+
+    @property
+    def collections(self) -> List["SpillList"]:
+        """Collections governed by this budget that are still alive."""
+        alive = [collection for collection in (ref() for ref in self._collections) if collection]
+        if len(alive) < len(self._collections):
+            self._collections = [weakref.ref(collection) for collection in alive]
+        return alive
+
+    @property
+    def used_bytes(self) -> int:
+        """Estimated memory used by the resident records of live collections."""
+        return sum(collection.resident_bytes for collection in self.collections)
+
+    def collection(self, records: Iterable[Any] = (), name: str = "records") -> "SpillList":
+        """
+        Create a collection governed by this budget.
+
+        Args:
+            records: Initial records
+            name: Name used for the collection's segment directory
+
+        Returns:
+            New collection holding the records
+        """
+        collection = SpillList(self, name)
+        self._collections.append(weakref.ref(collection))
+        collection.extend(records)
+        return collection
+
+    def enforce(self):
+        """Spill the largest collections until resident records fit the budget."""
+        used = self.used_bytes
+        while used > self.limit_bytes:
+            spillable = [c for c in self.collections if c.spillable]
+            if not spillable:
+                return
+            largest = max(spillable, key=lambda collection: collection.resident_bytes)
+            used -= largest.spill()
+
+
+class SpillList(Sequence):
+    """Append-only sequence of records that can move its records to disk.
+
+    Spilled records are stored in pickled segments of SEGMENT_SIZE records,
+    so record ``i`` lives in segment ``i // SEGMENT_SIZE``. The most
+    recently read segment is kept loaded, which makes sequential access by
+    index as cheap as iteration. Records read back from disk are copies, so
+    changing them does not change the collection.
+    """
+
+    SEGMENT_SIZE = 256
+    # Records appended between two checks of the memory budget
+    CHECK_INTERVAL = 64
+
+    def __init__(self, budget: Optional[MemoryBudget] = None, name: str = "records"):
+        """
+        Initialize an empty collection.
+
+        Args:
+            budget: Memory budget deciding when to spill; without one the
+                records stay in memory unless spill() is called
+            name: Name used for the segment directory
+        """
+        self.budget = budget
+        self.name = name
+        self._segments: List[Path] = []
+        self._tail: List[Any] = []
+        self._tail_sizes: List[int] = []
+        self._resident_bytes = 0
+        self._spilled = False
+        self._directory: Optional[Path] = None
+        self._loaded: Tuple[int, List[Any]] = (-1, [])
+        self._unchecked = 0
+
+    @property
+    def resident_bytes(self) -> int:
+        """Estimated memory used by the records kept in memory."""
+        return self._resident_bytes
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the collection writes its records to disk."""
+        return self._spilled
+
+    @property
+    def spillable(self) -> bool:
+        """Whether spilling would move at least one segment to disk."""
+        return len(self._tail) >= self.SEGMENT_SIZE
+
+    def __len__(self) -> int:
+        """Number of records."""
+        return len(self._segments) * self.SEGMENT_SIZE + len(self._tail)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        """
+        Get a record, or a list of records for a slice.
+
+        Args:
+            index: Record position or slice
+
+        Returns:
+            Record, or list of records
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("SpillList index out of range")
+
+        segment, offset = divmod(index, self.SEGMENT_SIZE)
+        if segment >= len(self._segments):
+            return self._tail[index - len(self._segments) * self.SEGMENT_SIZE]
+        if self._loaded[0] != segment:
+            self._loaded = (segment, self._read(segment))
+        return self._loaded[1][offset]
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the records, reading one segment at a time."""
+        for segment in range(len(self._segments)):
+            if self._loaded[0] == segment:
+                yield from self._loaded[1]
+            else:
+                yield from self._read(segment)
+        yield from list(self._tail)
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare record by record with another sequence."""
+        if not isinstance(other, (SpillList, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        """Summarize the collection without loading it."""
+        return (
+            f"SpillList({self.name!r}, {len(self)} records, "
+            f"{len(self._segments)} segments on disk)"
+        )
+
+    def __reduce__(self):
+        """Pickle as a plain list, streaming the records instead of copying them."""
+        return list, (), None, iter(self)
+
+    def append(self, record: Any):
+        """
+        Add a record at the end.
+
+        Args:
+            record: Record to add
+        """
+        size = estimate_size(record) if self.budget else 0
+        self._tail.append(record)
+        self._tail_sizes.append(size)
+        self._resident_bytes += size
+        if self._spilled and len(self._tail) >= self.SEGMENT_SIZE:
+            self._flush()
+
+        self._unchecked += 1
+        if self.budget is not None and self._unchecked >= self.CHECK_INTERVAL:
+            self._unchecked = 0
+            self.budget.enforce()
+
+    def extend(self, records: Iterable[Any]):
+        """
+        Add records at the end.
+
+        Args:
+            records: Records to add
+        """
+        for record in records:
+            self.append(record)
+        if self.budget is not None:
+            self._unchecked = 0
+            self.budget.enforce()
+
+    def spill(self) -> int:
+        """
+        Move the resident records to disk, and any later ones as they arrive.
+
+        Records that do not fill a whole segment stay in memory until
+        enough follow.
+
+        Returns:
+            Estimated bytes released
+        """
+        before = self.resident_bytes
+        if not self._spilled:
+            self._spilled = True
+            logger.info(f"Memory limit reached; spilling {self.name} to disk")
+        self._flush()
+        return before - self.resident_bytes
+
+    def _flush(self):
+        """Write full segments from the in-memory tail."""
+        size = self.SEGMENT_SIZE
+        if len(self._tail) < size:
+            return
+        if self._directory is None:
+            root = self.budget.spill_dir if self.budget else Path(tempfile.gettempdir())
+            root.mkdir(parents=True, exist_ok=True)
+            self._directory = Path(tempfile.mkdtemp(prefix=f"{self.name}-", dir=root))
+            weakref.finalize(self, shutil.rmtree, str(self._directory), True)
+
+        full = len(self._tail) // size * size
+        for start in range(0, full, size):
+            path = self._directory / f"{len(self._segments):06d}.pkl"
+            with path.open("wb") as f:
+                pickle.dump(self._tail[start : start + size], f, protocol=pickle.HIGHEST_PROTOCOL)
+            self._segments.append(path)
+        self._resident_bytes -= sum(self._tail_sizes[:full])
+        del self._tail[:full]
+        del self._tail_sizes[:full]
+
+    def _read(self, segment: int) -> List[Any]:
+        """Load the records of a segment."""
+        with self._segments[segment].open("rb") as f:
+            return pickle.load(f)
@@ -0,0 +1,461 @@
+"""
+Local SQLite store of collected repository data and detections.
+
+Collection writes repositories, commits, PRs, issues and comments here, and
+detection writes its results. Later stages read from the store, so
+detection with new rules, deep analysis and reporting can run offline,
+without fetching from GitHub again.
+
+Long PR, issue and comment bodies are stored once in a blobs table, keyed
+by the digest of their text, and loaded lazily when records read from the
+store access them.
+"""
+
+import json
+import sqlite3
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from typing import Union
+
+from llmdev.blobs import MIN_BLOB_LENGTH, DIGEST_PATTERN, Blob, blob_handle, blob_source
+from llmdev.blobs import text_digest
+from llmdev.detector import Detection, DetectionStore
+from llmdev.records import RECORD_TYPES, Record
+
+
+logger = logging.getLogger(__name__)
+
+# Columns per table after the repository column, with their value kinds;
+# record dictionaries use the same keys as the collectors produce. Blob
+# columns hold the digest of a text in the blobs table, or short texts inline
+TABLE_COLUMNS: Dict[str, List[Tuple[str, str]]] = {
+    "repositories": [
+        ("owner", "text"),
+        ("name", "text"),
+        ("description", "text"),
+        ("stars", "integer"),
+        ("forks", "integer"),
+        ("created_at", "timestamp"),
+        ("updated_at", "timestamp"),
+        ("collected_at", "timestamp"),
+    ],
+    "commits": [
+        ("sha", "text"),
+        ("message", "text"),
+        ("author", "text"),
+        ("author_email", "text"),
+        ("date", "timestamp"),
+        ("url", "text"),
+    ],
+    "prs": [
+        ("number", "integer"),
+        ("title", "text"),
+        ("body", "blob"),
+        ("author", "text"),
+        ("state", "text"),
+        ("created_at", "timestamp"),
+        ("updated_at", "timestamp"),
+        ("merged", "bool"),
+        ("merged_at", "timestamp"),
+        ("url", "text"),
+    ],
+    "issues": [
+        ("number", "integer"),
+        ("title", "text"),
+        ("body", "blob"),
+        ("author", "text"),
+        ("state", "text"),
+        ("created_at", "timestamp"),
+        ("updated_at", "timestamp"),
+        ("url", "text"),
+    ],
+    "comments": [
+        ("source_type", "text"),
+        ("source_number", "integer"),
+        ("position", "integer"),
+        ("type", "text"),
+        ("author", "text"),
+        ("created_at", "timestamp"),
+        ("path", "text"),
+        ("body", "blob"),
+    ],
+    "detections": [
+        ("source_type", "text"),
+        ("source_id", "text"),
+        ("detection_type", "text"),
+        ("confidence", "real"),
+        ("evidence", "text"),
+        ("metadata", "json"),
+    ],
+}
+
+SQL_TYPES = {
+    "text": "TEXT",
+    "blob": "TEXT",
+    "timestamp": "TEXT",
+    "json": "TEXT",
+    "integer": "INTEGER",
+    "bool": "INTEGER",
+    "real": "REAL",
+}
+
+# Natural keys within a repository; rows with the same key are replaced
+PRIMARY_KEYS = {
+    "repositories": (),
+    "commits": ("sha",),
+    "prs": ("number",),
+    "issues": ("number",),
+    "comments": ("source_type", "source_number", "position"),
+}
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS commits_author ON commits (author)",
+    "CREATE INDEX IF NOT EXISTS commits_date ON commits (repo, date)",
+    "CREATE INDEX IF NOT EXISTS prs_author ON prs (author)",
+    "CREATE INDEX IF NOT EXISTS prs_created_at ON prs (repo, created_at)",
+    "CREATE INDEX IF NOT EXISTS issues_author ON issues (author)",
+    "CREATE INDEX IF NOT EXISTS issues_created_at ON issues (repo, created_at)",
+    "CREATE INDEX IF NOT EXISTS detections_source ON detections (repo, source_type, source_id)",
+    "CREATE INDEX IF NOT EXISTS detections_type ON detections (detection_type)",
+]
+
+# Collected tables and the source type of their comments
+ITEM_TABLES = (("prs", "pr"), ("issues", "issue"))
+
+# Records written per batch, bounding the blobs held for one insert
+INSERT_BATCH_SIZE = 1000
+
+
+def _to_sql(value: Any, kind: str) -> Any:
+    """Convert a record value for storage."""
+    if value is None:
+        return None
+    if kind == "timestamp":
+        return value.isoformat() if isinstance(value, datetime) else str(value)
+    if kind == "json":
+        return json.dumps(value, default=str)
+    if kind == "bool":
+        return int(bool(value))
+    return value
+
+
+def _from_sql(value: Any, kind: str) -> Any:
+    """Convert a stored value back to its record form."""
+    if value is None:
+        return None
+    if kind == "timestamp":
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return value
+    if kind == "json":
+        return json.loads(value)
+    if kind == "bool":
+        return bool(value)
+    return value
+
+
+class AnalysisStore:
+    """Normalized SQLite store of repositories, their activity and detections."""
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Open or create the store.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.db_path))
+        self.blob_source = blob_source(self.db_path)
+        self._create_schema()
+        logger.debug(f"Opened analysis store at {self.db_path}")
+
+    def __enter__(self) -> "AnalysisStore":
+        """Use the store as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the database on exit."""
+        self.close()
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def _create_schema(self):
+        """Create tables and indexes that do not exist yet."""
+        with self.connection:
+            for table, columns in TABLE_COLUMNS.items():
+                definitions = ["repo TEXT NOT NULL"]
+                definitions += [f"{name} {SQL_TYPES[kind]}" for name, kind in columns]
+                if table in PRIMARY_KEYS:
+                    key = ", ".join(("repo",) + PRIMARY_KEYS[table])
+                    definitions.append(f"PRIMARY KEY ({key})")
+                self.connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(definitions)})"
+                )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, text TEXT NOT NULL)"
+            )
+            for statement in INDEXES:
+                self.connection.execute(statement)
+
+    def repositories(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the stored repositories.
+
+        Returns:
+            Mapping of repository full name to repository metadata
+        """
+        return {
+            record["full_name"]: record
+            for record in self._select("repositories", "1 = 1", (), full_name_column=True)
+        }
+
+    def save_collection(self, collected: Dict[str, Any]) -> str:
+        """
+        Store collected repository data.
+
+        Records with the same key as stored ones (commit SHA, PR or issue
+        number) replace them; the comments of a stored PR or issue are
+        replaced with the new ones. Other stored records are kept, so the
+        store accumulates data across collections.
+
+        Args:
+            collected: Dictionary with 'repository' metadata and lists of
+                'commits', 'prs' and 'issues' as built by the collectors
+
+        Returns:
+            Full name of the repository
+        """
+        repository = dict(collected["repository"])
+        repo = repository["full_name"]
+        repository.setdefault("collected_at", datetime.now())
+
+        with self.connection:
+            self._insert("repositories", repo, [repository])
+            self._insert("commits", repo, collected.get("commits", []))
+            for table, source_type in ITEM_TABLES:
+                items = collected.get(table, [])
+                self._insert(table, repo, items)
+                self.connection.executemany(
+                    "DELETE FROM comments WHERE repo = ? AND source_type = ? AND source_number = ?",
+                    ((repo, source_type, item.get("number")) for item in items),
+                )
+                self._insert("comments", repo, self._iter_comments(source_type, items))
+            self._delete_orphan_blobs()
+
+        logger.info(
+            f"Stored {len(collected.get('commits', []))} commits, "
+            f"{len(collected.get('prs', []))} PRs and {len(collected.get('issues', []))} "
+            f"issues for {repo}"
+        )
+        return repo
+
+    def load_collection(
+        self,
+        repo: str,
+        collection: Optional[Callable[[Iterable[Dict[str, Any]], str], Sequence]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Load the stored data of a repository.
+
+        Records are streamed from the database into the collections, so
+        with disk-backed collections the whole repository never has to be
+        in memory at once.
+
+        Args:
+            repo: Repository full name ('owner/repo')
+            collection: Called with the records and the table name to build
+                each collection; plain lists by default
+
+        Returns:
+            Dictionary with 'repository' and the 'commits', 'prs' and
+            'issues' records, each PR and issue carrying its 'comments', in
+            collection order
+
+        Raises:
+            KeyError: If the repository is not in the store
+        """
+        repositories = list(self._select("repositories", "repo = ?", (repo,), True))
+        if not repositories:
+            raise KeyError(f"Repository {repo} is not in the analysis store")
+
+        collection = collection or (lambda records, table: list(records))
+        loaded = {
+            "repository": repositories[0],
+            "commits": collection(self._iter_records(repo, "commits"), "commits"),
+        }
+        for table, source_type in ITEM_TABLES:
+            loaded[table] = collection(self._iter_with_comments(repo, table, source_type), table)
+        return loaded
+
+    def save_detections(self, repo: str, detections: Iterable[Detection]) -> int:
+        """
+        Replace the stored detections of a repository.
+
+        Args:
+            repo: Repository full name
+            detections: Detections from the latest detection run
+
+        Returns:
+            Number of detections stored
+        """
+        records = (
+            {
+                "source_type": detection.source_type,
+                "source_id": detection.source_id,
+                "detection_type": detection.detection_type,
+                "confidence": detection.confidence,
+                "evidence": detection.evidence,
+                "metadata": detection.metadata,
+            }
+            for detection in detections
+        )
+        with self.connection:
+            self.connection.execute("DELETE FROM detections WHERE repo = ?", (repo,))
+            count = self._insert("detections", repo, records)
+        return count
+
+    def load_detections(self, repo: str) -> DetectionStore:
+        """
+        Load the stored detections of a repository.
+
+        Args:
+            repo: Repository full name
+
+        Returns:
+            Detections in the order they were stored
+        """
+        return DetectionStore(
+            Detection(**record) for record in self._select("detections", "repo = ?", (repo,))
+        )
+
+    def _insert(self, table: str, repo: str, records: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace records of a table, storing their long texts as blobs."""
+        columns = TABLE_COLUMNS[table]
+        names = ", ".join(["repo"] + [name for name, _ in columns])
+        placeholders = ", ".join("?" * (len(columns) + 1))
+        statement = f"INSERT OR REPLACE INTO {table} ({names}) VALUES ({placeholders})"
+
+        count = 0
+        rows: List[List[Any]] = []
+        blobs: Dict[str, str] = {}
+        for record in records:
+            row = [repo]
+            for name, kind in columns:
+                if kind == "blob":
+                    row.append(self._blob_value(record, name, blobs))
+                else:
+                    row.append(_to_sql(record.get(name), kind))
+            rows.append(row)
+            if len(rows) >= INSERT_BATCH_SIZE:
+                count += self._write_rows(statement, rows, blobs)
+        if rows:
+            count += self._write_rows(statement, rows, blobs)
+        return count
+
+    def _write_rows(self, statement: str, rows: List[List[Any]], blobs: Dict[str, str]) -> int:
+        """Write a batch of rows and the blobs they refer to, then clear both."""
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO blobs (digest, text) VALUES (?, ?)", blobs.items()
+        )
+        count = self.connection.executemany(statement, rows).rowcount
+        rows.clear()
+        blobs.clear()
+        return count
+
+    def _blob_value(self, record: Dict[str, Any], name: str, blobs: Dict[str, str]) -> Any:
+        """Get the stored form of a text field, collecting the blob to write."""
+        blob = record.blob(name) if isinstance(record, Record) else record.get(name)
+        if isinstance(blob, Blob):
+            # Blobs read from this store are already in it, and need not be loaded
+            if blob.loaded or blob.source is not self.blob_source:
+                blobs[blob.digest] = blob.text
+            return blob.digest
+        text = record.get(name)
+        if isinstance(text, str) and len(text) >= MIN_BLOB_LENGTH:
+            digest = text_digest(text)
+            blobs[digest] = text
+            return digest
+        return text
+
+    def _delete_orphan_blobs(self):
+        """Delete blobs that no stored record refers to any more."""
+        referenced = " UNION ".join(
+            f"SELECT {name} FROM {table} WHERE {name} IS NOT NULL"
+            for table, columns in TABLE_COLUMNS.items()
+            for name, kind in columns
+            if kind == "blob"
+        )
+        self.connection.execute(f"DELETE FROM blobs WHERE digest NOT IN ({referenced})")
+
+    def _select(
+        self,
+        table: str,
+        where: str,
+        params: Tuple,
+        full_name_column: bool = False,
+        order: str = "rowid",
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield records of a table matching a condition."""
+        columns = TABLE_COLUMNS[table]
+        names = ", ".join(["repo"] + [name for name, _ in columns])
+        cursor = self.connection.execute(
+            f"SELECT {names} FROM {table} WHERE {where} ORDER BY {order}", params
+        )
+        for row in cursor:
+            record = {
+                name: self._from_blob(value) if kind == "blob" else _from_sql(value, kind)
+                for (name, kind), value in zip(columns, row[1:])
+            }
+            if full_name_column:
+                record["full_name"] = row[0]
+            yield record
+
+    def _from_blob(self, value: Optional[str]) -> Any:
+        """Turn a stored digest into a lazily loaded blob; inline texts stay as they are."""
+        if value is not None and DIGEST_PATTERN.fullmatch(value):
+            return blob_handle(value, self.blob_source)
+        return value
+
+    def _iter_records(self, repo: str, table: str) -> Iterator[Record]:
+        """Yield the stored rows of a table as records."""
+        record_type = RECORD_TYPES[table]
+        for row in self._select(table, "repo = ?", (repo,)):
+            yield record_type.from_dict(row)
+
+    def _iter_with_comments(self, repo: str, table: str, source_type: str) -> Iterator[Record]:
+        """Yield stored PRs or issues as records, each with its comments attached."""
+        for item in self._select(table, "repo = ?", (repo,)):
+            comments = []
+            for comment in self._select(
+                "comments",
+                "repo = ? AND source_type = ? AND source_number = ?",
+                (repo, source_type, item["number"]),
+                order="position",
+            ):
+                for key in ("source_type", "source_number", "position"):
+                    comment.pop(key)
+                comments.append(comment)
+            item["comments"] = comments
+            yield RECORD_TYPES[table].from_dict(item)
+
+    @staticmethod
+    def _iter_comments(source_type: str, items: Iterable[Dict[str, Any]]) -> Iterator[Dict]:
+        """Yield comment records of PRs or issues with their position."""
+        for item in items:
+            for position, comment in enumerate(item.get("comments", [])):
+                # Copy stored values, so blobs are passed on without loading them
+                if isinstance(comment, Record):
+                    record = dict(zip(comment, comment.raw_values()))
+                else:
+                    record = dict(comment)
+                record["source_type"] = source_type
+                record["source_number"] = item.get("number")
+                record["position"] = position
+                yield record
@@ -0,0 +1,239 @@
+"""
+Pipelined execution of stages connected by bounded queues.
+
+Each stage runs in its own thread and hands its outputs to the next stage
+through a queue of limited size. Work on early items overlaps with
+producing later ones, for example analyzing the first PRs while later PRs
+are still being fetched. A full queue blocks its producer, so the number of
+items in flight, and therefore memory use, stays bounded.
+"""
+
+import queue
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's output, and a wait ended by a failed stage
+_DONE = object()
+_STOPPED = object()
+
+# Seconds between checks for a failed stage while waiting on a queue
+_POLL_INTERVAL = 0.1
+
+
+class StageStats:
+    """Timing of one pipelined stage."""
+
+    def __init__(self, name: str):
+        """
+        Initialize empty statistics.
+
+        Args:
+            name: Stage name
+        """
+        self.name = name
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.starved_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.wall_seconds = 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of the stage's lifetime spent working."""
+        return self.busy_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Summarize the statistics.
+
+        Returns:
+            Dictionary with item count, busy, starved (waiting for input)
+            and blocked (waiting for queue space) seconds, and utilization
+        """
+        return {
+            "items": self.items,
+            "busy_seconds": self.busy_seconds,
+            "starved_seconds": self.starved_seconds,
+            "blocked_seconds": self.blocked_seconds,
+            "utilization": self.utilization,
+        }
+
+
+class StreamPipeline:
+    """A source and a chain of stages, each in its own thread."""
+
+    def __init__(self, queue_size: int = 64):
+        """
+        Initialize an empty pipeline.
+
+        Args:
+            queue_size: Maximum items waiting between two stages
+        """
+        self.queue_size = queue_size
+        self.stages: List[tuple] = []
+        self.stats: Dict[str, StageStats] = {}
+        self._failed = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def add_stage(self, name: str, func: Callable[[Any], Iterable[Any]]) -> "StreamPipeline":
+        """
+        Append a stage.
+
+        Args:
+            name: Stage name, used in the statistics
+            func: Called with each input item; returns the items to pass on
+
+        Returns:
+            This pipeline
+        """
+        self.stages.append((name, func))
+        return self
+
+    def run(self, source: Iterable[Any], source_name: str = "source") -> Iterator[Any]:
+        """
+        Run the pipeline, yielding the outputs of the last stage in order.
+
+        The source is consumed in its own thread; time spent producing the
+        next item, such as waiting for the network, counts as busy time.
+
+        Args:
+            source: Items fed to the first stage
+            source_name: Name of the source in the statistics
+
+        Yields:
+            Outputs of the last stage
+
+        Raises:
+            Exception: The first exception raised by the source or a stage
+        """
+        self._failed.clear()
+        self._error = None
+        names = [source_name] + [name for name, _ in self.stages]
+        self.stats = {name: StageStats(name) for name in names}
+
+        queues = [queue.Queue(self.queue_size) for _ in range(len(self.stages) + 1)]
+        threads = [
+            threading.Thread(
+                target=self._produce,
+                args=(source, queues[0], self.stats[source_name]),
+                name=f"stage-{source_name}",
+                daemon=True,
+            )
+        ]
+        for i, (name, func) in enumerate(self.stages):
+            threads.append(
+                threading.Thread(
+                    target=self._consume,
+                    args=(func, queues[i], queues[i + 1], self.stats[name]),
+                    name=f"stage-{name}",
+                    daemon=True,
+                )
+            )
+
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = self._get(queues[-1])
+                if item is _DONE or item is _STOPPED:
+                    break
+                yield item
+        finally:
+            # Stop the stages if the caller stops early or a stage failed
+            self._failed.set()
+            for thread in threads:
+                thread.join()
+
+        if self._error is not None:
+            raise self._error
+        for stats in self.stats.values():
+            logger.info(
+                f"Stage {stats.name}: {stats.items} items, "
+                f"{stats.utilization:.0%} busy, {stats.starved_seconds:.1f}s starved, "
+                f"{stats.blocked_seconds:.1f}s blocked"
+            )
+
+    def _produce(self, source: Iterable[Any], outbox: queue.Queue, stats: StageStats):
+        """Feed source items into the first queue."""
+        started = time.perf_counter()
+        try:
+            iterator = iter(source)
+            while True:
+                tick = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                stats.busy_seconds += time.perf_counter() - tick
+                stats.items += 1
+                if not self._put(outbox, item, stats):
+                    return
+            self._put(outbox, _DONE, stats)
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            stats.wall_seconds = time.perf_counter() - started
+
+    def _consume(
+        self,
+        func: Callable[[Any], Iterable[Any]],
+        inbox: queue.Queue,
+        outbox: queue.Queue,
+        stats: StageStats,
+    ):
+        """Apply a stage function to every item of its input queue."""
+        started = time.perf_counter()
+        try:
+            while True:
+                tick = time.perf_counter()
+                item = self._get(inbox)
+                stats.starved_seconds += time.perf_counter() - tick
+                if item is _DONE or item is _STOPPED:
+                    break
+
+                tick = time.perf_counter()
+                outputs = list(func(item))
+                stats.busy_seconds += time.perf_counter() - tick
+                stats.items += 1
+                for output in outputs:
+                    if not self._put(outbox, output, stats):
+                        return
+            if item is _DONE:
+                self._put(outbox, _DONE, stats)
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            stats.wall_seconds = time.perf_counter() - started
+
+    def _put(self, outbox: queue.Queue, item: Any, stats: StageStats) -> bool:
+        """Put an item, waiting while the queue is full; False if the run failed."""
+        tick = time.perf_counter()
+        try:
+            while not self._failed.is_set():
+                try:
+                    outbox.put(item, timeout=_POLL_INTERVAL)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            stats.blocked_seconds += time.perf_counter() - tick
+
+    def _get(self, inbox: queue.Queue) -> Any:
+        """Get an item, waiting while the queue is empty; _STOPPED if the run failed."""
+        while not self._failed.is_set():
+            try:
+                return inbox.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return _STOPPED
+
+    def _fail(self, error: BaseException):
+        """Record the first failure and stop every stage."""
+        if self._error is None:
+            self._error = error
+        self._failed.set()
@@ -0,0 +1,211 @@
+"""
+Commit trailer parsing and co-author indexing.
+
+Trailers are the ``Key: value`` lines git places in the last paragraph of a
+commit message (``Co-authored-by:``, ``Signed-off-by:``, ``Generated-by:``).
+Only that final block is examined, so parsing cost does not grow with the
+length of the message body.
+"""
+
+import re
+import logging
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# A trailer line: token, colon, value (git allows letters, digits and dashes in the token)
+TRAILER_LINE = re.compile(r"^([A-Za-z0-9][A-Za-z0-9-]*):[ \t]*(\S.*)$")
+
+# "Name <email>" identity values
+IDENTITY = re.compile(r"^\s*(.*?)\s*<([^>]*)>\s*$")
+
+# Trailer keys (lowercase) that name a co-author identity
+CO_AUTHOR_KEYS = {"co-authored-by"}
+
+# Trailer keys (lowercase) that always declare AI assistance, whatever the value
+AI_ASSIST_KEYS = {"generated-by", "assisted-by", "ai-assisted-by", "made-with"}
+
+
+class Trailer(NamedTuple):
+    """A single commit trailer."""
+
+    key: str
+    value: str
+
+    @property
+    def normalized_key(self) -> str:
+        """Lowercase trailer key for comparisons."""
+        return self.key.lower()
+
+
+def split_trailers(message: str) -> Tuple[str, List[Trailer]]:
+    """
+    Split a commit message into its body and trailing trailer block.
+
+    The last paragraph counts as a trailer block only when every line is a
+    trailer or an indented continuation of one. The subject paragraph is
+    never treated as trailers.
+
+    Args:
+        message: Full commit message
+
+    Returns:
+        Tuple of (message without the trailer block, list of trailers)
+    """
+    if not message:
+        return "", []
+
+    stripped = message.rstrip()
+    separator = stripped.rfind("\n\n")
+    if separator == -1:
+        return message, []
+
+    trailers: List[Trailer] = []
+    for line in stripped[separator + 2 :].split("\n"):
+        if line[:1] in (" ", "\t") and trailers:
+            key, value = trailers[-1]
+            trailers[-1] = Trailer(key, f"{value} {line.strip()}")
+            continue
+        match = TRAILER_LINE.match(line.rstrip())
+        if match is None:
+            return message, []
+        trailers.append(Trailer(match.group(1), match.group(2).strip()))
+
+    return stripped[:separator], trailers
+
+
+def parse_identity(value: str) -> Tuple[str, str]:
+    """
+    Parse a ``Name <email>`` identity.
+
+    Args:
+        value: Identity string
+
+    Returns:
+        Tuple of (name, email); email is empty when absent
+    """
+    match = IDENTITY.match(value)
+    if match is None:
+        return value.strip(), ""
+    return match.group(1), match.group(2)
+
+
+def identity_key(name: str, email: str = "") -> str:
+    """
+    Build a stable index key for an identity, preferring the email address.
+
+    Args:
+        name: Display name
+        email: Email address
+
+    Returns:
+        Lowercase identity key
+    """
+    return (email or name).strip().lower()
+
+
+class CoAuthorIndex:
+    """Repository-wide index of commit authors, co-authors and AI trailers."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        # identity key -> {"name", "commits", "ai_trailer_commits"}
+        self.authors: Dict[str, Dict[str, Any]] = {}
+        # co-author identity key -> {"name", "commits", "tool"}
+        self.co_authors: Dict[str, Dict[str, Any]] = {}
+
+    def add_commit(
+        self,
+        author: str,
+        author_email: str,
+        trailers: List[Trailer],
+        ai_trailers: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Record one commit.
+
+        Args:
+            author: Commit author name
+            author_email: Commit author email
+            trailers: Trailers parsed from the commit message
+            ai_trailers: Mapping of AI trailer values on this commit to their tool
+        """
+        ai_trailers = ai_trailers or {}
+
+        key = identity_key(author, author_email)
+        entry = self.authors.setdefault(
+            key, {"name": author, "commits": 0, "ai_trailer_commits": 0}
+        )
+        entry["commits"] += 1
+        if ai_trailers:
+            entry["ai_trailer_commits"] += 1
+
+        for trailer in trailers:
+            if trailer.normalized_key not in CO_AUTHOR_KEYS:
+                continue
+            name, email = parse_identity(trailer.value)
+            co_entry = self.co_authors.setdefault(
+                identity_key(name, email), {"name": name, "commits": 0, "tool": None}
+            )
+            co_entry["commits"] += 1
+            co_entry["tool"] = co_entry["tool"] or ai_trailers.get(trailer.value)
+
+    def merge(self, other: "CoAuthorIndex") -> "CoAuthorIndex":
+        """
+        Merge another index into this one.
+
+        Args:
+            other: Index to merge
+
+        Returns:
+            This index
+        """
+        for key, theirs in other.authors.items():
+            entry = self.authors.setdefault(
+                key, {"name": theirs["name"], "commits": 0, "ai_trailer_commits": 0}
+            )
+            entry["commits"] += theirs["commits"]
+            entry["ai_trailer_commits"] += theirs["ai_trailer_commits"]
+
+        for key, theirs in other.co_authors.items():
+            entry = self.co_authors.setdefault(
+                key, {"name": theirs["name"], "commits": 0, "tool": None}
+            )
+            entry["commits"] += theirs["commits"]
+            entry["tool"] = entry["tool"] or theirs["tool"]
+
+        return self
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize per-identity AI trailer usage.
+
+        Returns:
+            Dictionary with per-author commit counts and AI trailer share,
+            and co-author identities ordered by commit count
+        """
+        authors = {
+            key: {
+                "name": entry["name"],
+                "commits": entry["commits"],
+                "ai_trailer_commits": entry["ai_trailer_commits"],
+                "ai_trailer_share": (
+                    entry["ai_trailer_commits"] / entry["commits"] if entry["commits"] else 0.0
+                ),
+            }
+            for key, entry in self.authors.items()
+        }
+        co_authors = dict(
+            sorted(self.co_authors.items(), key=lambda item: item[1]["commits"], reverse=True)
+        )
+        total_commits = sum(entry["commits"] for entry in self.authors.values())
+        ai_commits = sum(entry["ai_trailer_commits"] for entry in self.authors.values())
+
+        return {
+            "authors": authors,
+            "co_authors": co_authors,
+            "total_commits": total_commits,
+            "ai_trailer_commits": ai_commits,
+            "ai_trailer_share": ai_commits / total_commits if total_commits else 0.0,
+        }
@@ -4,7 +4,10 @@ Tests for the new analyzers in MVP2.
 
 import pytest
 from datetime import datetime
+from llmdev.accumulator import Accumulator
 from llmdev.analyzers import PRAnalyzer, IterationAnalyzer, PromptAnalyzer
+from llmdev.analyzers import CategoryDistribution, IterationSummary, PromptPatternSummary
+from llmdev.analyzers.markdown import MarkdownDocument
 
 
 class TestPRAnalyzer:
@@ -45,6 +48,65 @@ Implement JWT-based authentication.
         assert items[1]["completed"] is False
         assert "authentication" in items[0]["text"].lower()
 
+    def test_extract_from_shared_document(self):
+        """Test that all extractors accept one pre-tokenized MarkdownDocument."""
+        analyzer = PRAnalyzer()
+
+        body = """## Problem
+The login endpoint accepts expired tokens without any error.
+
+## Solution
+Validate token expiry before loading the user session.
+
+Task Request:
+Make expired tokens fail with a 401 response code.
+
+- [x] Add expiry check
+- [ ] Add regression test
+"""
+        doc = MarkdownDocument(body)
+
+        assert analyzer.extract_prompts(doc) == analyzer.extract_prompts(body)
+        assert [p["type"] for p in analyzer.extract_prompts(doc)] == [
+            "problem",
+            "solution",
+            "task_request",
+        ]
+        assert analyzer.extract_problem_statement(doc).startswith("The login endpoint")
+        assert analyzer.extract_solution_approach(doc).startswith("Validate token expiry")
+        assert analyzer.extract_checklist(doc) == [
+            {"text": "Add expiry check", "completed": True},
+            {"text": "Add regression test", "completed": False},
+        ]
+
+    def test_extract_problem_statement_falls_back_to_paragraph(self):
+        """Test the first-paragraph fallback and the short-section skip."""
+        analyzer = PRAnalyzer()
+
+        body = """This paragraph explains the change in enough detail to be used as a problem.
+
+## Problem
+Too short.
+## Notes
+"""
+
+        problem = analyzer.extract_problem_statement(body)
+
+        assert problem.startswith("This paragraph")
+        assert analyzer.extract_problem_statement("") is None
+
+    def test_markdown_document_nested_sections(self):
+        """Test that a section inside an earlier section's content is skipped."""
+        body = "## Problem\nrequest ## Task\nmore text here\n## Goal\nfinal goal text"
+        doc = MarkdownDocument(body)
+
+        keywords = [section.keyword for section in doc.sections]
+        found = [section.keyword for section in doc.iter_sections(["problem", "task", "goal"])]
+
+        assert keywords == ["problem", "task", "goal"]
+        assert found == ["problem", "goal"]
+        assert doc.content(doc.first_section("goal")) == "final goal text"
+
     def test_categorize_pr_as_feature(self):
         """Test PR categorization as feature."""
         analyzer = PRAnalyzer()
@@ -309,3 +371,132 @@ tokens = generate_tokens(user_id)
         assert patterns["average_specificity"] == pytest.approx(0.6, rel=0.1)
         assert patterns["context_percentage"] == pytest.approx(66.67, rel=0.1)
         assert patterns["constraints_percentage"] == pytest.approx(33.33, rel=0.1)
+
+    def test_analyze_prompts_matches_single_analysis(self):
+        """Test that batch feature rows agree with per-prompt analysis."""
+        analyzer = PromptAnalyzer()
+
+        prompts = [
+            "Implement a function in file auth.py because login fails.\n- must avoid logging",
+            "Could we consider a cleaner approach? For instance a cache.",
+            "```\nexample()\n```",
+            "",
+        ]
+
+        matrix = analyzer.analyze_prompts(prompts)
+        columns = PromptAnalyzer.FEATURE_INDEX
+
+        assert len(matrix) == len(prompts)
+        for row, prompt in zip(matrix, prompts):
+            single = analyzer.analyze_prompt(prompt)
+            assert row[columns["specificity_score"]] == single["specificity_score"]
+            assert bool(row[columns["has_context"]]) == single["has_context"]
+            assert bool(row[columns["has_constraints"]]) == single["has_constraints"]
+            assert bool(row[columns["has_examples"]]) == single["has_examples"]
+            assert row[columns["word_count"]] == single["word_count"]
+
+    def test_extract_prompt_patterns_from_matrix(self):
+        """Test that patterns aggregated from the matrix match the dict path."""
+        analyzer = PromptAnalyzer()
+
+        prompts = [
+            "The existing parser must handle empty input, e.g. an empty file.",
+            "Add tests",
+            "Refactor the class because it is too large",
+        ]
+
+        from_matrix = analyzer.extract_prompt_patterns(analyzer.analyze_prompts(prompts))
+        from_dicts = analyzer.extract_prompt_patterns(
+            [analyzer.analyze_prompt(prompt) for prompt in prompts]
+        )
+
+        assert from_matrix["total_prompts"] == 3
+        for key, value in from_dicts.items():
+            assert from_matrix[key] == pytest.approx(value)
+
+    def test_analyze_prompts_without_numpy(self, monkeypatch):
+        """Test the pure-Python fallback when numpy is not installed."""
+        from llmdev.analyzers import prompt_analyzer
+
+        monkeypatch.setattr(prompt_analyzer, "np", None)
+        analyzer = PromptAnalyzer()
+
+        rows = analyzer.analyze_prompts(["Fix the bug because tests fail", "Add docs"])
+        patterns = analyzer.extract_prompt_patterns(rows)
+
+        assert isinstance(rows, list)
+        assert rows[0][PromptAnalyzer.FEATURE_INDEX["has_context"]] == 1.0
+        assert patterns["context_percentage"] == pytest.approx(50.0)
+        assert analyzer.extract_prompt_patterns(analyzer.analyze_prompts([]))["total_prompts"] == 0
+
+
+class TestSummaryAccumulators:
+    """Test cases for the mergeable deep-analysis accumulators."""
+
+    def _pr_analyses(self):
+        return [
+            {"category": "fix", "iterations": {"pattern_type": "quick_win", "commit_count": 1}},
+            {
+                "category": "feature",
+                "iterations": {"pattern_type": "moderate", "commit_count": 3, "refinement_count": 1},
+            },
+            {
+                "category": "fix",
+                "iterations": {"pattern_type": "complex", "commit_count": 6, "refinement_count": 3},
+            },
+        ]
+
+    def test_incomplete_accumulator_cannot_be_created(self):
+        """Test that a subclass missing one of the abstract methods is rejected."""
+
+        class Partial(Accumulator):
+            def add(self, item):
+                return self
+
+            def merge(self, other):
+                return self
+
+        with pytest.raises(TypeError):
+            Partial()
+
+    def test_iteration_summary_merge(self):
+        """Test that merged iteration summaries match the one-shot summary."""
+        analyses = self._pr_analyses()
+
+        merged = IterationSummary().extend(analyses[:2]).merge(IterationSummary().add(analyses[2]))
+
+        assert merged.finalize() == IterationAnalyzer().get_iteration_summary(analyses)
+        assert IterationSummary().finalize()["total_prs"] == 0
+
+    def test_category_distribution_merge(self):
+        """Test that category counts combine across shards."""
+        analyses = self._pr_analyses()
+
+        merged = CategoryDistribution().add(analyses[0]).merge(
+            CategoryDistribution().extend(analyses[1:])
+        )
+
+        assert merged.finalize() == {"fix": 2, "feature": 1}
+
+    def test_prompt_pattern_summary_merge(self):
+        """Test that prompt summaries from matrices, rows and dicts combine."""
+        analyzer = PromptAnalyzer()
+        prompts = [
+            "We must fix the parser because it fails, e.g. on empty input.",
+            "Add tests",
+            "Could you refactor the class?",
+        ]
+        matrix = analyzer.analyze_prompts(prompts)
+
+        merged = (
+            PromptPatternSummary()
+            .extend(matrix[:1])
+            .merge(PromptPatternSummary().extend(list(matrix[1:2])))
+            .merge(PromptPatternSummary().add(analyzer.analyze_prompt(prompts[2])))
+        )
+        whole = analyzer.extract_prompt_patterns(matrix)
+
+        assert merged.total_prompts == 3
+        for key, value in whole.items():
+            assert merged.finalize()[key] == pytest.approx(value)
+
@@ -0,0 +1,178 @@
+"""
+Tests for content-addressed text blobs.
+"""
+
+import pickle
+import sqlite3
+from llmdev.blobs import Blob, BlobStore, blob_of, intern_text, text_digest
+from llmdev.detector import CopilotDetector
+from llmdev.records import CommentRecord, PRRecord
+from llmdev.spill import estimate_size
+from llmdev.store import AnalysisStore
+from tests.test_store import _collected
+
+TEMPLATE = (
+    "## Description\n\nThis PR was generated with GitHub Copilot.\n\n## Checklist\n- [ ] Tests"
+)
+
+
+def _pr(number, body=TEMPLATE):
+    return PRRecord(number=number, title="Update", body="".join(body), comments=[])
+
+
+class TestBlobs:
+    """Test cases for Blob and BlobStore."""
+
+    def test_equal_texts_share_a_blob(self):
+        """Test that interning equal texts gives one blob holding one string."""
+        store = BlobStore()
+        first = store.intern("".join(["x" * 50, "y" * 50]))
+        second = store.intern("x" * 50 + "y" * 50)
+
+        assert first is second
+        assert first.digest == text_digest("x" * 50 + "y" * 50)
+        assert len(store) == 1
+
+    def test_records_share_long_bodies(self):
+        """Test that records with the same long body refer to the same text."""
+        first, second = _pr(1), _pr(2, body=list(TEMPLATE))
+
+        assert isinstance(first.blob("body"), Blob)
+        assert first.blob("body") is second.blob("body")
+        assert first["body"] is second["body"]
+        assert first["body"] == TEMPLATE
+        assert first.get("body") == TEMPLATE
+        assert first.to_dict()["body"] == TEMPLATE
+
+    def test_short_texts_stay_strings(self):
+        """Test that short bodies are not turned into blobs."""
+        comment = CommentRecord(body="LGTM")
+
+        assert comment.blob("body") is None
+        assert blob_of(comment, "body") is None
+        assert blob_of({"body": TEMPLATE}, "body") is None
+
+    def test_cached_results(self):
+        """Test that a result is computed once per blob."""
+        blob = intern_text(TEMPLATE)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(blob.text)
+
+        assert blob.cached("length", compute) == len(TEMPLATE)
+        assert blob.cached("length", compute) == len(TEMPLATE)
+        assert len(calls) == 1
+        assert blob.document is blob.document
+
+    def test_pickle_round_trip(self):
+        """Test that records pickle with their blobs and share them again when loaded."""
+        pr = _pr(1)
+        restored = pickle.loads(pickle.dumps(pr))
+
+        assert restored == pr
+        assert restored.blob("body") is pr.blob("body")
+
+
+class TestBlobDetection:
+    """Test cases for detection over blob-backed records."""
+
+    def test_detections_match_plain_text(self):
+        """Test that blob detections equal detections on the plain text."""
+        detector = CopilotDetector()
+        pr = _pr(5)
+
+        expected = detector.detect_in_text(TEMPLATE, "pr", "5")
+        assert expected
+        assert detector.detect_in_field(pr, "body", "pr", "5") == expected
+        assert detector.detect_in_pr(pr) == detector.detect_in_pr(pr.to_dict())
+
+    def test_body_searched_once(self, monkeypatch):
+        """Test that a body repeated across records is searched only once."""
+        detector = CopilotDetector()
+        records = [_pr(number) for number in range(20)]
+        calls = []
+        search = detector.detect_in_text
+        monkeypatch.setattr(
+            detector,
+            "detect_in_text",
+            lambda *args, **kwargs: calls.append(1) or search(*args, **kwargs),
+        )
+        records[0].blob("body")._results = None
+
+        detections = [
+            detector.detect_in_field(pr, "body", "pr", str(pr["number"])) for pr in records
+        ]
+
+        assert len(calls) == 1
+        assert [found[0].source_id for found in detections] == [str(n) for n in range(20)]
+        assert detections[0][0].metadata is not detections[1][0].metadata
+
+
+class TestBlobStorage:
+    """Test cases for blobs in the analysis store."""
+
+    def test_repeated_bodies_stored_once(self, tmp_path):
+        """Test that repeated bodies are written once and read back lazily."""
+        collected = _collected()
+        collected["prs"] = [dict(_pr(number).to_dict(), comments=[]) for number in range(1, 51)]
+        store = AnalysisStore(tmp_path / "analysis.db")
+        repo = store.save_collection(collected)
+
+        (blob_count,) = store.connection.execute("SELECT COUNT(*) FROM blobs").fetchone()
+        assert blob_count == 1
+
+        prs = store.load_collection(repo)["prs"]
+        blob = prs[0].blob("body")
+        assert blob is prs[-1].blob("body")
+        assert prs[0]["body"] == TEMPLATE
+        assert [pr["body"] for pr in prs] == [TEMPLATE] * 50
+        store.close()
+
+    def test_lazy_load(self, tmp_path):
+        """Test that stored blobs are not read until their text is accessed."""
+        body = "Unique body " + "z" * 80
+        collected = _collected()
+        collected["prs"][0]["body"] = body
+        with AnalysisStore(tmp_path / "analysis.db") as store:
+            repo = store.save_collection(collected)
+        del collected
+
+        with AnalysisStore(tmp_path / "analysis.db") as store:
+            pr = store.load_collection(repo)["prs"][0]
+            blob = pr.blob("body")
+            assert not blob.loaded
+            unloaded_size = estimate_size(pr)
+            # Saving records read from the store does not load their bodies
+            store.save_collection(store.load_collection(repo))
+            assert not blob.loaded
+            assert pr["body"] == body
+            assert blob.loaded
+            assert estimate_size(pr) > unloaded_size + len(body)
+
+    def test_orphan_blobs_removed(self, tmp_path):
+        """Test that replacing a body deletes its blob once nothing refers to it."""
+        collected = _collected()
+        collected["prs"][0]["body"] = "First body " + "a" * 80
+        store = AnalysisStore(tmp_path / "analysis.db")
+        repo = store.save_collection(collected)
+        collected["prs"][0]["body"] = "Second body " + "b" * 80
+        store.save_collection(collected)
+
+        texts = [row[0] for row in store.connection.execute("SELECT text FROM blobs")]
+        assert texts == [collected["prs"][0]["body"]]
+        assert store.load_collection(repo)["prs"][0]["body"] == collected["prs"][0]["body"]
+        store.close()
+
+    def test_inline_bodies_readable(self, tmp_path):
+        """Test that bodies stored inline, before blobs existed, still load."""
+        with AnalysisStore(tmp_path / "analysis.db") as store:
+            repo = store.save_collection(_collected())
+        connection = sqlite3.connect(str(tmp_path / "analysis.db"))
+        with connection:
+            connection.execute("UPDATE prs SET body = ?", ("a" * 32,))
+        connection.close()
+
+        with AnalysisStore(tmp_path / "analysis.db") as store:
+            assert store.load_collection(repo)["prs"][0]["body"] == "a" * 32
@@ -5,8 +5,9 @@ Tests for caching infrastructure.
 import pytest
 import time
 import tempfile
+from datetime import datetime
 from pathlib import Path
-from llmdev.cache import DiskCache, RateLimiter
+from llmdev.cache import DiskCache, MemoStore, RateLimiter, content_hash
 
 
 class TestDiskCache:
@@ -88,6 +89,57 @@ class TestDiskCache:
             assert value == complex_data
 
 
+class TestMemoStore:
+    """Test cases for MemoStore."""
+
+    def test_memo_set_and_get(self, tmp_path):
+        """Test that values round-trip and hits/misses are counted."""
+        memo = MemoStore(str(tmp_path), "v1")
+
+        assert memo.get("missing") is None
+        assert memo.set("key", {"when": datetime(2024, 1, 1), "rows": [[0.5, 1.0]]}) is True
+        assert memo.get("key") == {"when": datetime(2024, 1, 1), "rows": [[0.5, 1.0]]}
+        assert (memo.hits, memo.misses) == (1, 1)
+
+    def test_new_version_ignores_old_entries(self, tmp_path):
+        """Test that a code version change invalidates memoized values without deleting them."""
+        MemoStore(str(tmp_path), "v1").set("key", "old")
+
+        memo = MemoStore(str(tmp_path), "v2")
+
+        assert memo.get("key") is None
+        assert MemoStore(str(tmp_path), "v1").get("key") == "old"
+
+    def test_prune_only_removes_version_directories(self, tmp_path):
+        """Test that pruning keeps the current version and directories that are not versions."""
+        old, current = "0123456789abcdef", "fedcba9876543210"
+        MemoStore(str(tmp_path), old).set("key", "old")
+        (tmp_path / "stages").mkdir()
+        (tmp_path / "spill").mkdir()
+
+        memo = MemoStore(str(tmp_path), current)
+        memo.set("key", "new")
+
+        assert memo.prune_stale_versions() == 1
+        assert sorted(path.name for path in tmp_path.iterdir()) == [current, "spill", "stages"]
+        assert memo.get("key") == "new"
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        """Test that an unreadable entry is treated as missing."""
+        memo = MemoStore(str(tmp_path), "v1")
+        (tmp_path / "v1" / "key.pkl").write_bytes(b"not a pickle")
+
+        assert memo.get("key") is None
+
+    def test_content_hash_is_stable(self):
+        """Test that content hashes ignore key order and depend on content."""
+        a = {"title": "Fix", "created_at": datetime(2024, 1, 1), "comments": []}
+        b = {"comments": [], "created_at": datetime(2024, 1, 1), "title": "Fix"}
+
+        assert content_hash(a, []) == content_hash(b, [])
+        assert content_hash(a, []) != content_hash(dict(a, title="Fix bug"), [])
+
+
 class TestRateLimiter:
     """Test cases for RateLimiter."""
 
@@ -0,0 +1,152 @@
+"""
+Tests for the memory-mapped JSONL corpus.
+"""
+
+import gzip
+import json
+import pytest
+from llmdev.analyzer import RepositoryAnalyzer
+from llmdev.config import Config
+from llmdev.corpus import Corpus, CorpusTable
+from llmdev.detector import CopilotDetector
+from llmdev.records import CommitRecord, PRRecord
+from tests.test_store import _collected
+
+
+def _many_prs(count):
+    collected = _collected()
+    template = collected["prs"][0]
+    collected["prs"] = [dict(template, number=number) for number in range(1, count + 1)]
+    return collected
+
+
+@pytest.fixture(params=["corpus.jsonl", "corpus.jsonl.gz"])
+def corpus_path(request, tmp_path):
+    return tmp_path / request.param
+
+
+class TestCorpus:
+    """Test cases for Corpus."""
+
+    def test_round_trip(self, corpus_path):
+        """Test that records read back equal the collected ones."""
+        collected = _collected()
+        with Corpus(corpus_path) as corpus:
+            repo = corpus.write_collection(collected)
+
+        loaded = Corpus(corpus_path).load_collection(repo)
+        assert isinstance(loaded["prs"], CorpusTable)
+        assert loaded["commits"] == collected["commits"]
+        assert loaded["prs"] == collected["prs"]
+        assert loaded["issues"] == collected["issues"]
+        assert isinstance(loaded["prs"][0], PRRecord)
+        assert loaded["prs"][0]["comments"][0]["created_at"] == collected["prs"][0]["created_at"]
+        assert loaded["repository"]["stars"] == 3
+
+    def test_random_access(self, corpus_path):
+        """Test lookups by PR number and commit SHA."""
+        with Corpus(corpus_path) as corpus:
+            repo = corpus.write_collection(_many_prs(600))
+
+        corpus = Corpus(corpus_path)
+        assert corpus.get(repo, "prs", 457)["url"].endswith("/pull/42")
+        assert corpus.get(repo, "prs", 457)["number"] == 457
+        assert isinstance(corpus.get(repo, "commits", "abc123"), CommitRecord)
+        assert corpus.table(repo, "prs").get(9999) is None
+        assert corpus.table(repo, "prs")[-1]["number"] == 600
+        with pytest.raises(KeyError):
+            corpus.get(repo, "prs", 9999)
+
+    def test_later_records_replace_earlier(self, corpus_path):
+        """Test that appending a record with a known key replaces it in place."""
+        collected = _many_prs(3)
+        with Corpus(corpus_path) as corpus:
+            repo = corpus.write_collection(collected)
+            corpus.append(repo, "prs", dict(collected["prs"][1], title="Renamed"))
+
+        prs = Corpus(corpus_path).table(repo, "prs")
+        assert [pr["number"] for pr in prs] == [1, 2, 3]
+        assert prs[1]["title"] == "Renamed"
+
+    def test_index_rebuilt_and_extended(self, corpus_path):
+        """Test that a missing index is rebuilt and records appended by others are indexed."""
+        with Corpus(corpus_path) as corpus:
+            repo = corpus.write_collection(_many_prs(300))
+        corpus_path.with_name(corpus_path.name + ".idx").unlink()
+
+        corpus = Corpus(corpus_path)
+        assert len(corpus.table(repo, "prs")) == 300
+        corpus.close()
+
+        with Corpus(corpus_path) as writer:
+            writer.append(repo, "prs", dict(_collected()["prs"][0], number=301))
+        corpus = Corpus(corpus_path)
+        assert corpus.get(repo, "prs", 301)["number"] == 301
+
+    def test_reads_after_append(self, corpus_path):
+        """Test that records appended through an open corpus can be read back at once."""
+        corpus = Corpus(corpus_path)
+        repo = corpus.write_collection(_collected())
+        corpus.append(repo, "prs", dict(_collected()["prs"][0], number=43))
+
+        assert corpus.get(repo, "prs", 43)["number"] == 43
+        assert len(corpus.table(repo, "prs")) == 2
+        corpus.close()
+
+    def test_readable_as_plain_jsonl(self, tmp_path):
+        """Test that a compressed corpus is one JSONL stream to standard tools."""
+        path = tmp_path / "corpus.jsonl.gz"
+        with Corpus(path) as corpus:
+            corpus.write_collection(_many_prs(600))
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        assert sum(line["table"] == "prs" for line in lines) == 600
+
+    def test_incomplete_last_line_dropped(self, tmp_path):
+        """Test that a record cut off by an interrupted write is ignored and overwritten."""
+        path = tmp_path / "corpus.jsonl"
+        with Corpus(path) as corpus:
+            repo = corpus.write_collection(_collected())
+        path.with_name(path.name + ".idx").unlink()
+        with path.open("ab") as f:
+            f.write(b'{"repo": "test/repo", "table": "prs"')
+
+        with Corpus(path) as corpus:
+            assert len(corpus.table(repo, "prs")) == 1
+            corpus.append(repo, "prs", dict(_collected()["prs"][0], number=43))
+        assert [pr["number"] for pr in Corpus(path).table(repo, "prs")] == [42, 43]
+
+
+class TestCorpusAnalysis:
+    """Test cases for analysis from a corpus."""
+
+    def test_detector_reads_corpus_table(self, corpus_path):
+        """Test that batch detection over a corpus view matches detection over lists."""
+        collected = _many_prs(50)
+        with Corpus(corpus_path) as corpus:
+            repo = corpus.write_collection(collected)
+        table = Corpus(corpus_path).table(repo, "prs")
+
+        detector = CopilotDetector()
+        assert detector.detect_batch(table, "pr", workers=1) == detector.detect_batch(
+            collected["prs"], "pr", workers=1
+        )
+
+    def test_analyze_corpus(self, tmp_path):
+        """Test that collected data written to the corpus can be analyzed offline."""
+        config = Config(
+            store_path=None,
+            search_index_path=None,
+            corpus_path=tmp_path / "corpus.jsonl.gz",
+            enable_cache=False,
+            detection_workers=1,
+        )
+        analyzer = RepositoryAnalyzer(config)
+        expected = analyzer._analyze_collected(analyzer.normalize(_collected()))
+        results = analyzer.analyze_corpus("test/repo")
+
+        assert list(results["detections"]) == list(expected["detections"])
+        assert results["analysis"]["prs_analyzed"] == 1
+        with pytest.raises(KeyError):
+            analyzer.analyze_corpus("other/repo")
@@ -12,9 +12,9 @@ from llmdev.analyzer import RepositoryAnalyzer
 class TestDeepAnalysis:
     """Test deep analysis integration."""
 
-    def test_deep_analysis_enabled(self):
+    def test_deep_analysis_enabled(self, tmp_path):
         """Test that deep analysis creates the required analyzers."""
-        config = Config(deep_analysis=True)
+        config = Config(deep_analysis=True, memo_dir=tmp_path / "memo")
         analyzer = RepositoryAnalyzer(config)
 
         assert analyzer.pr_analyzer is not None
@@ -30,9 +30,9 @@ class TestDeepAnalysis:
         assert analyzer.iteration_analyzer is None
         assert analyzer.prompt_analyzer is None
 
-    def test_run_deep_analysis(self):
+    def test_run_deep_analysis(self, tmp_path):
         """Test the deep analysis execution."""
-        config = Config(deep_analysis=True)
+        config = Config(deep_analysis=True, memo_dir=tmp_path / "memo")
         analyzer = RepositoryAnalyzer(config)
 
         # Mock PR data
@@ -69,3 +69,126 @@ class TestDeepAnalysis:
         assert len(result["pr_analyses"]) == 2
         assert result["category_distribution"]["feature"] >= 1
         assert result["category_distribution"]["fix"] >= 1
+        assert result["prompt_templates"]["total_prompts"] == result["total_prompts_found"]
+
+
+def _prs():
+    """Two small PRs for memoization tests."""
+    return [
+        {
+            "number": 1,
+            "title": "Add new feature",
+            "body": "## Problem\nNeed authentication for the admin API endpoints\n\n- [x] Implement",
+            "created_at": datetime(2024, 1, 1),
+            "merged_at": datetime(2024, 1, 2),
+            "merged": True,
+            "comments": [],
+        },
+        {
+            "number": 2,
+            "title": "Fix bug",
+            "body": "Fixed the login bug",
+            "created_at": datetime(2024, 1, 3),
+            "merged_at": datetime(2024, 1, 3),
+            "merged": True,
+            "comments": [],
+        },
+    ]
+
+
+class TestDeepAnalysisMemo:
+    """Test memoization of per-PR deep analysis across runs."""
+
+    def _analyzer(self, tmp_path):
+        """Create an analyzer whose analyze_pr calls are counted."""
+        analyzer = RepositoryAnalyzer(Config(deep_analysis=True, memo_dir=tmp_path / "memo"))
+        analyzer.pr_analyzer.analyze_pr = Mock(wraps=analyzer.pr_analyzer.analyze_pr)
+        return analyzer
+
+    def test_unchanged_prs_served_from_memo(self, tmp_path):
+        """Test that a second run reuses every unchanged PR."""
+        first = self._analyzer(tmp_path)
+        first_result = first._run_deep_analysis(_prs(), [])
+
+        second = self._analyzer(tmp_path)
+        second_result = second._run_deep_analysis(_prs(), [])
+
+        assert first.pr_analyzer.analyze_pr.call_count == 2
+        assert second.pr_analyzer.analyze_pr.call_count == 0
+        assert second_result == first_result
+
+    def test_changed_pr_is_reanalyzed(self, tmp_path):
+        """Test that only PRs whose content changed are analyzed again."""
+        self._analyzer(tmp_path)._run_deep_analysis(_prs(), [])
+
+        prs = _prs()
+        prs[1]["comments"] = [{"author": "reviewer", "body": "Please add a test"}]
+        analyzer = self._analyzer(tmp_path)
+        analyzer._run_deep_analysis(prs, [])
+
+        assert analyzer.pr_analyzer.analyze_pr.call_count == 1
+        assert analyzer.pr_analyzer.analyze_pr.call_args[0][0]["number"] == 2
+
+    def test_memo_disabled_without_cache(self, tmp_path):
+        """Test that no memo is used when caching is disabled."""
+        config = Config(deep_analysis=True, enable_cache=False, memo_dir=tmp_path / "memo")
+        analyzer = RepositoryAnalyzer(config)
+
+        assert analyzer.memo is None
+        assert analyzer._run_deep_analysis(_prs(), [])["total_prompts_found"] == 1
+        assert not (tmp_path / "memo").exists()
+
+
+class TestParallelDeepAnalysis:
+    """Test the process-pool deep analysis mode."""
+
+    def _prs(self, count):
+        """Generate varied PRs."""
+        templates = [
+            "## Problem\nThe parser fails on empty files because input is not checked.\n\n- [x] Fix",
+            "## Solution\nWe should refactor the class, e.g. split it into modules.",
+            "Update docs for the new API",
+        ]
+        return [
+            {
+                "number": i,
+                "title": ["Add feature", "Fix bug", "Improve docs"][i % 3],
+                "body": templates[i % 3] + f" ({i})",
+                "created_at": datetime(2024, 1, 1),
+                "merged_at": datetime(2024, 1, 1 + i % 5),
+                "merged": i % 2 == 0,
+                "comments": [],
+            }
+            for i in range(count)
+        ]
+
+    def _run(self, tmp_path, workers, prs):
+        """Run deep analysis with memoization disabled."""
+        config = Config(deep_analysis=True, enable_cache=False, deep_analysis_workers=workers)
+        analyzer = RepositoryAnalyzer(config)
+        analyzer.MIN_PARALLEL_PRS = 4
+        analyzer.DEEP_ANALYSIS_CHUNK_SIZE = 3
+        return analyzer._run_deep_analysis(prs, [])
+
+    def test_parallel_matches_serial(self, tmp_path):
+        """Test that the parallel run returns the serial results in order."""
+        prs = self._prs(20)
+
+        serial = self._run(tmp_path, 1, prs)
+        parallel = self._run(tmp_path, 2, prs)
+
+        assert [a["number"] for a in parallel["pr_analyses"]] == list(range(20))
+        assert parallel == serial
+
+    def test_small_input_stays_in_process(self, tmp_path, monkeypatch):
+        """Test that tiny inputs never start a process pool."""
+        import llmdev.analyzer as analyzer_module
+
+        def fail(*args, **kwargs):
+            raise AssertionError("process pool should not be used")
+
+        monkeypatch.setattr(analyzer_module, "ProcessPoolExecutor", fail)
+
+        result = self._run(tmp_path, 4, self._prs(3))
+
+        assert len(result["pr_analyses"]) == 3
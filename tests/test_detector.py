@@ -3,7 +3,8 @@ Tests for the Copilot detector.
 """
 
 import pytest
-from llmdev.detector import CopilotDetector, Detection
+from llmdev.detector import CopilotDetector, Detection, DetectionStore, DetectionSummary
+from llmdev.rules import DetectionRule, RuleSet, has_uppercase_literal, load_rules
 
 
 class TestCopilotDetector:
@@ -91,6 +92,43 @@ class TestCopilotDetector:
             detections = detector.detect_in_text(text, "test", "test1")
             assert len(detections) > 0, f"Failed to detect: {text}"
 
+    def test_reports_every_separate_occurrence(self):
+        """Test that distant mentions each produce a detection with local evidence."""
+        detector = CopilotDetector()
+
+        text = "Drafted with copilot.\n" + "x" * 200 + "\nReviewed the GitHub Copilot output."
+        detections = detector.detect_in_text(text, "pr", "7")
+
+        assert len(detections) == 2
+        assert detections[0].evidence == "Drafted with copilot."
+        assert detections[1].evidence == "Reviewed the GitHub Copilot output."
+        assert detections[1].metadata["keyword"] == "github copilot"
+
+    def test_keyword_is_longest_match_per_occurrence(self):
+        """Test that each detection records the longest keyword matched at its occurrence."""
+        detector = CopilotDetector()
+
+        text = "Generated by Copilot.\n" + "x" * 200 + "\nTweaked the co-pilot output."
+        detections = detector.detect_in_text(text, "pr", "8")
+
+        assert [d.metadata["keyword"] for d in detections] == ["generated by copilot", "co-pilot"]
+
+    def test_nearby_mentions_share_evidence(self):
+        """Test that mentions inside one evidence window are reported once."""
+        detector = CopilotDetector()
+
+        detections = detector.detect_in_text("copilot and co-pilot", "commit", "abc")
+
+        assert len(detections) == 1
+        assert detections[0].evidence == "copilot and co-pilot"
+
+    def test_case_sensitive_detection(self):
+        """Test that case-sensitive matching ignores differently cased keywords."""
+        detector = CopilotDetector()
+
+        assert detector.detect_in_text("Using COPILOT", "commit", "a", case_sensitive=True) == []
+        assert detector.detect_in_text("using copilot", "commit", "a", case_sensitive=True)
+
     def test_get_summary(self):
         """Test summary generation from detections."""
         detector = CopilotDetector()
@@ -119,3 +157,219 @@ class TestCopilotDetector:
 
         assert summary["total"] == 0
         assert summary["average_confidence"] == 0.0
+
+
+class TestDetectionRules:
+    """Test cases for the data-driven detection rules."""
+
+    def test_builtin_rules_cover_multiple_tools(self):
+        """Test that the built-in rule file covers assistants beyond Copilot."""
+        rule_set = load_rules()
+
+        for tool in ["copilot", "claude", "cursor", "codex", "devin", "aider", "chatgpt"]:
+            assert tool in rule_set.tools
+
+    def test_metadata_records_matched_tool(self):
+        """Test that detections record which tool and rule matched."""
+        detector = CopilotDetector()
+
+        detections = detector.detect_in_text("Implemented with Claude Code", "pr", "1")
+
+        assert len(detections) == 1
+        assert detections[0].metadata["tool"] == "claude"
+        assert detections[0].metadata["rule"] == "claude-mention"
+
+    def test_scope_restricts_rules(self):
+        """Test that rules only apply to their declared scopes."""
+        rule_set = RuleSet(
+            [
+                DetectionRule(name="pr-only", tool="agent", patterns=["agentx"], scope=["pr"]),
+                DetectionRule(name="bot", tool="agent", patterns=["agentx"], scope=["author"]),
+            ]
+        )
+        detector = CopilotDetector(rule_set)
+
+        assert detector.detect_in_text("made by agentx", "pr", "1")
+        assert detector.detect_in_text("made by agentx", "commit", "a") == []
+
+    def test_author_rules_detect_agent_accounts(self):
+        """Test that PR authors matching author rules are detected."""
+        detector = CopilotDetector()
+
+        pr_data = {"number": 5, "title": "Tidy", "body": "", "author": "devin-ai-integration[bot]"}
+        detections = detector.detect_in_pr(pr_data)
+
+        assert len(detections) == 1
+        assert detections[0].detection_type == "bot_author"
+        assert detections[0].metadata["tool"] == "devin"
+
+    def test_load_rules_from_file(self, tmp_path):
+        """Test loading a custom rule file."""
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text(
+            '{"version": 1, "rules": [{"name": "x", "tool": "xbot", "patterns": ["xbot"]}]}'
+        )
+
+        detector = CopilotDetector(load_rules(rules_file))
+        detections = detector.detect_in_text("thanks xbot", "comment", "1")
+
+        assert detections[0].metadata["tool"] == "xbot"
+        assert detector.detect_in_text("thanks copilot", "comment", "1") == []
+
+    def test_mixed_case_pattern(self):
+        """Test that patterns with uppercase letters still match case-insensitively."""
+        rule_set = RuleSet(
+            [DetectionRule(name="x", tool="x", patterns=["Claude", r"Agent\S*X"], scope=["pr"])]
+        )
+        detector = CopilotDetector(rule_set)
+
+        assert detector.detect_in_text("made by Claude", "pr", "1")[0].metadata["keyword"] == (
+            "claude"
+        )
+        assert detector.detect_in_text("made by CLAUDE", "pr", "1")
+        assert detector.detect_in_text("by agent-x", "pr", "1")
+        assert detector.detect_in_text("made by Claude", "pr", "1", case_sensitive=True)
+        assert detector.detect_in_text("made by claude", "pr", "1", case_sensitive=True) == []
+
+    def test_uppercase_literal_check(self):
+        """Test that escapes, group names and flags do not count as uppercase literals."""
+        assert has_uppercase_literal("Claude")
+        assert has_uppercase_literal("[A-Z]+bot")
+        assert not has_uppercase_literal(r"\bclaude\S+\W")
+        assert not has_uppercase_literal(r"(?P<Tool>devin)(?P=Tool)(?L)\N{BULLET}")
+
+    def test_invalid_rule_scope(self):
+        """Test that unknown scopes are rejected."""
+        with pytest.raises(ValueError):
+            DetectionRule(name="bad", tool="x", patterns=["x"], scope=["wiki"])
+
+    def test_offsets_survive_length_changing_lowercase(self):
+        """Test evidence slicing when lowercasing changes the text length."""
+        detector = CopilotDetector()
+
+        detections = detector.detect_in_text("İstanbul team used Claude Code", "pr", "1")
+
+        assert detections[0].metadata["tool"] == "claude"
+        assert detections[0].evidence == "İstanbul team used Claude Code"
+
+
+class TestBatchDetection:
+    """Test cases for CopilotDetector.detect_batch."""
+
+    MESSAGES = [
+        "Change\n\nCo-authored-by: Copilot <copilot@users.noreply.github.com>",
+        "Change with copilot",
+        "Plain change",
+    ]
+
+    def _commits(self, count):
+        return [
+            {
+                "sha": f"{i:040x}",
+                "message": self.MESSAGES[i % len(self.MESSAGES)],
+                "author": "dev",
+                "author_email": "dev@example.com",
+            }
+            for i in range(count)
+        ]
+
+    def test_small_batch_runs_in_process(self):
+        """Test that small batches match per-record detection."""
+        records = self._commits(10)
+        expected = CopilotDetector()
+        sequential = [d for r in records for d in expected.detect_in_commit(r)]
+
+        assert CopilotDetector().detect_batch(records, "commit") == sequential
+
+    def test_parallel_batch_is_deterministic(self):
+        """Test that the process pool returns the same ordered results."""
+        records = self._commits(60)
+        sequential_detector = CopilotDetector()
+        sequential = [d for r in records for d in sequential_detector.detect_in_commit(r)]
+
+        detector = CopilotDetector()
+        detector.MIN_PARALLEL_RECORDS = 1
+        parallel = detector.detect_batch(records, "commit", workers=2, chunk_size=7)
+
+        assert parallel == sequential
+        assert detector.co_authors.summary() == sequential_detector.co_authors.summary()
+
+    def test_unsupported_source_type(self):
+        """Test that unknown source types are rejected."""
+        with pytest.raises(ValueError):
+            CopilotDetector().detect_batch([], "wiki")
+
+
+class TestDetectionStore:
+    """Test cases for the compact DetectionStore."""
+
+    def _detections(self):
+        return [
+            Detection("commit", "1", "explicit_mention", 0.95, "e1", {"tool": "copilot"}),
+            Detection("pr", "2", "bot_author", 0.8, "e2", {"tool": "devin"}),
+            Detection("commit", "3", "explicit_mention", 0.9, "e3", {"tool": "copilot"}),
+        ]
+
+    def test_round_trip(self):
+        """Test that stored detections come back unchanged and in order."""
+        detections = self._detections()
+        store = DetectionStore(detections)
+
+        assert len(store) == 3
+        assert list(store) == detections
+        assert store[1] == detections[1]
+        assert store[:2] == detections[:2]
+
+    def test_summary_matches_list_summary(self):
+        """Test that summaries from the arrays match the list-based summary."""
+        detector = CopilotDetector()
+        detections = self._detections()
+
+        from_store = detector.get_summary(DetectionStore(detections))
+        from_list = detector.get_summary(detections)
+
+        assert from_store["by_source"] == from_list["by_source"]
+        assert from_store["by_type"] == from_list["by_type"]
+        assert from_store["average_confidence"] == pytest.approx(from_list["average_confidence"])
+
+    def test_materialized_metadata_is_not_shared(self):
+        """Test that mutating one returned detection leaves the store intact."""
+        store = DetectionStore(self._detections())
+
+        store[0].metadata["tool"] = "changed"
+
+        assert store[2].metadata["tool"] == "copilot"
+
+    def test_detection_metadata_defaults_to_empty(self):
+        """Test lazy metadata allocation on slotted detections."""
+        detection = Detection("pr", "1", "explicit_mention", 0.9, "e")
+
+        assert detection.metadata == {}
+        assert not hasattr(detection, "__dict__")
+
+
+class TestDetectionSummary:
+    """Test cases for the mergeable DetectionSummary."""
+
+    def test_merged_shards_match_whole(self):
+        """Test that merging partial summaries equals summarizing everything."""
+        detections = TestDetectionStore()._detections()
+
+        whole = DetectionSummary().extend(detections).finalize()
+        merged = (
+            DetectionSummary()
+            .extend(detections[:1])
+            .merge(DetectionSummary().extend(DetectionStore(detections[1:])))
+            .finalize()
+        )
+
+        assert merged["by_source"] == whole["by_source"]
+        assert merged["by_type"] == whole["by_type"]
+        assert merged["average_confidence"] == pytest.approx(whole["average_confidence"])
+        assert whole["total"] == 3
+        assert whole["by_source"] == {"commit": 2, "pr": 1}
+
+    def test_empty_summary(self):
+        """Test the summary of no detections."""
+        assert DetectionSummary().finalize() == CopilotDetector().get_summary([])
+
@@ -0,0 +1,102 @@
+"""
+Tests for the shared Document view.
+"""
+
+import pytest
+from llmdev.analyzers import PRAnalyzer, PromptAnalyzer
+from llmdev.detector import CopilotDetector
+from llmdev.document import CodeSpan, Document
+
+
+class TestDocument:
+    """Test cases for Document."""
+
+    def test_views_are_cached(self):
+        """Test that derived views are computed once and reused."""
+        doc = Document("Fix the Bug in parser.py\n- add a test")
+
+        assert doc.lower == "fix the bug in parser.py\n- add a test"
+        assert doc.lower is doc.lower
+        assert doc.tokens is doc.tokens
+        assert doc.markdown is doc.markdown
+        assert doc.word_count == 9
+        assert doc.lines == ["Fix the Bug in parser.py", "- add a test"]
+
+    def test_token_lookups(self):
+        """Test whole-token membership and counts."""
+        doc = Document("Add it, then add more. Adding is fine.")
+
+        assert doc.has_token("add")
+        assert not doc.has_token("adding ", "ad")
+        assert doc.count_tokens("add", "then") == 3
+
+    def test_tokens_split_before_lowercasing(self):
+        """Test that characters whose lowercase form is longer do not split tokens."""
+        doc = Document("Rename İ2 to İSTANBUL")
+
+        assert doc.tokens == ["rename", "i\u03072", "to", "i\u0307stanbul"]
+        assert doc.has_token("to")
+        assert not doc.has_token("2")
+
+    def test_code_spans(self):
+        """Test fenced blocks, inline spans and unmatched backticks."""
+        text = "Use `run()` here.\n```python\nprint(1)\n```\nstray ` tick"
+        doc = Document(text)
+
+        fenced_start = text.index("```")
+        assert doc.code_spans == [
+            CodeSpan(4, 11, False),
+            CodeSpan(fenced_start, text.rindex("```") + 3, True),
+        ]
+
+    def test_unclosed_fence_runs_to_end(self):
+        """Test that an unclosed fence extends to the end of the text."""
+        doc = Document("text `inline ```\ncode")
+
+        assert doc.code_spans == [CodeSpan(13, len(doc.text), True)]
+
+    def test_of_reuses_document(self):
+        """Test that Document.of wraps text but passes documents through."""
+        doc = Document("body")
+
+        assert Document.of(doc) is doc
+        assert Document.of(None).text == ""
+
+
+class TestDocumentConsumers:
+    """Test that the detector and analyzers accept a shared Document."""
+
+    def test_detector_accepts_document(self):
+        """Test detection results are the same for text and Document."""
+        detector = CopilotDetector()
+        text = "Implemented with GitHub Copilot suggestions"
+
+        from_text = detector.detect_in_text(text, "pr", "1")
+        from_doc = detector.detect_in_text(Document(text), "pr", "1")
+
+        assert from_doc == from_text
+        assert len(from_doc) == 1
+
+    def test_prompt_analyzer_accepts_document(self):
+        """Test prompt analysis is the same for text and Document."""
+        analyzer = PromptAnalyzer()
+        text = "We must avoid breaking the existing API, e.g. in file api.py.\n1. Add tests"
+
+        assert analyzer.analyze_prompt(Document(text)) == analyzer.analyze_prompt(text)
+
+    def test_prompt_analyzer_non_ascii_identifier(self):
+        """Test that a dotted capital I does not make an identifier count as a number."""
+        analyzer = PromptAnalyzer()
+
+        assert analyzer.analyze_prompt("Rename İ2 to idx") == analyzer.analyze_prompt(
+            "Rename X2 to idx"
+        )
+
+    def test_pr_analyzer_shares_document(self):
+        """Test PR categorization and extraction from one Document."""
+        analyzer = PRAnalyzer()
+        doc = Document("## Problem\nThe parser crashes on empty input files.\n- [x] Fix bug")
+
+        assert analyzer.categorize_pr("Fix parser", doc) == "fix"
+        assert analyzer.extract_problem_statement(doc).startswith("The parser crashes")
+        assert analyzer.extract_checklist(doc) == [{"text": "Fix bug", "completed": True}]
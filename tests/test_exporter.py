@@ -0,0 +1,148 @@
+"""
+Tests for structured result export.
+"""
+
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+from llmdev.config import Config
+from llmdev.detector import Detection, DetectionStore
+from llmdev.exporter import SCHEMA_VERSION, ResultExporter
+
+
+def _results():
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return {
+        "repository": {"owner": "test", "name": "repo", "full_name": "test/repo"},
+        "commits": [
+            {
+                "sha": "abc123",
+                "message": "Add feature",
+                "author": "dev",
+                "author_email": "dev@example.com",
+                "date": created,
+                "url": "https://github.com/test/repo/commit/abc123",
+            }
+        ],
+        "prs": [
+            {
+                "number": 42,
+                "title": "Add endpoint",
+                "body": "Made with copilot",
+                "author": "dev",
+                "state": "closed",
+                "created_at": created,
+                "updated_at": created,
+                "merged": True,
+                "merged_at": datetime(2024, 1, 1, 3, 30, tzinfo=timezone.utc),
+                "url": "https://github.com/test/repo/pull/42",
+                "comments": [
+                    {
+                        "type": "issue_comment",
+                        "body": "LGTM",
+                        "author": "rev",
+                        "created_at": created,
+                    }
+                ],
+            }
+        ],
+        "issues": [],
+        "detections": DetectionStore(
+            [
+                Detection(
+                    "pr", "42", "explicit_mention", 0.95, "Made with copilot", {"tool": "copilot"}
+                )
+            ]
+        ),
+        "deep_analysis": {
+            "pr_analyses": [
+                {
+                    "number": 42,
+                    "title": "Add endpoint",
+                    "category": "feature",
+                    "complexity_score": 2,
+                    "iteration_count": 1,
+                    "time_to_merge_hours": 3.5,
+                    "prompt_extraction": [{"type": "problem", "content": "x" * 30}],
+                    "checklist_items": [{"text": "a", "completed": True}],
+                    "iterations": {"pattern_type": "quick_win", "refinement_count": 0},
+                }
+            ]
+        },
+    }
+
+
+class TestResultExporter:
+    """Test cases for ResultExporter."""
+
+    def test_jsonl_export(self, tmp_path):
+        """Test that every table is written as JSONL with schema versions."""
+        written = ResultExporter(Config(output_dir=tmp_path)).export(_results(), ["jsonl"])
+
+        prs = [json.loads(line) for line in written["prs.jsonl"].read_text().splitlines()]
+        comments = [json.loads(line) for line in written["comments.jsonl"].read_text().splitlines()]
+        detections = [
+            json.loads(line) for line in written["detections.jsonl"].read_text().splitlines()
+        ]
+        deep = [
+            json.loads(line) for line in written["deep_analysis.jsonl"].read_text().splitlines()
+        ]
+
+        assert prs[0]["schema_version"] == SCHEMA_VERSION
+        assert prs[0]["repository"] == "test/repo"
+        assert prs[0]["comment_count"] == 1
+        assert prs[0]["merged_at"] == "2024-01-01T03:30:00+00:00"
+        assert "comments" not in prs[0]
+        assert comments[0]["source_type"] == "pr"
+        assert comments[0]["source_number"] == 42
+        assert detections[0]["tool"] == "copilot"
+        assert deep[0]["pattern_type"] == "quick_win"
+        assert deep[0]["checklist_completed"] == 1
+        assert written["issues.jsonl"].read_text() == ""
+
+    def test_manifest(self, tmp_path):
+        """Test that the manifest records schema version and row counts."""
+        written = ResultExporter(Config(output_dir=tmp_path)).export(_results(), ["jsonl"])
+
+        manifest = json.loads(written["manifest.json"].read_text())
+
+        assert manifest["schema_version"] == SCHEMA_VERSION
+        assert manifest["tables"]["commits"]["rows"] == 1
+        assert manifest["tables"]["issues"]["rows"] == 0
+        assert "sha" in manifest["tables"]["commits"]["columns"]
+
+    def test_unknown_format(self, tmp_path):
+        """Test that unknown formats are rejected."""
+        with pytest.raises(ValueError):
+            ResultExporter(Config(output_dir=tmp_path)).export(_results(), ["csv"])
+
+    def test_parquet_export(self, tmp_path):
+        """Test Parquet export when pyarrow is installed."""
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        written = ResultExporter(Config(output_dir=tmp_path)).export(_results(), ["parquet"])
+
+        commits = pq.read_table(written["commits.parquet"]).to_pylist()
+        prs = pq.read_table(written["prs.parquet"]).to_pylist()
+        issues = pq.read_table(written["issues.parquet"])
+
+        assert commits[0]["sha"] == "abc123"
+        assert commits[0]["schema_version"] == SCHEMA_VERSION
+        assert prs[0]["merged_at"] - prs[0]["created_at"] == timedelta(hours=3, minutes=30)
+        assert issues.num_rows == 0
+        assert "number" in issues.column_names
+
+    def test_parquet_unparseable_timestamp(self, tmp_path):
+        """Test that timestamp strings that are not ISO format are exported as null."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        results = _results()
+        results["commits"][0]["date"] = "last Tuesday"
+        results["prs"][0]["created_at"] = "2024-01-01T00:00:00Z"
+
+        written = ResultExporter(Config(output_dir=tmp_path)).export(results, ["parquet"])
+
+        commits = pq.read_table(written["commits.parquet"]).to_pylist()
+        prs = pq.read_table(written["prs.parquet"]).to_pylist()
+        assert commits[0]["date"] is None
+        assert commits[0]["sha"] == "abc123"
+        assert prs[0]["created_at"] == datetime(2024, 1, 1, tzinfo=timezone.utc)
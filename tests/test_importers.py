@@ -0,0 +1,386 @@
+"""
+Tests for offline importers of GitHub data dumps.
+"""
+
+import io
+import gzip
+import json
+import tarfile
+import pytest
+from datetime import datetime, timezone
+from click.testing import CliRunner
+from llmdev.cli import cli
+from llmdev.importers import (
+    GHArchiveImporter,
+    GhApiImporter,
+    MigrationArchiveImporter,
+    iter_json_values,
+)
+from llmdev.records import CommitRecord, IssueRecord, PRRecord
+from llmdev.store import AnalysisStore
+
+CREATED = "2024-01-01T09:30:00Z"
+USER = {"login": "dev"}
+
+
+def _api_pr(number, **fields):
+    pr = {
+        "number": number,
+        "title": "Add endpoint",
+        "body": "Generated with GitHub Copilot",
+        "user": USER,
+        "state": "closed",
+        "created_at": CREATED,
+        "updated_at": CREATED,
+        "merged_at": "2024-01-02T00:00:00Z",
+        "html_url": f"https://github.com/test/repo/pull/{number}",
+        "head": {"ref": "feature"},
+        "issue_url": f"https://api.github.com/repos/test/repo/issues/{number}",
+    }
+    pr.update(fields)
+    return pr
+
+
+def _api_issue(number, **fields):
+    issue = {
+        "number": number,
+        "title": "Bug",
+        "body": "It breaks",
+        "user": {"login": "user"},
+        "state": "open",
+        "created_at": CREATED,
+        "updated_at": CREATED,
+        "html_url": f"https://github.com/test/repo/issues/{number}",
+    }
+    issue.update(fields)
+    return issue
+
+
+def _api_comment(number, body, **fields):
+    comment = {
+        "id": hash((number, body)),
+        "body": body,
+        "user": {"login": "reviewer"},
+        "created_at": CREATED,
+        "issue_url": f"https://api.github.com/repos/test/repo/issues/{number}",
+    }
+    comment.update(fields)
+    return comment
+
+
+def _api_commit(sha):
+    return {
+        "sha": sha,
+        "commit": {
+            "message": "Add parser\n\nCo-authored-by: Copilot <copilot@github.com>",
+            "author": {"name": "Dev", "email": "dev@example.com", "date": CREATED},
+        },
+        "html_url": f"https://github.com/test/repo/commit/{sha}",
+    }
+
+
+def _write_pages(path, pages):
+    path.write_text("".join(json.dumps(page) for page in pages))
+    return path
+
+
+class TestJsonValues:
+    """Test cases for reading concatenated JSON."""
+
+    def test_paginated_pages(self, tmp_path, monkeypatch):
+        """Test that pages split across read chunks are all decoded."""
+        monkeypatch.setattr("llmdev.importers.READ_CHUNK_SIZE", 7)
+        path = _write_pages(tmp_path / "pulls.json", [[{"a": 1}, {"a": 2}], [{"a": 3}], 42])
+
+        assert list(iter_json_values(path)) == [[{"a": 1}, {"a": 2}], [{"a": 3}], 42]
+
+    def test_json_lines_and_gzip(self, tmp_path):
+        """Test JSON lines in a gzipped file."""
+        path = tmp_path / "items.jsonl.gz"
+        with gzip.open(path, "wt") as f:
+            f.write('{"a": 1}\n{"a": 2}\n')
+
+        assert list(iter_json_values(path)) == [{"a": 1}, {"a": 2}]
+
+    def test_invalid_json(self, tmp_path):
+        """Test that malformed input raises ValueError."""
+        path = tmp_path / "broken.json"
+        path.write_text('[{"a": 1}')
+
+        with pytest.raises(ValueError, match="broken.json"):
+            list(iter_json_values(path))
+
+
+class TestGhApiImporter:
+    """Test cases for importing gh api output."""
+
+    def test_records_match_collectors(self, tmp_path):
+        """Test that dumps of several endpoints become the collectors' records."""
+        _write_pages(
+            tmp_path / "repo.json",
+            [{"full_name": "test/repo", "stargazers_count": 3, "forks_count": 1}],
+        )
+        _write_pages(tmp_path / "pulls.json", [[_api_pr(42)], [_api_pr(43, merged_at=None)]])
+        _write_pages(
+            tmp_path / "issues.json", [[_api_issue(7), {"number": 42, "pull_request": {}}]]
+        )
+        _write_pages(tmp_path / "commits.json", [[_api_commit("abc123")]])
+        _write_pages(
+            tmp_path / "comments.json",
+            [
+                [_api_comment(42, "LGTM"), _api_comment(7, "Same here")],
+                [
+                    _api_comment(
+                        42,
+                        "Nit",
+                        issue_url=None,
+                        pull_request_url="https://api.github.com/repos/test/repo/pulls/42",
+                        diff_hunk="@@",
+                        path="x.py",
+                    )
+                ],
+            ],
+        )
+
+        collected = GhApiImporter([tmp_path]).collect()
+
+        assert collected["repository"]["full_name"] == "test/repo"
+        assert collected["repository"]["stars"] == 3
+        (commit,) = collected["commits"]
+        assert isinstance(commit, CommitRecord) and commit["author_email"] == "dev@example.com"
+        pr, unmerged = collected["prs"]
+        assert isinstance(pr, PRRecord)
+        assert pr["merged"] and not unmerged["merged"]
+        assert pr["created_at"] == datetime(2024, 1, 1, 9, 30, tzinfo=timezone.utc)
+        assert pr["author"] == "dev"
+        assert pr["comments"] == [
+            {
+                "type": "issue_comment",
+                "body": "LGTM",
+                "author": "reviewer",
+                "created_at": pr["created_at"],
+            },
+            {
+                "type": "review_comment",
+                "body": "Nit",
+                "author": "reviewer",
+                "created_at": pr["created_at"],
+                "path": "x.py",
+            },
+        ]
+        (issue,) = collected["issues"]
+        assert isinstance(issue, IssueRecord)
+        assert issue["comments"] == [
+            {"body": "Same here", "author": "reviewer", "created_at": issue["created_at"]}
+        ]
+
+    def test_repository_from_urls(self, tmp_path):
+        """Test that the repository is taken from item URLs without a repository dump."""
+        path = _write_pages(tmp_path / "pulls.json", [[_api_pr(1)]])
+
+        assert GhApiImporter([path]).collect()["repository"]["full_name"] == "test/repo"
+        with pytest.raises(ValueError):
+            GhApiImporter([_write_pages(tmp_path / "empty.json", [[]])]).collect()
+
+
+class TestMigrationArchiveImporter:
+    """Test cases for importing migration archives."""
+
+    def _archive(self, tmp_path):
+        documents = {
+            "repositories_000001.json": [
+                {"type": "repository", "url": "https://github.com/test/repo", "description": "Test"}
+            ],
+            "pull_requests_000001.json": [
+                {
+                    "type": "pull_request",
+                    "url": "https://github.com/test/repo/pull/5",
+                    "user": "https://github.com/dev",
+                    "title": "Add endpoint",
+                    "body": "Generated with GitHub Copilot",
+                    "created_at": "2024-01-01T09:30:00.000+00:00",
+                    "closed_at": "2024-01-02T09:30:00.000+00:00",
+                    "merged_at": "2024-01-02T09:30:00.000+00:00",
+                }
+            ],
+            "issues_000001.json": [
+                {
+                    "type": "issue",
+                    "url": "https://github.com/test/repo/issues/6",
+                    "user": "https://github.com/user",
+                    "title": "Bug",
+                    "body": "It breaks",
+                    "created_at": "2024-01-01T09:30:00.000+00:00",
+                    "closed_at": None,
+                }
+            ],
+            "issue_comments_000001.json": [
+                {
+                    "type": "issue_comment",
+                    "pull_request": "https://github.com/test/repo/pull/5",
+                    "user": "https://github.com/reviewer",
+                    "body": "LGTM",
+                    "created_at": "2024-01-01T10:00:00.000+00:00",
+                },
+                {
+                    "type": "issue_comment",
+                    "issue": "https://github.com/test/repo/issues/6",
+                    "user": "https://github.com/reviewer",
+                    "body": "Confirmed",
+                    "created_at": "2024-01-01T10:00:00.000+00:00",
+                },
+            ],
+            "pull_request_review_comments_000001.json": [
+                {
+                    "type": "pull_request_review_comment",
+                    "pull_request": "https://github.com/test/repo/pull/5",
+                    "user": "https://github.com/reviewer",
+                    "body": "Nit",
+                    "path": "x.py",
+                    "created_at": "2024-01-01T10:00:00.000+00:00",
+                }
+            ],
+        }
+        path = tmp_path / "migration.tar.gz"
+        with tarfile.open(path, "w:gz") as archive:
+            for name, document in documents.items():
+                data = json.dumps(document).encode("utf-8")
+                info = tarfile.TarInfo(f"export/{name}")
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        return path
+
+    def test_archive(self, tmp_path):
+        """Test that archived PRs and issues become records with their comments."""
+        collected = MigrationArchiveImporter([self._archive(tmp_path)]).collect()
+
+        assert collected["repository"]["full_name"] == "test/repo"
+        assert collected["repository"]["description"] == "Test"
+        assert collected["commits"] == []
+        (pr,) = collected["prs"]
+        assert (pr["number"], pr["author"], pr["state"], pr["merged"]) == (5, "dev", "closed", True)
+        assert [c["type"] for c in pr["comments"]] == ["issue_comment", "review_comment"]
+        assert pr["comments"][1]["path"] == "x.py"
+        (issue,) = collected["issues"]
+        assert (issue["number"], issue["state"]) == (6, "open")
+        assert issue["comments"][0]["body"] == "Confirmed"
+        assert "type" not in issue["comments"][0]
+
+
+class TestGHArchiveImporter:
+    """Test cases for importing GH Archive events."""
+
+    def _events(self, tmp_path):
+        repo = {"name": "test/repo"}
+        events = [
+            {"type": "WatchEvent", "repo": {"name": "other/repo"}, "payload": {}},
+            {
+                "type": "PullRequestEvent",
+                "repo": repo,
+                "payload": {"action": "opened", "pull_request": _api_pr(1, state="open")},
+            },
+            {
+                "type": "PullRequestEvent",
+                "repo": repo,
+                "payload": {"action": "closed", "pull_request": _api_pr(1, merged=True)},
+            },
+            {
+                "type": "IssueCommentEvent",
+                "repo": repo,
+                "payload": {
+                    "action": "created",
+                    "issue": _api_issue(1, pull_request={"merged_at": None}),
+                    "comment": {"id": 10, "body": "LGTM", "user": USER, "created_at": CREATED},
+                },
+            },
+            {
+                "type": "IssueCommentEvent",
+                "repo": repo,
+                "payload": {
+                    "action": "created",
+                    "issue": _api_issue(2, pull_request={"merged_at": CREATED}),
+                    "comment": {"id": 11, "body": "Thanks", "user": USER, "created_at": CREATED},
+                },
+            },
+            {
+                "type": "IssueCommentEvent",
+                "repo": repo,
+                "payload": {
+                    "action": "created",
+                    "issue": _api_issue(3),
+                    "comment": {"id": 12, "body": "Spam", "user": USER, "created_at": CREATED},
+                },
+            },
+            {
+                "type": "IssueCommentEvent",
+                "repo": repo,
+                "payload": {"action": "deleted", "issue": _api_issue(3), "comment": {"id": 12}},
+            },
+            {
+                "type": "PushEvent",
+                "repo": repo,
+                "created_at": CREATED,
+                "payload": {
+                    "commits": [
+                        {
+                            "sha": "abc123",
+                            "message": "Fix\n\nCo-authored-by: Copilot <copilot@github.com>",
+                            "author": {"name": "Dev", "email": "dev@example.com"},
+                        }
+                    ]
+                },
+            },
+        ]
+        path = tmp_path / "2024-01-01-9.json.gz"
+        with gzip.open(path, "wt") as f:
+            f.writelines(json.dumps(event) + "\n" for event in events)
+        return path
+
+    def test_events(self, tmp_path):
+        """Test that events of the repository become records in their latest state."""
+        collected = GHArchiveImporter([self._events(tmp_path)], "test/repo").collect()
+
+        first, second = collected["prs"]
+        assert (first["number"], first["state"], first["merged"]) == (1, "closed", True)
+        assert [c["body"] for c in first["comments"]] == ["LGTM"]
+        assert (second["number"], second["merged"]) == (2, True)
+        (issue,) = collected["issues"]
+        assert issue["number"] == 3 and issue["comments"] == []
+        (commit,) = collected["commits"]
+        assert commit["url"] == "https://github.com/test/repo/commit/abc123"
+        assert commit["date"] == datetime(2024, 1, 1, 9, 30, tzinfo=timezone.utc)
+
+    def test_repository_required(self, tmp_path):
+        """Test that GH Archive imports need the repository name."""
+        with pytest.raises(ValueError):
+            GHArchiveImporter([tmp_path])
+
+
+class TestImportCommand:
+    """Test cases for the import command."""
+
+    def test_import_then_store(self, tmp_path):
+        """Test that imported data lands in the analysis store for offline analysis."""
+        path = _write_pages(tmp_path / "pulls.json", [[_api_pr(42)]])
+        store_path = tmp_path / "store.db"
+
+        result = CliRunner().invoke(
+            cli, ["import", "gh-api", str(path), "--store", str(store_path)]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "test/repo" in result.output
+        with AnalysisStore(store_path) as store:
+            (pr,) = store.load_collection("test/repo")["prs"]
+        assert pr["body"] == "Generated with GitHub Copilot"
+
+    def test_import_error(self, tmp_path):
+        """Test that a GH Archive import without a repository fails cleanly."""
+        path = _write_pages(tmp_path / "events.json", [])
+
+        result = CliRunner().invoke(
+            cli, ["import", "gharchive", str(path), "--store", str(tmp_path / "store.db")]
+        )
+
+        assert result.exit_code == 1
+        assert "owner/repo" in result.output
@@ -5,8 +5,8 @@ Integration tests for llmdev using mock data.
 import pytest
 from pathlib import Path
 from datetime import datetime
-from llmdev.detector import CopilotDetector, Detection
-from llmdev.reporter import ReportGenerator
+from llmdev.detector import CopilotDetector, Detection, DetectionStore
+from llmdev.reporter import ReportGenerator, ReportIndex
 from llmdev.config import Config
 
 
@@ -182,3 +182,126 @@ class TestIntegration:
         content = report_path.read_text()
         assert "**Total Copilot Detections:** 0" in content
         assert "No Copilot usage detected" in content
+
+
+class TestReportIndex:
+    """Tests for the report lookup tables."""
+
+    def test_index_resolves_records_and_groups_detections(self):
+        """Test that records are found by SHA or number and detections are grouped."""
+        results = {
+            "commits": [{"sha": "abc123", "url": "https://example.com/c/abc123"}],
+            "prs": [{"number": 42, "url": "https://example.com/pull/42"}],
+            "issues": [{"number": 10, "url": "https://example.com/issues/10"}],
+            "detections": [
+                Detection("pr", "42", "explicit_mention", 0.95, "copilot"),
+                Detection("commit", "abc123", "explicit_mention", 0.95, "copilot"),
+                Detection("pr", "7", "explicit_mention", 0.95, "copilot"),
+            ],
+        }
+
+        index = ReportIndex(results)
+
+        assert index.record("commit", "abc123")["url"].endswith("abc123")
+        assert index.record("pr", "42")["url"].endswith("/42")
+        assert index.record("issue", "10")["url"].endswith("/10")
+        assert index.record("pr", "7") is None
+        assert [d.source_id for d in index.iter_detections("pr")] == ["42", "7"]
+        assert [d.source_id for d in index.iter_detections("pr", limit=1)] == ["42"]
+        assert index.count("pr") == 2
+        assert index.count("issue") == 0
+
+
+class TestStreamingReport:
+    """Tests for the streaming report writer."""
+
+    def _results(self, detection_count):
+        detections = [
+            Detection("pr", str(i), "explicit_mention", 0.95, f"copilot {i}")
+            for i in range(detection_count)
+        ]
+        return {
+            "repository": {
+                "owner": "test",
+                "name": "repo",
+                "full_name": "test/repo",
+                "description": "",
+                "stars": 1,
+                "forks": 1,
+                "created_at": datetime(2024, 1, 1),
+                "updated_at": datetime(2024, 1, 2),
+            },
+            "analysis": {
+                "timestamp": datetime(2024, 1, 3),
+                "commits_analyzed": 0,
+                "prs_analyzed": detection_count,
+                "issues_analyzed": 0,
+            },
+            "commits": [],
+            "prs": [{"number": i, "url": f"https://example.com/pull/{i}"} for i in range(3)],
+            "issues": [],
+            "detections": DetectionStore(detections),
+            "summary": CopilotDetector().get_summary(detections),
+        }
+
+    def test_written_file_matches_rendered_markdown(self, tmp_path):
+        """Test that the streamed file is identical to the joined markdown."""
+        reporter = ReportGenerator(Config(output_dir=tmp_path))
+        results = self._results(25)
+
+        report_path = reporter.generate(results)
+
+        assert report_path.read_text() == reporter._generate_markdown(results)
+
+    def test_default_limit_truncates_findings(self, tmp_path):
+        """Test that the default configuration lists ten detections per source."""
+        content = ReportGenerator(Config(output_dir=tmp_path))._generate_markdown(
+            self._results(25)
+        )
+
+        assert content.count("- **PR #") == 10
+        assert "*... and 15 more PR detections*" in content
+
+    def test_full_findings_listing(self, tmp_path):
+        """Test that a None limit lists every detection."""
+        config = Config(output_dir=tmp_path, report_findings_limit=None)
+        content = ReportGenerator(config)._generate_markdown(self._results(25))
+
+        assert content.count("- **PR #") == 25
+        assert "more PR detections" not in content
+        assert "https://example.com/pull/2" in content
+
+    def test_distribution_table(self, tmp_path):
+        """Test that sketched PR metric quantiles are rendered as a table."""
+        reporter = ReportGenerator(Config(output_dir=tmp_path))
+        results = self._results(0)
+        results["deep_analysis"] = {
+            "distributions": {
+                "time_to_merge_hours": {"count": 2, "p50": 4.0, "p90": 9.0, "p99": 9.5, "max": 9.5},
+                "comment_count": {"count": 0},
+            }
+        }
+
+        markdown = reporter._generate_markdown(results)
+
+        assert "| Time to merge (hours) | 4.0 | 9.0 | 9.5 | 9.5 |" in markdown
+        assert "Comments per PR" not in markdown
+
+    def test_prompt_template_section(self, tmp_path):
+        """Test that reused prompt templates are listed under prompt analysis."""
+        reporter = ReportGenerator(Config(output_dir=tmp_path))
+        results = self._results(0)
+        results["deep_analysis"] = {
+            "prompt_patterns": {"total_prompts": 4, "average_specificity": 0.5},
+            "prompt_templates": {
+                "template_reuse_rate": 75.0,
+                "distinct_templates": 2,
+                "group_count": 1,
+                "groups": [{"size": 3, "sample": "Fix the\nfailing tests", "members": []}],
+            },
+        }
+
+        markdown = reporter._generate_markdown(results)
+
+        assert "**Template Reuse Rate:** 75.0%" in markdown
+        assert "- **3 prompts:** Fix the failing tests" in markdown
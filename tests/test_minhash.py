@@ -0,0 +1,107 @@
+"""
+Tests for MinHash near-duplicate detection.
+"""
+
+import pytest
+from llmdev import minhash
+from llmdev.analyzers import PromptAnalyzer
+from llmdev.minhash import MinHasher, NearDuplicateIndex, similarity
+
+TEMPLATE = (
+    "You are working on the {name} service. Fix the failing tests in the "
+    "integration suite, keep the public API unchanged and add a regression "
+    "test for the reported crash before opening the pull request."
+)
+
+
+class TestMinHasher:
+    """Test cases for MinHasher."""
+
+    def test_case_and_punctuation_are_ignored(self):
+        """Test that equivalent texts get identical signatures."""
+        hasher = MinHasher()
+
+        assert hasher.signature("Fix the parser, then add tests!") == hasher.signature(
+            "fix the PARSER then add tests"
+        )
+
+    def test_similarity_estimates(self):
+        """Test that similar texts score high and unrelated texts low."""
+        hasher = MinHasher()
+        first = hasher.signature(TEMPLATE.format(name="billing"))
+        second = hasher.signature(TEMPLATE.format(name="shipping"))
+        other = hasher.signature("Update the README with installation steps for Windows users")
+
+        assert similarity(first, second) > 0.7
+        assert similarity(first, other) < 0.1
+
+    def test_python_path_matches_numpy(self, monkeypatch):
+        """Test that signatures do not depend on numpy being installed."""
+        pytest.importorskip("numpy")
+        hasher = MinHasher()
+        texts = [TEMPLATE.format(name=str(i)) for i in range(5)] + ["short", ""]
+        batched = hasher.signatures(texts)
+
+        monkeypatch.setattr(minhash, "np", None)
+
+        assert hasher.signatures(texts) == batched
+
+
+class TestNearDuplicateIndex:
+    """Test cases for NearDuplicateIndex."""
+
+    def _prompts(self):
+        templated = [(TEMPLATE.format(name=f"service-{i}"), i) for i in range(6)]
+        distinct = [
+            ("Add a dark mode toggle to the settings page of the web dashboard", 10),
+            ("Migrate the nightly export job from cron to the workflow scheduler", 11),
+        ]
+        return templated + distinct
+
+    def test_groups_near_duplicates(self):
+        """Test that templated prompts form one group and others stay apart."""
+        summary = NearDuplicateIndex().extend(self._prompts()).finalize()
+
+        assert summary["total_prompts"] == 8
+        assert summary["group_count"] == 1
+        assert summary["duplicate_prompts"] == 6
+        assert summary["distinct_templates"] == 3
+        assert summary["template_reuse_rate"] == pytest.approx(75.0)
+        group = summary["groups"][0]
+        assert group["members"] == [0, 1, 2, 3, 4, 5]
+        assert group["sample"].startswith("You are working on the service-0")
+
+    def test_merge_preserves_groups(self):
+        """Test that merging shard indexes equals indexing everything at once."""
+        prompts = self._prompts()
+        whole = NearDuplicateIndex().extend(prompts).finalize()
+
+        merged = NearDuplicateIndex().extend(prompts[::2])
+        merged.merge(NearDuplicateIndex().extend(prompts[1::2]))
+        summary = merged.finalize()
+
+        assert summary["group_count"] == whole["group_count"]
+        assert summary["duplicate_prompts"] == whole["duplicate_prompts"]
+        assert sorted(summary["groups"][0]["members"]) == whole["groups"][0]["members"]
+
+    def test_empty_index(self):
+        """Test the summary of an empty index."""
+        summary = NearDuplicateIndex().finalize()
+
+        assert summary["total_prompts"] == 0
+        assert summary["template_reuse_rate"] == 0
+        assert summary["groups"] == []
+
+    def test_bands_must_divide_signature(self):
+        """Test validation of the band layout."""
+        with pytest.raises(ValueError):
+            NearDuplicateIndex(bands=3)
+
+    def test_prompt_analyzer_finds_templates(self):
+        """Test the PromptAnalyzer entry point on plain texts."""
+        texts = [text for text, _ in self._prompts()]
+
+        summary = PromptAnalyzer().find_prompt_templates(texts)
+
+        assert summary["groups"][0]["size"] == 6
+        assert summary["groups"][0]["members"] == [None] * 6
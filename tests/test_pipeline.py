@@ -0,0 +1,172 @@
+"""
+Tests for the staged analysis pipeline.
+"""
+
+import json
+import pytest
+from llmdev.analyzer import RepositoryAnalyzer
+from llmdev.config import Config
+from llmdev.pipeline import Pipeline
+from llmdev.rules import DEFAULT_RULES_PATH
+from llmdev.store import AnalysisStore
+from tests.test_store import _collected
+
+
+def _pipeline(tmp_path, **kwargs):
+    """A pipeline over local directories whose collect stage counts its calls."""
+    config = Config(
+        output_dir=tmp_path / "output",
+        store_path=tmp_path / "store.db",
+        search_index_path=None,
+        stage_cache_dir=tmp_path / "stages",
+        memo_dir=tmp_path / "memo",
+        **kwargs,
+    )
+    config.output_dir.mkdir()
+    analyzer = RepositoryAnalyzer(config)
+    calls = []
+
+    def collect(owner, repo):
+        calls.append((owner, repo))
+        return _collected()
+
+    analyzer.collect = collect
+    return Pipeline(config, analyzer), calls
+
+
+class TestPipeline:
+    """Test cases for Pipeline."""
+
+    def test_unchanged_stages_are_reused(self, tmp_path):
+        """Test that a second run collects again but reuses every later stage."""
+        pipeline, calls = _pipeline(tmp_path)
+
+        first = pipeline.run("test", "repo")
+        second = pipeline.run("test", "repo")
+
+        assert set(first.values()) == {"ran"}
+        assert second.pop("collect") == "ran"
+        assert set(second.values()) == {"cached"}
+        assert len(calls) == 2
+        assert pipeline.output("report")["report"].exists()
+        assert len(pipeline.output("detect")["detections"]) > 0
+
+    def test_output_hash_ignores_pickle_layout(self, tmp_path):
+        """Test that equal collected data built in a different order keeps later stages cached."""
+        pipeline, _ = _pipeline(tmp_path)
+        pipeline.run("test", "repo", until="detect")
+
+        def collect(owner, repo):
+            collected = _collected()
+            return {key: collected[key] for key in reversed(list(collected))}
+
+        pipeline.analyzer.collect = collect
+        statuses = pipeline.run("test", "repo", until="detect")
+
+        assert statuses == {"collect": "ran", "normalize": "cached", "detect": "cached"}
+
+    def test_changed_data_reruns_later_stages(self, tmp_path):
+        """Test that newly collected data is analyzed instead of the cached collection."""
+        pipeline, _ = _pipeline(tmp_path)
+        pipeline.run("test", "repo", until="detect")
+
+        collected = _collected()
+        collected["prs"][0]["title"] = "Retitled"
+        pipeline.analyzer.collect = lambda owner, repo: collected
+        statuses = pipeline.run("test", "repo", until="detect")
+
+        assert set(statuses.values()) == {"ran"}
+        assert pipeline.output("normalize")["prs"][0]["title"] == "Retitled"
+
+    def test_deleted_report_is_written_again(self, tmp_path):
+        """Test that a cached report stage reruns when its report file is gone."""
+        pipeline, _ = _pipeline(tmp_path)
+        pipeline.run("test", "repo")
+        report_path = pipeline.output("report")["report"]
+        report_path.unlink()
+
+        statuses = pipeline.run("test", "repo")
+
+        assert statuses["aggregate"] == "cached"
+        assert statuses["report"] == "ran"
+        assert report_path.exists()
+
+    def test_rule_change_reruns_detection_only(self, tmp_path):
+        """Test that editing detection rules reruns detection but not normalization."""
+        rules_path = tmp_path / "rules.json"
+        rules_path.write_text(DEFAULT_RULES_PATH.read_text())
+        pipeline, calls = _pipeline(tmp_path, detection_rules_path=rules_path)
+        pipeline.run("test", "repo")
+
+        # A change that leaves the detections identical stops at detection
+        rules = json.loads(rules_path.read_text())
+        rules["version"] = rules.get("version", 1) + 1
+        rules_path.write_text(json.dumps(rules))
+        statuses = pipeline.run("test", "repo")
+
+        assert statuses == {
+            "collect": "ran",
+            "normalize": "cached",
+            "detect": "ran",
+            "deep": "cached",
+            "aggregate": "cached",
+            "report": "cached",
+        }
+
+        rules["rules"] = []
+        rules_path.write_text(json.dumps(rules))
+        statuses = pipeline.run("test", "repo")
+
+        assert [stage for stage, status in statuses.items() if status == "ran"] == [
+            "collect",
+            "detect",
+            "aggregate",
+            "report",
+        ]
+        assert len(calls) == 3
+
+    def test_rerun_from_stage(self, tmp_path):
+        """Test forcing a stage and everything after it, reusing the collection."""
+        pipeline, calls = _pipeline(tmp_path, deep_analysis=True)
+        pipeline.run("test", "repo")
+
+        statuses = pipeline.run("test", "repo", rerun_from="deep")
+
+        assert [stage for stage, status in statuses.items() if status == "ran"] == [
+            "deep",
+            "aggregate",
+            "report",
+        ]
+        assert len(calls) == 1
+        assert pipeline.output("aggregate")["deep_analysis"]["pr_analyses"][0]["number"] == 42
+
+    def test_single_stage(self, tmp_path):
+        """Test running one stage on the cached outputs of its inputs."""
+        pipeline, _ = _pipeline(tmp_path)
+        with pytest.raises(ValueError):
+            pipeline.run("test", "repo", only="detect")
+
+        pipeline.run("test", "repo", until="normalize")
+        statuses = pipeline.run("test", "repo", only="detect")
+
+        assert statuses == {"collect": "skipped", "normalize": "cached", "detect": "ran"}
+
+    def test_offline_reads_store(self, tmp_path):
+        """Test that offline runs skip collection and reuse unchanged results."""
+        pipeline, calls = _pipeline(tmp_path)
+        with AnalysisStore(tmp_path / "store.db") as store:
+            store.save_collection(_collected())
+
+        first = pipeline.run("test", "repo", until="detect", offline=True)
+        second = pipeline.run("test", "repo", until="detect", offline=True)
+
+        assert first == {"collect": "skipped", "normalize": "ran", "detect": "ran"}
+        assert second == {"collect": "skipped", "normalize": "ran", "detect": "cached"}
+        assert calls == []
+
+    def test_unknown_stage(self, tmp_path):
+        """Test that stage names are validated."""
+        pipeline, _ = _pipeline(tmp_path)
+
+        with pytest.raises(ValueError):
+            pipeline.run("test", "repo", rerun_from="fetch")
@@ -0,0 +1,250 @@
+"""
+Tests for compact collected record types.
+"""
+
+import gc
+import json
+import pickle
+import pytest
+import tracemalloc
+from datetime import datetime
+from types import SimpleNamespace
+from llmdev.analyzer import RepositoryAnalyzer
+from llmdev.cache import content_hash
+from llmdev.config import Config
+from llmdev.records import CommentRecord, CommitRecord, PRRecord
+
+
+def _pr_dict(number=42):
+    return {
+        "number": number,
+        "title": "Add endpoint",
+        "body": "Generated with GitHub Copilot",
+        "author": "dev",
+        "state": "closed",
+        "created_at": datetime(2024, 1, 1),
+        "updated_at": datetime(2024, 1, 1),
+        "merged": True,
+        "merged_at": None,
+        "url": f"https://github.com/test/repo/pull/{number}",
+        "comments": [
+            {"type": "issue_comment", "body": "LGTM", "author": "a", "created_at": None},
+            {"type": "review_comment", "body": "Nit", "author": "b", "path": "x.py"},
+        ],
+    }
+
+
+def _api_payloads(count):
+    """JSON payloads shaped like the GitHub API responses the collectors read."""
+    authors = [f"Developer {n}" for n in range(40)]
+    commits, prs = [], []
+    for n in range(count):
+        author = authors[n % len(authors)]
+        sha = f"{n * 2654435761:040x}"
+        commits.append(
+            json.dumps(
+                {
+                    "sha": sha,
+                    "message": f"Refactor parser to share tokenizer state (#{n})",
+                    "author": author,
+                    "author_email": author.lower().replace(" ", ".") + "@example.com",
+                    "date": f"2024-01-{n % 28 + 1:02d}T10:00:00+00:00",
+                    "url": f"https://github.com/owner/repo/commit/{sha}",
+                }
+            )
+        )
+        prs.append(
+            json.dumps(
+                {
+                    "number": n,
+                    "title": f"Add endpoint {n}",
+                    "body": f"Fixes #{n}",
+                    "author": author,
+                    "state": "closed" if n % 3 else "open",
+                    "created_at": "2024-01-01T00:00:00+00:00",
+                    "updated_at": "2024-01-02T00:00:00+00:00",
+                    "merged": bool(n % 3),
+                    "merged_at": "2024-01-02T00:00:00+00:00",
+                    "url": f"https://github.com/owner/repo/pull/{n}",
+                    "comments": [
+                        {
+                            "type": "issue_comment",
+                            "body": "LGTM",
+                            "author": authors[(n + c) % len(authors)],
+                            "created_at": "2024-01-01T12:00:00+00:00",
+                        }
+                        for c in range(n % 4)
+                    ],
+                }
+            )
+        )
+    return commits, prs
+
+
+def _commit_dict(payload):
+    """A commit dictionary as the collector built it, with literal keys."""
+    data = json.loads(payload)
+    return {
+        "sha": data["sha"],
+        "message": data["message"],
+        "author": data["author"],
+        "author_email": data["author_email"],
+        "date": datetime.fromisoformat(data["date"]),
+        "url": data["url"],
+    }
+
+
+def _pr_from_payload(payload):
+    """A PR dictionary as the collector built it, with literal keys."""
+    data = json.loads(payload)
+    return {
+        "number": data["number"],
+        "title": data["title"],
+        "body": data["body"],
+        "author": data["author"],
+        "state": data["state"],
+        "created_at": datetime.fromisoformat(data["created_at"]),
+        "updated_at": datetime.fromisoformat(data["updated_at"]),
+        "merged": data["merged"],
+        "merged_at": datetime.fromisoformat(data["merged_at"]),
+        "url": data["url"],
+        "comments": [
+            {
+                "type": comment["type"],
+                "body": comment["body"],
+                "author": comment["author"],
+                "created_at": datetime.fromisoformat(comment["created_at"]),
+            }
+            for comment in data["comments"]
+        ],
+    }
+
+
+def _traced_size(build):
+    """Bytes still allocated by the objects that build() returns."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        built = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del built
+    return size
+
+
+class TestRecords:
+    """Test cases for Record types."""
+
+    def test_dict_compatible(self):
+        """Test that a record reads like the dictionary it was built from."""
+        data = _pr_dict()
+        pr = PRRecord.from_dict(data)
+
+        assert pr == data
+        assert data == pr
+        assert dict(pr)["title"] == "Add endpoint"
+        assert pr["number"] == 42
+        assert pr.get("body", "") == data["body"]
+        assert pr.get("unknown", "default") == "default"
+        assert "comments" in pr and "unknown" not in pr
+        assert set(pr.keys()) == set(data)
+        assert isinstance(pr["comments"][0], CommentRecord)
+        assert pr.to_dict() == data
+        assert type(pr.to_dict()["comments"][0]) is dict
+
+    def test_missing_fields_are_absent(self):
+        """Test that unset fields behave like missing keys."""
+        comment = CommentRecord(type="issue_comment", body="Hi")
+
+        assert "path" not in comment
+        assert comment.get("path") is None
+        assert len(comment) == 2
+        with pytest.raises(KeyError):
+            comment["path"]
+
+        comment["path"] = "x.py"
+        assert comment["path"] == "x.py"
+        del comment["path"]
+        assert "path" not in comment
+
+    def test_unknown_field_rejected(self):
+        """Test that setting a field the record type lacks raises KeyError."""
+        with pytest.raises(KeyError, match="labels"):
+            CommitRecord(sha="abc", labels=["bug"])
+
+    def test_interned_strings(self):
+        """Test that authors and states are shared between records."""
+        first = PRRecord(author="".join(["de", "v"]), state="".join(["op", "en"]))
+        second = PRRecord(author="".join(["d", "ev"]), state="".join(["o", "pen"]))
+
+        assert first["author"] is second["author"]
+        assert first["state"] is second["state"]
+
+    def test_pickle_round_trip(self):
+        """Test that records survive pickling, as used by worker processes and caches."""
+        pr = PRRecord.from_dict(_pr_dict())
+        restored = pickle.loads(pickle.dumps(pr))
+
+        assert type(restored) is PRRecord
+        assert restored == pr
+        assert "path" not in restored["comments"][0]
+
+    def test_content_hash_matches_dict(self):
+        """Test that records hash like dictionaries, so memoized results stay valid."""
+        assert content_hash(PRRecord.from_dict(_pr_dict()), []) == content_hash(_pr_dict(), [])
+
+    def test_smaller_than_dict(self):
+        """Test the deep footprint of a batch of records against plain dictionaries."""
+        commits, prs = _api_payloads(5000)
+        assert not hasattr(PRRecord.from_dict(_pr_dict()), "__dict__")
+
+        commit_dicts = _traced_size(lambda: [_commit_dict(p) for p in commits])
+        commit_records = _traced_size(lambda: [CommitRecord(**_commit_dict(p)) for p in commits])
+        pr_dicts = _traced_size(lambda: [_pr_from_payload(p) for p in prs])
+        pr_records = _traced_size(lambda: [PRRecord.from_dict(_pr_from_payload(p)) for p in prs])
+
+        # About 1.7x for commits and 1.9x for PRs; see the records module docstring
+        assert commit_dicts >= 1.6 * commit_records
+        assert pr_dicts >= 1.8 * pr_records
+
+
+class TestCollectedRecords:
+    """Test cases for records built by the collectors."""
+
+    def test_collectors_yield_records(self):
+        """Test that collected commits and PRs are records with the usual fields."""
+        analyzer = RepositoryAnalyzer(Config())
+        user = SimpleNamespace(login="dev")
+        pr = SimpleNamespace(
+            number=7,
+            title="Add parser",
+            body=None,
+            user=user,
+            state="open",
+            created_at=datetime(2024, 1, 1),
+            updated_at=datetime(2024, 1, 2),
+            merged=False,
+            merged_at=None,
+            html_url="https://github.com/test/repo/pull/7",
+        )
+        author = SimpleNamespace(name="Dev", email="dev@example.com", date=datetime(2024, 1, 1))
+        commit = SimpleNamespace(
+            sha="abc123",
+            commit=SimpleNamespace(message="Add parser", author=author),
+            html_url="https://github.com/test/repo/commit/abc123",
+        )
+        analyzer.github_client = SimpleNamespace(
+            get_pull_requests=lambda repository: [pr],
+            get_pr_comments=lambda pr: [{"type": "issue_comment", "body": "LGTM"}],
+            get_commits=lambda repository: [commit],
+        )
+
+        (pr_record,) = analyzer._collect_prs(None)
+        (commit_record,) = analyzer._collect_commits(None)
+
+        assert isinstance(pr_record, PRRecord)
+        assert pr_record["body"] == ""
+        assert pr_record["comments"] == [{"type": "issue_comment", "body": "LGTM"}]
+        assert isinstance(commit_record, CommitRecord)
+        assert commit_record["author_email"] == "dev@example.com"
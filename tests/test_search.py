@@ -0,0 +1,142 @@
+"""
+Tests for the full-text search index.
+"""
+
+import pytest
+from datetime import date, datetime, timezone
+from click.testing import CliRunner
+from llmdev.cli import cli
+from llmdev.search import SearchIndex, match_expression
+
+
+def _results(full_name="test/repo"):
+    return {
+        "repository": {"owner": "test", "name": "repo", "full_name": full_name},
+        "commits": [
+            {
+                "sha": "abc123",
+                "message": "Refactor login handler\n\nCo-authored-by: Copilot",
+                "author": "dev",
+                "date": datetime(2024, 1, 5, tzinfo=timezone.utc),
+                "url": "https://github.com/test/repo/commit/abc123",
+            }
+        ],
+        "prs": [
+            {
+                "number": 42,
+                "title": "Fix login timeout",
+                "body": "The session expired too early; generated with Copilot agent.",
+                "author": "alice",
+                "created_at": datetime(2024, 2, 1, 12, 0),
+                "url": "https://github.com/test/repo/pull/42",
+                "comments": [
+                    {"body": "Please add a regression test", "author": "bob"},
+                ],
+            }
+        ],
+        "issues": [
+            {
+                "number": 7,
+                "title": "Dashboard renders slowly",
+                "body": "Rendering the login dashboard takes seconds",
+                "author": "carol",
+                "created_at": "2024-03-10T08:00:00Z",
+                "url": "https://github.com/test/repo/issues/7",
+                "comments": [],
+            }
+        ],
+    }
+
+
+@pytest.fixture
+def index(tmp_path):
+    with SearchIndex(tmp_path / "search.db") as search_index:
+        search_index.index_results(_results())
+        search_index.index_results(_results("other/repo"))
+        yield search_index
+
+
+class TestSearchIndex:
+    """Test cases for SearchIndex."""
+
+    def test_indexes_every_source(self, index):
+        """Test that commits, PRs, issues and comments are indexed per repo."""
+        assert len(index) == 8
+        assert index.repositories() == {"other/repo": 4, "test/repo": 4}
+
+    def test_reindexing_replaces_documents(self, index):
+        """Test that indexing a repository again updates instead of duplicating."""
+        results = _results()
+        results["prs"][0]["body"] = "Rewritten description"
+        index.index_results(results)
+
+        assert len(index) == 8
+        assert index.search("rewritten", repo="test/repo")[0].source_id == "42"
+        assert not index.search("session", repo="test/repo")
+
+    def test_reindexing_drops_removed_documents(self, index):
+        """Test that texts missing from a new analysis are removed from the index."""
+        results = _results()
+        results["issues"] = []
+        index.index_results(results)
+
+        assert index.repositories() == {"other/repo": 4, "test/repo": 3}
+        assert not index.search("dashboard", repo="test/repo")
+        assert index.search("dashboard", repo="other/repo")
+
+    def test_ranked_and_scoped_search(self, index):
+        """Test BM25 ranking with title matches first and the scope filters."""
+        hits = index.search("login", repo="test/repo")
+
+        assert {hit.source_id for hit in hits[:2]} == {"42", "abc123"}
+        assert hits[2].source_type == "issue"
+        assert {hit.repo for hit in hits} == {"test/repo"}
+        assert [hit.source_id for hit in index.search("login", source_type="issue")] == ["7", "7"]
+        assert index.search("regression", author="bob")[0].source_type == "pr_comment"
+        assert "[dashboard]" in index.search("dashboard", repo="test/repo")[0].snippet
+
+    def test_date_filters(self, index):
+        """Test that since and until bound the creation time, inclusive of whole days."""
+        found = index.search("login", repo="test/repo", since=date(2024, 2, 1))
+        assert {hit.source_id for hit in found} == {"42", "7"}
+
+        found = index.search("login", repo="test/repo", until=date(2024, 2, 1))
+        assert {hit.source_id for hit in found} == {"abc123", "42"}
+
+    def test_query_syntax(self, index):
+        """Test plain terms are quoted and invalid FTS5 queries are reported."""
+        assert match_expression("copilot-agent login") == '"copilot-agent" "login"'
+        assert match_expression("log* OR session") == "log* OR session"
+        assert match_expression("title: login") == "title: login"
+        assert match_expression("fix: timeout") == '"fix:" "timeout"'
+        assert match_expression("subtitle:login") == '"subtitle:login"'
+        assert [hit.source_id for hit in index.search("title:timeout", repo="test/repo")] == ["42"]
+        assert index.search("fix: timeout", repo="test/repo")[0].source_id == "42"
+        assert index.search("co-authored-by")[0].source_type == "commit"
+        with pytest.raises(ValueError):
+            index.search("login AND")
+
+
+class TestSearchCommand:
+    """Test cases for the search command."""
+
+    def test_prints_hits(self, tmp_path):
+        """Test that the command lists matches from the local index."""
+        db_path = tmp_path / "search.db"
+        with SearchIndex(db_path) as search_index:
+            search_index.index_results(_results())
+
+        result = CliRunner().invoke(
+            cli, ["search", "session", "--type", "pr", "--index", str(db_path)]
+        )
+
+        assert result.exit_code == 0
+        assert "test/repo pr 42 - alice (2024-02-01)" in result.output
+        assert "https://github.com/test/repo/pull/42" in result.output
+
+    def test_missing_index(self, tmp_path):
+        """Test that a missing index is reported instead of created."""
+        result = CliRunner().invoke(cli, ["search", "x", "--index", str(tmp_path / "none.db")])
+
+        assert result.exit_code == 1
+        assert not (tmp_path / "none.db").exists()
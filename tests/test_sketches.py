@@ -0,0 +1,104 @@
+"""
+Tests for streaming quantile sketches.
+"""
+
+import random
+import pytest
+from datetime import datetime
+from llmdev.analyzers import PRDistributions
+from llmdev.sketches import KLLSketch
+
+
+def _rank(sorted_values, value):
+    """Fraction of values strictly below value."""
+    return sum(1 for v in sorted_values if v < value) / len(sorted_values)
+
+
+class TestKLLSketch:
+    """Test cases for KLLSketch."""
+
+    def test_exact_for_small_streams(self):
+        """Test that quantiles are exact before any compaction."""
+        sketch = KLLSketch()
+        for value in [5, 1, 3, 2, 4]:
+            sketch.add(value)
+
+        assert sketch.finalize() == {
+            "count": 5,
+            "min": 1.0,
+            "max": 5.0,
+            "p50": 3.0,
+            "p90": 5.0,
+            "p99": 5.0,
+        }
+
+    def test_rank_error_is_small_with_bounded_memory(self):
+        """Test accuracy and memory on a long skewed stream."""
+        rng = random.Random(7)
+        values = [rng.expovariate(1 / 30) for _ in range(50000)]
+        sketch = KLLSketch()
+        for value in values:
+            sketch.add(value)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.9, 0.99):
+            assert abs(_rank(ordered, sketch.quantile(q)) - q) < 0.02
+        assert sum(len(level) for level in sketch.compactors) < 1000
+
+    def test_merge_matches_single_stream(self):
+        """Test that merged shard sketches approximate the full stream."""
+        rng = random.Random(3)
+        values = [rng.random() * 100 for _ in range(20000)]
+        shards = [KLLSketch() for _ in range(5)]
+        for i, value in enumerate(values):
+            shards[i % 5].add(value)
+
+        merged = KLLSketch()
+        for shard in shards:
+            merged.merge(shard)
+
+        ordered = sorted(values)
+        assert merged.count == len(values)
+        assert merged.min == min(values) and merged.max == max(values)
+        for q in (0.5, 0.9, 0.99):
+            assert abs(_rank(ordered, merged.quantile(q)) - q) < 0.02
+
+    def test_empty_sketch(self):
+        """Test that an empty sketch reports no quantiles."""
+        sketch = KLLSketch().merge(KLLSketch())
+
+        assert sketch.quantile(0.5) is None
+        assert sketch.finalize()["count"] == 0
+
+    def test_invalid_arguments(self):
+        """Test validation of k and quantiles."""
+        with pytest.raises(ValueError):
+            KLLSketch(k=2)
+        with pytest.raises(ValueError):
+            KLLSketch().add(1).quantile(1.5)
+
+
+class TestPRDistributions:
+    """Test cases for per-PR metric distributions."""
+
+    def test_metrics_from_pr_analyses(self):
+        """Test that each metric is sketched and unmerged PRs skip time to merge."""
+        distributions = PRDistributions()
+        distributions.add(
+            {
+                "merged_at": datetime(2024, 1, 2),
+                "time_to_merge_hours": 24.0,
+                "iteration_count": 3,
+                "iterations": {"refinement_count": 1},
+                "comment_count": 4,
+            }
+        )
+        other = PRDistributions().add({"time_to_merge_hours": 5.0, "comment_count": 2})
+
+        summary = distributions.merge(other).finalize()
+
+        assert summary["time_to_merge_hours"]["count"] == 1
+        assert summary["time_to_merge_hours"]["p50"] == 24.0
+        assert summary["commit_count"]["max"] == 3.0
+        assert summary["comment_count"]["count"] == 2
+        assert summary["comment_count"]["p50"] == 2.0
@@ -0,0 +1,120 @@
+"""
+Tests for disk-backed record collections.
+"""
+
+import pickle
+import pytest
+from llmdev.analyzer import RepositoryAnalyzer
+from llmdev.config import Config
+from llmdev.spill import MemoryBudget, SpillList, estimate_size
+from tests.test_store import _collected
+
+
+def _records(count, size=100):
+    return [{"number": i, "body": "x" * size} for i in range(count)]
+
+
+class TestSpillList:
+    """Test cases for SpillList."""
+
+    def test_in_memory_until_spilled(self, tmp_path):
+        """Test that records stay in memory below the budget."""
+        budget = MemoryBudget(10 << 20, tmp_path)
+        records = budget.collection(_records(600), "prs")
+
+        assert not records.spilled
+        assert records.resident_bytes > 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_spills_beyond_budget(self, tmp_path):
+        """Test that exceeding the budget moves full segments to disk."""
+        budget = MemoryBudget(20_000, tmp_path)
+        records = budget.collection(_records(600), "prs")
+
+        assert records.spilled
+        assert records.resident_bytes < estimate_size(_records(SpillList.SEGMENT_SIZE))
+        assert budget.used_bytes == records.resident_bytes
+        assert len(list(next(tmp_path.iterdir()).iterdir())) == 600 // SpillList.SEGMENT_SIZE
+
+        # Later records keep being flushed a segment at a time
+        records.extend(_records(300))
+        assert records.resident_bytes < estimate_size(_records(SpillList.SEGMENT_SIZE))
+
+    def test_sequence_access(self, tmp_path):
+        """Test indexing, slicing, iteration and comparison of a spilled list."""
+        expected = _records(700)
+        records = MemoryBudget(1, tmp_path).collection(expected, "commits")
+
+        assert records.spilled
+        assert len(records) == 700
+        assert records[0] == expected[0]
+        assert records[300] == expected[300]
+        assert records[-1] == expected[-1]
+        assert records[250:260] == expected[250:260]
+        assert list(records) == expected
+        assert records == expected
+        assert [r["number"] for r in reversed(records)][:2] == [699, 698]
+        with pytest.raises(IndexError):
+            records[700]
+
+    def test_spills_largest_collection(self, tmp_path):
+        """Test that the budget spills the collection using the most memory."""
+        budget = MemoryBudget(300_000, tmp_path)
+        large = budget.collection(_records(600, size=500), "prs")
+        small = budget.collection(_records(300, size=10), "issues")
+
+        assert large.spilled
+        assert not small.spilled
+
+    def test_pickles_as_list(self, tmp_path):
+        """Test that a spilled list pickles to a plain list of its records."""
+        records = MemoryBudget(1, tmp_path).collection(_records(600), "prs")
+        restored = pickle.loads(pickle.dumps(records))
+
+        assert type(restored) is list
+        assert restored == _records(600)
+
+    def test_segments_removed_with_list(self, tmp_path):
+        """Test that segment files are deleted when the list is released."""
+        records = MemoryBudget(1, tmp_path).collection(_records(600), "prs")
+        directory = next(tmp_path.iterdir())
+        del records
+
+        assert not directory.exists()
+
+
+class TestSpillingAnalysis:
+    """Test cases for analysis under a memory limit."""
+
+    def test_results_match_in_memory_analysis(self, tmp_path, monkeypatch):
+        """Test that spilled collections give the same analysis results."""
+        monkeypatch.setattr(SpillList, "SEGMENT_SIZE", 1)
+
+        def analyze(**kwargs):
+            config = Config(
+                store_path=None,
+                search_index_path=None,
+                spill_dir=tmp_path / "spill",
+                deep_analysis=True,
+                enable_cache=False,
+                deep_analysis_workers=1,
+                detection_workers=1,
+                **kwargs,
+            )
+            analyzer = RepositoryAnalyzer(config)
+            if analyzer.memory_budget is not None:
+                analyzer.memory_budget.limit_bytes = 0
+            collected = {
+                key: analyzer._collection(value, key) if isinstance(value, list) else value
+                for key, value in _collected().items()
+            }
+            return analyzer, analyzer._analyze_collected(collected)
+
+        _, expected = analyze()
+        analyzer, results = analyze(memory_limit_mb=1)
+
+        assert isinstance(results["prs"], SpillList) and results["prs"].spilled
+        assert results["prs"] == expected["prs"]
+        assert list(results["detections"]) == list(expected["detections"])
+        assert isinstance(results["deep_analysis"]["pr_analyses"], SpillList)
+        assert results["deep_analysis"]["pr_analyses"] == expected["deep_analysis"]["pr_analyses"]
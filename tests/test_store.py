@@ -0,0 +1,185 @@
+"""
+Tests for the local analysis store.
+"""
+
+import pytest
+from datetime import datetime, timezone
+from llmdev.analyzer import RepositoryAnalyzer
+from llmdev.config import Config
+from llmdev.detector import Detection
+from llmdev.store import AnalysisStore
+
+
+def _collected():
+    created = datetime(2024, 1, 1, 9, 30, tzinfo=timezone.utc)
+    return {
+        "repository": {
+            "owner": "test",
+            "name": "repo",
+            "full_name": "test/repo",
+            "description": "Test repository",
+            "stars": 3,
+            "forks": 1,
+            "created_at": created,
+            "updated_at": created,
+        },
+        "commits": [
+            {
+                "sha": "abc123",
+                "message": "Add parser\n\nCo-authored-by: Copilot <copilot@github.com>",
+                "author": "dev",
+                "author_email": "dev@example.com",
+                "date": created,
+                "url": "https://github.com/test/repo/commit/abc123",
+            }
+        ],
+        "prs": [
+            {
+                "number": 42,
+                "title": "Add endpoint",
+                "body": "Generated with GitHub Copilot",
+                "author": "dev",
+                "state": "closed",
+                "created_at": created,
+                "updated_at": created,
+                "merged": True,
+                "merged_at": datetime(2024, 1, 2, tzinfo=timezone.utc),
+                "url": "https://github.com/test/repo/pull/42",
+                "comments": [
+                    {"type": "issue_comment", "body": "One", "author": "a", "created_at": created},
+                    {"type": "review_comment", "body": "Second", "author": "b", "path": "x.py"},
+                ],
+            }
+        ],
+        "issues": [
+            {
+                "number": 7,
+                "title": "Bug",
+                "body": "It breaks",
+                "author": "user",
+                "state": "open",
+                "created_at": created,
+                "updated_at": created,
+                "url": "https://github.com/test/repo/issues/7",
+                "comments": [],
+            }
+        ],
+    }
+
+
+class TestAnalysisStore:
+    """Test cases for AnalysisStore."""
+
+    def test_collection_round_trip(self, tmp_path):
+        """Test that stored records load back with their types and comments."""
+        with AnalysisStore(tmp_path / "store.db") as store:
+            assert store.save_collection(_collected()) == "test/repo"
+            loaded = store.load_collection("test/repo")
+
+        expected = _collected()
+        assert loaded["commits"] == expected["commits"]
+        assert loaded["repository"]["full_name"] == "test/repo"
+        assert loaded["repository"]["created_at"] == expected["repository"]["created_at"]
+        pr = loaded["prs"][0]
+        assert pr["merged"] is True
+        assert pr["merged_at"] == expected["prs"][0]["merged_at"]
+        assert [comment["body"] for comment in pr["comments"]] == ["One", "Second"]
+        assert pr["comments"][1]["path"] == "x.py"
+        assert loaded["issues"][0]["comments"] == []
+
+    def test_recollection_updates_records(self, tmp_path):
+        """Test that collecting again replaces records and comments by key."""
+        with AnalysisStore(tmp_path / "store.db") as store:
+            store.save_collection(_collected())
+            collected = _collected()
+            collected["prs"][0]["title"] = "Add endpoint v2"
+            collected["prs"][0]["comments"] = [{"body": "Only", "author": "c"}]
+            collected["commits"] = []
+            store.save_collection(collected)
+            loaded = store.load_collection("test/repo")
+
+        assert len(loaded["prs"]) == 1
+        assert loaded["prs"][0]["title"] == "Add endpoint v2"
+        assert [comment["body"] for comment in loaded["prs"][0]["comments"]] == ["Only"]
+        assert len(loaded["commits"]) == 1
+
+    def test_detections_are_replaced(self, tmp_path):
+        """Test that each detection run replaces the repository's detections."""
+        old = Detection("pr", "1", "explicit_mention", 0.9, "copilot", {"tool": "copilot"})
+        new = Detection("commit", "abc", "co_author", 0.95, "Copilot")
+        with AnalysisStore(tmp_path / "store.db") as store:
+            store.save_detections("test/repo", [old])
+            store.save_detections("test/repo", [new])
+            store.save_detections("other/repo", [old])
+
+            assert list(store.load_detections("test/repo")) == [new]
+            assert store.load_detections("other/repo")[0].metadata == {"tool": "copilot"}
+
+    def test_unknown_repository(self, tmp_path):
+        """Test that loading a repository that was never collected fails."""
+        with AnalysisStore(tmp_path / "store.db") as store:
+            store.save_collection(_collected())
+
+            assert list(store.repositories()) == ["test/repo"]
+            with pytest.raises(KeyError):
+                store.load_collection("missing/repo")
+
+
+class TestOfflineAnalysis:
+    """Test that analysis stages run from the store."""
+
+    def _config(self, tmp_path, **kwargs):
+        return Config(
+            store_path=tmp_path / "store.db",
+            search_index_path=None,
+            enable_cache=False,
+            **kwargs,
+        )
+
+    def test_analyze_reads_collection_from_store(self, tmp_path, monkeypatch):
+        """Test that collected data goes through the store before analysis."""
+        analyzer = RepositoryAnalyzer(self._config(tmp_path))
+        monkeypatch.setattr(analyzer, "collect", lambda owner, repo: _collected())
+
+        results = analyzer.analyze("test", "repo")
+
+        assert results["prs"][0]["comments"][1]["path"] == "x.py"
+        with AnalysisStore(tmp_path / "store.db") as store:
+            assert list(store.load_detections("test/repo")) == list(results["detections"])
+        assert len(results["detections"]) > 0
+
+    def test_analyze_returns_this_run_only(self, tmp_path, monkeypatch):
+        """Test that data kept from earlier collections stays out of online results."""
+        earlier = _collected()
+        earlier["prs"][0] = dict(earlier["prs"][0], number=41, body="Manual change")
+        with AnalysisStore(tmp_path / "store.db") as store:
+            store.save_collection(earlier)
+        analyzer = RepositoryAnalyzer(self._config(tmp_path))
+        monkeypatch.setattr(analyzer, "collect", lambda owner, repo: _collected())
+
+        results = analyzer.analyze("test", "repo")
+
+        assert [pr["number"] for pr in results["prs"]] == [42]
+        assert results["analysis"]["prs_analyzed"] == 1
+        stored = analyzer.analyze_stored("test/repo")
+        assert sorted(pr["number"] for pr in stored["prs"]) == [41, 42]
+
+    def test_offline_detection_and_deep_analysis(self, tmp_path):
+        """Test re-running detection and deep analysis without GitHub access."""
+        with AnalysisStore(tmp_path / "store.db") as store:
+            store.save_collection(_collected())
+        analyzer = RepositoryAnalyzer(self._config(tmp_path, deep_analysis=True))
+        analyzer.github_client = None
+
+        results = analyzer.analyze_stored("test/repo")
+
+        assert results["analysis"]["prs_analyzed"] == 1
+        assert results["summary"]["total"] == len(results["detections"]) > 0
+        assert results["deep_analysis"]["pr_analyses"][0]["number"] == 42
+
+    def test_offline_requires_store(self, tmp_path):
+        """Test that offline analysis needs the store to be enabled."""
+        analyzer = RepositoryAnalyzer(Config(store_path=None, search_index_path=None))
+
+        with pytest.raises(ValueError):
+            analyzer.analyze_stored("test/repo")
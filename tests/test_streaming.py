@@ -0,0 +1,155 @@
+"""
+Tests for pipelined execution with bounded queues.
+"""
+
+import time
+import threading
+import pytest
+from types import SimpleNamespace
+from llmdev.analyzer import RepositoryAnalyzer
+from llmdev.config import Config
+from llmdev.store import AnalysisStore
+from llmdev.streaming import StreamPipeline
+from tests.test_store import _collected
+
+
+class TestStreamPipeline:
+    """Test cases for StreamPipeline."""
+
+    def test_outputs_in_order(self):
+        """Test that outputs of chained stages arrive in input order."""
+        stream = StreamPipeline(queue_size=2)
+        stream.add_stage("double", lambda x: [x * 2])
+        stream.add_stage("split", lambda x: [x, x + 1] if x % 4 == 0 else [x])
+
+        assert list(stream.run(range(5))) == [0, 1, 2, 4, 5, 6, 8, 9]
+        assert stream.stats["source"].items == 5
+        assert stream.stats["double"].items == 5
+        assert stream.stats["split"].items == 5
+
+    def test_stage_can_drop_items(self):
+        """Test that a stage returning nothing filters its input."""
+        stream = StreamPipeline().add_stage("odd", lambda x: [x] if x % 2 else [])
+        assert list(stream.run(range(6))) == [1, 3, 5]
+
+    def test_backpressure_bounds_items_in_flight(self):
+        """Test that a slow stage keeps the source from running ahead."""
+        produced = []
+        consumed = []
+        lead = []
+
+        def source():
+            for i in range(30):
+                produced.append(i)
+                lead.append(len(produced) - len(consumed))
+                yield i
+
+        def slow(x):
+            time.sleep(0.002)
+            consumed.append(x)
+            return [x]
+
+        stream = StreamPipeline(queue_size=3).add_stage("slow", slow)
+        assert list(stream.run(source())) == list(range(30))
+
+        # Queued items, the one being processed and the one being produced
+        assert max(lead) <= 3 + 2
+        assert stream.stats["source"].blocked_seconds > 0
+
+    def test_stage_error_is_raised(self):
+        """Test that an exception in a stage stops the pipeline and is re-raised."""
+
+        def fail(x):
+            if x == 3:
+                raise RuntimeError("bad item")
+            return [x]
+
+        stream = StreamPipeline(queue_size=1).add_stage("fail", fail)
+        with pytest.raises(RuntimeError, match="bad item"):
+            list(stream.run(range(1000)))
+        assert not [t for t in threading.enumerate() if t.name.startswith("stage-")]
+
+    def test_source_error_is_raised(self):
+        """Test that an exception while producing items is re-raised."""
+
+        def source():
+            yield 1
+            raise IOError("connection reset")
+
+        stream = StreamPipeline().add_stage("identity", lambda x: [x])
+        with pytest.raises(IOError, match="connection reset"):
+            list(stream.run(source()))
+
+    def test_stats(self):
+        """Test per-stage statistics."""
+        stream = StreamPipeline().add_stage("work", lambda x: (time.sleep(0.01), [x])[1])
+        list(stream.run(range(3), source_name="fetch"))
+
+        stats = stream.stats["work"].to_dict()
+        assert stats["items"] == 3
+        assert stats["busy_seconds"] >= 0.03
+        assert 0 < stats["utilization"] <= 1
+        assert set(stream.stats) == {"fetch", "work"}
+
+
+def _analyzer(tmp_path, **kwargs):
+    """An analyzer whose GitHub fetchers yield the test collection."""
+    config = Config(
+        search_index_path=None,
+        memo_dir=tmp_path / "memo",
+        deep_analysis=True,
+        deep_analysis_workers=1,
+        detection_workers=1,
+        **kwargs,
+    )
+    analyzer = RepositoryAnalyzer(config)
+    collected = _collected()
+    repository = SimpleNamespace(
+        full_name="test/repo",
+        description=collected["repository"]["description"],
+        stargazers_count=collected["repository"]["stars"],
+        forks_count=collected["repository"]["forks"],
+        created_at=collected["repository"]["created_at"],
+        updated_at=collected["repository"]["updated_at"],
+    )
+    analyzer.github_client.get_repository = lambda owner, repo: repository
+    analyzer._iter_commits = lambda repository: iter(_collected()["commits"])
+    analyzer._iter_prs = lambda repository: iter(_collected()["prs"])
+    analyzer._iter_issues = lambda repository: iter(_collected()["issues"])
+    return analyzer
+
+
+class TestPipelinedAnalysis:
+    """Test cases for the pipelined RepositoryAnalyzer path."""
+
+    def test_matches_serial_analysis(self, tmp_path):
+        """Test that pipelined analysis gives the same results as the serial stages."""
+        serial = _analyzer(tmp_path, store_path=None).analyze("test", "repo")
+        pipelined = _analyzer(tmp_path, store_path=None, pipelined=True).analyze("test", "repo")
+
+        assert list(pipelined["detections"]) == list(serial["detections"])
+        assert pipelined["summary"] == serial["summary"]
+        assert pipelined["authors"] == serial["authors"]
+        assert pipelined["prs"] == serial["prs"]
+        assert pipelined["deep_analysis"]["pr_analyses"] == serial["deep_analysis"]["pr_analyses"]
+        assert (
+            pipelined["deep_analysis"]["category_distribution"]
+            == serial["deep_analysis"]["category_distribution"]
+        )
+
+        stages = pipelined["analysis"]["stages"]
+        assert list(stages) == ["fetch", "detect", "deep"]
+        total = len(serial["commits"]) + len(serial["prs"]) + len(serial["issues"])
+        assert stages["fetch"]["items"] == total
+        assert stages["deep"]["items"] == total
+
+    def test_saves_to_store(self, tmp_path):
+        """Test that pipelined analysis stores the collection and detections."""
+        store_path = tmp_path / "store.db"
+        results = _analyzer(tmp_path, store_path=store_path, pipelined=True).analyze(
+            "test", "repo"
+        )
+
+        with AnalysisStore(store_path) as store:
+            assert store.load_collection("test/repo")["prs"][0]["number"] == 42
+            assert len(store.load_detections("test/repo")) == len(results["detections"])
@@ -0,0 +1,139 @@
+"""
+Tests for commit trailer parsing and co-author indexing.
+"""
+
+import pytest
+from llmdev.detector import CopilotDetector
+from llmdev.trailers import CoAuthorIndex, Trailer, parse_identity, split_trailers
+
+
+class TestSplitTrailers:
+    """Test cases for split_trailers."""
+
+    def test_extracts_trailer_block(self):
+        """Test that the final trailer paragraph is split from the body."""
+        message = (
+            "Add parser\n\nLonger explanation.\n\n"
+            "Signed-off-by: Dev <dev@example.com>\n"
+            "Co-authored-by: Copilot <175728472+Copilot@users.noreply.github.com>\n"
+        )
+
+        body, trailers = split_trailers(message)
+
+        assert body == "Add parser\n\nLonger explanation."
+        assert trailers == [
+            Trailer("Signed-off-by", "Dev <dev@example.com>"),
+            Trailer("Co-authored-by", "Copilot <175728472+Copilot@users.noreply.github.com>"),
+        ]
+
+    def test_subject_only_message_has_no_trailers(self):
+        """Test that a single paragraph is never treated as trailers."""
+        assert split_trailers("Fixes: the login bug") == ("Fixes: the login bug", [])
+
+    def test_prose_paragraph_is_not_a_trailer_block(self):
+        """Test that a final paragraph with ordinary prose is left in the body."""
+        message = "Subject\n\nNote: this is prose\nand keeps going"
+
+        assert split_trailers(message) == (message, [])
+
+    def test_continuation_lines(self):
+        """Test that indented lines continue the previous trailer."""
+        _, trailers = split_trailers("Subject\n\nGenerated-by: Claude Code\n  with review")
+
+        assert trailers == [Trailer("Generated-by", "Claude Code with review")]
+
+    def test_parse_identity(self):
+        """Test identity parsing with and without email."""
+        assert parse_identity("Claude <noreply@anthropic.com>") == (
+            "Claude",
+            "noreply@anthropic.com",
+        )
+        assert parse_identity("aider") == ("aider", "")
+
+
+class TestTrailerDetection:
+    """Test cases for trailer-based detection in commits."""
+
+    def test_co_author_trailer_detection(self):
+        """Test that AI co-author trailers produce typed detections."""
+        detector = CopilotDetector()
+        commit = {
+            "sha": "abc",
+            "message": "Refactor\n\nCo-authored-by: Claude <noreply@anthropic.com>",
+            "author": "dev",
+            "author_email": "dev@example.com",
+        }
+
+        detections = detector.detect_in_commit(commit)
+
+        assert len(detections) == 1
+        assert detections[0].detection_type == "co_author_trailer"
+        assert detections[0].metadata["tool"] == "claude"
+
+    def test_human_co_author_is_not_detected(self):
+        """Test that human co-authors are indexed but not flagged."""
+        detector = CopilotDetector()
+        commit = {
+            "sha": "abc",
+            "message": "Pair on parser\n\nCo-authored-by: Alex <alex@example.com>",
+            "author": "dev",
+        }
+
+        assert detector.detect_in_commit(commit) == []
+        assert detector.co_authors.co_authors["alex@example.com"]["commits"] == 1
+
+    def test_generated_by_trailer_detection(self):
+        """Test that Generated-by trailers always count as AI assistance."""
+        detector = CopilotDetector()
+        commit = {"sha": "abc", "message": "Tidy\n\nGenerated-by: SomeNewAgent 1.0"}
+
+        detections = detector.detect_in_commit(commit)
+
+        assert detections[0].detection_type == "generated_by_trailer"
+        assert detections[0].metadata["tool"] == "unknown"
+
+    @pytest.mark.parametrize(
+        "trailer, tool",
+        [
+            ("Note: drafted with GitHub Copilot", "copilot"),
+            ("Reviewed-by: Claude <noreply@anthropic.com>", "claude"),
+        ],
+    )
+    def test_tool_in_other_trailer_detected(self, trailer, tool):
+        """Test that a tool named in a trailer without structural handling is still found."""
+        detector = CopilotDetector()
+        commit = {"sha": "abc", "message": f"Fix bug\n\n{trailer}", "author": "dev"}
+
+        detections = detector.detect_in_commit(commit)
+
+        assert [d.detection_type for d in detections] == ["explicit_mention"]
+        assert detections[0].metadata["tool"] == tool
+        assert detections[0].evidence == trailer
+
+    def test_author_aggregates(self):
+        """Test per-identity share of commits carrying AI trailers."""
+        detector = CopilotDetector()
+        trailer = "\n\nCo-authored-by: Copilot <copilot@users.noreply.github.com>"
+        for sha, message in [("1", "One" + trailer), ("2", "Two"), ("3", "Three" + trailer)]:
+            detector.detect_in_commit(
+                {"sha": sha, "message": message, "author": "Dev", "author_email": "dev@x.org"}
+            )
+
+        summary = detector.co_authors.summary()
+
+        assert summary["authors"]["dev@x.org"]["commits"] == 3
+        assert summary["authors"]["dev@x.org"]["ai_trailer_commits"] == 2
+        assert summary["authors"]["dev@x.org"]["ai_trailer_share"] == pytest.approx(2 / 3)
+        assert summary["co_authors"]["copilot@users.noreply.github.com"]["tool"] == "copilot"
+
+    def test_index_merge(self):
+        """Test merging two partial indexes."""
+        first = CoAuthorIndex()
+        second = CoAuthorIndex()
+        first.add_commit("Dev", "dev@x.org", [], {"Copilot": "copilot"})
+        second.add_commit("Dev", "dev@x.org", [], {})
+
+        merged = first.merge(second).summary()
+
+        assert merged["total_commits"] == 2
+        assert merged["ai_trailer_commits"] == 1